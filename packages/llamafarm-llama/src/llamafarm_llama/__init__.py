@@ -35,7 +35,20 @@ _lib_path = get_lib_path()
 # Import main classes (after binary is ensured available)
 # Import logging control
 from ._bindings import set_llama_log_level  # noqa: E402
+from .batching import BatchRequest, ContinuousBatcher  # noqa: E402
+from .cache import (  # noqa: E402
+    BaseLlamaCache,
+    LlamaDiskCache,
+    LlamaRAMCache,
+    LlamaState,
+)
 from .llama import Llama  # noqa: E402
+from .logits import (  # noqa: E402
+    LogitBiasProcessor,
+    LogitsProcessor,
+    LogitsProcessorList,
+    TokenMaskProcessor,
+)
 from .types import (  # noqa: E402
     ChatCompletionChunk,
     ChatCompletionResponse,
@@ -49,6 +62,19 @@ __llama_cpp_version__ = LLAMA_CPP_VERSION
 __all__ = [
     # Main class
     "Llama",
+    # Continuous batching
+    "ContinuousBatcher",
+    "BatchRequest",
+    # Logits processors
+    "LogitsProcessor",
+    "LogitsProcessorList",
+    "LogitBiasProcessor",
+    "TokenMaskProcessor",
+    # KV cache snapshots
+    "BaseLlamaCache",
+    "LlamaRAMCache",
+    "LlamaDiskCache",
+    "LlamaState",
     # Types
     "ChatMessage",
     "ChatCompletionResponse",
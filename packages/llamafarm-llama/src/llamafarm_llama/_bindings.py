@@ -248,6 +248,7 @@ LLAMA_CDEF = """
     uint32_t llama_n_ctx(const struct llama_context * ctx);
     uint32_t llama_n_batch(const struct llama_context * ctx);
     uint32_t llama_n_ubatch(const struct llama_context * ctx);
+    enum llama_pooling_type llama_pooling_type(const struct llama_context * ctx);
 
     // Tokenization (llama.cpp b7376+ uses vocab instead of model)
     int32_t llama_tokenize(
@@ -312,6 +313,11 @@ LLAMA_CDEF = """
     void llama_memory_seq_keep(llama_memory_t mem, llama_seq_id seq_id);
     void llama_memory_seq_add(llama_memory_t mem, llama_seq_id seq_id, llama_pos p0, llama_pos p1, llama_pos delta);
 
+    // Per-sequence state save/restore (KV cache snapshots)
+    size_t llama_state_seq_get_size(struct llama_context * ctx, llama_seq_id seq_id);
+    size_t llama_state_seq_get_data(struct llama_context * ctx, uint8_t * dst, size_t size, llama_seq_id seq_id);
+    size_t llama_state_seq_set_data(struct llama_context * ctx, const uint8_t * src, size_t size, llama_seq_id dest_seq_id);
+
     // Decoding
     int32_t llama_decode(struct llama_context * ctx, struct llama_batch batch);
 
@@ -0,0 +1,504 @@
+"""
+Continuous batching over multiple llama.cpp sequences in one context.
+
+A :class:`ContinuousBatcher` owns a background thread that keeps up to
+``n_slots`` generation requests resident in a single llama context (one
+sequence ID per slot). Between decode steps it admits queued requests into
+free slots; every step decodes all active sequences (plus prompt chunks of
+newly admitted ones) in a single ``llama_decode`` call and samples one token
+per sequence. Concurrent callers therefore share the model instead of waiting
+for each other's completions to finish.
+
+Example:
+    >>> llm = Llama(model_path="model.gguf", n_ctx=8192, n_seq_max=4)
+    >>> batcher = ContinuousBatcher(llm)
+    >>> batcher.start()
+    >>> request = BatchRequest(
+    ...     llm.tokenize(prompt, add_special=False, parse_special=True),
+    ...     max_tokens=128,
+    ...     on_delta=lambda text: print(text, end=""),
+    ...     on_done=lambda reason, error: print(f"\\n[{reason}]"),
+    ... )
+    >>> batcher.submit(request)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Deque, Iterator, List, Optional
+
+from ._bindings import ffi
+from .streaming import IncrementalDetokenizer, StopMatcher
+
+if TYPE_CHECKING:
+    from .llama import Llama
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRequest:
+    """A generation request scheduled on a :class:`ContinuousBatcher`.
+
+    Callbacks are invoked from the batcher thread and must not block.
+
+    Args:
+        prompt_tokens: Prompt token IDs (already templated and tokenized).
+        max_tokens: Maximum tokens to generate.
+        temperature: Sampling temperature.
+        top_p: Top-p sampling.
+        top_k: Top-k sampling.
+        min_p: Min-p sampling.
+        seed: Random seed (None = random).
+        stop: Stop sequences.
+        logits_processor: Optional processor called as
+            ``processor(token_ids, logits)`` with a zero-copy NumPy view of the
+            logits (see :mod:`llamafarm_llama.logits`).
+        on_delta: Called with each new piece of generated text.
+        on_done: Called exactly once with ``(finish_reason, error)``. The finish
+            reason is "stop", "length", "cancelled" or "error".
+    """
+
+    def __init__(
+        self,
+        prompt_tokens: List[int],
+        *,
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        top_p: float = 0.95,
+        top_k: int = 40,
+        min_p: float = 0.05,
+        seed: Optional[int] = None,
+        stop: Optional[List[str]] = None,
+        logits_processor: Optional[Callable] = None,
+        on_delta: Optional[Callable[[str], None]] = None,
+        on_done: Optional[Callable[[str, Optional[BaseException]], None]] = None,
+    ):
+        self.prompt_tokens = list(prompt_tokens)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+        self.top_k = top_k
+        self.min_p = min_p
+        self.seed = seed
+        self.stop = [s for s in (stop or []) if s]
+        self.logits_processor = logits_processor
+        self.on_delta = on_delta
+        self.on_done = on_done
+
+        self.generated_tokens: List[int] = []
+        self.finish_reason: Optional[str] = None
+        self.cancelled = False
+        self.t_submit = time.perf_counter()
+        self.t_first_token: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the request has finished (successfully or not)."""
+        return self.finish_reason is not None
+
+    @property
+    def n_ctx_needed(self) -> int:
+        """KV cells the request may occupy at most."""
+        return len(self.prompt_tokens) + self.max_tokens
+
+
+class _Slot:
+    """Per-sequence generation state for an admitted request."""
+
+    def __init__(
+        self,
+        seq_id: int,
+        request: BatchRequest,
+        sampler: "ffi.CData",
+        detok: IncrementalDetokenizer,
+    ):
+        self.seq_id = seq_id
+        self.request = request
+        self.sampler = sampler
+        self.n_past = 0  # Tokens decoded into this sequence
+        self.n_prompt_done = 0  # Prompt tokens decoded so far
+        self.i_batch = -1  # Index of this slot's logits in the current batch
+        self.next_token: Optional[int] = None  # Sampled, not yet decoded
+        self.detok = detok
+        # Prompt + generated tokens, extended in place for logits processors
+        self.input_ids = list(request.prompt_tokens)
+        self.stop_matcher = StopMatcher(request.stop)
+
+    @property
+    def prefilling(self) -> bool:
+        return self.n_prompt_done < len(self.request.prompt_tokens)
+
+
+class ContinuousBatcher:
+    """Schedules concurrent generation requests onto one llama context.
+
+    The Llama instance must be created with ``n_seq_max >= n_slots``. While the
+    batcher is running it owns the context; use :meth:`exclusive` to run
+    single-sequence calls (e.g. multimodal completions) on the same instance.
+
+    Args:
+        llama: Loaded Llama instance.
+        n_slots: Number of concurrent sequences (default: ``llama.n_seq_max``).
+    """
+
+    def __init__(self, llama: "Llama", n_slots: Optional[int] = None):
+        self._llama = llama
+        self._lib = llama._lib
+        self._n_slots = n_slots or llama.n_seq_max
+        if self._n_slots > llama.n_seq_max:
+            raise ValueError(
+                f"n_slots ({self._n_slots}) exceeds the context's n_seq_max "
+                f"({llama.n_seq_max})"
+            )
+        self._n_ctx = llama.n_ctx
+        self._n_batch = llama.n_batch
+
+        self._cv = threading.Condition()
+        self._pending: Deque[BatchRequest] = deque()
+        self._slots: List[Optional[_Slot]] = [None] * self._n_slots
+        self._reserved = 0  # KV cells reserved by admitted requests
+        self._paused = 0  # Number of exclusive() holders waiting or active
+        self._ctx_lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._batch = None
+
+    @property
+    def n_slots(self) -> int:
+        """Number of concurrent sequence slots."""
+        return self._n_slots
+
+    @property
+    def n_active(self) -> int:
+        """Number of requests currently resident in a slot."""
+        return sum(1 for s in self._slots if s is not None)
+
+    @property
+    def n_pending(self) -> int:
+        """Number of requests waiting for a free slot."""
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        with self._cv:
+            if self._running:
+                return
+            self._batch = self._lib.llama_batch_init(self._n_batch, 0, 1)
+            self._running = True
+        # Sequences are managed explicitly from now on
+        self._llama._clear_kv()
+        self._thread = threading.Thread(
+            target=self._run, name="llama-batcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Continuous batching started: {self._n_slots} slots, "
+            f"n_ctx={self._n_ctx}, n_batch={self._n_batch}"
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the scheduler and fail all queued and active requests."""
+        with self._cv:
+            if not self._running:
+                return
+            self._running = False
+            self._cv.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        with self._cv:
+            shutdown = RuntimeError("Batcher stopped")
+            while self._pending:
+                self._finish_request(self._pending.popleft(), "error", shutdown)
+            for slot in self._slots:
+                if slot is not None:
+                    self._release(slot, "error", shutdown)
+            if self._batch is not None:
+                self._lib.llama_batch_free(self._batch)
+                self._batch = None
+
+    def submit(self, request: BatchRequest) -> None:
+        """Queue a request for generation.
+
+        Raises:
+            ValueError: If the prompt cannot fit in the context.
+            RuntimeError: If the batcher is not running.
+        """
+        if not request.prompt_tokens:
+            raise ValueError("Prompt must contain at least one token")
+        if len(request.prompt_tokens) >= self._n_ctx:
+            raise ValueError(
+                f"Prompt too long: {len(request.prompt_tokens)} tokens > "
+                f"{self._n_ctx} context"
+            )
+        # Never generate past the shared context
+        request.max_tokens = min(
+            request.max_tokens, self._n_ctx - len(request.prompt_tokens)
+        )
+
+        with self._cv:
+            if not self._running:
+                raise RuntimeError("Batcher is not running")
+            self._pending.append(request)
+            self._cv.notify_all()
+
+    def cancel(self, request: BatchRequest) -> None:
+        """Cancel a request. Its slot is freed before the next decode step."""
+        with self._cv:
+            request.cancelled = True
+            if request in self._pending:
+                self._pending.remove(request)
+                self._finish_request(request, "cancelled", None)
+            self._cv.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator["Llama"]:
+        """Take exclusive use of the context for single-sequence calls.
+
+        Admission of new requests is paused and the caller waits until all
+        active sequences have finished.
+        """
+        with self._cv:
+            self._paused += 1
+            while self.n_active > 0 and self._running:
+                self._cv.wait()
+        self._ctx_lock.acquire()
+        try:
+            self._llama._clear_kv()
+            yield self._llama
+        finally:
+            self._llama._clear_kv()
+            self._ctx_lock.release()
+            with self._cv:
+                self._paused -= 1
+                self._cv.notify_all()
+
+    # ------------------------------------------------------------------
+    # Scheduler loop
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while self._running and not self._has_work():
+                    self._cv.wait()
+                if not self._running:
+                    return
+                self._release_cancelled()
+                self._admit()
+
+            if self.n_active == 0:
+                continue
+
+            with self._ctx_lock:
+                try:
+                    self._step()
+                except Exception as e:
+                    logger.error(f"Batch decode step failed: {e}", exc_info=True)
+                    with self._cv:
+                        for slot in self._slots:
+                            if slot is not None:
+                                self._release(slot, "error", e)
+
+            with self._cv:
+                self._cv.notify_all()
+
+    def _has_work(self) -> bool:
+        if self.n_active > 0:
+            return True
+        return bool(self._pending) and self._paused == 0
+
+    def _admit(self) -> None:
+        """Move pending requests into free slots while the KV budget allows."""
+        if self._paused:
+            return
+        for seq_id, slot in enumerate(self._slots):
+            if slot is not None:
+                continue
+            if not self._pending:
+                break
+            request = self._pending[0]
+            needed = min(request.n_ctx_needed, self._n_ctx)
+            if self._reserved + needed > self._n_ctx:
+                # Head-of-line request waits until enough cells are released
+                break
+            self._pending.popleft()
+            sampler = self._llama._build_sampler(
+                temperature=request.temperature,
+                top_p=request.top_p,
+                top_k=request.top_k,
+                min_p=request.min_p,
+                seed=request.seed,
+            )
+            self._slots[seq_id] = _Slot(
+                seq_id, request, sampler, IncrementalDetokenizer(self._llama)
+            )
+            self._reserved += needed
+            logger.debug(
+                f"Admitted request into slot {seq_id} "
+                f"({len(request.prompt_tokens)} prompt tokens, "
+                f"waited {(time.perf_counter() - request.t_submit) * 1000:.1f}ms)"
+            )
+
+    def _release_cancelled(self) -> None:
+        for slot in self._slots:
+            if slot is not None and slot.request.cancelled:
+                self._release(slot, "cancelled", None)
+
+    def _release(
+        self, slot: _Slot, finish_reason: str, error: Optional[BaseException]
+    ) -> None:
+        """Free a slot's sequence and sampler and notify its request."""
+        self._lib.llama_memory_seq_rm(self._llama._memory, slot.seq_id, -1, -1)
+        self._lib.llama_sampler_free(slot.sampler)
+        self._slots[slot.seq_id] = None
+        self._reserved -= min(slot.request.n_ctx_needed, self._n_ctx)
+
+        request = slot.request
+        if finish_reason in ("stop", "length") and request.t_first_token is not None:
+            gen_time = time.perf_counter() - request.t_first_token
+            n_gen = len(request.generated_tokens)
+            logger.info(
+                f"[Perf] Slot {slot.seq_id}: generated {n_gen} tokens in "
+                f"{gen_time * 1000:.1f}ms "
+                f"({n_gen / gen_time if gen_time > 0 else 0:.1f} tok/s)"
+            )
+        self._finish_request(request, finish_reason, error)
+
+    @staticmethod
+    def _finish_request(
+        request: BatchRequest, finish_reason: str, error: Optional[BaseException]
+    ) -> None:
+        if request.done:
+            return
+        request.finish_reason = finish_reason
+        if request.on_done is not None:
+            try:
+                request.on_done(finish_reason, error)
+            except Exception as e:
+                logger.warning(f"on_done callback failed: {e}")
+
+    def _add_token(
+        self, n: int, token: int, pos: int, seq_id: int, logits: bool
+    ) -> None:
+        batch = self._batch
+        batch.token[n] = token
+        batch.pos[n] = pos
+        batch.n_seq_id[n] = 1
+        batch.seq_id[n][0] = seq_id
+        batch.logits[n] = 1 if logits else 0
+
+    def _step(self) -> None:
+        """Run one decode over all active sequences and sample their next tokens."""
+        # The resident sequences no longer match the single-sequence prefix cache
+        self._llama._kv_tokens = None
+
+        n = 0
+        active = [s for s in self._slots if s is not None]
+
+        # Generating sequences: one token each
+        for slot in active:
+            slot.i_batch = -1
+            if not slot.prefilling and slot.next_token is not None:
+                self._add_token(n, slot.next_token, slot.n_past, slot.seq_id, True)
+                slot.i_batch = n
+                slot.n_past += 1
+                slot.next_token = None
+                n += 1
+
+        # Prefilling sequences: fill the rest of the batch with prompt chunks
+        for slot in active:
+            if not slot.prefilling or n >= self._n_batch:
+                continue
+            prompt = slot.request.prompt_tokens
+            take = min(self._n_batch - n, len(prompt) - slot.n_prompt_done)
+            for k in range(take):
+                idx = slot.n_prompt_done + k
+                is_last = idx == len(prompt) - 1
+                self._add_token(n, prompt[idx], slot.n_past, slot.seq_id, is_last)
+                if is_last:
+                    slot.i_batch = n
+                slot.n_past += 1
+                n += 1
+            slot.n_prompt_done += take
+
+        if n == 0:
+            return
+
+        self._batch.n_tokens = n
+        result = self._lib.llama_decode(self._llama._ctx, self._batch)
+        if result != 0:
+            raise RuntimeError(f"llama_decode failed with status {result}")
+
+        with self._cv:
+            for slot in active:
+                if slot.i_batch >= 0 and not slot.request.cancelled:
+                    self._sample(slot)
+
+    def _sample(self, slot: _Slot) -> None:
+        """Sample, detokenize and emit the next token for a sequence."""
+        llama = self._llama
+        request = slot.request
+
+        if request.logits_processor is not None:
+            llama._apply_logits_processor(
+                request.logits_processor, slot.input_ids, slot.i_batch
+            )
+
+        token = self._lib.llama_sampler_sample(slot.sampler, llama._ctx, slot.i_batch)
+        self._lib.llama_sampler_accept(slot.sampler, token)
+        slot.input_ids.append(token)
+
+        if request.t_first_token is None:
+            request.t_first_token = time.perf_counter()
+            logger.info(
+                f"[TTFT] Slot {slot.seq_id}: first token "
+                f"{(request.t_first_token - request.t_submit) * 1000:.1f}ms"
+            )
+
+        if self._lib.llama_vocab_is_eog(llama._vocab, token):
+            self._flush_pending(slot)
+            self._release(slot, "stop", None)
+            return
+
+        request.generated_tokens.append(token)
+        delta = slot.detok.push(token)
+
+        finish_reason = None
+        stop_idx = slot.stop_matcher.feed(delta)
+        if stop_idx is not None:
+            finish_reason = "stop"
+            delta = delta[: max(stop_idx, 0)]
+
+        if delta:
+            self._emit(request, delta)
+
+        if (
+            finish_reason is None
+            and len(request.generated_tokens) >= request.max_tokens
+        ):
+            self._flush_pending(slot)
+            finish_reason = "length"
+
+        if finish_reason is not None:
+            self._release(slot, finish_reason, None)
+        else:
+            slot.next_token = token
+
+    def _flush_pending(self, slot: _Slot) -> None:
+        text = slot.detok.flush()
+        if text:
+            self._emit(slot.request, text)
+
+    @staticmethod
+    def _emit(request: BatchRequest, text: str) -> None:
+        if request.on_delta is not None:
+            try:
+                request.on_delta(text)
+            except Exception as e:
+                logger.warning(f"on_delta callback failed: {e}")
@@ -0,0 +1,340 @@
+"""
+KV cache snapshots for prefix reuse across requests.
+
+A :class:`Llama` instance always reuses the longest common token prefix of
+the sequence that is currently resident in its KV cache. Attaching a cache
+via :meth:`Llama.set_cache` additionally keeps snapshots of *other* prefixes
+(e.g. one per chat session or per system prompt) so that switching between
+conversations does not discard already-processed prompts.
+
+Example:
+    >>> from llamafarm_llama import Llama, LlamaRAMCache
+    >>> llm = Llama(model_path="model.gguf", n_ctx=8192)
+    >>> llm.set_cache(LlamaRAMCache(capacity_bytes=2 << 30))
+    >>> llm.create_chat_completion(messages, cache_key="session-123")
+
+:class:`LlamaDiskCache` persists snapshots to a directory so they survive model
+unloads and process restarts. Attached via :meth:`Llama.set_prefix_cache`, it is
+keyed by model + token prefix hash instead of a caller-supplied key:
+
+    >>> llm.set_prefix_cache(LlamaDiskCache("~/.cache/kv", capacity_bytes=8 << 30))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LlamaState:
+    """Snapshot of a single llama.cpp sequence.
+
+    Attributes:
+        tokens: Token IDs that were decoded into the sequence.
+        state: Opaque sequence state from ``llama_state_seq_get_data``.
+    """
+
+    tokens: Tuple[int, ...]
+    state: bytes
+
+    @property
+    def n_bytes(self) -> int:
+        """Approximate memory footprint of the snapshot."""
+        return len(self.state) + 4 * len(self.tokens)
+
+
+class BaseLlamaCache(ABC):
+    """Base class for keyed KV state caches."""
+
+    def __init__(self, capacity_bytes: int = 2 << 30):
+        self.capacity_bytes = capacity_bytes
+
+    @property
+    @abstractmethod
+    def cache_size(self) -> int:
+        """Total size in bytes of all cached snapshots."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[LlamaState]:
+        """Return the snapshot for ``key`` (marking it recently used), or None."""
+
+    @abstractmethod
+    def put(self, key: str, value: LlamaState) -> None:
+        """Store a snapshot, evicting least recently used entries if needed."""
+
+    @abstractmethod
+    def pop(self, key: str) -> Optional[LlamaState]:
+        """Remove and return the snapshot for ``key``."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all cached snapshots."""
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        """Iterate over cached keys, least recently used first."""
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class LlamaRAMCache(BaseLlamaCache):
+    """In-memory LRU cache of sequence snapshots, bounded by total bytes."""
+
+    def __init__(self, capacity_bytes: int = 2 << 30):
+        super().__init__(capacity_bytes)
+        self._entries: OrderedDict[str, LlamaState] = OrderedDict()
+        self._size = 0
+
+    @property
+    def cache_size(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[LlamaState]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: LlamaState) -> None:
+        if value.n_bytes > self.capacity_bytes:
+            logger.debug(
+                f"Skipping KV snapshot for '{key}': {value.n_bytes} bytes exceeds "
+                f"cache capacity of {self.capacity_bytes} bytes"
+            )
+            self.pop(key)
+            return
+
+        self.pop(key)
+        self._entries[key] = value
+        self._size += value.n_bytes
+
+        while self._size > self.capacity_bytes and self._entries:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.n_bytes
+            logger.debug(
+                f"Evicted KV snapshot '{evicted_key}' ({evicted.n_bytes} bytes)"
+            )
+
+    def pop(self, key: str) -> Optional[LlamaState]:
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._size -= value.n_bytes
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def keys(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LlamaDiskCache(BaseLlamaCache):
+    """On-disk LRU cache of sequence snapshots, bounded by total bytes.
+
+    Each snapshot is one file in ``cache_dir``. Recency is tracked with file
+    modification times, so the LRU order is rebuilt from the directory when a
+    new process opens it. Writes go through a temporary file and an atomic
+    rename, so readers never see a partial snapshot. The index is guarded by a
+    lock, so one cache can be shared by models loaded in different threads.
+
+    Keys made of ``[A-Za-z0-9_.-]`` are used as file names directly; other keys
+    are stored under their SHA-256 digest (and :meth:`keys` yields the digest).
+
+    Args:
+        cache_dir: Directory for snapshot files (created if missing).
+        capacity_bytes: Maximum total size of snapshot files.
+    """
+
+    SUFFIX = ".kvstate"
+    _MAGIC = b"LFKV"
+    _VERSION = 1
+    _HEADER = struct.Struct("<4sII")  # magic, version, n_tokens
+    _SAFE_KEY = re.compile(r"^[A-Za-z0-9_.-]{1,200}$")
+
+    def __init__(
+        self, cache_dir: Union[str, os.PathLike], capacity_bytes: int = 10 << 30
+    ):
+        super().__init__(capacity_bytes)
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # name -> file size, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._scan()
+
+    def _scan(self) -> None:
+        """Index existing snapshot files by modification time."""
+        files = []
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append(
+                (stat.st_mtime_ns, path.name[: -len(self.SUFFIX)], stat.st_size)
+            )
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        self._evict()
+
+    def _name(self, key: str) -> str:
+        if self._SAFE_KEY.match(key):
+            return key
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}{self.SUFFIX}"
+
+    def _forget(self, name: str) -> None:
+        size = self._entries.pop(name, None)
+        if size is not None:
+            self._size -= size
+        try:
+            self._path(name).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Failed to delete KV snapshot '{name}': {e}")
+
+    def _evict(self) -> None:
+        while self._size > self.capacity_bytes and self._entries:
+            name = next(iter(self._entries))
+            size = self._entries[name]
+            self._forget(name)
+            logger.debug(f"Evicted KV snapshot '{name}' from disk ({size} bytes)")
+
+    @classmethod
+    def _encode(cls, value: LlamaState) -> bytes:
+        tokens = array("i", value.tokens)
+        if sys.byteorder == "big":
+            tokens.byteswap()
+        header = cls._HEADER.pack(cls._MAGIC, cls._VERSION, len(tokens))
+        return header + tokens.tobytes() + value.state
+
+    @classmethod
+    def _decode(cls, data: bytes) -> Optional[LlamaState]:
+        if len(data) < cls._HEADER.size:
+            return None
+        magic, version, n_tokens = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC or version != cls._VERSION:
+            return None
+        start = cls._HEADER.size
+        end = start + 4 * n_tokens
+        if len(data) < end:
+            return None
+        tokens = array("i")
+        tokens.frombytes(data[start:end])
+        if sys.byteorder == "big":
+            tokens.byteswap()
+        return LlamaState(tokens=tuple(tokens), state=data[end:])
+
+    @property
+    def cache_size(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[LlamaState]:
+        with self._lock:
+            name = self._name(key)
+            if name not in self._entries:
+                return None
+
+            path = self._path(name)
+            try:
+                data = path.read_bytes()
+            except OSError:
+                # Removed by another process sharing the directory
+                self._forget(name)
+                return None
+
+            value = self._decode(data)
+            if value is None:
+                logger.warning(f"Discarding unreadable KV snapshot: {path}")
+                self._forget(name)
+                return None
+
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._entries.move_to_end(name)
+            return value
+
+    def put(self, key: str, value: LlamaState) -> None:
+        with self._lock:
+            name = self._name(key)
+            data = self._encode(value)
+            if len(data) > self.capacity_bytes:
+                logger.debug(
+                    f"Skipping KV snapshot for '{key}': {len(data)} bytes exceeds "
+                    f"cache capacity of {self.capacity_bytes} bytes"
+                )
+                self._forget(name)
+                return
+
+            path = self._path(name)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            try:
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Failed to write KV snapshot {path}: {e}")
+                tmp.unlink(missing_ok=True)
+                return
+
+            old = self._entries.pop(name, None)
+            if old is not None:
+                self._size -= old
+            self._entries[name] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    def pop(self, key: str) -> Optional[LlamaState]:
+        with self._lock:
+            value = self.get(key)
+            self._forget(self._name(key))
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in list(self._entries):
+                self._forget(name)
+
+    def keys(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._name(key) in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -6,9 +6,11 @@ from __future__ import annotations
 
 import logging
 import sys
+import threading
 import time
 import uuid
 from typing import (
+    TYPE_CHECKING,
     Callable,
     Dict,
     Iterator,
@@ -18,15 +20,28 @@ from typing import (
 )
 
 from ._bindings import ensure_backend, ffi, get_lib, get_mtmd_lib
+from .cache import BaseLlamaCache, LlamaState
+from .streaming import IncrementalDetokenizer, StopMatcher
 from .types import (
     ChatCompletionChunk,
     ChatCompletionResponse,
     EmbeddingResponse,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+def _is_cancelled(cancel_event: Optional[threading.Event]) -> bool:
+    return cancel_event is not None and cancel_event.is_set()
+
+
+# enum llama_pooling_type
+LLAMA_POOLING_TYPE_NONE = 0
+
+
 class Llama:
     """
     High-level interface to llama.cpp, API-compatible with llama-cpp-python.
@@ -85,6 +100,7 @@ class Llama:
         flash_attn: bool = True,  # Enable by default for faster inference
         cache_type_k: Optional[str] = None,  # KV cache key quantization (e.g., "q4_0", "q8_0", "f16")
         cache_type_v: Optional[str] = None,  # KV cache value quantization (e.g., "q4_0", "q8_0", "f16")
+        n_seq_max: int = 1,  # Parallel sequences for continuous batching
         verbose: bool = True,
         warmup: bool = True,  # Run warmup inference to compile shaders
         **kwargs,
@@ -121,6 +137,9 @@ class Llama:
             cache_type_v: KV cache value quantization type. Same options as cache_type_k.
                           Setting both to "q4_0" significantly reduces memory on devices
                           like Jetson Orin Nano (8GB shared memory).
+            n_seq_max: Maximum number of parallel sequences in the context. Values
+                       above 1 enable continuous batching (see ContinuousBatcher);
+                       all sequences share one unified KV cache of n_ctx cells.
             verbose: Print verbose output.
             warmup: Run warmup inference to pre-compile GPU shaders.
                     This moves shader compilation cost to load time,
@@ -189,6 +208,11 @@ class Llama:
         ctx_params.n_threads = n_threads
         ctx_params.n_threads_batch = n_threads_batch
         ctx_params.embeddings = embedding
+        ctx_params.n_seq_max = max(1, n_seq_max)
+        # Share one KV pool across sequences instead of splitting n_ctx evenly,
+        # so a long request can use cells that idle slots aren't holding
+        if n_seq_max > 1:
+            ctx_params.kv_unified = True
 
         # Performance optimizations for GPU inference
         # flash_attn_type: -1 = auto, 0 = disabled, 1 = enabled
@@ -247,6 +271,7 @@ class Llama:
         # Store config
         self._n_ctx = n_ctx
         self._n_batch = n_batch
+        self._n_seq_max = max(1, n_seq_max)
         self._n_threads = n_threads
 
         # Get vocab from model (new API - llama.cpp b7376+)
@@ -258,6 +283,26 @@ class Llama:
         # Initialize sampler chain
         self._sampler = None
 
+        # Prefix-aware KV cache reuse: tokens currently decoded into sequence 0
+        # (None when the contents are unknown, e.g. after multimodal embeddings),
+        # the cache key they belong to, and an optional snapshot cache for
+        # prefixes that are no longer resident.
+        self._kv_tokens: Optional[List[int]] = []
+        self._kv_cache_key: Optional[str] = None
+        self._cache: Optional[BaseLlamaCache] = None
+
+        # Persistent snapshots keyed by model + prompt prefix hash (see
+        # set_prefix_cache), and the length of the prompt that produced the
+        # resident sequence (the prefix its snapshot is stored under).
+        self._prefix_cache: Optional[BaseLlamaCache] = None
+        self._prefix_min_tokens = 0
+        self._prefix_fingerprint = ""
+        self._kv_prompt_len = 0
+
+        # Optional draft model for speculative decoding (see set_draft_model)
+        self._draft: Optional["Llama"] = None
+        self._n_draft = 0
+
         # Pre-allocate reusable buffers for detokenization to avoid CFFI
         # thread-safety issues with dynamic type creation during GC
         import threading
@@ -265,6 +310,8 @@ class Llama:
         self._detok_token_buf = ffi.new("llama_token[8192]")  # Max 8K tokens
         self._detok_char_buf = ffi.new("char[131072]")  # 128KB text buffer
         self._detok_char_buf_size = 131072
+        # Per-token text pieces, filled lazily as tokens are generated
+        self._piece_cache: Dict[int, bytes] = {}
 
         # Initialize multimodal context if projector path provided
         self._mtmd_lib = None
@@ -300,7 +347,7 @@ class Llama:
 
         try:
             # Clear KV cache
-            self._lib.llama_memory_clear(self._memory, True)
+            self._clear_kv()
 
             # Tokenize a short prompt
             warmup_text = "Hello"
@@ -315,7 +362,7 @@ class Llama:
             self._sample_token()
 
             # Clear state for real inference
-            self._lib.llama_memory_clear(self._memory, True)
+            self._clear_kv()
             if self._sampler is not None:
                 self._lib.llama_sampler_free(self._sampler)
                 self._sampler = None
@@ -463,6 +510,7 @@ class Llama:
         repeat_penalty: float = 1.1,
         stream: bool = False,
         stop: Optional[List[str]] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> Union[ChatCompletionResponse, Iterator[ChatCompletionChunk]]:
         """Create a chat completion with audio input.
 
@@ -481,6 +529,7 @@ class Llama:
             repeat_penalty: Repetition penalty
             stream: Whether to stream the response
             stop: Stop sequences
+            cancel_event: Stops generation before the next token once set
 
         Returns:
             ChatCompletionResponse or Iterator[ChatCompletionChunk] if streaming
@@ -515,6 +564,7 @@ class Llama:
                         min_p=min_p,
                         repeat_penalty=repeat_penalty,
                         stop=stop,
+                        cancel_event=cancel_event,
                     )
                 finally:
                     self.free_bitmap(bitmap)
@@ -531,6 +581,7 @@ class Llama:
                     min_p=min_p,
                     repeat_penalty=repeat_penalty,
                     stop=stop,
+                    cancel_event=cancel_event,
                 )
             finally:
                 self.free_bitmap(bitmap)
@@ -615,11 +666,12 @@ class Llama:
         min_p: float,
         repeat_penalty: float,
         stop: Optional[List[str]],
+        cancel_event: Optional[threading.Event] = None,
     ) -> ChatCompletionResponse:
         """Generate completion from tokenized chunks."""
         try:
             # Clear KV cache
-            self._lib.llama_memory_clear(self._memory, True)
+            self._clear_kv()
 
             # Process each chunk
             n_chunks = self._mtmd_lib.mtmd_input_chunks_size(chunks)
@@ -664,10 +716,16 @@ class Llama:
 
             # Generate tokens
             generated_tokens = []
-            generated_text = ""
+            text_parts: List[str] = []
+            detok = IncrementalDetokenizer(self)
+            stop_matcher = StopMatcher(stop)
             finish_reason = "length"
 
             for _ in range(max_tokens):
+                if _is_cancelled(cancel_event):
+                    finish_reason = "cancelled"
+                    break
+
                 token = self._sample_token()
 
                 # Check EOS
@@ -676,21 +734,20 @@ class Llama:
                     break
 
                 generated_tokens.append(token)
-                text = self.detokenize([token])
-                generated_text += text
+                text = detok.push(token)
+                text_parts.append(text)
 
                 # Check stop sequences
-                if stop:
-                    for s in stop:
-                        if s in generated_text:
-                            finish_reason = "stop"
-                            break
-                    if finish_reason == "stop":
-                        break
+                if stop_matcher.feed(text) is not None:
+                    finish_reason = "stop"
+                    break
 
                 # Decode for next iteration
                 self._decode_batch([token])
 
+            text_parts.append(detok.flush())
+            generated_text = "".join(text_parts)
+
             return {
                 "id": f"chatcmpl-{uuid.uuid4().hex[:8]}",
                 "object": "chat.completion",
@@ -728,11 +785,12 @@ class Llama:
         min_p: float,
         repeat_penalty: float,
         stop: Optional[List[str]],
+        cancel_event: Optional[threading.Event] = None,
     ) -> Iterator[ChatCompletionChunk]:
         """Stream completion from tokenized chunks."""
         try:
             # Clear KV cache
-            self._lib.llama_memory_clear(self._memory, True)
+            self._clear_kv()
 
             # Process each chunk (same as non-streaming)
             n_chunks = self._mtmd_lib.mtmd_input_chunks_size(chunks)
@@ -770,9 +828,13 @@ class Llama:
 
             # Stream generation
             completion_id = f"chatcmpl-{uuid.uuid4().hex[:8]}"
-            generated_text = ""
+            detok = IncrementalDetokenizer(self)
+            stop_matcher = StopMatcher(stop)
 
             for i in range(max_tokens):
+                if _is_cancelled(cancel_event):
+                    break
+
                 token = self._sample_token()
 
                 # Check EOS
@@ -792,16 +854,10 @@ class Llama:
                     }
                     break
 
-                text = self.detokenize([token])
-                generated_text += text
+                text = detok.push(token)
 
                 # Check stop sequences
-                should_stop = False
-                if stop:
-                    for s in stop:
-                        if s in generated_text:
-                            should_stop = True
-                            break
+                should_stop = stop_matcher.feed(text) is not None
 
                 yield {
                     "id": completion_id,
@@ -837,6 +893,10 @@ class Llama:
         """
         n_embd = self._lib.llama_model_n_embd(self._model)
 
+        # Media embeddings are not token IDs, so the KV contents can no longer
+        # be matched against a token prefix
+        self._kv_tokens = None
+
         # Create batch with embeddings
         batch = self._lib.llama_batch_init(n_tokens, n_embd, 1)
         batch.n_tokens = n_tokens
@@ -904,6 +964,16 @@ class Llama:
         """Get the vocabulary size."""
         return self._lib.llama_vocab_n_tokens(self._vocab)
 
+    @property
+    def n_seq_max(self) -> int:
+        """Get the maximum number of parallel sequences."""
+        return self._n_seq_max
+
+    @property
+    def n_batch(self) -> int:
+        """Get the maximum number of tokens per decode call."""
+        return self._n_batch
+
     @property
     def n_embd(self) -> int:
         """Get the embedding dimension."""
@@ -1028,6 +1098,44 @@ class Llama:
 
             return ffi.buffer(self._detok_char_buf, n_chars)[:]
 
+    def _token_piece(self, token: int) -> bytes:
+        """
+        Get the raw bytes of a single token (cached per vocabulary entry).
+
+        Unlike detokenizing a one-token list, the leading space of the piece is
+        kept, so pieces of consecutive tokens can simply be concatenated.
+
+        Args:
+            token: Token ID.
+
+        Returns:
+            Raw bytes of the token's text piece.
+        """
+        piece = self._piece_cache.get(token)
+        if piece is not None:
+            return piece
+
+        with self._detok_lock:
+            n_chars = self._lib.llama_token_to_piece(
+                self._vocab,
+                token,
+                self._detok_char_buf,
+                self._detok_char_buf_size,
+                0,  # lstrip
+                False,  # special
+            )
+            if n_chars < 0:
+                buf = ffi.new(f"char[{-n_chars}]")
+                n_chars = self._lib.llama_token_to_piece(
+                    self._vocab, token, buf, -n_chars, 0, False
+                )
+                piece = ffi.buffer(buf, n_chars)[:]
+            else:
+                piece = ffi.buffer(self._detok_char_buf, n_chars)[:]
+
+        self._piece_cache[token] = piece
+        return piece
+
     @staticmethod
     def _decode_utf8_streaming(data: bytes) -> tuple[str, bytes]:
         """
@@ -1156,10 +1264,29 @@ class Llama:
         repeat_penalty: float = 1.1,
         seed: Optional[int] = None,
     ):
-        """Create a sampler chain."""
+        """Create the sampler chain used by the single-sequence generation path."""
         if self._sampler is not None:
             self._lib.llama_sampler_free(self._sampler)
 
+        self._sampler = self._build_sampler(
+            temperature=temperature,
+            top_p=top_p,
+            top_k=top_k,
+            min_p=min_p,
+            repeat_penalty=repeat_penalty,
+            seed=seed,
+        )
+
+    def _build_sampler(
+        self,
+        temperature: float = 0.7,
+        top_p: float = 0.95,
+        top_k: int = 40,
+        min_p: float = 0.05,
+        repeat_penalty: float = 1.1,
+        seed: Optional[int] = None,
+    ) -> "ffi.CData":
+        """Build a new sampler chain. The caller owns it (llama_sampler_free)."""
         chain_params = self._lib.llama_sampler_chain_default_params()
         chain = self._lib.llama_sampler_chain_init(chain_params)
 
@@ -1194,7 +1321,7 @@ class Llama:
             chain, self._lib.llama_sampler_init_dist(seed)
         )
 
-        self._sampler = chain
+        return chain
 
     def _decode_batch(self, tokens: List[int]) -> bool:
         """Decode a batch of tokens, chunking if necessary.
@@ -1220,12 +1347,175 @@ class Llama:
             result = self._lib.llama_decode(self._ctx, batch)
             if result != 0:
                 logger.error(f"Failed to decode batch at offset {offset}")
+                # Partially decoded state can't be reused for prefix matching
+                self._kv_tokens = None
                 return False
 
+            if self._kv_tokens is not None:
+                self._kv_tokens.extend(chunk)
             offset += chunk_size
 
         return True
 
+    def _logits_view(self, idx: int = -1) -> "np.ndarray":
+        """
+        Get a zero-copy float32 NumPy view of the logits for batch output ``idx``.
+
+        Writes to the view modify llama.cpp's logits buffer directly, so they are
+        seen by the sampler. The view is only valid until the next decode.
+        """
+        import numpy as np
+
+        logits_ptr = self._lib.llama_get_logits_ith(self._ctx, idx)
+        if logits_ptr == ffi.NULL:
+            raise RuntimeError(f"No logits available for batch index {idx}")
+        n_vocab = self._lib.llama_vocab_n_tokens(self._vocab)
+        return np.frombuffer(ffi.buffer(logits_ptr, n_vocab * 4), dtype=np.float32)
+
+    def _apply_logits_processor(
+        self, logits_processor: Callable, input_ids: List[int], idx: int = -1
+    ) -> None:
+        """Run a logits processor on the zero-copy logits view for ``idx``."""
+        logits = self._logits_view(idx)
+        processed = logits_processor(input_ids, logits)
+        # In-place processors return the view itself (or None): nothing to copy
+        if processed is not None and processed is not logits:
+            logits[:] = processed
+
+    def _generate_tokens(
+        self,
+        input_ids: List[int],
+        max_tokens: int,
+        logits_processor: Optional[Callable],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[int]:
+        """Yield up to ``max_tokens`` sampled tokens after the evaluated prompt.
+
+        Each yielded token is decoded before the next one is sampled.
+        ``input_ids`` (prompt + generated) is extended in place. Generation
+        stops early, between tokens, once ``cancel_event`` is set.
+        """
+        if _is_cancelled(cancel_event):
+            return
+
+        if (
+            self._draft is not None
+            and logits_processor is None
+            and self._kv_tokens is not None
+        ):
+            yield from self._generate_speculative(input_ids, max_tokens, cancel_event)
+            return
+
+        for _ in range(max_tokens):
+            if _is_cancelled(cancel_event):
+                return
+
+            # Apply logits processor if provided
+            if logits_processor is not None:
+                self._apply_logits_processor(logits_processor, input_ids)
+
+            token = self._sample_token()
+            input_ids.append(token)
+            yield token
+
+            # Decode single token for next iteration
+            if not self._decode_batch([token]):
+                raise RuntimeError("Failed to decode token")
+
+    def _draft_tokens(self, input_ids: List[int], n_draft: int) -> List[int]:
+        """Greedily propose up to ``n_draft`` continuation tokens with the draft."""
+        import numpy as np
+
+        draft = self._draft
+        # The draft reuses its resident prefix, so only new tokens are decoded
+        try:
+            draft._eval_prompt(input_ids)
+        except RuntimeError:
+            logger.warning("Draft model failed to decode; verifying without drafts")
+            return []
+
+        proposed: List[int] = []
+        for i in range(n_draft):
+            token = int(np.argmax(draft._logits_view()))
+            proposed.append(token)
+            if i == n_draft - 1 or self._lib.llama_vocab_is_eog(self._vocab, token):
+                break
+            if not draft._decode_batch([token]):
+                break
+        return proposed
+
+    def _generate_speculative(
+        self,
+        input_ids: List[int],
+        max_tokens: int,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[int]:
+        """Generate with draft proposals verified in one batched decode per step."""
+        n_ctx = self._n_ctx
+        batch = self._lib.llama_batch_init(self._n_draft + 1, 0, 1)
+        n_generated = n_drafted = n_accepted = n_steps = 0
+        t_start = time.perf_counter()
+
+        try:
+            # The first token comes from the logits of the evaluated prompt
+            token = self._sample_token()
+            input_ids.append(token)
+            n_generated = 1
+            yield token
+
+            while n_generated < max_tokens and not _is_cancelled(cancel_event):
+                n_past = len(self._kv_tokens)
+                n_draft = min(
+                    self._n_draft, max_tokens - n_generated - 1, n_ctx - n_past - 1
+                )
+                drafts = self._draft_tokens(input_ids, n_draft) if n_draft > 0 else []
+
+                # Decode the pending token plus all drafts, with logits everywhere
+                seq = [token] + drafts
+                for i, t in enumerate(seq):
+                    batch.token[i] = t
+                    batch.pos[i] = n_past + i
+                    batch.n_seq_id[i] = 1
+                    batch.seq_id[i][0] = 0
+                    batch.logits[i] = 1
+                batch.n_tokens = len(seq)
+                if self._lib.llama_decode(self._ctx, batch) != 0:
+                    self._kv_tokens = None
+                    raise RuntimeError("Failed to decode token")
+                n_steps += 1
+                n_drafted += len(drafts)
+
+                # Sample at each position until the target disagrees with a draft
+                sampled: List[int] = []
+                for i in range(len(seq)):
+                    t = self._lib.llama_sampler_sample(self._sampler, self._ctx, i)
+                    self._lib.llama_sampler_accept(self._sampler, t)
+                    sampled.append(t)
+                    if i >= len(drafts) or t != drafts[i]:
+                        break
+                n_ok = len(sampled) - 1
+                n_accepted += n_ok
+
+                # Keep the pending token and the accepted drafts in the KV cache
+                if n_ok < len(drafts):
+                    self._lib.llama_memory_seq_rm(self._memory, 0, n_past + 1 + n_ok, -1)
+                self._kv_tokens.extend(seq[: 1 + n_ok])
+
+                for t in sampled:
+                    input_ids.append(t)
+                    n_generated += 1
+                    yield t
+                token = sampled[-1]
+        finally:
+            self._lib.llama_batch_free(batch)
+            elapsed = time.perf_counter() - t_start
+            rate = 100.0 * n_accepted / n_drafted if n_drafted else 0.0
+            logger.info(
+                f"[Perf] Speculative decoding: {n_generated} tokens in "
+                f"{n_steps} target decodes ({elapsed * 1000:.1f}ms), "
+                f"accepted {n_accepted}/{n_drafted} draft tokens ({rate:.1f}%)"
+            )
+
     def _sample_token(self) -> int:
         """Sample the next token."""
         # Sample using the sampler chain
@@ -1234,6 +1524,281 @@ class Llama:
 
         return token
 
+    def set_cache(self, cache: Optional[BaseLlamaCache]) -> None:
+        """Attach a KV snapshot cache for multi-conversation prefix reuse.
+
+        The live KV cache is always reused for the longest common token prefix.
+        With a cache attached, requests that pass ``cache_key`` also stash the
+        resident sequence when a different key takes over, and restore it when
+        that key comes back.
+
+        Args:
+            cache: Cache instance (e.g. LlamaRAMCache), or None to disable.
+        """
+        self._cache = cache
+
+    def set_prefix_cache(
+        self, cache: Optional[BaseLlamaCache], min_tokens: int = 256
+    ) -> None:
+        """Attach a snapshot cache keyed by model + prompt prefix hash.
+
+        Unlike :meth:`set_cache`, no caller-supplied key is needed. The resident
+        sequence is stored under a hash of the prompt that produced it when a
+        prompt that does not extend it takes over, or when
+        :meth:`save_prefix_state` is called (e.g. before unloading the model).
+        A later prompt starting with that prefix restores the snapshot instead
+        of re-decoding it. With a :class:`LlamaDiskCache` this works across
+        model reloads and process restarts.
+
+        Args:
+            cache: Cache instance (e.g. LlamaDiskCache), or None to disable.
+            min_tokens: Minimum prompt length worth snapshotting.
+        """
+        self._prefix_cache = cache
+        self._prefix_min_tokens = min_tokens
+        if cache is not None and not self._prefix_fingerprint:
+            self._prefix_fingerprint = self._model_fingerprint()
+
+    def save_prefix_state(self) -> bool:
+        """Store the resident sequence in the prefix cache (see set_prefix_cache).
+
+        Returns:
+            True if a snapshot for the resident prompt is now cached.
+        """
+        n_prompt = self._kv_prompt_len
+        if (
+            self._prefix_cache is None
+            or not self._kv_tokens
+            or n_prompt < max(self._prefix_min_tokens, 1)
+        ):
+            return False
+
+        digest = self._token_digests(self._kv_tokens, [n_prompt])[n_prompt]
+        key = self._prefix_key(digest, n_prompt)
+        if key in self._prefix_cache:
+            return True
+
+        t_start = time.perf_counter()
+        state = self._save_kv_state()
+        if state is None:
+            return False
+        self._prefix_cache.put(key, state)
+        logger.info(
+            f"[Perf] Saved KV snapshot: {len(state.tokens)} tokens, "
+            f"{len(state.state) / (1 << 20):.1f}MB in "
+            f"{(time.perf_counter() - t_start) * 1000:.1f}ms"
+        )
+        return True
+
+    def _restore_prefix_state(self, tokens: List[int], n_reuse: int) -> int:
+        """Restore the longest cached prefix of ``tokens`` if it beats ``n_reuse``.
+
+        Returns:
+            Number of reusable tokens now in the KV cache (0 if a failed restore
+            cleared it).
+        """
+        lengths = set()
+        prefix = f"{self._prefix_fingerprint}-"
+        for key in self._prefix_cache.keys():
+            if not key.startswith(prefix):
+                continue
+            try:
+                n = int(key.split("-")[1])
+            except (IndexError, ValueError):
+                continue
+            if n_reuse < n <= len(tokens):
+                lengths.add(n)
+        if not lengths:
+            return n_reuse
+
+        digests = self._token_digests(tokens, lengths)
+        for n in sorted(lengths, reverse=True):
+            key = self._prefix_key(digests[n], n)
+            cached = self._prefix_cache.get(key)
+            if cached is None:
+                continue
+
+            t_start = time.perf_counter()
+            n_cached = self._common_prefix_len(list(cached.tokens), tokens)
+            if not self._load_kv_state(cached):
+                # Incompatible snapshot (e.g. different KV cache type)
+                logger.warning(f"Discarding KV snapshot that failed to load: {key}")
+                self._prefix_cache.pop(key)
+                return 0
+            logger.info(
+                f"[Perf] Restored KV snapshot: {n_cached}/{len(tokens)} prompt "
+                f"tokens in {(time.perf_counter() - t_start) * 1000:.1f}ms"
+            )
+            return n_cached
+        return n_reuse
+
+    def _model_fingerprint(self) -> str:
+        """Short hash identifying the model file, for prefix cache keys."""
+        import hashlib
+        import os
+
+        ident = os.path.abspath(self._model_path)
+        try:
+            stat = os.stat(self._model_path)
+            ident += f":{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            pass
+        return hashlib.blake2b(ident.encode("utf-8"), digest_size=8).hexdigest()
+
+    def _prefix_key(self, digest: str, n_tokens: int) -> str:
+        return f"{self._prefix_fingerprint}-{n_tokens}-{digest}"
+
+    @staticmethod
+    def _token_digests(tokens: List[int], lengths) -> Dict[int, str]:
+        """Hash ``tokens[:n]`` for every ``n`` in ``lengths`` in a single pass."""
+        import hashlib
+        from array import array
+
+        h = hashlib.blake2b(digest_size=16)
+        digests = {}
+        pos = 0
+        for n in sorted(lengths):
+            h.update(array("i", tokens[pos:n]).tobytes())
+            pos = n
+            digests[n] = h.hexdigest()
+        return digests
+
+    def set_draft_model(self, draft: Optional["Llama"], n_draft: int = 8) -> None:
+        """Enable speculative decoding with a smaller draft model.
+
+        Each step the draft model greedily proposes up to ``n_draft`` tokens,
+        and this model verifies them in a single batched decode. The longest
+        prefix matching this model's own samples is accepted, so the output
+        distribution is unchanged. Requests that use a logits processor fall
+        back to regular decoding.
+
+        Args:
+            draft: Draft model sharing this model's vocabulary, or None to disable.
+            n_draft: Maximum tokens proposed per verification step.
+
+        Raises:
+            ValueError: If the vocabularies differ or n_draft < 1.
+        """
+        if draft is not None:
+            if draft.n_vocab != self.n_vocab:
+                raise ValueError(
+                    f"Draft model vocabulary ({draft.n_vocab}) does not match "
+                    f"target vocabulary ({self.n_vocab})"
+                )
+            if n_draft < 1:
+                raise ValueError("n_draft must be at least 1")
+        self._draft = draft
+        self._n_draft = n_draft if draft is not None else 0
+
+    def _clear_kv(self) -> None:
+        """Clear the KV cache and forget which tokens it held."""
+        self._lib.llama_memory_clear(self._memory, True)
+        self._kv_tokens = []
+        self._kv_cache_key = None
+        self._kv_prompt_len = 0
+
+    @staticmethod
+    def _common_prefix_len(a: List[int], b: List[int]) -> int:
+        """Length of the longest common prefix of two token sequences."""
+        n = min(len(a), len(b))
+        for i in range(n):
+            if a[i] != b[i]:
+                return i
+        return n
+
+    def _save_kv_state(self) -> Optional[LlamaState]:
+        """Snapshot sequence 0 of the KV cache, or None if it can't be saved."""
+        if not self._kv_tokens:
+            return None
+
+        size = self._lib.llama_state_seq_get_size(self._ctx, 0)
+        if size == 0:
+            return None
+
+        buf = ffi.new(f"uint8_t[{size}]")
+        n_written = self._lib.llama_state_seq_get_data(self._ctx, buf, size, 0)
+        if n_written == 0:
+            return None
+
+        return LlamaState(
+            tokens=tuple(self._kv_tokens),
+            state=ffi.buffer(buf, n_written)[:],
+        )
+
+    def _load_kv_state(self, state: LlamaState) -> bool:
+        """Restore a snapshot into sequence 0. Returns False on failure."""
+        self._lib.llama_memory_clear(self._memory, True)
+        src = ffi.from_buffer("uint8_t[]", state.state)
+        if self._lib.llama_state_seq_set_data(self._ctx, src, len(state.state), 0) == 0:
+            self._clear_kv()
+            return False
+
+        self._kv_tokens = list(state.tokens)
+        return True
+
+    def _eval_prompt(self, tokens: List[int], cache_key: Optional[str] = None) -> int:
+        """Decode a prompt, skipping the prefix already present in the KV cache.
+
+        Args:
+            tokens: Full prompt token sequence.
+            cache_key: Conversation key used for snapshot lookups (see set_cache).
+
+        Returns:
+            Number of prompt tokens reused from the cache (not re-decoded).
+
+        Raises:
+            RuntimeError: If decoding fails.
+        """
+        kv_tokens = self._kv_tokens or []
+        n_reuse = self._common_prefix_len(kv_tokens, tokens)
+
+        if self._cache is not None and cache_key != self._kv_cache_key:
+            # Another conversation is about to overwrite the resident sequence;
+            # stash it so that conversation can resume without re-decoding.
+            if self._kv_cache_key is not None and n_reuse < len(kv_tokens):
+                state = self._save_kv_state()
+                if state is not None:
+                    self._cache.put(self._kv_cache_key, state)
+
+            if cache_key is not None:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    n_cached = self._common_prefix_len(list(cached.tokens), tokens)
+                    if n_cached > n_reuse:
+                        # A failed restore leaves the KV cache empty
+                        n_reuse = n_cached if self._load_kv_state(cached) else 0
+
+        if self._prefix_cache is not None and self._kv_tokens is not None:
+            # A prompt that doesn't extend the resident one starts a different
+            # conversation; persist the resident one before it is overwritten.
+            if n_reuse < self._kv_prompt_len:
+                self.save_prefix_state()
+            n_reuse = self._restore_prefix_state(tokens, n_reuse)
+
+        # Always re-decode at least the last prompt token to get fresh logits
+        n_reuse = min(n_reuse, len(tokens) - 1)
+
+        if n_reuse > 0 and n_reuse < len(self._kv_tokens or []):
+            # Drop the diverging tail; recurrent/SWA memories may refuse partial
+            # removal, in which case we fall back to a full re-decode.
+            if not self._lib.llama_memory_seq_rm(self._memory, 0, n_reuse, -1):
+                n_reuse = 0
+
+        if n_reuse <= 0:
+            n_reuse = 0
+            self._clear_kv()
+        else:
+            del self._kv_tokens[n_reuse:]
+
+        self._kv_cache_key = cache_key
+
+        if not self._decode_batch(tokens[n_reuse:]):
+            self._clear_kv()
+            raise RuntimeError("Failed to decode prompt")
+        self._kv_prompt_len = len(tokens)
+
+        return n_reuse
+
     def create_chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -1248,6 +1813,8 @@ class Llama:
         stream: bool = False,
         seed: Optional[int] = None,
         logits_processor: Optional[Callable] = None,
+        cache_key: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None,
         **kwargs,
     ) -> Union[ChatCompletionResponse, Iterator[ChatCompletionChunk]]:
         """
@@ -1265,6 +1832,11 @@ class Llama:
             stream: Stream the response.
             seed: Random seed.
             logits_processor: Custom logits processor (for ThinkingBudgetProcessor).
+            cache_key: Identifies the conversation (e.g. a session ID) whose KV
+                state should be snapshotted when another conversation takes over
+                the context. Requires a cache attached via set_cache().
+            cancel_event: Set it (e.g. when the client disconnects) to stop
+                generating before the next token; finish_reason is "cancelled".
 
         Returns:
             Chat completion response or stream of chunks.
@@ -1283,17 +1855,14 @@ class Llama:
                 f"Prompt too long: {len(tokens)} tokens > {self._n_ctx} context"
             )
 
-        # Clear KV cache
-        self._lib.llama_memory_clear(self._memory, True)
-
-        # Decode prompt (this is the main TTFT cost)
-        if not self._decode_batch(tokens):
-            raise RuntimeError("Failed to decode prompt")
+        # Decode prompt, reusing any cached prefix (this is the main TTFT cost)
+        n_reused = self._eval_prompt(tokens, cache_key=cache_key)
         t_prompt = time.perf_counter()
 
         logger.info(
             f"[TTFT] Tokenization: {(t_tokenize - t_start)*1000:.1f}ms, "
-            f"Prompt processing ({len(tokens)} tokens): {(t_prompt - t_tokenize)*1000:.1f}ms"
+            f"Prompt processing ({len(tokens)} tokens, {n_reused} reused): "
+            f"{(t_prompt - t_tokenize)*1000:.1f}ms"
         )
 
         # Create sampler
@@ -1307,9 +1876,13 @@ class Llama:
         )
 
         if stream:
-            return self._stream_completion(tokens, max_tokens, stop, logits_processor, t_start)
+            return self._stream_completion(
+                tokens, max_tokens, stop, logits_processor, t_start, cancel_event
+            )
         else:
-            return self._complete(tokens, max_tokens, stop, logits_processor, t_start)
+            return self._complete(
+                tokens, max_tokens, stop, logits_processor, t_start, cancel_event
+            )
 
     def create_completion(
         self,
@@ -1325,6 +1898,8 @@ class Llama:
         stream: bool = False,
         seed: Optional[int] = None,
         logits_processor: Optional[Callable] = None,
+        cache_key: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None,
         **kwargs,
     ) -> Union[ChatCompletionResponse, Iterator[ChatCompletionChunk]]:
         """
@@ -1345,6 +1920,8 @@ class Llama:
             stream: Stream the response.
             seed: Random seed.
             logits_processor: Custom logits processor.
+            cache_key: Conversation key for KV snapshot reuse (see set_cache()).
+            cancel_event: Stops generation before the next token once set.
 
         Returns:
             Completion response or stream of chunks.
@@ -1360,17 +1937,14 @@ class Llama:
                 f"Prompt too long: {len(tokens)} tokens > {self._n_ctx} context"
             )
 
-        # Clear KV cache
-        self._lib.llama_memory_clear(self._memory, True)
-
-        # Decode prompt (this is the main TTFT cost)
-        if not self._decode_batch(tokens):
-            raise RuntimeError("Failed to decode prompt")
+        # Decode prompt, reusing any cached prefix (this is the main TTFT cost)
+        n_reused = self._eval_prompt(tokens, cache_key=cache_key)
         t_prompt = time.perf_counter()
 
         logger.info(
             f"[TTFT] Tokenization: {(t_tokenize - t_start)*1000:.1f}ms, "
-            f"Prompt processing ({len(tokens)} tokens): {(t_prompt - t_tokenize)*1000:.1f}ms"
+            f"Prompt processing ({len(tokens)} tokens, {n_reused} reused): "
+            f"{(t_prompt - t_tokenize)*1000:.1f}ms"
         )
 
         # Create sampler
@@ -1384,9 +1958,13 @@ class Llama:
         )
 
         if stream:
-            return self._stream_completion(tokens, max_tokens, stop, logits_processor, t_start)
+            return self._stream_completion(
+                tokens, max_tokens, stop, logits_processor, t_start, cancel_event
+            )
         else:
-            return self._complete(tokens, max_tokens, stop, logits_processor, t_start)
+            return self._complete(
+                tokens, max_tokens, stop, logits_processor, t_start, cancel_event
+            )
 
     def _complete(
         self,
@@ -1395,64 +1973,57 @@ class Llama:
         stop: Optional[List[str]],
         logits_processor: Optional[Callable],
         t_start: float,
+        cancel_event: Optional[threading.Event] = None,
     ) -> ChatCompletionResponse:
         """Generate a non-streaming completion."""
         generated_tokens = []
+        # Prompt + generated tokens, extended in place for logits processors
+        input_ids = list(prompt_tokens)
+        text_parts: List[str] = []
+        detok = IncrementalDetokenizer(self)
+        stop_matcher = StopMatcher(stop)
         finish_reason = "length"
         t_first_token = None
 
-        for i in range(max_tokens):
-            # Apply logits processor if provided
-            if logits_processor is not None:
-                import numpy as np
-                logits_ptr = self._lib.llama_get_logits(self._ctx)
-                n_vocab = self._lib.llama_vocab_n_tokens(self._vocab)
-                # Use numpy for efficient array operations (avoids 2x 151k iterations)
-                logits_array = np.ctypeslib.as_array(
-                    ffi.cast("float*", logits_ptr), shape=(n_vocab,)
-                )
-                processed = logits_processor(
-                    prompt_tokens + generated_tokens, logits_array
-                )
-                # Write back efficiently with numpy
-                if processed is not logits_array:
-                    np.copyto(logits_array, processed)
-
-            token = self._sample_token()
-            generated_tokens.append(token)
-
-            # Log TTFT on first token
-            if i == 0:
-                t_first_token = time.perf_counter()
-                logger.info(f"[TTFT] First token: {(t_first_token - t_start)*1000:.1f}ms total")
+        tokens = self._generate_tokens(
+            input_ids, max_tokens, logits_processor, cancel_event
+        )
+        try:
+            for i, token in enumerate(tokens):
+                generated_tokens.append(token)
 
-            # Check for EOS
-            if self._lib.llama_vocab_is_eog(self._vocab, token):
-                finish_reason = "stop"
-                break
+                # Log TTFT on first token
+                if i == 0:
+                    t_first_token = time.perf_counter()
+                    logger.info(f"[TTFT] First token: {(t_first_token - t_start)*1000:.1f}ms total")
 
-            # Decode the new token for stop sequence check
-            if stop:
-                text = self.detokenize(generated_tokens)
-                for s in stop:
-                    if s in text:
-                        finish_reason = "stop"
-                        # Trim to stop sequence
-                        text = text[: text.index(s)]
-                        generated_tokens = self.tokenize(
-                            text, add_special=False, parse_special=False
-                        )
-                        break
-                if finish_reason == "stop":
+                # Check for EOS
+                if self._lib.llama_vocab_is_eog(self._vocab, token):
+                    finish_reason = "stop"
                     break
 
-            # Decode single token for next iteration
-            if not self._decode_batch([token]):
-                raise RuntimeError("Failed to decode token")
+                # Only the new token's text is decoded and matched
+                text = detok.push(token)
+                stop_idx = stop_matcher.feed(text)
+                if stop_idx is not None:
+                    finish_reason = "stop"
+                    # Trim to stop sequence (it may have started in earlier text)
+                    text_parts.append(text)
+                    content = "".join(text_parts)
+                    cut = len(content) - len(text) + stop_idx
+                    text_parts = [content[:cut]]
+                    break
+                text_parts.append(text)
+            else:
+                text_parts.append(detok.flush())
+                if _is_cancelled(cancel_event):
+                    finish_reason = "cancelled"
+        finally:
+            tokens.close()
 
         # Build response
         t_end = time.perf_counter()
-        content = self.detokenize(generated_tokens)
+        content = "".join(text_parts)
         completion_id = f"chatcmpl-{uuid.uuid4().hex[:8]}"
 
         # Log generation stats
@@ -1489,42 +2060,35 @@ class Llama:
         stop: Optional[List[str]],
         logits_processor: Optional[Callable],
         t_start: float,
+        cancel_event: Optional[threading.Event] = None,
     ) -> Iterator[ChatCompletionChunk]:
         """Generate a streaming completion."""
         completion_id = f"chatcmpl-{uuid.uuid4().hex[:8]}"
         created = int(time.time())
         generated_tokens = []
-        accumulated_text = ""
-        # Track bytes we've already processed to compute deltas
-        prev_bytes_len = 0
-        # Buffer for incomplete UTF-8 byte sequences (e.g., partial emojis)
-        pending_bytes = b""
+        # Prompt + generated tokens, extended in place for logits processors
+        input_ids = list(prompt_tokens)
+        # Converts only the newest token, buffering incomplete UTF-8 sequences
+        # (e.g., partial emojis)
+        detok = IncrementalDetokenizer(self)
+        stop_matcher = StopMatcher(stop)
+
+        tokens = self._generate_tokens(
+            input_ids, max_tokens, logits_processor, cancel_event
+        )
+        try:
+            for i, token in enumerate(tokens):
+                generated_tokens.append(token)
 
-        for i in range(max_tokens):
-            # Apply logits processor if provided
-            if logits_processor is not None:
-                logits = self._lib.llama_get_logits(self._ctx)
-                n_vocab = self._lib.llama_vocab_n_tokens(self._vocab)
-                logits_list = [logits[j] for j in range(n_vocab)]
-                processed = logits_processor(
-                    prompt_tokens + generated_tokens, logits_list
-                )
-                for j, v in enumerate(processed):
-                    logits[j] = v
+                # Log TTFT on first token
+                if i == 0:
+                    t_first_token = time.perf_counter()
+                    logger.info(f"[TTFT] First token: {(t_first_token - t_start)*1000:.1f}ms total")
 
-            token = self._sample_token()
-            generated_tokens.append(token)
-
-            # Log TTFT on first token
-            if i == 0:
-                t_first_token = time.perf_counter()
-                logger.info(f"[TTFT] First token: {(t_first_token - t_start)*1000:.1f}ms total")
-
-            # Check for EOS
-            if self._lib.llama_vocab_is_eog(self._vocab, token):
-                # Flush any pending bytes (decode with replacement for incomplete sequences)
-                if pending_bytes:
-                    final_text = pending_bytes.decode("utf-8", errors="replace")
+                # Check for EOS
+                if self._lib.llama_vocab_is_eog(self._vocab, token):
+                    # Flush any pending bytes (decode with replacement for incomplete sequences)
+                    final_text = detok.flush()
                     if final_text:
                         yield {
                             "id": completion_id,
@@ -1539,100 +2103,66 @@ class Llama:
                                 }
                             ],
                         }
-                yield {
-                    "id": completion_id,
-                    "object": "chat.completion.chunk",
-                    "created": created,
-                    "model": self._model_path,
-                    "choices": [
-                        {
-                            "index": 0,
-                            "delta": {},
-                            "finish_reason": "stop",
-                        }
-                    ],
-                }
-                break
+                    yield {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": self._model_path,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                    }
+                    break
 
-            # Decode to get the new text, handling incomplete UTF-8 sequences
-            # (e.g., emojis that span multiple tokens)
-            all_bytes = self._detokenize_bytes(generated_tokens)
-            # New bytes = all bytes minus what we've already processed
-            # prev_bytes_len tracks how many bytes we've already decoded into accumulated_text
-            new_bytes = all_bytes[prev_bytes_len:]
-            combined_bytes = pending_bytes + new_bytes
-
-            # Decode only complete UTF-8 sequences, buffer incomplete ones
-            decoded_text, pending_bytes = self._decode_utf8_streaming(combined_bytes)
-            delta = decoded_text
-            accumulated_text += decoded_text
-            # Update how many bytes we've fully processed (not counting pending)
-            prev_bytes_len = len(all_bytes) - len(pending_bytes)
-
-            # Check stop sequences
-            finish_reason = None
-            if stop:
-                for s in stop:
-                    if s in accumulated_text:
-                        finish_reason = "stop"
-                        delta = delta[: delta.index(s)] if s in delta else ""
-                        break
+                # Decode only the new token, handling incomplete UTF-8 sequences
+                # (e.g., emojis that span multiple tokens)
+                delta = detok.push(token)
 
-            if delta:
-                yield {
-                    "id": completion_id,
-                    "object": "chat.completion.chunk",
-                    "created": created,
-                    "model": self._model_path,
-                    "choices": [
-                        {
-                            "index": 0,
-                            "delta": {"content": delta},
-                            "finish_reason": finish_reason,
-                        }
-                    ],
-                }
+                # Check stop sequences against the new text only
+                finish_reason = None
+                stop_idx = stop_matcher.feed(delta)
+                if stop_idx is not None:
+                    finish_reason = "stop"
+                    delta = delta[: max(stop_idx, 0)]
 
-            if finish_reason:
-                # Flush any pending bytes before stopping
-                if pending_bytes:
-                    final_text = pending_bytes.decode("utf-8", errors="replace")
-                    if final_text:
-                        yield {
-                            "id": completion_id,
-                            "object": "chat.completion.chunk",
-                            "created": created,
-                            "model": self._model_path,
-                            "choices": [
-                                {
-                                    "index": 0,
-                                    "delta": {"content": final_text},
-                                    "finish_reason": None,
-                                }
-                            ],
-                        }
-                yield {
-                    "id": completion_id,
-                    "object": "chat.completion.chunk",
-                    "created": created,
-                    "model": self._model_path,
-                    "choices": [
-                        {
-                            "index": 0,
-                            "delta": {},
-                            "finish_reason": finish_reason,
-                        }
-                    ],
-                }
-                break
+                if delta:
+                    yield {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": self._model_path,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {"content": delta},
+                                "finish_reason": finish_reason,
+                            }
+                        ],
+                    }
 
-            # Decode single token for next iteration
-            if not self._decode_batch([token]):
-                raise RuntimeError("Failed to decode token")
-        else:
-            # Max tokens reached - flush any pending bytes first
-            if pending_bytes:
-                final_text = pending_bytes.decode("utf-8", errors="replace")
+                if finish_reason:
+                    # Anything still buffered comes after the stop sequence
+                    yield {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": self._model_path,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {},
+                                "finish_reason": finish_reason,
+                            }
+                        ],
+                    }
+                    break
+            else:
+                # Max tokens reached - flush any pending bytes first
+                final_text = detok.flush()
                 if final_text:
                     yield {
                         "id": completion_id,
@@ -1647,95 +2177,196 @@ class Llama:
                             }
                         ],
                     }
-            yield {
-                "id": completion_id,
-                "object": "chat.completion.chunk",
-                "created": created,
-                "model": self._model_path,
-                "choices": [
-                    {
-                        "index": 0,
-                        "delta": {},
-                        "finish_reason": "length",
-                    }
-                ],
-            }
+                yield {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": self._model_path,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "delta": {},
+                            "finish_reason": "cancelled"
+                            if _is_cancelled(cancel_event)
+                            else "length",
+                        }
+                    ],
+                }
+        finally:
+            tokens.close()
 
-    def create_embedding(
+    def embed(
         self,
         input: Union[str, List[str]],
-        **kwargs,
-    ) -> EmbeddingResponse:
+        normalize: bool = True,
+    ) -> "np.ndarray":
         """
-        Generate embeddings for input text(s).
+        Embed text(s) into a ``(len(input), n_embd)`` float32 array.
+
+        With a pooling model, inputs are packed into shared batches (one sequence
+        ID per input, up to ``n_seq_max`` inputs and ``n_batch`` tokens per
+        decode) and the pooled vector of each sequence is read directly into
+        the output array.
 
         Args:
             input: Text or list of texts to embed.
+            normalize: L2-normalize each embedding.
 
         Returns:
-            Embedding response.
+            Array with one embedding per input text.
         """
+        embeddings, _ = self._embed([input] if isinstance(input, str) else input)
+        if normalize:
+            self._l2_normalize(embeddings)
+        return embeddings
+
+    def _embed(self, texts: List[str]) -> "tuple[np.ndarray, int]":
+        """Embed texts, returning the raw embeddings and the total token count."""
+        import numpy as np
+
         if not self._embedding_mode:
             raise RuntimeError("Model not initialized in embedding mode")
 
-        texts = [input] if isinstance(input, str) else input
-        embeddings_data = []
+        token_lists = [
+            self.tokenize(text, add_special=True, parse_special=False)
+            for text in texts
+        ]
+        n_embd = self.n_embd
+        out = np.empty((len(texts), n_embd), dtype=np.float32)
 
-        for idx, text in enumerate(texts):
-            # Tokenize
-            tokens = self.tokenize(text, add_special=True, parse_special=False)
+        pooled = (
+            self._lib.llama_pooling_type(self._ctx) != LLAMA_POOLING_TYPE_NONE
+        )
+        if pooled and self._n_seq_max > 1:
+            self._embed_packed(token_lists, out)
+        else:
+            for idx, tokens in enumerate(token_lists):
+                self._clear_kv()
+                if not self._decode_batch(tokens):
+                    raise RuntimeError(f"Failed to decode text {idx}")
+                emb_ptr = ffi.NULL
+                if pooled:
+                    emb_ptr = self._lib.llama_get_embeddings_seq(self._ctx, 0)
+                if emb_ptr == ffi.NULL:
+                    emb_ptr = self._lib.llama_get_embeddings(self._ctx)
+                if emb_ptr == ffi.NULL:
+                    raise RuntimeError("Failed to get embeddings")
+                out[idx] = np.frombuffer(
+                    ffi.buffer(emb_ptr, n_embd * 4), dtype=np.float32
+                )
 
-            # Clear KV cache
-            self._lib.llama_memory_clear(self._memory, True)
+        return out, sum(len(tokens) for tokens in token_lists)
 
-            # Decode
-            if not self._decode_batch(tokens):
-                raise RuntimeError(f"Failed to decode text {idx}")
+    def _embed_packed(self, token_lists: List[List[int]], out: "np.ndarray") -> None:
+        """Decode many sequences per batch and read their pooled embeddings."""
+        import numpy as np
 
-            # Get embeddings
-            emb_ptr = self._lib.llama_get_embeddings(self._ctx)
-            if emb_ptr == ffi.NULL:
-                # Try sequence embeddings
-                emb_ptr = self._lib.llama_get_embeddings_seq(self._ctx, 0)
+        n_embd = out.shape[1]
+        n_batch = self._n_batch
+        batch = self._lib.llama_batch_init(n_batch, 0, 1)
+        try:
+            group: List[int] = []
+            n_group_tokens = 0
+
+            def flush() -> None:
+                self._clear_kv()
+                self._kv_tokens = None
+                n = 0
+                for seq_id, idx in enumerate(group):
+                    for pos, token in enumerate(token_lists[idx]):
+                        batch.token[n] = token
+                        batch.pos[n] = pos
+                        batch.n_seq_id[n] = 1
+                        batch.seq_id[n][0] = seq_id
+                        batch.logits[n] = 1
+                        n += 1
+                batch.n_tokens = n
+                result = self._lib.llama_decode(self._ctx, batch)
+                if result != 0:
+                    raise RuntimeError(
+                        f"Failed to decode embedding batch: error {result}"
+                    )
+                for seq_id, idx in enumerate(group):
+                    emb_ptr = self._lib.llama_get_embeddings_seq(self._ctx, seq_id)
+                    if emb_ptr == ffi.NULL:
+                        raise RuntimeError("Failed to get embeddings")
+                    out[idx] = np.frombuffer(
+                        ffi.buffer(emb_ptr, n_embd * 4), dtype=np.float32
+                    )
 
-            if emb_ptr == ffi.NULL:
-                raise RuntimeError("Failed to get embeddings")
+            for idx, tokens in enumerate(token_lists):
+                if len(tokens) > n_batch:
+                    # Too long to share a batch: decode on its own in chunks
+                    self._clear_kv()
+                    if not self._decode_batch(tokens):
+                        raise RuntimeError(f"Failed to decode text {idx}")
+                    emb_ptr = self._lib.llama_get_embeddings_seq(self._ctx, 0)
+                    if emb_ptr == ffi.NULL:
+                        raise RuntimeError("Failed to get embeddings")
+                    out[idx] = np.frombuffer(
+                        ffi.buffer(emb_ptr, n_embd * 4), dtype=np.float32
+                    )
+                    continue
+                if group and (
+                    n_group_tokens + len(tokens) > n_batch
+                    or len(group) >= self._n_seq_max
+                ):
+                    flush()
+                    group, n_group_tokens = [], 0
+                group.append(idx)
+                n_group_tokens += len(tokens)
+            if group:
+                flush()
+        finally:
+            self._lib.llama_batch_free(batch)
+            self._clear_kv()
 
-            n_embd = self._lib.llama_model_n_embd(self._model)
-            embedding = [emb_ptr[i] for i in range(n_embd)]
+    @staticmethod
+    def _l2_normalize(embeddings: "np.ndarray") -> None:
+        """L2-normalize rows in place, leaving zero vectors untouched."""
+        import numpy as np
 
-            # L2 normalize
-            import math
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
 
-            norm = math.sqrt(sum(x * x for x in embedding))
-            if norm > 0:
-                embedding = [x / norm for x in embedding]
+    def create_embedding(
+        self,
+        input: Union[str, List[str]],
+        **kwargs,
+    ) -> EmbeddingResponse:
+        """
+        Generate embeddings for input text(s).
+
+        Args:
+            input: Text or list of texts to embed.
+
+        Returns:
+            Embedding response.
+        """
+        texts = [input] if isinstance(input, str) else input
+        embeddings, n_tokens = self._embed(texts)
+        self._l2_normalize(embeddings)
 
-            embeddings_data.append(
+        return {
+            "object": "list",
+            "data": [
                 {
                     "index": idx,
                     "embedding": embedding,
                     "object": "embedding",
                 }
-            )
-
-        return {
-            "object": "list",
-            "data": embeddings_data,
+                for idx, embedding in enumerate(embeddings.tolist())
+            ],
             "model": self._model_path,
             "usage": {
-                "prompt_tokens": sum(
-                    len(self.tokenize(t, add_special=True)) for t in texts
-                ),
-                "total_tokens": sum(
-                    len(self.tokenize(t, add_special=True)) for t in texts
-                ),
+                "prompt_tokens": n_tokens,
+                "total_tokens": n_tokens,
             },
         }
 
     def reset(self):
         """Reset the context state."""
-        self._lib.llama_memory_clear(self._memory, True)
+        self._clear_kv()
         if self._sampler is not None:
             self._lib.llama_sampler_reset(self._sampler)
 
@@ -0,0 +1,99 @@
+"""
+Vectorized logits processors.
+
+A logits processor is called once per generated token as
+``processor(input_ids, scores)``. ``input_ids`` is the sequence so far (prompt
+plus generated tokens) and ``scores`` is a zero-copy ``float32`` NumPy view of
+llama.cpp's logits for the next token. Processors should modify ``scores`` in
+place with vectorized operations and return it (or None); returning a
+different array is supported but costs a copy back into the logits buffer.
+
+Example:
+    >>> from llamafarm_llama import LogitBiasProcessor, LogitsProcessorList
+    >>> newline = llm.tokenize("\\n", add_special=False)[0]
+    >>> processors = LogitsProcessorList(
+    ...     [LogitBiasProcessor({newline: -5.0}), my_processor]
+    ... )
+    >>> llm.create_chat_completion(messages, logits_processor=processors)
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class LogitsProcessor(ABC):
+    """Base class for processors that edit next-token logits in place."""
+
+    @abstractmethod
+    def __call__(
+        self, input_ids: Sequence[int], scores: "np.ndarray"
+    ) -> Optional["np.ndarray"]:
+        """Adjust ``scores`` for the next token.
+
+        Args:
+            input_ids: Prompt and generated token IDs so far.
+            scores: Logits for the next token (modify in place).
+
+        Returns:
+            ``scores`` (or None) after in-place edits, or a replacement array.
+        """
+
+
+class LogitsProcessorList(list):
+    """Applies several processors in order to the same logits view."""
+
+    def __call__(self, input_ids: Sequence[int], scores: "np.ndarray") -> "np.ndarray":
+        for processor in self:
+            processed = processor(input_ids, scores)
+            if processed is not None and processed is not scores:
+                scores[:] = processed
+        return scores
+
+
+class LogitBiasProcessor(LogitsProcessor):
+    """Adds a fixed bias to selected token logits.
+
+    Args:
+        logit_bias: Mapping of token ID to additive bias. Use ``-inf`` to ban a
+            token outright.
+    """
+
+    def __init__(self, logit_bias: Dict[int, float]):
+        import numpy as np
+
+        self._ids = np.fromiter(logit_bias.keys(), dtype=np.int64)
+        self._bias = np.fromiter(logit_bias.values(), dtype=np.float32)
+
+    def __call__(self, input_ids: Sequence[int], scores: "np.ndarray") -> "np.ndarray":
+        scores[self._ids] += self._bias
+        return scores
+
+
+class TokenMaskProcessor(LogitsProcessor):
+    """Restricts sampling to an allowed set of tokens.
+
+    The mask of blocked tokens is built once, so each call is a single
+    vectorized write.
+
+    Args:
+        allowed_tokens: Token IDs that may be sampled.
+        n_vocab: Vocabulary size.
+    """
+
+    def __init__(self, allowed_tokens: Iterable[int], n_vocab: int):
+        import numpy as np
+
+        self._blocked = np.ones(n_vocab, dtype=bool)
+        allowed: List[int] = [t for t in allowed_tokens if 0 <= t < n_vocab]
+        self._blocked[allowed] = False
+
+    def __call__(self, input_ids: Sequence[int], scores: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        np.putmask(scores, self._blocked, -np.inf)
+        return scores
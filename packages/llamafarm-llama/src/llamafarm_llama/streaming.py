@@ -0,0 +1,139 @@
+"""
+Constant-time per-token helpers for streaming generation.
+
+:class:`IncrementalDetokenizer` converts one token at a time using a cached
+per-token piece table, buffering incomplete UTF-8 sequences, so the cost of a
+step does not grow with the length of the output. :class:`StopMatcher` is an
+Aho-Corasick automaton over stop sequences that consumes only the newly
+decoded text and keeps its partial-match state between steps.
+
+Example:
+    >>> detok = IncrementalDetokenizer(llm)
+    >>> matcher = StopMatcher(["</answer>", "\\n\\n"])
+    >>> for token in tokens:
+    ...     delta = detok.push(token)
+    ...     idx = matcher.feed(delta)
+    ...     if idx is not None:
+    ...         print(delta[: max(idx, 0)])
+    ...         break
+    ...     print(delta, end="")
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .llama import Llama
+
+
+class IncrementalDetokenizer:
+    """Detokenizes a generated sequence one token at a time.
+
+    The first token goes through ``llama_detokenize`` so leading-space handling
+    matches detokenizing the whole sequence; later tokens use the cached piece
+    table from :meth:`Llama._token_piece`.
+
+    Args:
+        llama: Llama instance whose vocabulary is used.
+    """
+
+    def __init__(self, llama: "Llama"):
+        self._llama = llama
+        self._pending = b""
+        self._first = True
+
+    def push(self, token: int) -> str:
+        """Add a token and return the newly completed text (may be empty)."""
+        if self._first:
+            piece = self._llama._detokenize_bytes([token])
+            self._first = False
+        else:
+            piece = self._llama._token_piece(token)
+        text, self._pending = self._llama._decode_utf8_streaming(self._pending + piece)
+        return text
+
+    def flush(self) -> str:
+        """Return any buffered incomplete bytes, decoded with replacement."""
+        pending, self._pending = self._pending, b""
+        return pending.decode("utf-8", errors="replace")
+
+
+class StopMatcher:
+    """Streaming multi-pattern matcher for stop sequences (Aho-Corasick).
+
+    Text is fed in arbitrary pieces; each character advances the automaton
+    once, so matching cost is proportional to the new text only, no matter
+    how many stop sequences there are or how long the output has grown.
+
+    Args:
+        stops: Stop sequences. Empty strings are ignored.
+    """
+
+    def __init__(self, stops: Optional[List[str]] = None):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Length of the longest stop sequence that ends in each state
+        self._out: List[int] = [0]
+        self._state = 0
+
+        for stop in stops or []:
+            if stop:
+                self._add(stop)
+        self._build()
+
+    def __bool__(self) -> bool:
+        return len(self._goto) > 1
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state] = max(self._out[state], len(pattern))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = max(self._out[nxt], self._out[self._fail[nxt]])
+
+    def feed(self, text: str) -> Optional[int]:
+        """Consume ``text`` and report the first completed stop sequence.
+
+        Returns:
+            Index in ``text`` where the matched stop sequence starts, or None if
+            no stop sequence completed. The index is negative when the match
+            began in text fed by an earlier call.
+        """
+        if len(self._goto) == 1:
+            return None
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = self._state
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                self._state = state
+                return i + 1 - out[state]
+        self._state = state
+        return None
+
+    def reset(self) -> None:
+        """Forget any partial match."""
+        self._state = 0
@@ -0,0 +1,168 @@
+"""Tests for continuous batching over multiple sequences."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+EOS = 99
+
+
+def _make_llama(token_streams, n_seq_max=4, n_ctx=1024, n_batch=64):
+    """Create a Llama with a mocked library whose samplers replay token streams.
+
+    The i-th sampler created (i.e. the i-th admitted request) returns the tokens
+    in token_streams[i].
+    """
+    from llamafarm_llama.llama import Llama
+
+    llm = Llama.__new__(Llama)
+    lib = MagicMock()
+    lib.llama_decode.return_value = 0
+    lib.llama_n_ctx.return_value = n_ctx
+    lib.llama_vocab_n_tokens.return_value = 128
+    lib.llama_vocab_is_eog.side_effect = lambda vocab, token: token == EOS
+    lib.llama_sampler_sample.side_effect = lambda sampler, ctx, idx: next(
+        sampler.stream
+    )
+
+    streams = iter([iter(tokens) for tokens in token_streams])
+
+    def build_sampler(**kwargs):
+        sampler = MagicMock()
+        sampler.stream = next(streams)
+        return sampler
+
+    llm._lib = lib
+    llm._ctx = MagicMock()
+    llm._memory = MagicMock()
+    llm._vocab = MagicMock()
+    llm._n_batch = n_batch
+    llm._n_seq_max = n_seq_max
+    llm._kv_tokens = []
+    llm._kv_cache_key = None
+    llm._cache = None
+    llm._closed = True
+    llm._build_sampler = build_sampler
+    llm._detokenize_bytes = lambda tokens, remove_special=False: b"".join(
+        f"<{t}>".encode() for t in tokens
+    )
+    llm._token_piece = lambda token: f"<{token}>".encode()
+    return llm
+
+
+def _run(batcher, requests, timeout=5.0):
+    """Submit requests and wait for all of them to finish."""
+    events = [threading.Event() for _ in requests]
+    texts = ["" for _ in requests]
+
+    for i, req in enumerate(requests):
+        req.on_delta = lambda text, i=i: texts.__setitem__(i, texts[i] + text)
+        req.on_done = lambda reason, error, i=i: events[i].set()
+
+    # Hold the context so all requests are admitted before the first step
+    with batcher._ctx_lock:
+        for req in requests:
+            batcher.submit(req)
+    for event in events:
+        assert event.wait(timeout), "request did not finish"
+    return texts
+
+
+@pytest.fixture
+def make_batcher():
+    from llamafarm_llama.batching import ContinuousBatcher
+
+    batchers = []
+
+    def _make(llm, n_slots):
+        batcher = ContinuousBatcher(llm, n_slots=n_slots)
+        batcher.start()
+        batchers.append(batcher)
+        return batcher
+
+    yield _make
+    for batcher in batchers:
+        batcher.stop()
+
+
+class TestContinuousBatcher:
+    """Test scheduling of concurrent requests onto sequence slots."""
+
+    def test_concurrent_requests_share_decode_steps(self, make_batcher):
+        """Active sequences should be decoded together in one llama_decode call."""
+        from llamafarm_llama.batching import BatchRequest
+
+        llm = _make_llama([[1, 2, 3, EOS], [4, 5, 6, EOS]])
+        batcher = make_batcher(llm, n_slots=2)
+        requests = [BatchRequest([10, 11, 12]), BatchRequest([20, 21])]
+
+        texts = _run(batcher, requests)
+
+        assert texts == ["<1><2><3>", "<4><5><6>"]
+        assert [r.finish_reason for r in requests] == ["stop", "stop"]
+        # 1 prefill step + 3 generation steps, shared between both sequences
+        assert llm._lib.llama_decode.call_count == 4
+        # Sequences are freed when done
+        llm._lib.llama_memory_seq_rm.assert_any_call(llm._memory, 0, -1, -1)
+        llm._lib.llama_memory_seq_rm.assert_any_call(llm._memory, 1, -1, -1)
+
+    def test_max_tokens_finishes_with_length(self, make_batcher):
+        """Requests stop with finish_reason 'length' at max_tokens."""
+        from llamafarm_llama.batching import BatchRequest
+
+        batcher = make_batcher(_make_llama([[1, 2, 3, 4, 5]]), n_slots=1)
+        request = BatchRequest([7], max_tokens=2)
+
+        assert _run(batcher, [request]) == ["<1><2>"]
+        assert request.finish_reason == "length"
+
+    def test_stop_sequence_truncates_output(self, make_batcher):
+        """Stop sequences end generation and are not emitted."""
+        from llamafarm_llama.batching import BatchRequest
+
+        batcher = make_batcher(_make_llama([[1, 2, 3, 4, EOS]]), n_slots=1)
+        request = BatchRequest([7], stop=["<3>"])
+
+        assert _run(batcher, [request]) == ["<1><2>"]
+        assert request.finish_reason == "stop"
+
+    def test_requests_beyond_slots_are_queued(self, make_batcher):
+        """Requests wait for a free slot instead of failing."""
+        from llamafarm_llama.batching import BatchRequest
+
+        batcher = make_batcher(_make_llama([[1, EOS], [2, EOS]]), n_slots=1)
+
+        assert _run(batcher, [BatchRequest([7]), BatchRequest([8])]) == ["<1>", "<2>"]
+
+    def test_cancel_pending_request(self):
+        """Cancelling a queued request reports 'cancelled' without decoding it."""
+        from llamafarm_llama.batching import BatchRequest, ContinuousBatcher
+
+        batcher = ContinuousBatcher(_make_llama([]), n_slots=1)
+        done = []
+        request = BatchRequest([7], on_done=lambda reason, error: done.append(reason))
+
+        batcher._running = True  # Accept submissions without a worker thread
+        batcher.submit(request)
+        batcher.cancel(request)
+
+        assert done == ["cancelled"]
+        assert batcher.n_pending == 0
+
+    def test_prompt_too_long_rejected(self):
+        """Prompts that can't fit in the shared context are rejected up front."""
+        from llamafarm_llama.batching import BatchRequest, ContinuousBatcher
+
+        batcher = ContinuousBatcher(_make_llama([], n_ctx=8), n_slots=1)
+        batcher._running = True
+
+        with pytest.raises(ValueError):
+            batcher.submit(BatchRequest(list(range(8))))
+
+    def test_n_slots_cannot_exceed_n_seq_max(self):
+        """The batcher can't use more sequences than the context allows."""
+        from llamafarm_llama.batching import ContinuousBatcher
+
+        with pytest.raises(ValueError):
+            ContinuousBatcher(_make_llama([], n_seq_max=2), n_slots=4)
@@ -2,6 +2,8 @@
 
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 
 class TestLlamaInit:
     """Test Llama initialization."""
@@ -217,3 +219,466 @@ class TestResponseTypes:
 
         assert "role" in ChatMessage.__annotations__
         assert "content" in ChatMessage.__annotations__
+
+
+def _make_bare_llama():
+    """Create a Llama instance with a mocked library, bypassing model loading."""
+    from llamafarm_llama.llama import Llama
+
+    llm = Llama.__new__(Llama)
+    llm._lib = MagicMock()
+    llm._lib.llama_decode.return_value = 0
+    llm._lib.llama_memory_seq_rm.return_value = True
+    llm._ctx = MagicMock()
+    llm._memory = MagicMock()
+    llm._n_batch = 512
+    llm._kv_tokens = []
+    llm._kv_cache_key = None
+    llm._cache = None
+    llm._prefix_cache = None
+    llm._prefix_fingerprint = ""
+    llm._kv_prompt_len = 0
+    llm._closed = True  # Nothing to free in __del__
+    return llm
+
+
+class TestPrefixReuse:
+    """Test prefix-aware KV cache reuse between requests."""
+
+    def test_common_prefix_len(self):
+        """Common prefix length should stop at the first differing token."""
+        from llamafarm_llama.llama import Llama
+
+        assert Llama._common_prefix_len([1, 2, 3], [1, 2, 4]) == 2
+        assert Llama._common_prefix_len([1, 2], [1, 2, 3]) == 2
+        assert Llama._common_prefix_len([], [1]) == 0
+
+    def test_first_prompt_decodes_everything(self):
+        """Without cached tokens the full prompt is decoded."""
+        llm = _make_bare_llama()
+
+        assert llm._eval_prompt([1, 2, 3, 4]) == 0
+        assert llm._kv_tokens == [1, 2, 3, 4]
+        llm._lib.llama_memory_clear.assert_called()
+
+    def test_extended_prompt_only_decodes_suffix(self):
+        """A prompt extending the cached tokens should only decode the new suffix."""
+        llm = _make_bare_llama()
+        llm._eval_prompt([1, 2, 3, 4])
+        llm._lib.reset_mock()
+
+        assert llm._eval_prompt([1, 2, 3, 4, 5, 6]) == 4
+        llm._lib.llama_memory_clear.assert_not_called()
+        llm._lib.llama_memory_seq_rm.assert_not_called()
+        assert llm._lib.llama_batch_get_one.call_args[0][1] == 2
+        assert llm._kv_tokens == [1, 2, 3, 4, 5, 6]
+
+    def test_diverging_prompt_truncates_tail(self):
+        """A diverging prompt should drop the stale tail from the KV cache."""
+        llm = _make_bare_llama()
+        llm._eval_prompt([1, 2, 3, 4])
+
+        assert llm._eval_prompt([1, 2, 9]) == 2
+        llm._lib.llama_memory_seq_rm.assert_called_with(llm._memory, 0, 2, -1)
+        assert llm._kv_tokens == [1, 2, 9]
+
+    def test_identical_prompt_redecodes_last_token(self):
+        """An identical prompt must still re-decode one token for fresh logits."""
+        llm = _make_bare_llama()
+        llm._eval_prompt([1, 2, 3])
+
+        assert llm._eval_prompt([1, 2, 3]) == 2
+        llm._lib.llama_memory_seq_rm.assert_called_with(llm._memory, 0, 2, -1)
+        assert llm._kv_tokens == [1, 2, 3]
+
+    def test_partial_removal_unsupported_falls_back(self):
+        """If the memory refuses partial removal the prompt is fully re-decoded."""
+        llm = _make_bare_llama()
+        llm._eval_prompt([1, 2, 3, 4])
+        llm._lib.llama_memory_seq_rm.return_value = False
+
+        assert llm._eval_prompt([1, 2, 9]) == 0
+        assert llm._kv_tokens == [1, 2, 9]
+
+    def test_decode_failure_invalidates_cache(self):
+        """A failed decode should leave no reusable prefix behind."""
+        llm = _make_bare_llama()
+        llm._lib.llama_decode.return_value = 1
+
+        with pytest.raises(RuntimeError):
+            llm._eval_prompt([1, 2, 3])
+        assert llm._kv_tokens == []
+
+    def test_switching_keys_snapshots_and_restores(self):
+        """Switching conversations should stash and later restore KV state."""
+        from llamafarm_llama.cache import LlamaRAMCache
+
+        llm = _make_bare_llama()
+        llm._lib.llama_state_seq_get_size.return_value = 8
+        llm._lib.llama_state_seq_get_data.return_value = 8
+        llm._lib.llama_state_seq_set_data.return_value = 8
+        llm.set_cache(LlamaRAMCache(capacity_bytes=1024))
+
+        llm._eval_prompt([1, 2, 3, 4], cache_key="a")
+        llm._eval_prompt([7, 8, 9], cache_key="b")
+        assert "a" in llm._cache
+        assert llm._cache.get("a").tokens == (1, 2, 3, 4)
+
+        assert llm._eval_prompt([1, 2, 3, 4, 5], cache_key="a") == 4
+        llm._lib.llama_state_seq_set_data.assert_called_once()
+        assert llm._kv_tokens == [1, 2, 3, 4, 5]
+        assert "b" in llm._cache
+
+
+class TestLlamaRAMCache:
+    """Test the in-memory LRU snapshot cache."""
+
+    def test_lru_eviction_by_bytes(self):
+        """Least recently used snapshots are evicted once capacity is exceeded."""
+        from llamafarm_llama.cache import LlamaRAMCache, LlamaState
+
+        cache = LlamaRAMCache(capacity_bytes=250)
+        cache.put("a", LlamaState(tokens=(), state=b"x" * 100))
+        cache.put("b", LlamaState(tokens=(), state=b"x" * 100))
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", LlamaState(tokens=(), state=b"x" * 100))
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.cache_size == 200
+
+    def test_oversized_entry_not_stored(self):
+        """Snapshots larger than the whole cache are skipped."""
+        from llamafarm_llama.cache import LlamaRAMCache, LlamaState
+
+        cache = LlamaRAMCache(capacity_bytes=10)
+        cache.put("a", LlamaState(tokens=(), state=b"x" * 100))
+
+        assert len(cache) == 0
+        assert cache.cache_size == 0
+
+
+class TestLlamaDiskCache:
+    """Test the on-disk LRU snapshot cache."""
+
+    def test_snapshots_survive_reopen(self, tmp_path):
+        """A new cache over the same directory sees earlier snapshots."""
+        from llamafarm_llama.cache import LlamaDiskCache, LlamaState
+
+        LlamaDiskCache(tmp_path).put("a", LlamaState(tokens=(1, 2, 3), state=b"kv"))
+
+        reopened = LlamaDiskCache(tmp_path)
+        assert list(reopened.keys()) == ["a"]
+        assert reopened.get("a") == LlamaState(tokens=(1, 2, 3), state=b"kv")
+
+    def test_lru_eviction_deletes_files(self, tmp_path):
+        """Least recently used files are removed once capacity is exceeded."""
+        from llamafarm_llama.cache import LlamaDiskCache, LlamaState
+
+        cache = LlamaDiskCache(tmp_path, capacity_bytes=250)
+        cache.put("a", LlamaState(tokens=(), state=b"x" * 100))
+        cache.put("b", LlamaState(tokens=(), state=b"x" * 100))
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", LlamaState(tokens=(), state=b"x" * 100))
+
+        assert sorted(p.stem for p in tmp_path.glob("*.kvstate")) == ["a", "c"]
+        assert "b" not in cache
+
+    def test_unsafe_keys_are_hashed(self, tmp_path):
+        """Keys that aren't valid file names are stored under a digest."""
+        from llamafarm_llama.cache import LlamaDiskCache, LlamaState
+
+        cache = LlamaDiskCache(tmp_path)
+        cache.put("../session/1", LlamaState(tokens=(1,), state=b"kv"))
+
+        assert "../session/1" in cache
+        assert len(list(tmp_path.glob("*.kvstate"))) == 1
+        assert cache.pop("../session/1").tokens == (1,)
+        assert not list(tmp_path.glob("*.kvstate"))
+
+    def test_corrupt_file_is_discarded(self, tmp_path):
+        """Unreadable snapshot files are treated as misses and deleted."""
+        from llamafarm_llama.cache import LlamaDiskCache
+
+        (tmp_path / "a.kvstate").write_bytes(b"garbage")
+        cache = LlamaDiskCache(tmp_path)
+
+        assert cache.get("a") is None
+        assert not (tmp_path / "a.kvstate").exists()
+
+
+def _make_prefix_llama(cache):
+    """Create a bare Llama whose KV state can be saved and restored."""
+    llm = _make_bare_llama()
+    llm._model_path = "model.gguf"
+    llm._lib.llama_state_seq_get_size.return_value = 8
+    llm._lib.llama_state_seq_get_data.return_value = 8
+    llm._lib.llama_state_seq_set_data.return_value = 8
+    llm.set_prefix_cache(cache, min_tokens=2)
+    return llm
+
+
+class TestPrefixSnapshots:
+    """Test snapshots keyed by model + prompt prefix hash."""
+
+    def test_switching_conversation_persists_resident_prefix(self, tmp_path):
+        """The resident sequence is saved before a different prompt replaces it."""
+        from llamafarm_llama.cache import LlamaDiskCache
+
+        cache = LlamaDiskCache(tmp_path)
+        llm = _make_prefix_llama(cache)
+        llm._eval_prompt([1, 2, 3, 4])
+        llm._decode_batch([5])  # Generated token
+
+        llm._eval_prompt([9, 9, 9])
+
+        assert len(cache) == 1
+        assert cache.get(next(cache.keys())).tokens == (1, 2, 3, 4, 5)
+
+    def test_resume_restores_instead_of_redecoding(self, tmp_path):
+        """A fresh model restores the cached prefix of a resumed conversation."""
+        from llamafarm_llama.cache import LlamaDiskCache
+
+        llm = _make_prefix_llama(LlamaDiskCache(tmp_path))
+        llm._eval_prompt([1, 2, 3, 4])
+        llm._decode_batch([5])
+        assert llm.save_prefix_state()
+
+        # e.g. after an idle unload and reload
+        resumed = _make_prefix_llama(LlamaDiskCache(tmp_path))
+        assert resumed._eval_prompt([1, 2, 3, 4, 5, 6, 7]) == 5
+        resumed._lib.llama_state_seq_set_data.assert_called_once()
+        assert resumed._lib.llama_batch_get_one.call_args[0][1] == 2
+        assert resumed._kv_tokens == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_incompatible_snapshot_is_dropped(self, tmp_path):
+        """A snapshot llama.cpp refuses to load is deleted and the prompt decoded."""
+        from llamafarm_llama.cache import LlamaDiskCache
+
+        cache = LlamaDiskCache(tmp_path)
+        llm = _make_prefix_llama(cache)
+        llm._eval_prompt([1, 2, 3, 4])
+        llm.save_prefix_state()
+
+        resumed = _make_prefix_llama(cache)
+        resumed._lib.llama_state_seq_set_data.return_value = 0
+        assert resumed._eval_prompt([1, 2, 3, 4, 5]) == 0
+        assert len(cache) == 0
+        assert resumed._kv_tokens == [1, 2, 3, 4, 5]
+
+    def test_short_prompts_are_not_saved(self, tmp_path):
+        """Prompts below min_tokens are not worth a snapshot."""
+        from llamafarm_llama.cache import LlamaDiskCache
+
+        llm = _make_prefix_llama(LlamaDiskCache(tmp_path))
+        llm._eval_prompt([1])
+
+        assert not llm.save_prefix_state()
+        assert len(llm._prefix_cache) == 0
+
+
+def _make_embedding_llama(n_seq_max=4, n_batch=512):
+    """Create a bare embedding-mode Llama whose pooled outputs are inspectable.
+
+    The pooled embedding of sequence ``s`` after the ``d``-th decode is
+    ``[d, s, 1]``.
+    """
+    from types import SimpleNamespace
+
+    from llamafarm_llama._bindings import ffi
+
+    llm = _make_bare_llama()
+    llm._embedding_mode = True
+    llm._n_seq_max = n_seq_max
+    llm._n_batch = n_batch
+    llm._model = MagicMock()
+    llm._model_path = "embed.gguf"
+    llm._lib.llama_model_n_embd.return_value = 3
+    llm._lib.llama_pooling_type.return_value = 1  # MEAN
+    llm.tokenize = MagicMock(side_effect=lambda text, **kwargs: [7] * len(text))
+
+    def batch_init(n_tokens, embd, n_seq):
+        return SimpleNamespace(
+            token=[0] * n_tokens,
+            pos=[0] * n_tokens,
+            n_seq_id=[0] * n_tokens,
+            seq_id=[[0] for _ in range(n_tokens)],
+            logits=[0] * n_tokens,
+            n_tokens=0,
+        )
+
+    buffers = []
+
+    def get_embeddings_seq(ctx, seq_id):
+        buf = ffi.new("float[3]", [llm._lib.llama_decode.call_count, seq_id, 1])
+        buffers.append(buf)  # Keep alive until read
+        return buf
+
+    llm._lib.llama_batch_init.side_effect = batch_init
+    llm._lib.llama_get_embeddings_seq.side_effect = get_embeddings_seq
+    return llm
+
+
+class TestBatchedEmbeddings:
+    """Test packing multiple inputs into shared embedding batches."""
+
+    def test_inputs_share_decode_calls(self):
+        """Inputs are packed up to n_seq_max sequences per decode."""
+        llm = _make_embedding_llama(n_seq_max=4)
+
+        out = llm.embed(["a", "bb", "c", "dd", "e"], normalize=False)
+
+        assert out.shape == (5, 3)
+        assert llm._lib.llama_decode.call_count == 2
+        assert out[:, 0].tolist() == [1, 1, 1, 1, 2]
+        assert out[:, 1].tolist() == [0, 1, 2, 3, 0]
+        llm._lib.llama_batch_free.assert_called_once()
+
+    def test_token_budget_splits_batches(self):
+        """A new batch starts when the next input would exceed n_batch tokens."""
+        llm = _make_embedding_llama(n_seq_max=8, n_batch=8)
+
+        out = llm.embed(["aaaaa", "bbbbb", "cc"], normalize=False)
+
+        assert llm._lib.llama_decode.call_count == 2
+        assert out[:, 0].tolist() == [1, 2, 2]
+
+    def test_create_embedding_normalizes_and_counts_tokens_once(self):
+        """create_embedding normalizes rows and reuses the tokenization counts."""
+        import numpy as np
+
+        llm = _make_embedding_llama()
+
+        response = llm.create_embedding(["abc", "de"])
+
+        norms = np.linalg.norm([d["embedding"] for d in response["data"]], axis=1)
+        assert np.allclose(norms, 1.0)
+        assert response["usage"]["prompt_tokens"] == 5
+        assert llm.tokenize.call_count == 2
+
+    def test_single_sequence_context_embeds_one_at_a_time(self):
+        """Without spare sequence slots each input is decoded on its own."""
+        llm = _make_embedding_llama(n_seq_max=1)
+
+        llm.embed(["a", "b", "c"], normalize=False)
+
+        assert llm._lib.llama_batch_init.call_count == 0
+        assert llm._lib.llama_batch_get_one.call_count == 3
+
+
+def _make_speculative_llama(target_samples, draft_tokens, n_draft=3):
+    """Create a bare Llama with a mocked draft model.
+
+    ``target_samples`` are returned by the target sampler in order and
+    ``draft_tokens`` are the draft's greedy proposals in order.
+    """
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    llm = _make_bare_llama()
+    llm._n_ctx = 4096
+    llm._vocab = MagicMock()
+    llm._sampler = MagicMock()
+    llm._lib.llama_vocab_is_eog.return_value = False
+    llm._lib.llama_sampler_sample.side_effect = list(target_samples)
+    llm._lib.llama_batch_init.side_effect = lambda n, embd, n_seq: SimpleNamespace(
+        token=[0] * n,
+        pos=[0] * n,
+        n_seq_id=[0] * n,
+        seq_id=[[0] for _ in range(n)],
+        logits=[0] * n,
+        n_tokens=0,
+    )
+
+    def one_hot(token):
+        logits = np.zeros(128, dtype=np.float32)
+        logits[token] = 1.0
+        return logits
+
+    draft = MagicMock()
+    draft._logits_view.side_effect = [one_hot(t) for t in draft_tokens]
+    llm._draft = draft
+    llm._n_draft = n_draft
+    return llm
+
+
+class TestSpeculativeDecoding:
+    """Test draft-model speculative decoding."""
+
+    def test_accepts_matching_prefix_and_trims_rejected_drafts(self):
+        """Drafts up to the first mismatch are kept; the rest leave the KV cache."""
+        llm = _make_speculative_llama(
+            target_samples=[10, 11, 12, 99, 100], draft_tokens=[11, 12, 13]
+        )
+        llm._eval_prompt([1, 2, 3])
+        llm._lib.llama_decode.reset_mock()
+
+        out = list(llm._generate_tokens([1, 2, 3], max_tokens=5, logits_processor=None))
+
+        assert out == [10, 11, 12, 99, 100]
+        # The draft continues from the prompt plus the first sampled token
+        llm._draft._eval_prompt.assert_called_once()
+        assert llm._draft._eval_prompt.call_args[0][0][:4] == [1, 2, 3, 10]
+        assert llm._draft._decode_batch.call_count == 2
+        # One batched verification for three drafts, then one plain step
+        assert llm._lib.llama_decode.call_count == 2
+        llm._lib.llama_memory_seq_rm.assert_called_once_with(llm._memory, 0, 6, -1)
+        assert llm._kv_tokens == [1, 2, 3, 10, 11, 12, 99]
+
+    def test_logits_processor_disables_speculation(self):
+        """Requests with a logits processor decode one token at a time."""
+        llm = _make_speculative_llama(target_samples=[10, 11], draft_tokens=[])
+        llm._logits_view = MagicMock()
+        llm._eval_prompt([1, 2, 3])
+
+        out = list(llm._generate_tokens([1, 2, 3], 2, lambda ids, scores: scores))
+
+        assert out == [10, 11]
+        llm._draft._eval_prompt.assert_not_called()
+        assert llm._kv_tokens == [1, 2, 3, 10, 11]
+
+    def test_set_draft_model_rejects_vocab_mismatch(self):
+        """The draft must share the target's vocabulary."""
+        llm = _make_bare_llama()
+        llm._vocab = MagicMock()
+        llm._lib.llama_vocab_n_tokens.return_value = 32000
+        draft = MagicMock(n_vocab=151936)
+
+        with pytest.raises(ValueError, match="vocabulary"):
+            llm.set_draft_model(draft)
+
+
+class TestCancellation:
+    """Test stopping generation between tokens."""
+
+    def test_generation_stops_once_event_is_set(self):
+        """Setting the event stops sampling before the next token."""
+        import threading
+
+        llm = _make_speculative_llama(target_samples=[10, 11, 12, 13], draft_tokens=[])
+        llm._draft = None
+        cancel = threading.Event()
+
+        out = []
+        for token in llm._generate_tokens([1, 2, 3], 4, None, cancel):
+            out.append(token)
+            if len(out) == 2:
+                cancel.set()
+
+        assert out == [10, 11]
+        assert llm._lib.llama_sampler_sample.call_count == 2
+
+    def test_speculative_generation_honours_cancelled_event(self):
+        """An already cancelled request never drafts or samples."""
+        import threading
+
+        llm = _make_speculative_llama(target_samples=[10], draft_tokens=[11])
+        llm._eval_prompt([1, 2, 3])
+        cancel = threading.Event()
+        cancel.set()
+
+        assert list(llm._generate_tokens([1, 2, 3], 5, None, cancel)) == []
+        llm._draft._eval_prompt.assert_not_called()
+        llm._lib.llama_sampler_sample.assert_not_called()
@@ -0,0 +1,93 @@
+"""Tests for vectorized logits processors and the zero-copy logits view."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from llamafarm_llama._bindings import ffi
+from llamafarm_llama.logits import (
+    LogitBiasProcessor,
+    LogitsProcessorList,
+    TokenMaskProcessor,
+)
+
+
+def _make_llama_with_logits(values):
+    """Create a bare Llama whose logits buffer is a real CFFI float array."""
+    from llamafarm_llama.llama import Llama
+
+    llm = Llama.__new__(Llama)
+    llm._lib = MagicMock()
+    llm._ctx = MagicMock()
+    llm._vocab = MagicMock()
+    llm._closed = True
+    buf = ffi.new(f"float[{len(values)}]", values)
+    llm._lib.llama_get_logits_ith.return_value = buf
+    llm._lib.llama_vocab_n_tokens.return_value = len(values)
+    return llm, buf
+
+
+class TestLogitsView:
+    """Test that processors edit llama.cpp's logits without copies."""
+
+    def test_in_place_edits_reach_the_buffer(self):
+        """Writes through the view land in the underlying logits buffer."""
+        llm, buf = _make_llama_with_logits([1.0, 2.0, 3.0])
+
+        def processor(input_ids, scores):
+            scores[1] = -np.inf
+            return scores
+
+        llm._apply_logits_processor(processor, [5, 6])
+
+        assert list(buf) == [1.0, -np.inf, 3.0]
+
+    def test_returned_array_is_copied_back(self):
+        """A processor returning a new array still updates the logits."""
+        llm, buf = _make_llama_with_logits([1.0, 2.0, 3.0])
+
+        llm._apply_logits_processor(lambda ids, scores: scores * 2, [])
+
+        assert list(buf) == [2.0, 4.0, 6.0]
+
+    def test_view_is_float32_and_writable(self):
+        """The view has the vocab's length and can be modified."""
+        llm, _ = _make_llama_with_logits([0.0] * 8)
+
+        view = llm._logits_view()
+
+        assert view.dtype == np.float32
+        assert view.shape == (8,)
+        assert view.flags.writeable
+
+
+class TestLogitsProcessors:
+    """Test the built-in vectorized processors."""
+
+    def test_logit_bias(self):
+        """Biases are added to the selected tokens only."""
+        scores = np.zeros(4, dtype=np.float32)
+
+        LogitBiasProcessor({1: 2.0, 3: -1.0})([], scores)
+
+        assert scores.tolist() == [0.0, 2.0, 0.0, -1.0]
+
+    def test_token_mask(self):
+        """Tokens outside the allowed set are set to -inf."""
+        scores = np.ones(4, dtype=np.float32)
+
+        TokenMaskProcessor([0, 2], n_vocab=4)([], scores)
+
+        assert scores.tolist() == [1.0, -np.inf, 1.0, -np.inf]
+
+    def test_processor_list_chains_in_order(self):
+        """Each processor sees the result of the previous one."""
+        scores = np.zeros(3, dtype=np.float32)
+        processors = LogitsProcessorList(
+            [LogitBiasProcessor({0: 1.0}), lambda ids, s: s * 3]
+        )
+
+        result = processors([], scores)
+
+        assert result is scores
+        assert scores.tolist() == [3.0, 0.0, 0.0]
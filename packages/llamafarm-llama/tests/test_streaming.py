@@ -0,0 +1,97 @@
+"""Tests for incremental detokenization and streaming stop matching."""
+
+from unittest.mock import MagicMock
+
+from llamafarm_llama.streaming import IncrementalDetokenizer, StopMatcher
+
+
+class TestStopMatcher:
+    """Test the Aho-Corasick stop sequence matcher."""
+
+    def test_no_stops_never_matches(self):
+        """A matcher without stop sequences is falsy and never matches."""
+        matcher = StopMatcher([])
+
+        assert not matcher
+        assert matcher.feed("anything at all") is None
+
+    def test_match_within_single_piece(self):
+        """The start index of a stop sequence inside one piece is returned."""
+        matcher = StopMatcher(["END"])
+
+        assert matcher.feed("hello END world") == 6
+
+    def test_match_spanning_pieces(self):
+        """A stop sequence split across pieces yields a negative start index."""
+        matcher = StopMatcher(["</answer>"])
+
+        assert matcher.feed("42 </ans") is None
+        assert matcher.feed("wer> trailing") == -5
+
+    def test_earliest_completed_match_wins(self):
+        """The first stop sequence to complete ends the stream."""
+        matcher = StopMatcher(["abcd", "bc"])
+
+        assert matcher.feed("xabcd") == 2  # "bc" completes before "abcd"
+
+    def test_overlapping_prefix_uses_failure_links(self):
+        """A failed partial match can still be the start of another match."""
+        matcher = StopMatcher(["aab"])
+
+        assert matcher.feed("a") is None
+        assert matcher.feed("a") is None
+        assert matcher.feed("ab") == -1  # Match began with the previous "a"
+
+    def test_reset_forgets_partial_match(self):
+        """reset() discards state carried over from earlier pieces."""
+        matcher = StopMatcher(["\n\n"])
+        matcher.feed("line\n")
+        matcher.reset()
+
+        assert matcher.feed("\nnext") is None
+
+
+def _make_llama(pieces):
+    """Create a Llama stand-in whose tokens map to the given byte pieces."""
+    from llamafarm_llama.llama import Llama
+
+    llama = MagicMock()
+    llama._detokenize_bytes.side_effect = lambda tokens: b"".join(
+        pieces[t].lstrip(b" ") for t in tokens
+    )
+    llama._token_piece.side_effect = lambda token: pieces[token]
+    llama._decode_utf8_streaming = Llama._decode_utf8_streaming
+    return llama
+
+
+class TestIncrementalDetokenizer:
+    """Test one-token-at-a-time detokenization."""
+
+    def test_first_token_uses_full_detokenize(self):
+        """Only the first token goes through llama_detokenize."""
+        llama = _make_llama({1: b" Hello", 2: b" world"})
+        detok = IncrementalDetokenizer(llama)
+
+        assert detok.push(1) + detok.push(2) == "Hello world"
+        llama._detokenize_bytes.assert_called_once_with([1])
+        llama._token_piece.assert_called_once_with(2)
+
+    def test_multibyte_character_is_buffered(self):
+        """Bytes of a character split across tokens are held until complete."""
+        emoji = "😀".encode()
+        llama = _make_llama({1: b"Hi ", 2: emoji[:2], 3: emoji[2:]})
+        detok = IncrementalDetokenizer(llama)
+
+        assert detok.push(1) == "Hi "
+        assert detok.push(2) == ""
+        assert detok.push(3) == "😀"
+        assert detok.flush() == ""
+
+    def test_flush_replaces_incomplete_bytes(self):
+        """flush() returns leftover bytes decoded with replacement."""
+        llama = _make_llama({1: b"ok", 2: "😀".encode()[:2]})
+        detok = IncrementalDetokenizer(llama)
+        detok.push(1)
+        detok.push(2)
+
+        assert detok.flush() == "�"
@@ -500,6 +500,9 @@ class SearchAPI(BaseAPI):
             # Look for alternative retrieval strategy by name
             strategy_to_use = self._get_retrieval_strategy_by_name(retrieval_strategy)
 
+        # Keyword strategies search with the original query text
+        kwargs.setdefault("query_text", query)
+
         # Use retrieval strategy to get results
         retrieval_result = strategy_to_use.retrieve(
             query_embedding=query_embedding,
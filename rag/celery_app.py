@@ -117,6 +117,28 @@ def setup_celery_logging(**kwargs):
     pass
 
 
+# Serve read-only tasks over a request/response endpoint alongside the broker
+@signals.worker_ready.connect
+def start_rpc_endpoint(**kwargs):
+    from core.rpc_server import start_rpc_server
+
+    start_rpc_server(app.tasks)
+
+
+@signals.worker_shutdown.connect
+def stop_rpc_endpoint(**kwargs):
+    from core.rpc_server import stop_rpc_server
+
+    stop_rpc_server()
+
+
+@signals.worker_shutdown.connect
+def close_http_sessions(**kwargs):
+    from utils.http_pool import close_sessions
+
+    close_sessions()
+
+
 def run_worker():
     try:
         # Always use thread pool to avoid:
@@ -8,6 +8,7 @@ import requests
 from core.base import Embedder
 from core.logging import RAGStructLogger
 from core.settings import settings
+from utils.http_pool import cached_health_check, get_session
 
 logger = RAGStructLogger("rag.components.embedders.ollama_embedder.ollama_embedder")
 
@@ -41,9 +42,20 @@ class OllamaEmbedder(Embedder):
         self._consecutive_failures = 0
 
     def validate_config(self) -> bool:
-        """Validate configuration and check Ollama availability."""
+        """Validate configuration and check Ollama availability.
+
+        A successful check is reused for HEALTH_CHECK_TTL_SECONDS.
+        """
+        return cached_health_check(
+            f"ollama:{self.base_url}:{self.model}", self._probe_ollama
+        )
+
+    def _probe_ollama(self) -> bool:
+        """Check that Ollama responds and report whether the model is pulled."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = get_session(self.base_url).get(
+                f"{self.base_url}/api/tags", timeout=5
+            )
             if response.status_code != 200:
                 logger.warning(f"Ollama not available at {self.base_url}")
                 return False
@@ -134,7 +146,7 @@ class OllamaEmbedder(Embedder):
         Raises:
             Any exception from the underlying API
         """
-        response = requests.post(
+        response = get_session(self.base_url).post(
             f"{self.base_url}/api/embeddings",
             json={"model": self.model, "prompt": text},
             timeout=self.timeout,
@@ -10,6 +10,7 @@ import requests  # type: ignore
 from core.base import Embedder
 from core.logging import RAGStructLogger
 from core.settings import settings
+from utils.http_pool import cached_health_check, get_session
 
 logger = RAGStructLogger(
     "rag.components.embedders.universal_embedder.universal_embedder"
@@ -79,7 +80,13 @@ class UniversalEmbedder(Embedder):
 
         Retries with exponential backoff to handle cases where the runtime
         is still loading models (e.g., embedding model on first request).
+        A successful check is reused for HEALTH_CHECK_TTL_SECONDS.
         """
+        return cached_health_check(f"universal:{self.base_url}", self._probe_runtime)
+
+    def _probe_runtime(self) -> bool:
+        """Check /health and /v1/models, retrying with exponential backoff."""
+        session = get_session(self.base_url)
         max_retries = 4
         base_delay = 2.0  # seconds
 
@@ -87,7 +94,7 @@ class UniversalEmbedder(Embedder):
             try:
                 # Check if server is available
                 health_url = self.base_url.replace("/v1", "/health")
-                response = requests.get(health_url, timeout=10)
+                response = session.get(health_url, timeout=10)
                 if response.status_code != 200:
                     logger.warning(f"Universal Runtime not available at {health_url}")
                     if attempt < max_retries - 1:
@@ -102,7 +109,7 @@ class UniversalEmbedder(Embedder):
 
                 # Check if embeddings endpoint is available by listing models
                 models_url = f"{self.base_url}/models"
-                response = requests.get(models_url, timeout=10)
+                response = session.get(models_url, timeout=10)
                 if response.status_code == 200:
                     logger.info(f"Universal Runtime available at {self.base_url}")
                     return True
@@ -146,7 +153,8 @@ class UniversalEmbedder(Embedder):
 
         embeddings = []
 
-        # Process in batches (circuit breaker checked per-text in embed_text)
+        # Process in batches (one request per batch, circuit breaker checked
+        # per batch in embed_batch)
         for i in range(0, len(texts), self.batch_size):
             batch = texts[i : i + self.batch_size]
             batch_embeddings = self._embed_batch(batch)
@@ -155,19 +163,15 @@ class UniversalEmbedder(Embedder):
         return embeddings
 
     def _embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Embed a batch of texts using base class embed_text for each.
+        """Embed a batch of texts in a single request via base class embed_batch.
 
         Raises:
             EmbedderUnavailableError: If Universal Runtime is unavailable and fail_fast is enabled
             CircuitBreakerOpenError: If circuit breaker trips during batch processing
         """
-        embeddings = []
-        for text in texts:
-            # Use base class embed_text which handles circuit breaker,
-            # validation, fail-fast, and error handling
-            embedding = self.embed_text(text)
-            embeddings.append(embedding)
-        return embeddings
+        # Base class embed_batch handles circuit breaker, validation,
+        # fail-fast, and error handling
+        return self.embed_batch(texts)
 
     def get_embedding_dimension(self) -> int:
         """Get the dimension of embeddings produced by this model."""
@@ -213,12 +217,34 @@ class UniversalEmbedder(Embedder):
         Raises:
             Any exception from the underlying API
         """
+        embeddings = self._post_embeddings(text)
+        return embeddings[0] if embeddings else []
+
+    def _call_embedding_api_batch(self, texts: list[str]) -> list[list[float]]:
+        """Call Universal Runtime API once for a list of texts.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            One embedding vector per text, in input order
+
+        Raises:
+            Any exception from the underlying API
+        """
+        return self._post_embeddings(texts)
+
+    def _post_embeddings(self, inputs: str | list[str]) -> list[list[float]]:
+        """POST to the OpenAI-compatible embeddings endpoint.
+
+        Returns the embeddings ordered by their ``index`` field.
+        """
         url = f"{self.base_url}/embeddings"
 
         # Prepare request in OpenAI format
         payload = {
             "model": self.model,
-            "input": text,
+            "input": inputs,
         }
 
         headers = {
@@ -229,7 +255,7 @@ class UniversalEmbedder(Embedder):
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
-        response = requests.post(
+        response = get_session(self.base_url).post(
             url,
             json=payload,
             headers=headers,
@@ -239,9 +265,8 @@ class UniversalEmbedder(Embedder):
         if response.status_code == 200:
             result = response.json()
             data = result.get("data", [])
-            if data and len(data) > 0:
-                return data[0].get("embedding", [])
-            return []
+            data = sorted(data, key=lambda item: item.get("index", 0))
+            return [item.get("embedding", []) for item in data]
         else:
             error_msg = (
                 f"Universal Runtime API error {response.status_code}: {response.text}"
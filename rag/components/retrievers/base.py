@@ -99,15 +99,22 @@ class HybridRetrievalStrategy(RetrievalStrategy):
             self.weights.append(weight)
 
     def combine_results(
-        self, results: list[RetrievalResult], top_k: int
+        self,
+        results: list[RetrievalResult],
+        top_k: int,
+        weights: list[float] | None = None,
     ) -> RetrievalResult:
-        """Combine results from multiple strategies."""
+        """Combine results from multiple strategies.
+
+        ``weights`` overrides the configured weights for this call.
+        """
         # Simple score combination - override in subclasses for more sophisticated merging
         doc_scores: dict[str, float] = {}
         all_docs = {}
+        weights = self.weights if weights is None else weights
 
         for i, result in enumerate(results):
-            weight = self.weights[i] if i < len(self.weights) else 1.0
+            weight = weights[i] if i < len(weights) else 1.0
 
             for doc, score in zip(result.documents, result.scores, strict=False):
                 if doc.id not in doc_scores:
@@ -127,6 +134,6 @@ class HybridRetrievalStrategy(RetrievalStrategy):
             strategy_metadata={
                 "strategy": self.name,
                 "num_sub_strategies": len(self.strategies),
-                "weights": self.weights,
+                "weights": weights,
             },
         )
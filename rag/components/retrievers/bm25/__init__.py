@@ -0,0 +1,12 @@
+"""BM25 Component
+
+Component for BM25 keyword retrieval.
+"""
+
+from .bm25 import BM25Strategy
+
+__all__ = ["BM25Strategy"]
+
+# Component metadata (read from schema.json at runtime)
+COMPONENT_TYPE = "retriever"
+COMPONENT_NAME = "bm25"
@@ -0,0 +1,145 @@
+"""BM25 strategy - keyword search over the store's lexical index."""
+
+from pathlib import Path
+from typing import Any
+
+from components.retrievers.base import RetrievalResult, RetrievalStrategy
+from components.retrievers.metadata_filtered.metadata_filtered import (
+    MetadataFilteredStrategy,
+)
+from core.logging import RAGStructLogger
+
+logger = RAGStructLogger("rag.components.retrievers.bm25.bm25")
+
+
+class BM25Strategy(RetrievalStrategy):
+    """Keyword retrieval ranked with BM25.
+
+    Searches the lexical index that vector stores maintain next to their
+    collection (see ``VectorStore.lexical_search``). The query embedding is
+    ignored; the original query text is used instead.
+
+    Use Cases:
+    - Exact-term queries: error codes, part numbers, identifiers, names
+    - The keyword half of a lexical + dense hybrid search
+
+    Performance: Fast (inverted index lookup)
+    Complexity: Low
+    """
+
+    def __init__(
+        self,
+        name: str = "BM25Strategy",
+        config: dict[str, Any] | None = None,
+        project_dir: Path | None = None,
+    ):
+        super().__init__(name, config, project_dir)
+        config = config or {}
+        self.default_filters = config.get("default_filters", {})
+        self.fallback_multiplier = config.get("fallback_multiplier", 3)
+        # Operator filters ($gt, $ne, ...) are applied after the search
+        self._post_filter = MetadataFilteredStrategy(name=f"{name}_filter")
+
+    def retrieve(
+        self,
+        query_embedding: list[float],
+        vector_store,
+        top_k: int = 5,
+        query_text: str = "",
+        metadata_filter: dict[str, Any] | None = None,
+        **kwargs,
+    ) -> RetrievalResult:
+        """Search the lexical index with the query text.
+
+        Args:
+            query_embedding: Unused; kept for the strategy interface
+            vector_store: The vector store whose lexical index to search
+            top_k: Number of results to return
+            query_text: Original query text
+            metadata_filter: Additional filters to apply
+            **kwargs: Additional arguments
+
+        Returns:
+            RetrievalResult with documents scored relative to the best match
+        """
+        filters = {**self.default_filters, **(metadata_filter or {})}
+        index_filters = {k: v for k, v in filters.items() if not isinstance(v, dict)}
+        post_filters = {k: v for k, v in filters.items() if isinstance(v, dict)}
+
+        documents = []
+        if query_text and hasattr(vector_store, "lexical_search"):
+            search_k = top_k * self.fallback_multiplier if post_filters else top_k
+            documents = vector_store.lexical_search(
+                query_text, top_k=search_k, metadata_filter=index_filters
+            )
+            if post_filters:
+                documents = self._post_filter._filter_documents(
+                    documents, post_filters
+                )[:top_k]
+        elif query_text:
+            logger.warning(
+                f"{type(vector_store).__name__} does not support keyword search"
+            )
+
+        # BM25 scores are unbounded; scale them so they combine with
+        # similarity scores in weighted hybrids
+        best = max((doc.metadata["bm25_score"] for doc in documents), default=0.0)
+        scores = []
+        for doc in documents:
+            score = doc.metadata["bm25_score"] / best if best > 0 else 0.0
+            doc.metadata["similarity_score"] = score
+            scores.append(score)
+
+        return RetrievalResult(
+            documents=documents,
+            scores=scores,
+            strategy_metadata={
+                "strategy": self.name,
+                "version": "1.0.0",
+                "filters_applied": filters,
+                "total_results": len(documents),
+            },
+        )
+
+    def supports_vector_store(self, vector_store_type: str) -> bool:
+        """Supported by stores that keep a lexical index."""
+        return vector_store_type in {
+            "ChromaStore",
+            "FaissStore",
+            "FAISSStore",
+            "QdrantStore",
+        }
+
+    def validate_config(self) -> bool:
+        """Validate strategy configuration."""
+        return isinstance(self.default_filters, dict) and self.fallback_multiplier >= 1
+
+    def get_config_schema(self) -> dict[str, Any]:
+        """Get configuration schema for this strategy."""
+        return {
+            "type": "object",
+            "properties": {
+                "default_filters": {
+                    "type": "object",
+                    "default": {},
+                    "description": "Metadata filters applied to every search",
+                },
+                "fallback_multiplier": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "default": 3,
+                    "description": "Extra results fetched when operator filters are applied after the search",
+                },
+            },
+            "additionalProperties": False,
+        }
+
+    def get_performance_info(self) -> dict[str, Any]:
+        """Get performance characteristics of this strategy."""
+        return {
+            "speed": "fast",
+            "memory_usage": "low",
+            "complexity": "low",
+            "accuracy": "medium",
+            "best_for": ["exact_terms", "identifiers", "hybrid_search"],
+        }
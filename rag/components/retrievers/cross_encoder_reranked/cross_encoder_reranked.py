@@ -8,6 +8,7 @@ import requests
 from components.retrievers.base import RetrievalResult, RetrievalStrategy
 from core.base import Document
 from core.logging import RAGStructLogger
+from utils.http_pool import get_session
 
 logger = RAGStructLogger("rag.components.retrievers.cross_encoder_reranked")
 
@@ -215,7 +216,7 @@ class CrossEncoderRerankedStrategy(RetrievalStrategy):
             }
 
             # Call Universal Runtime
-            response = requests.post(
+            response = get_session(url).post(
                 url,
                 json=payload,
                 timeout=self.timeout,
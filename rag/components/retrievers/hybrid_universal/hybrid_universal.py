@@ -6,6 +6,7 @@ from typing import Any
 from components.retrievers.base import (
     HybridRetrievalStrategy,
     RetrievalResult,
+    RetrievalStrategy,
 )
 from core.base import Document
 
@@ -15,8 +16,13 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
 
     This strategy combines multiple retrieval strategies with configurable weights
     to balance different aspects of search quality. It can mix basic similarity,
-    metadata filtering, multi-query, and reranking approaches to achieve optimal
-    results for complex use cases.
+    metadata filtering, multi-query, reranking and BM25 keyword approaches to
+    achieve optimal results for complex use cases.
+
+    ``alpha`` (or ``hybrid_alpha`` per request) blends dense and keyword
+    results: the dense sub-strategies share a total weight of alpha and the
+    BM25 ones 1 - alpha, so 0 is keyword-only and 1 is semantic-only. A BM25
+    strategy is added implicitly when none is configured.
 
     Use Cases:
     - Production systems requiring balanced precision and recall
@@ -53,6 +59,9 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         self.diversity_boost = config.get(
             "diversity_boost", 0.0
         )  # Boost for result diversity
+        self.alpha = config.get("alpha")  # None keeps the configured weights
+        # Counterpart added when alpha is set but only one side is configured
+        self._implicit_strategies: dict[str, RetrievalStrategy] = {}
 
         # Create strategy instances
         self._initialize_strategies(strategies_config)
@@ -67,23 +76,29 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         from components.retrievers.basic_similarity.basic_similarity import (
             BasicSimilarityStrategy,
         )
+        from components.retrievers.bm25.bm25 import BM25Strategy
+        from components.retrievers.cross_encoder_reranked.cross_encoder_reranked import (
+            CrossEncoderRerankedStrategy,
+        )
         from components.retrievers.metadata_filtered.metadata_filtered import (
             MetadataFilteredStrategy,
         )
         from components.retrievers.multi_query.multi_query import MultiQueryStrategy
-        from components.retrievers.reranked.reranked import RerankedStrategy
 
         # Map strategy types to classes
         strategy_classes = {
             "BasicSimilarityStrategy": BasicSimilarityStrategy,
+            "BM25Strategy": BM25Strategy,
+            "CrossEncoderRerankedStrategy": CrossEncoderRerankedStrategy,
             "MetadataFilteredStrategy": MetadataFilteredStrategy,
             "MultiQueryStrategy": MultiQueryStrategy,
-            "RerankedStrategy": RerankedStrategy,
+            "RerankedStrategy": CrossEncoderRerankedStrategy,
             # Aliases for convenience
             "basic": BasicSimilarityStrategy,
+            "bm25": BM25Strategy,
             "filtered": MetadataFilteredStrategy,
             "multi_query": MultiQueryStrategy,
-            "reranked": RerankedStrategy,
+            "reranked": CrossEncoderRerankedStrategy,
         }
 
         for strategy_config in strategies_config:
@@ -109,11 +124,18 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
             query_embedding: The embedded query vector
             vector_store: The vector store to search
             top_k: Number of final results to return
-            **kwargs: Additional arguments passed to sub-strategies
+            **kwargs: Additional arguments passed to sub-strategies;
+                ``hybrid_alpha`` overrides the configured alpha
 
         Returns:
             RetrievalResult with combined and weighted documents
         """
+        alpha = kwargs.pop("hybrid_alpha", None)
+        if alpha is None:
+            alpha = self.alpha
+        elif not 0 <= alpha <= 1:
+            raise ValueError(f"hybrid_alpha must be between 0 and 1, got {alpha}")
+
         if not self.strategies:
             # Fallback to basic strategy if no strategies configured
             from components.retrievers.basic_similarity.basic_similarity import (
@@ -127,15 +149,17 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
 
         # Get results from all strategies
         results = []
+        weights = []
         strategy_performances: dict[str, dict[str, Any]] = {}
 
-        for strategy in self.strategies:
+        for strategy, weight in self._weighted_strategies(alpha):
             try:
                 # Get more results from each strategy for better combination
                 result = strategy.retrieve(
                     query_embedding, vector_store, top_k * 2, **kwargs
                 )
                 results.append(result)
+                weights.append(weight)
 
                 # Track strategy performance
                 strategy_performances[strategy.name] = {
@@ -170,17 +194,18 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
 
         # Combine results using the specified method
         if self.combination_method == "rank_fusion":
-            combined_result = self._rank_fusion_combine(results, top_k)
+            combined_result = self._rank_fusion_combine(results, top_k, weights)
         else:
             # Default to weighted average
-            combined_result = self.combine_results(results, top_k)
+            combined_result = self.combine_results(results, top_k, weights)
 
         # Add hybrid-specific metadata
         combined_result.strategy_metadata.update(
             {
                 "version": "1.0.0",
                 "combination_method": self.combination_method,
-                "num_strategies": len(self.strategies),
+                "num_strategies": len(results),
+                "hybrid_alpha": alpha,
                 "strategy_performances": strategy_performances,
                 "normalize_scores": self.normalize_scores,
                 "diversity_boost": self.diversity_boost,
@@ -189,8 +214,56 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
 
         return combined_result
 
+    def _weighted_strategies(
+        self, alpha: float | None
+    ) -> list[tuple[RetrievalStrategy, float]]:
+        """Pair each sub-strategy with its weight for this search.
+
+        Without alpha the configured weights are used. With alpha the dense
+        strategies are scaled to a total weight of alpha and the BM25 ones to
+        1 - alpha; strategies left with no weight are not run.
+        """
+        from components.retrievers.basic_similarity.basic_similarity import (
+            BasicSimilarityStrategy,
+        )
+        from components.retrievers.bm25.bm25 import BM25Strategy
+
+        pairs = [
+            (strategy, self.weights[i] if i < len(self.weights) else 1.0)
+            for i, strategy in enumerate(self.strategies)
+        ]
+        if alpha is None:
+            return pairs
+
+        lexical = [(s, w) for s, w in pairs if isinstance(s, BM25Strategy)]
+        dense = [(s, w) for s, w in pairs if not isinstance(s, BM25Strategy)]
+        if not lexical:
+            lexical = [(self._implicit_strategy(BM25Strategy), 1.0)]
+        if not dense:
+            dense = [(self._implicit_strategy(BasicSimilarityStrategy), 1.0)]
+
+        def scale(group, total):
+            group_weight = sum(w for _, w in group)
+            return [
+                (s, total * w / group_weight if group_weight else total / len(group))
+                for s, w in group
+            ]
+
+        return [
+            (s, w) for s, w in scale(dense, alpha) + scale(lexical, 1 - alpha) if w > 0
+        ]
+
+    def _implicit_strategy(self, strategy_class: type) -> RetrievalStrategy:
+        name = strategy_class.__name__
+        if name not in self._implicit_strategies:
+            self._implicit_strategies[name] = strategy_class(name=f"{self.name}_{name}")
+        return self._implicit_strategies[name]
+
     def _rank_fusion_combine(
-        self, results: list[RetrievalResult], top_k: int
+        self,
+        results: list[RetrievalResult],
+        top_k: int,
+        weights: list[float] | None = None,
     ) -> RetrievalResult:
         """Combine results using reciprocal rank fusion.
 
@@ -201,17 +274,20 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         Args:
             results: List of RetrievalResult objects from different strategies
             top_k: Number of final results to return
+            weights: Per-result weights; defaults to the configured weights
 
         Returns:
             Combined RetrievalResult
         """
         from collections import defaultdict
 
+        weights = self.weights if weights is None else weights
+
         doc_fusion_scores: defaultdict[str, float] = defaultdict(float)
         doc_objects: dict[str, Document] = {}
 
         for i, result in enumerate(results):
-            strategy_weight = self.weights[i] if i < len(self.weights) else 1.0
+            strategy_weight = weights[i] if i < len(weights) else 1.0
 
             for rank, doc in enumerate(result.documents):
                 doc_id = doc.id or f"doc_{hash(doc.content[:100])}"
@@ -316,6 +392,9 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         if not (0 <= self.diversity_boost <= 1):
             return False
 
+        if self.alpha is not None and not (0 <= self.alpha <= 1):
+            return False
+
         # Validate all sub-strategies
         return all(strategy.validate_config() for strategy in self.strategies)
 
@@ -342,6 +421,13 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
                     "default": 0.0,
                     "description": "Boost factor for result diversity (reduces redundancy)",
                 },
+                "alpha": {
+                    "type": ["number", "null"],
+                    "minimum": 0,
+                    "maximum": 1,
+                    "default": None,
+                    "description": "Dense vs keyword blend: 0 = keyword-only, 1 = semantic-only",
+                },
                 "strategies": {
                     "type": "array",
                     "minItems": 1,
@@ -352,10 +438,13 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
                                 "type": "string",
                                 "enum": [
                                     "BasicSimilarityStrategy",
+                                    "BM25Strategy",
+                                    "CrossEncoderRerankedStrategy",
                                     "MetadataFilteredStrategy",
                                     "MultiQueryStrategy",
                                     "RerankedStrategy",
                                     "basic",
+                                    "bm25",
                                     "filtered",
                                     "multi_query",
                                     "reranked",
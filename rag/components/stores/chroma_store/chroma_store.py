@@ -10,7 +10,7 @@ import chromadb
 
 from core.base import Document, VectorStore
 from core.logging import RAGStructLogger
-from utils.hash_utils import DeduplicationTracker
+from utils.dedup_index import HASH_KINDS, PersistentDedupIndex
 
 logger = RAGStructLogger("rag.components.stores.chroma_store.chroma_store")
 
@@ -84,11 +84,25 @@ class ChromaStore(VectorStore):
 
         self._setup_collection()
 
-        # Initialize deduplication tracker
+        # Hash index stored alongside the collection, so duplicates are still
+        # recognised after the store is recreated or the worker restarts
         self.deduplication_enabled = config.get("enable_deduplication", True)
-        self.dedup_tracker = (
-            DeduplicationTracker() if self.deduplication_enabled else None
+        self.dedup_index = (
+            self._open_dedup_index() if self.deduplication_enabled else None
         )
+        self.lexical_index = self.open_lexical_index(self.collection_name)
+
+    def _open_dedup_index(self) -> PersistentDedupIndex | None:
+        """Open the persistent hash index for this collection."""
+        path = Path(self.persist_directory) / f"{self.collection_name}.dedup.sqlite3"
+        try:
+            return PersistentDedupIndex(path)
+        except Exception as e:
+            logger.warning(
+                f"Could not open dedup index at {path}, "
+                f"falling back to ID-only deduplication: {e}"
+            )
+            return None
 
     @classmethod
     def _get_or_create_client(
@@ -201,51 +215,17 @@ class ChromaStore(VectorStore):
             documents_content = []
             skipped_duplicates = 0
 
+            candidates = []
             for doc in documents:
                 if not doc.embeddings:
                     logger.warning(f"Document {doc.id} has no embeddings, skipping")
                     continue
+                candidates.append(doc)
 
-                # Check for duplicates if deduplication is enabled
-                if self.deduplication_enabled and self.dedup_tracker and doc.metadata:
-                    document_hash = doc.metadata.get("document_hash")
-                    chunk_hash = doc.metadata.get("chunk_hash")
-                    source_hash = doc.metadata.get("source_hash")
-
-                    # Check if this document or chunk already exists
-                    is_duplicate_doc = (
-                        document_hash
-                        and self.dedup_tracker.is_duplicate_document(document_hash)
-                    )
-                    is_duplicate_chunk = (
-                        chunk_hash and self.dedup_tracker.is_duplicate_chunk(chunk_hash)
-                    )
-                    is_duplicate_source = (
-                        source_hash
-                        and self.dedup_tracker.is_duplicate_source(source_hash)
-                    )
-
-                    if is_duplicate_doc or is_duplicate_chunk or is_duplicate_source:
-                        logger.debug(f"Skipping duplicate document {doc.id}")
-                        skipped_duplicates += 1
-                        continue
-
-                    # Check if document already exists in ChromaDB by ID
-                    if self._document_exists(doc.id):
-                        logger.debug(
-                            f"Document {doc.id} already exists in collection, skipping"
-                        )
-                        skipped_duplicates += 1
-                        continue
-
-                    # Register in dedup tracker
-                    if document_hash:
-                        self.dedup_tracker.register_document(
-                            document_hash, doc.id, source_hash or ""
-                        )
-                    if chunk_hash:
-                        self.dedup_tracker.register_chunk(chunk_hash, doc.id)
+            if self.deduplication_enabled:
+                candidates, skipped_duplicates = self._filter_duplicates(candidates)
 
+            for doc in candidates:
                 ids.append(doc.id or f"doc_{len(ids)}")
                 embeddings.append(doc.embeddings)
 
@@ -330,6 +310,11 @@ class ChromaStore(VectorStore):
                 documents=documents_content,
             )
 
+            if self.dedup_index:
+                self._register_hashes(candidates, set(ids))
+            stored_ids = set(ids)
+            self._index_lexical([doc for doc in candidates if doc.id in stored_ids])
+
             if skipped_duplicates > 0:
                 logger.info(
                     f"Added {len(ids)} documents, skipped {skipped_duplicates} duplicates"
@@ -454,6 +439,9 @@ class ChromaStore(VectorStore):
         try:
             self.client.delete_collection(name=self.collection_name)
             logger.info(f"Deleted collection: {self.collection_name}")
+            if self.dedup_index:
+                self.dedup_index.clear()
+            self._unindex_lexical()
             # Recreate collection for continued use
             self._setup_collection()
             return True
@@ -524,19 +512,81 @@ class ChromaStore(VectorStore):
                 return 0
 
             self.collection.delete(ids=doc_ids)
+            if self.dedup_index:
+                self.dedup_index.remove_documents(doc_ids)
+            self._unindex_lexical(doc_ids)
             logger.info(f"Deleted {len(doc_ids)} documents from ChromaDB")
             return len(doc_ids)
         except Exception as e:
             logger.error(f"Failed to delete documents: {e}")
             raise
 
-    def _document_exists(self, doc_id: str) -> bool:
-        """Check if a document with the given ID already exists."""
+    def get_existing_ids(self, doc_ids: list[str]) -> set[str]:
+        """Return which of the given IDs are in the collection, in one lookup."""
+        unique_ids = list(dict.fromkeys(i for i in doc_ids if i))
+        if not unique_ids:
+            return set()
         try:
-            results = self.collection.get(ids=[doc_id], include=[])
-            return bool(results and results["ids"] and doc_id in results["ids"])
+            results = self.collection.get(ids=unique_ids, include=[])
+            return set(results["ids"]) if results and results["ids"] else set()
         except Exception:
-            return False
+            return set()
+
+    def _filter_duplicates(
+        self, documents: list[Document]
+    ) -> tuple[list[Document], int]:
+        """Drop documents that are already stored or repeated within the batch.
+
+        A document is a duplicate if its ID is in the collection, or if its
+        document, chunk or source hash is indexed for a document that is still
+        in the collection. IDs and indexed hashes are checked with a single
+        collection lookup for the whole batch.
+
+        Returns:
+            Tuple of (documents to add, number of skipped duplicates)
+        """
+        doc_hashes = [
+            {kind: (doc.metadata or {}).get(f"{kind}_hash") for kind in HASH_KINDS}
+            for doc in documents
+        ]
+        indexed: dict[str, dict[str, str]] = {kind: {} for kind in HASH_KINDS}
+        if self.dedup_index:
+            for kind in HASH_KINDS:
+                indexed[kind] = self.dedup_index.lookup(
+                    kind, (hashes[kind] for hashes in doc_hashes)
+                )
+
+        existing = self.get_existing_ids(
+            [doc.id for doc in documents]
+            + [doc_id for by_hash in indexed.values() for doc_id in by_hash.values()]
+        )
+
+        kept: list[Document] = []
+        seen: dict[str, set[str]] = {kind: set() for kind in HASH_KINDS}
+        for doc, hashes in zip(documents, doc_hashes, strict=True):
+            is_duplicate = doc.id in existing or any(
+                value and (value in seen[kind] or indexed[kind].get(value) in existing)
+                for kind, value in hashes.items()
+            )
+            if is_duplicate:
+                logger.debug(f"Skipping duplicate document {doc.id}")
+                continue
+            for kind, value in hashes.items():
+                if value:
+                    seen[kind].add(value)
+            kept.append(doc)
+
+        return kept, len(documents) - len(kept)
+
+    def _register_hashes(self, documents: list[Document], stored_ids: set[str]):
+        """Record the hashes of newly stored documents in the dedup index."""
+        self.dedup_index.register(
+            (kind, value, doc.id)
+            for doc in documents
+            if doc.id in stored_ids and doc.metadata
+            for kind in HASH_KINDS
+            if (value := doc.metadata.get(f"{kind}_hash"))
+        )
 
     def get_collection_info(self) -> dict[str, Any]:
         """Get information about the collection."""
@@ -3,9 +3,9 @@
 Component for faiss store.
 """
 
-from .faiss_store import FaissStore
+from .faiss_store import FAISSStore, FaissStore
 
-__all__ = ["FaissStore"]
+__all__ = ["FaissStore", "FAISSStore"]
 
 # Component metadata (read from schema.json at runtime)
 COMPONENT_TYPE = "store"
@@ -0,0 +1,736 @@
+"""FAISS vector store implementation.
+
+Vectors live in a FAISS index file; document IDs, content and metadata live
+in a SQLite sidecar keyed by the int64 ID the vector has in the index:
+
+    <persist_directory>/<collection_name>/
+        index.faiss       IVF index, or an IDMap2 over a Flat/HNSW/LSH index
+        metadata.sqlite3  faiss_id -> doc_id, content, source, metadata
+
+Searches use a memory-mapped, read-only view of the index file
+(IO_FLAG_MMAP), so every worker process shares the page-cached index instead
+of loading its own copy. Writes go to an in-memory copy of the index that is
+written back atomically, at most once per FLUSH_INTERVAL_SECONDS. Rows whose
+vectors have not been written yet are marked unpersisted, so vectors lost in
+a crash before the flush are re-ingested instead of being reported as
+existing.
+
+Stores opened on the same collection within a process share one writer
+(index, metadata connection and lock), so their flushes never overwrite each
+other's vectors. As with ChromaStore's persistent client, only one process
+should write to a collection at a time.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+from faiss.contrib.inspect_tools import get_invlist
+
+from core.base import Document, VectorStore
+from core.logging import RAGStructLogger
+from utils.sqlite_utils import batched
+
+logger = RAGStructLogger("rag.components.stores.faiss_store.faiss_store")
+
+# Minimum time between two writes of the index file
+FLUSH_INTERVAL_SECONDS = 5.0
+
+# Neighbours per node for HNSW indexes
+HNSW_M = 32
+
+# IVF indexes trained on fewer vectors than nlist are rebuilt once the
+# collection could support this many times as many clusters
+IVF_REBUILD_FACTOR = 2
+
+# Extra candidates fetched per result when filtering search results by metadata
+FILTER_OVERFETCH = 4
+
+_INDEX_TYPES = ("Flat", "IVF", "HNSW", "LSH")
+_METRICS = {
+    "L2": faiss.METRIC_L2,
+    "IP": faiss.METRIC_INNER_PRODUCT,
+    # Cosine is inner product over L2-normalized vectors
+    "Cosine": faiss.METRIC_INNER_PRODUCT,
+}
+
+
+class _FaissCollection:
+    """Writer state shared by every FaissStore open on one collection.
+
+    Stores are created per task, so a worker running tasks in threads has
+    several open on the same collection. If each kept its own in-memory
+    index, every flush would overwrite the vectors the others added.
+    """
+
+    def __init__(self, collection_dir: Path):
+        self.index_path = collection_dir / "index.faiss"
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(
+            str(collection_dir / "metadata.sqlite3"),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._setup_metadata()
+
+        # Writable in-memory index, loaded on the first write
+        self.index: faiss.Index | None = None
+        self.dirty = False
+        # Doc IDs whose vectors are only in the in-memory index so far
+        self.pending_ids: set[str] = set()
+        self.last_flush = 0.0
+        self.flush_timer: threading.Timer | None = None
+
+        # Read-only mmap view of the index file and the file state it maps
+        self.mmap_index: faiss.Index | None = None
+        self.mmap_stamp: tuple[int, int] | None = None
+
+        # Vectors still in the index whose documents were deleted (HNSW
+        # cannot remove vectors); searches fetch that many extra candidates
+        self.tombstones = self.load_tombstones()
+
+    def _setup_metadata(self) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " faiss_id INTEGER PRIMARY KEY,"
+                " doc_id TEXT NOT NULL UNIQUE,"
+                " content TEXT,"
+                " source TEXT,"
+                " metadata TEXT,"
+                " persisted INTEGER NOT NULL DEFAULT 0)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS store_info ("
+                " key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def load_tombstones(self) -> int:
+        row = self.conn.execute(
+            "SELECT value FROM store_info WHERE key = 'tombstones'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def flush(self) -> None:
+        """Write pending index changes to disk."""
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if not self.dirty or self.index is None:
+                return
+
+            tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            faiss.write_index(self.index, str(tmp_path))
+            os.replace(tmp_path, self.index_path)
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE documents SET persisted = 1 WHERE persisted = 0"
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO store_info (key, value)"
+                    " VALUES ('tombstones', ?)",
+                    (str(self.tombstones),),
+                )
+
+            self.pending_ids.clear()
+            self.dirty = False
+            self.last_flush = time.monotonic()
+            logger.debug(
+                f"Flushed FAISS index with {self.index.ntotal} vectors "
+                f"to {self.index_path}"
+            )
+
+    def schedule_flush(self) -> None:
+        """Flush now, or once FLUSH_INTERVAL_SECONDS passed since the last one."""
+        self.dirty = True
+        elapsed = time.monotonic() - self.last_flush
+        if elapsed >= FLUSH_INTERVAL_SECONDS:
+            self.flush()
+        elif self.flush_timer is None:
+            self.flush_timer = threading.Timer(
+                FLUSH_INTERVAL_SECONDS - elapsed, self.flush
+            )
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+
+
+class FaissStore(VectorStore):
+    """FAISS vector store with memory-mapped indexes and SQLite metadata."""
+
+    # Class-level writer cache, so stores on one collection share its state.
+    # Entries go away with the last store using them (pending timers keep
+    # unflushed ones alive).
+    _collection_cache: "weakref.WeakValueDictionary[str, _FaissCollection]" = (
+        weakref.WeakValueDictionary()
+    )
+    _collection_cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str = "FaissStore",
+        config: dict[str, Any] | None = None,
+        project_dir: Path | None = None,
+    ):
+        super().__init__(name, config, project_dir)  # type: ignore
+        config = config or {}
+        self.collection_name = config.get("collection_name", "documents")
+        self.dimension = config.get("dimension") or config.get("embedding_dimension")
+        self.index_type = config.get("index_type", "Flat")
+        self.metric = config.get("metric", "L2")
+        self.nlist = max(int(config.get("nlist", 100)), 1)
+        self.nprobe = max(int(config.get("nprobe", 10)), 1)
+
+        if self.index_type not in _INDEX_TYPES:
+            logger.warning(f"Invalid index type '{self.index_type}', using 'Flat'")
+            self.index_type = "Flat"
+        if self.metric not in _METRICS:
+            logger.warning(f"Invalid metric '{self.metric}', using 'L2'")
+            self.metric = "L2"
+        if config.get("use_gpu"):
+            logger.warning("GPU indexes are not supported yet, using CPU")
+
+        self.collection_dir = Path(self.persist_directory) / self.collection_name
+        self.collection_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.collection_dir / "index.faiss"
+
+        self._state = self._get_or_create_collection(self.collection_dir)
+        self._lock = self._state.lock
+        self._conn = self._state.conn
+
+        self.lexical_index = self.open_lexical_index(self.collection_name)
+
+    @classmethod
+    def _get_or_create_collection(cls, collection_dir: Path) -> _FaissCollection:
+        """Get the shared writer state for a collection directory."""
+        key = str(collection_dir.resolve())
+        with cls._collection_cache_lock:
+            state = cls._collection_cache.get(key)
+            if state is None:
+                state = _FaissCollection(collection_dir)
+                cls._collection_cache[key] = state
+            return state
+
+    @classmethod
+    def clear_collection_cache(cls) -> None:
+        """Forget shared writer state; stores opened later start fresh.
+
+        Stores that are already open keep using (and flushing) their state.
+        """
+        with cls._collection_cache_lock:
+            cls._collection_cache.clear()
+
+    # ------------------------------------------------------------------
+    # Index lifecycle
+    # ------------------------------------------------------------------
+
+    def _create_index(self, vectors: np.ndarray) -> faiss.Index:
+        """Create an empty index for vectors shaped like ``vectors``."""
+        dimension = vectors.shape[1]
+        metric = _METRICS[self.metric]
+
+        if self.index_type == "IVF":
+            # k-means needs at least one training vector per cluster
+            nlist = min(self.nlist, len(vectors))
+            if nlist < self.nlist:
+                logger.warning(
+                    f"Training IVF index on {len(vectors)} vectors, "
+                    f"reducing nlist from {self.nlist} to {nlist}"
+                )
+            index = faiss.index_factory(dimension, f"IVF{nlist},Flat", metric)
+            index.train(vectors)
+        else:
+            spec = {"Flat": "Flat", "HNSW": f"HNSW{HNSW_M}", "LSH": "LSH"}
+            index = faiss.index_factory(
+                dimension, f"IDMap2,{spec[self.index_type]}", metric
+            )
+
+        logger.info(
+            f"Created FAISS {self.index_type} index with dimension {dimension} "
+            f"and {self.metric} metric"
+        )
+        return index
+
+    def _configure(self, index: faiss.Index) -> faiss.Index:
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = self.nprobe
+        return index
+
+    def _get_write_index(self, vectors: np.ndarray | None = None) -> faiss.Index | None:
+        """Load the index into memory for writing, creating it if needed."""
+        state = self._state
+        if state.index is None:
+            if self.index_path.exists():
+                state.index = self._configure(faiss.read_index(str(self.index_path)))
+            elif vectors is not None:
+                state.index = self._configure(self._create_index(vectors))
+            else:
+                return None
+            # Searches in this process now use the up-to-date in-memory index
+            state.mmap_index = None
+            state.mmap_stamp = None
+        return state.index
+
+    def _maybe_rebuild_ivf(self, index: faiss.Index) -> faiss.Index:
+        """Retrain an IVF index whose nlist was limited by a small first batch."""
+        ivf = faiss.extract_index_ivf(index) if self.index_type == "IVF" else None
+        if ivf is None or ivf.nlist >= self.nlist:
+            return index
+        if min(self.nlist, index.ntotal) < IVF_REBUILD_FACTOR * ivf.nlist:
+            return index
+
+        ids, vectors = [], []
+        for list_no in range(ivf.nlist):
+            list_ids, codes = get_invlist(ivf.invlists, list_no)
+            ids.append(list_ids)
+            vectors.append(codes.view(np.float32).reshape(len(list_ids), ivf.d))
+        vectors = np.ascontiguousarray(np.concatenate(vectors))
+
+        logger.info(f"Rebuilding IVF index on {len(vectors)} vectors")
+        rebuilt = self._configure(self._create_index(vectors))
+        rebuilt.add_with_ids(vectors, np.concatenate(ids))
+        self._state.index = rebuilt
+        return rebuilt
+
+    def _get_mmap_index(self) -> faiss.Index | None:
+        """Map the index file read-only, remapping it after it was rewritten."""
+        try:
+            stat = self.index_path.stat()
+        except FileNotFoundError:
+            return None
+
+        state = self._state
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if state.mmap_index is None or stamp != state.mmap_stamp:
+            try:
+                index = faiss.read_index(
+                    str(self.index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+            except RuntimeError as e:
+                logger.warning(f"Could not memory-map FAISS index, loading it: {e}")
+                index = faiss.read_index(str(self.index_path))
+            state.mmap_index = self._configure(index)
+            state.mmap_stamp = stamp
+            state.tombstones = state.load_tombstones()
+        return state.mmap_index
+
+    def flush(self) -> None:
+        """Write pending index changes to disk."""
+        self._state.flush()
+
+    def _as_matrix(self, embeddings: list[list[float]]) -> np.ndarray:
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError(f"Expected a list of vectors, got shape {vectors.shape}")
+        if self.metric == "Cosine":
+            faiss.normalize_L2(vectors)
+        return vectors
+
+    # ------------------------------------------------------------------
+    # VectorStore API
+    # ------------------------------------------------------------------
+
+    def add_documents(self, documents: list[Document]) -> bool:
+        """Add documents in one batch, skipping IDs that are already stored."""
+        try:
+            if not documents:
+                return True
+
+            candidates: dict[str, Document] = {}
+            for doc in documents:
+                if not doc.embeddings:
+                    logger.warning(f"Document {doc.id} has no embeddings, skipping")
+                    continue
+                candidates.setdefault(doc.id or uuid.uuid4().hex, doc)
+
+            with self._lock:
+                existing = self.get_existing_ids(list(candidates))
+                new_docs = {
+                    doc_id: doc
+                    for doc_id, doc in candidates.items()
+                    if doc_id not in existing
+                }
+                skipped = len(documents) - len(new_docs)
+                if not new_docs:
+                    logger.warning(
+                        "No valid documents with embeddings to add "
+                        "(all may be duplicates)"
+                    )
+                    return []
+
+                ids = list(new_docs)
+                vectors = self._as_matrix([doc.embeddings for doc in new_docs.values()])
+                if self.dimension and vectors.shape[1] != self.dimension:
+                    raise ValueError(
+                        f"Embedding dimension {vectors.shape[1]} does not match "
+                        f"configured dimension {self.dimension}"
+                    )
+                index = self._get_write_index(vectors)
+
+                with self._conn:
+                    # Rows left unpersisted by a writer that crashed before
+                    # flushing; their vectors never reached the index file
+                    for batch in batched(ids):
+                        placeholders = ",".join("?" * len(batch))
+                        self._conn.execute(
+                            f"DELETE FROM documents"
+                            f" WHERE persisted = 0 AND doc_id IN ({placeholders})",
+                            batch,
+                        )
+                    (max_id,) = self._conn.execute(
+                        "SELECT COALESCE(MAX(faiss_id), -1) FROM documents"
+                    ).fetchone()
+                    faiss_ids = np.arange(
+                        max_id + 1, max_id + 1 + len(ids), dtype=np.int64
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO documents"
+                        " (faiss_id, doc_id, content, source, metadata)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (
+                                int(faiss_id),
+                                doc_id,
+                                doc.content,
+                                doc.source,
+                                json.dumps(doc.metadata or {}, default=str),
+                            )
+                            for faiss_id, (doc_id, doc) in zip(
+                                faiss_ids, new_docs.items(), strict=True
+                            )
+                        ],
+                    )
+                    index.add_with_ids(vectors, faiss_ids)
+                self._maybe_rebuild_ivf(index)
+
+                self._state.pending_ids.update(ids)
+                self._state.schedule_flush()
+            self._index_lexical(list(new_docs.values()))
+
+            if skipped > 0:
+                logger.info(f"Added {len(ids)} documents, skipped {skipped} duplicates")
+            else:
+                logger.info(f"Added {len(ids)} documents to FAISS index")
+            return ids
+
+        except Exception as e:
+            logger.error(f"Failed to add documents to FAISS: {e}")
+            return False
+
+    def search(
+        self,
+        query: str = None,
+        top_k: int = 10,
+        query_embedding: list[float] | None = None,
+        where: dict[str, Any] | None = None,
+        **kwargs,
+    ) -> list[Document]:
+        """Search for similar documents."""
+        try:
+            if query_embedding is None:
+                logger.warning("No query embedding provided for search")
+                return []
+            return self.search_batch([query_embedding], top_k=top_k, where=where)[0]
+        except Exception as e:
+            logger.error(f"Failed to search FAISS: {e}")
+            return []
+
+    def search_batch(
+        self,
+        query_embeddings: list[list[float]],
+        top_k: int = 10,
+        where: dict[str, Any] | None = None,
+    ) -> list[list[Document]]:
+        """Search for several query vectors with a single index call.
+
+        Args:
+            query_embeddings: Query vectors
+            top_k: Results per query
+            where: Optional metadata equality filter, applied to the candidates
+
+        Returns:
+            One result list per query, best match first
+        """
+        if not query_embeddings:
+            return []
+        queries = self._as_matrix(query_embeddings)
+
+        with self._lock:
+            writable = index = self._state.index
+            if index is None:
+                index = self._get_mmap_index()
+            if index is None or index.ntotal == 0:
+                return [[] for _ in query_embeddings]
+            fetch = top_k * (FILTER_OVERFETCH if where else 1) + self._state.tombstones
+            fetch = min(index.ntotal, fetch)
+            if index is writable:
+                # The writable index may be modified concurrently
+                scores, faiss_ids = index.search(queries, fetch)
+
+        if index is not writable:
+            scores, faiss_ids = index.search(queries, fetch)
+
+        rows = self._fetch_rows({int(i) for i in faiss_ids.flatten() if i >= 0})
+        results: list[list[Document]] = []
+        for query_scores, query_ids in zip(scores, faiss_ids, strict=True):
+            documents: list[Document] = []
+            for score, faiss_id in zip(query_scores, query_ids, strict=True):
+                row = rows.get(int(faiss_id))
+                # Deleted documents and vectors lost before a flush have no row
+                if row is None:
+                    continue
+                doc = self._row_to_document(row)
+                if where and any(doc.metadata.get(k) != v for k, v in where.items()):
+                    continue
+                doc.metadata["_score"] = float(score)
+                doc.metadata["similarity_score"] = self._similarity(float(score))
+                documents.append(doc)
+                if len(documents) == top_k:
+                    break
+            results.append(documents)
+        return results
+
+    def _similarity(self, score: float) -> float:
+        """Map a raw FAISS score to a 0..1 similarity, as ChromaStore does."""
+        if self.metric == "L2":
+            # Squared L2 distance: 0 = identical
+            return 1.0 / (1.0 + score / 100.0)
+        # Inner product / cosine similarity in [-1, 1] for normalized vectors
+        return max(0.0, min(1.0, (1.0 + score) / 2.0))
+
+    def _fetch_rows(self, faiss_ids: set[int]) -> dict[int, tuple]:
+        rows: dict[int, tuple] = {}
+        for batch in batched(list(faiss_ids)):
+            placeholders = ",".join("?" * len(batch))
+            for row in self._conn.execute(
+                f"SELECT faiss_id, doc_id, content, source, metadata FROM documents"
+                f" WHERE faiss_id IN ({placeholders})",
+                batch,
+            ):
+                rows[row[0]] = row
+        return rows
+
+    def _row_to_document(self, row: tuple, include_content: bool = True) -> Document:
+        _, doc_id, content, source, metadata_json = row
+        metadata = json.loads(metadata_json) if metadata_json else {}
+        source = (
+            metadata.get("file_path")
+            or source
+            or metadata.get("source")
+            or metadata.get("file_name")
+        )
+        return Document(
+            id=doc_id,
+            content=(content or "") if include_content else "",
+            metadata=metadata,
+            source=source,
+        )
+
+    def get_existing_ids(self, doc_ids: list[str]) -> set[str]:
+        """Return which of the given IDs are stored, in one metadata lookup."""
+        unique_ids = list(dict.fromkeys(i for i in doc_ids if i))
+        existing: set[str] = set()
+        with self._lock:
+            for batch in batched(unique_ids):
+                placeholders = ",".join("?" * len(batch))
+                for doc_id, persisted in self._conn.execute(
+                    f"SELECT doc_id, persisted FROM documents"
+                    f" WHERE doc_id IN ({placeholders})",
+                    batch,
+                ):
+                    if persisted or doc_id in self._state.pending_ids:
+                        existing.add(doc_id)
+        return existing
+
+    def get_document(self, doc_id: str) -> Document | None:
+        """Get a specific document by ID."""
+        row = self._conn.execute(
+            "SELECT faiss_id, doc_id, content, source, metadata FROM documents"
+            " WHERE doc_id = ?",
+            (doc_id,),
+        ).fetchone()
+        return self._row_to_document(row) if row else None
+
+    def get_documents_by_metadata(
+        self, metadata_filter: dict[str, Any]
+    ) -> list[Document]:
+        """Get documents matching a metadata filter.
+
+        Args:
+            metadata_filter: Key-value pairs to match against document metadata.
+
+        Returns:
+            List of matching documents.
+        """
+        try:
+            clauses = " AND ".join(
+                "json_extract(metadata, ?) = ?" for _ in metadata_filter
+            )
+            params: list[Any] = []
+            for key, value in metadata_filter.items():
+                params.extend([f'$."{key}"', value])
+            rows = self._conn.execute(
+                "SELECT faiss_id, doc_id, content, source, metadata FROM documents"
+                + (f" WHERE {clauses}" if clauses else ""),
+                params,
+            ).fetchall()
+            return [self._row_to_document(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to get documents by metadata: {e}")
+            return []
+
+    def delete_documents(self, doc_ids: list[str]) -> int:
+        """Delete documents by their IDs.
+
+        Args:
+            doc_ids: List of document IDs to delete.
+
+        Returns:
+            Number of documents deleted.
+        """
+        try:
+            if not doc_ids:
+                return 0
+
+            with self._lock:
+                rows: list[tuple[int, str]] = []
+                for batch in batched(list(dict.fromkeys(doc_ids))):
+                    placeholders = ",".join("?" * len(batch))
+                    rows.extend(
+                        self._conn.execute(
+                            f"SELECT faiss_id, doc_id FROM documents"
+                            f" WHERE doc_id IN ({placeholders})",
+                            batch,
+                        )
+                    )
+                if not rows:
+                    return 0
+
+                faiss_ids = np.array([faiss_id for faiss_id, _ in rows], dtype=np.int64)
+                index = self._get_write_index()
+                with self._conn:
+                    for batch in batched([doc_id for _, doc_id in rows]):
+                        placeholders = ",".join("?" * len(batch))
+                        self._conn.execute(
+                            f"DELETE FROM documents WHERE doc_id IN ({placeholders})",
+                            batch,
+                        )
+
+                if index is not None:
+                    try:
+                        removed = index.remove_ids(faiss_ids)
+                    except RuntimeError:
+                        # HNSW cannot remove vectors; without their rows they
+                        # are skipped by searches
+                        removed = 0
+                    self._state.tombstones += len(faiss_ids) - removed
+                    self._state.schedule_flush()
+                self._state.pending_ids.difference_update(doc_id for _, doc_id in rows)
+            self._unindex_lexical([doc_id for _, doc_id in rows])
+
+            logger.info(f"Deleted {len(rows)} documents from FAISS")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            raise
+
+    def delete_collection(self) -> bool:
+        """Delete the collection."""
+        try:
+            with self._lock:
+                state = self._state
+                if state.flush_timer is not None:
+                    state.flush_timer.cancel()
+                    state.flush_timer = None
+                state.index = None
+                state.mmap_index = None
+                state.mmap_stamp = None
+                state.dirty = False
+                state.pending_ids.clear()
+                state.tombstones = 0
+                self.index_path.unlink(missing_ok=True)
+                with self._conn:
+                    self._conn.execute("DELETE FROM documents")
+                    self._conn.execute("DELETE FROM store_info")
+            self._unindex_lexical()
+            logger.info(f"Deleted collection: {self.collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete collection: {e}")
+            return False
+
+    def get_collection_info(self) -> dict[str, Any]:
+        """Get information about the collection."""
+        try:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+            return {
+                "name": self.collection_name,
+                "count": count,
+                "document_count": count,
+                "persist_directory": self.persist_directory,
+                "index_type": self.index_type,
+                "metric": self.metric,
+            }
+        except Exception as e:
+            logger.error(f"Failed to get collection info: {e}")
+            return {"error": str(e)}
+
+    def list_documents(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        include_content: bool = False,
+    ) -> tuple[list[Document], int]:
+        """List documents in the collection with pagination.
+
+        Args:
+            limit: Maximum number of chunks to return
+            offset: Number of chunks to skip
+            include_content: Whether to include document content in results
+
+        Returns:
+            Tuple of (list of Document objects, total count in collection)
+        """
+        try:
+            (total_count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM documents"
+            ).fetchone()
+            rows = self._conn.execute(
+                "SELECT faiss_id, doc_id, content, source, metadata FROM documents"
+                " ORDER BY faiss_id LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+            return [
+                self._row_to_document(row, include_content) for row in rows
+            ], total_count
+        except Exception as e:
+            logger.error(f"Failed to list documents from FAISS: {e}")
+            return [], 0
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get store description."""
+        return (
+            "FAISS vector store with memory-mapped Flat, IVF, HNSW and LSH "
+            "indexes for fast local similarity search."
+        )
+
+
+# Name used by the ``type`` field of database configs
+FAISSStore = FaissStore
+
+
+@atexit.register
+def _flush_open_collections() -> None:
+    for state in list(FaissStore._collection_cache.values()):
+        state.flush()
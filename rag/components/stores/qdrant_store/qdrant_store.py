@@ -1,93 +1,519 @@
-"""Qdrant Vector Store Component - Coming Soon
+"""Qdrant vector store implementation.
 
-This vector store will provide integration with Qdrant, a high-performance
-vector similarity search engine built with Rust.
+Runs against a Qdrant server (``url`` or ``host``/``port``) or, when neither
+is configured, embedded in the project directory through qdrant-client's
+local mode, which needs no server.
 
-Planned Features:
-- Full Qdrant API integration (local and cloud)
-- Advanced filtering and metadata support
-- Quantization and compression options
-- Distributed and replicated collections
-- High-performance search with HNSW indexing
-- Multi-tenant support
+Each document is one point. Qdrant point IDs must be integers or UUIDs, so
+the point ID is a UUID derived from the document ID and the document itself
+is kept in the payload:
 
-Status: Implementation in progress
+    {"doc_id": ..., "content": ..., "source": ..., "metadata": {...}}
+
+Metadata filters are translated into Qdrant filters on ``metadata.<key>`` and
+evaluated inside the index. On a server, payload indexes are created for the
+configured ``payload_indexes`` and for every field the first time it is
+filtered on.
 """
 
+import contextlib
+import threading
+import uuid
 from pathlib import Path
 from typing import Any
 
+from qdrant_client import QdrantClient, models
+
 from core.base import Document, VectorStore
+from core.logging import RAGStructLogger
+
+logger = RAGStructLogger("rag.components.stores.qdrant_store.qdrant_store")
+
+_DISTANCES = {
+    "Cosine": models.Distance.COSINE,
+    "Euclid": models.Distance.EUCLID,
+    "Dot": models.Distance.DOT,
+}
+
+_PAYLOAD_SCHEMAS = {
+    "keyword": models.PayloadSchemaType.KEYWORD,
+    "integer": models.PayloadSchemaType.INTEGER,
+    "float": models.PayloadSchemaType.FLOAT,
+    "bool": models.PayloadSchemaType.BOOL,
+}
+
+_RANGE_OPERATORS = {"$gt": "gt", "$gte": "gte", "$lt": "lt", "$lte": "lte"}
+
+# Namespace for deriving point IDs from document IDs
+_POINT_ID_NAMESPACE = uuid.UUID("5f1c7b52-3a3e-4c36-9d0e-6f2f2b8f6a11")
+
+
+def point_id(doc_id: str) -> str:
+    """Return the Qdrant point ID for a document ID."""
+    return str(uuid.uuid5(_POINT_ID_NAMESPACE, doc_id))
+
+
+def _payload_schema_for(value: Any) -> models.PayloadSchemaType | None:
+    """Infer the payload index type for a filter value."""
+    if isinstance(value, dict):
+        value = next(iter(value.values()), None)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    # bool is a subclass of int, so it has to be checked first
+    if isinstance(value, bool):
+        return models.PayloadSchemaType.BOOL
+    if isinstance(value, int):
+        return models.PayloadSchemaType.INTEGER
+    if isinstance(value, float):
+        return models.PayloadSchemaType.FLOAT
+    if isinstance(value, str):
+        return models.PayloadSchemaType.KEYWORD
+    return None
+
+
+def build_filter(metadata_filter: dict[str, Any] | None) -> models.Filter | None:
+    """Translate a metadata filter into a Qdrant filter.
+
+    Supports the filter format of MetadataFilteredStrategy: plain values match
+    exactly, lists match any of their values, and dicts hold operators
+    (``$ne``, ``$in``, ``$nin``, ``$gt``, ``$gte``, ``$lt``, ``$lte``).
+    Like the strategy's post-filter, only documents that have the key match.
+
+    Raises:
+        ValueError: If the filter uses an unsupported operator or value
+    """
+    if not metadata_filter:
+        return None
+
+    must: list[models.Condition] = []
+    must_not: list[models.Condition] = []
+
+    def _match(key: str, value: Any) -> models.FieldCondition:
+        if isinstance(value, list):
+            return models.FieldCondition(key=key, match=models.MatchAny(any=value))
+        if isinstance(value, float):
+            # MatchValue only supports keywords, integers and booleans
+            return models.FieldCondition(
+                key=key, range=models.Range(gte=value, lte=value)
+            )
+        if isinstance(value, (str, int, bool)):
+            return models.FieldCondition(key=key, match=models.MatchValue(value=value))
+        raise ValueError(f"Unsupported filter value for {key!r}: {value!r}")
+
+    for name, value in metadata_filter.items():
+        key = f"metadata.{name}"
+        if not isinstance(value, dict):
+            must.append(_match(key, value))
+            continue
+
+        ranges: dict[str, Any] = {}
+        for op, operand in value.items():
+            if op == "$in":
+                must.append(_match(key, list(operand)))
+            elif op == "$ne":
+                must_not.append(_match(key, operand))
+            elif op == "$nin":
+                must_not.append(_match(key, list(operand)))
+            elif op in _RANGE_OPERATORS:
+                ranges[_RANGE_OPERATORS[op]] = operand
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        if ranges:
+            must.append(models.FieldCondition(key=key, range=models.Range(**ranges)))
+        if "$ne" in value or "$nin" in value:
+            # must_not alone would also match documents without the key
+            must_not.append(
+                models.IsEmptyCondition(is_empty=models.PayloadField(key=key))
+            )
+
+    return models.Filter(must=must or None, must_not=must_not or None)
 
 
 class QdrantStore(VectorStore):
-    """Qdrant-based vector store for high-performance similarity search.
-
-    This component will integrate with Qdrant to provide enterprise-grade
-    vector search capabilities with advanced filtering and optimization.
+    """Qdrant-based vector store with native filtered search."""
 
-    Status: Coming Soon
-    """
+    # Class-level client cache. Local mode locks its storage directory, so all
+    # stores on one directory must share a client within the process.
+    _client_cache: dict[str, QdrantClient] = {}
+    _client_locks: dict[str, threading.RLock] = {}
+    _client_cache_lock = threading.Lock()
 
     def __init__(
         self,
         name: str = "QdrantStore",
-        config: dict[str, Any] = None,
+        config: dict[str, Any] | None = None,
         project_dir: Path | None = None,
     ):
-        super().__init__(name, config, project_dir)
-
-        # Configuration will include:
-        # - url: Qdrant server URL
-        # - api_key: API key for Qdrant Cloud
-        # - collection_name: Collection to use
-        # - vector_size: Dimension of vectors
-        # - distance: Distance metric (cosine, dot, euclidean)
-        # - hnsw_config: HNSW index configuration
-        # - quantization_config: Quantization settings
-        # - replication_factor: Number of replicas
-
-        # Placeholder for future implementation
-        raise NotImplementedError(
-            "QdrantStore is not yet implemented. "
-            "Coming soon in a future release! "
-            "For now, please use ChromaStore."
+        super().__init__(name, config, project_dir)  # type: ignore
+        config = config or {}
+        self.collection_name = config.get("collection_name", "documents")
+        self.vector_size = config.get("vector_size") or config.get(
+            "embedding_dimension", 768
         )
+        self.distance = config.get("distance", "Cosine")
+        if self.distance not in _DISTANCES:
+            logger.warning(f"Invalid distance '{self.distance}', using 'Cosine'")
+            self.distance = "Cosine"
+        self.on_disk = config.get("on_disk", False)
+        self.batch_size = max(int(config.get("batch_size", 256)), 1)
+        self.quantization = config.get("quantization", "none")
+        self.quantization_always_ram = config.get("quantization_always_ram", True)
+        self.hnsw_m = config.get("hnsw_m")
+        self.hnsw_ef = config.get("hnsw_ef")
+        self.payload_indexes: dict[str, str] = config.get("payload_indexes") or {}
+
+        self.url = config.get("url")
+        self.host = config.get("host")
+        self.is_local = not (self.url or self.host)
+
+        if self.is_local:
+            client_key = f"local://{self.persist_directory}"
+            logger.info(
+                f"Using embedded Qdrant with storage in {self.persist_directory}"
+            )
+            logger.warning(
+                "Embedded Qdrant mode: only one process can open the storage "
+                "directory. For production, configure a Qdrant server url or host."
+            )
+            self.client = self._get_or_create_client(
+                client_key, lambda: QdrantClient(path=self.persist_directory)
+            )
+        else:
+            client_key = self.url or f"http://{self.host}:{config.get('port', 6333)}"
+            logger.info(f"Using Qdrant server at {client_key}")
+            self.client = self._get_or_create_client(
+                client_key,
+                lambda: QdrantClient(
+                    url=self.url,
+                    host=None if self.url else self.host,
+                    port=config.get("port", 6333),
+                    grpc_port=config.get("grpc_port", 6334),
+                    prefer_grpc=config.get("prefer_grpc", False),
+                    api_key=config.get("api_key"),
+                ),
+            )
+        self._client_lock = self._client_locks[client_key]
+
+        # Payload fields that already have an index on the server
+        self._indexed_fields: set[str] = set()
+        self._setup_collection()
+        self.lexical_index = self.open_lexical_index(self.collection_name)
+
+    @classmethod
+    def _get_or_create_client(cls, client_key: str, client_factory) -> QdrantClient:
+        """Get or create a Qdrant client from the cache."""
+        with cls._client_cache_lock:
+            if client_key not in cls._client_cache:
+                logger.info(f"Creating new Qdrant client for: {client_key}")
+                cls._client_cache[client_key] = client_factory()
+                cls._client_locks[client_key] = threading.RLock()
+            return cls._client_cache[client_key]
+
+    @classmethod
+    def clear_client_cache(cls, client_key: str | None = None) -> None:
+        """Close and forget cached clients.
 
-    def add_documents(self, documents: list[Document]) -> bool:
-        """Add documents to Qdrant collection.
+        Args:
+            client_key: Specific client key to remove. If None, clears entire cache.
+        """
+        with cls._client_cache_lock:
+            keys = [client_key] if client_key else list(cls._client_cache)
+            for key in keys:
+                client = cls._client_cache.pop(key, None)
+                cls._client_locks.pop(key, None)
+                if client is not None:
+                    client.close()
+
+    def _guard(self):
+        """Serialize calls on the embedded client, which is not thread-safe."""
+        return self._client_lock if self.is_local else contextlib.nullcontext()
+
+    def validate_config(self) -> bool:
+        """Validate configuration."""
+        try:
+            with self._guard():
+                self.client.get_collections()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to Qdrant: {e}")
+            return False
+
+    def _setup_collection(self) -> None:
+        """Create the collection if needed and its configured payload indexes."""
+        with self._guard():
+            if not self.client.collection_exists(self.collection_name):
+                quantization_config = None
+                if self.quantization == "int8":
+                    quantization_config = models.ScalarQuantization(
+                        scalar=models.ScalarQuantizationConfig(
+                            type=models.ScalarType.INT8,
+                            always_ram=self.quantization_always_ram,
+                        )
+                    )
+                hnsw_config = (
+                    models.HnswConfigDiff(m=self.hnsw_m) if self.hnsw_m else None
+                )
+                self.client.create_collection(
+                    collection_name=self.collection_name,
+                    vectors_config=models.VectorParams(
+                        size=self.vector_size,
+                        distance=_DISTANCES[self.distance],
+                        on_disk=self.on_disk,
+                    ),
+                    hnsw_config=hnsw_config,
+                    quantization_config=quantization_config,
+                )
+            elif not self.is_local:
+                info = self.client.get_collection(self.collection_name)
+                self._indexed_fields = set(info.payload_schema or {})
+
+        for field, schema in self.payload_indexes.items():
+            if schema not in _PAYLOAD_SCHEMAS:
+                logger.warning(f"Invalid payload index type '{schema}' for {field}")
+                continue
+            self._ensure_payload_index(f"metadata.{field}", _PAYLOAD_SCHEMAS[schema])
+
+        logger.info(
+            f"Collection ready: {self.collection_name} with {self.distance} distance"
+        )
 
-        This will insert documents with their embeddings and metadata
-        into Qdrant with proper error handling and batching.
+    def _ensure_payload_index(
+        self, key: str, schema: models.PayloadSchemaType | None
+    ) -> None:
+        # Local mode scans payloads and ignores payload indexes
+        if self.is_local or schema is None or key in self._indexed_fields:
+            return
+        try:
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=key,
+                field_schema=schema,
+            )
+            logger.info(f"Created {schema.value} payload index on {key}")
+        except Exception as e:
+            logger.warning(f"Failed to create payload index on {key}: {e}")
+        self._indexed_fields.add(key)
+
+    def _search_params(self) -> models.SearchParams | None:
+        # Local mode always searches exactly
+        if self.is_local or not self.hnsw_ef:
+            return None
+        return models.SearchParams(hnsw_ef=self.hnsw_ef)
+
+    def _similarity(self, score: float) -> float:
+        """Map a Qdrant score to a 0..1 similarity."""
+        if self.distance == "Euclid":
+            # Euclidean distance: 0 = identical
+            return 1.0 / (1.0 + score)
+        # Cosine / dot product similarity in [-1, 1] for normalized vectors
+        return max(0.0, min(1.0, (1.0 + score) / 2.0))
+
+    def _to_document(self, payload: dict[str, Any] | None) -> Document:
+        payload = payload or {}
+        metadata = dict(payload.get("metadata") or {})
+        source = (
+            metadata.get("file_path")
+            or payload.get("source")
+            or metadata.get("source")
+            or metadata.get("file_name")
+        )
+        return Document(
+            id=payload.get("doc_id"),
+            content=payload.get("content") or "",
+            metadata=metadata,
+            source=source,
+        )
 
-        Args:
-            documents: Documents to add to the collection
+    def _scored_documents(self, points: list[models.ScoredPoint]) -> list[Document]:
+        documents = []
+        for point in points:
+            doc = self._to_document(point.payload)
+            doc.metadata["_score"] = point.score
+            doc.metadata["similarity_score"] = self._similarity(point.score)
+            documents.append(doc)
+        return documents
 
-        Raises:
-            NotImplementedError: This store is not yet implemented
-        """
-        raise NotImplementedError("QdrantStore coming soon!")
+    def add_documents(self, documents: list[Document]) -> bool:
+        """Upsert documents in batches, skipping IDs that are already stored."""
+        try:
+            if not documents:
+                return True
+
+            candidates: dict[str, Document] = {}
+            for doc in documents:
+                if not doc.embeddings:
+                    logger.warning(f"Document {doc.id} has no embeddings, skipping")
+                    continue
+                candidates.setdefault(doc.id or uuid.uuid4().hex, doc)
+
+            existing = self.get_existing_ids(list(candidates))
+            ids = [doc_id for doc_id in candidates if doc_id not in existing]
+            skipped = len(documents) - len(ids)
+            if not ids:
+                logger.warning(
+                    "No valid documents with embeddings to add (all may be duplicates)"
+                )
+                return []
+
+            for start in range(0, len(ids), self.batch_size):
+                batch = ids[start : start + self.batch_size]
+                points = [
+                    models.PointStruct(
+                        id=point_id(doc_id),
+                        vector=list(candidates[doc_id].embeddings),
+                        payload={
+                            "doc_id": doc_id,
+                            "content": candidates[doc_id].content,
+                            "source": candidates[doc_id].source,
+                            "metadata": candidates[doc_id].metadata or {},
+                        },
+                    )
+                    for doc_id in batch
+                ]
+                with self._guard():
+                    self.client.upsert(
+                        collection_name=self.collection_name, points=points, wait=True
+                    )
+                self._index_lexical([candidates[doc_id] for doc_id in batch])
+
+            if skipped > 0:
+                logger.info(f"Added {len(ids)} documents, skipped {skipped} duplicates")
+            else:
+                logger.info(f"Added {len(ids)} documents to Qdrant")
+            return ids
+
+        except Exception as e:
+            logger.error(f"Failed to add documents to Qdrant: {e}")
+            return False
 
     def search(
+        self,
+        query: str = None,
+        top_k: int = 10,
+        query_embedding: list[float] | None = None,
+        where: dict[str, Any] | None = None,
+        **kwargs,
+    ) -> list[Document]:
+        """Search for similar documents."""
+        if query_embedding is None:
+            logger.warning("No query embedding provided for search")
+            return []
+        try:
+            return self.search_with_filter(
+                query_embedding=query_embedding, top_k=top_k, metadata_filter=where
+            )
+        except Exception as e:
+            logger.error(f"Failed to search Qdrant: {e}")
+            return []
+
+    def search_with_filter(
         self,
         query_embedding: list[float],
-        top_k: int = 5,
+        top_k: int = 10,
         metadata_filter: dict[str, Any] | None = None,
     ) -> list[Document]:
-        """Search for similar documents in Qdrant.
+        """Search with the metadata filter applied inside the index.
 
-        Args:
-            query_embedding: Query vector
-            top_k: Number of results to return
-            metadata_filter: Optional metadata filters
+        Used by MetadataFilteredStrategy instead of over-fetching and
+        filtering the results afterwards.
+        """
+        query_filter = build_filter(metadata_filter)
+        for name, value in (metadata_filter or {}).items():
+            self._ensure_payload_index(f"metadata.{name}", _payload_schema_for(value))
+
+        with self._guard():
+            response = self.client.query_points(
+                collection_name=self.collection_name,
+                query=list(query_embedding),
+                limit=top_k,
+                query_filter=query_filter,
+                search_params=self._search_params(),
+                with_payload=True,
+            )
+        return self._scored_documents(response.points)
+
+    def search_batch(
+        self,
+        query_embeddings: list[list[float]],
+        top_k: int = 10,
+        where: dict[str, Any] | None = None,
+    ) -> list[list[Document]]:
+        """Search for several query vectors in one request.
 
         Returns:
-            List of similar documents
-
-        Raises:
-            NotImplementedError: This store is not yet implemented
+            One result list per query, best match first
         """
-        raise NotImplementedError("QdrantStore coming soon!")
+        if not query_embeddings:
+            return []
+        query_filter = build_filter(where)
+        requests = [
+            models.QueryRequest(
+                query=list(embedding),
+                limit=top_k,
+                filter=query_filter,
+                params=self._search_params(),
+                with_payload=True,
+            )
+            for embedding in query_embeddings
+        ]
+        with self._guard():
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name, requests=requests
+            )
+        return [self._scored_documents(response.points) for response in responses]
+
+    def get_existing_ids(self, doc_ids: list[str]) -> set[str]:
+        """Return which of the given IDs are stored, in one retrieve call."""
+        unique_ids = list(dict.fromkeys(i for i in doc_ids if i))
+        if not unique_ids:
+            return set()
+        with self._guard():
+            records = self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=[point_id(doc_id) for doc_id in unique_ids],
+                with_payload=["doc_id"],
+                with_vectors=False,
+            )
+        return {record.payload["doc_id"] for record in records if record.payload}
+
+    def get_document(self, doc_id: str) -> Document | None:
+        """Get a specific document by ID."""
+        try:
+            with self._guard():
+                records = self.client.retrieve(
+                    collection_name=self.collection_name,
+                    ids=[point_id(doc_id)],
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            return self._to_document(records[0].payload) if records else None
+        except Exception as e:
+            logger.error(f"Failed to get document {doc_id}: {e}")
+            return None
+
+    def _scroll(
+        self, scroll_filter: models.Filter | None = None, limit: int | None = None
+    ) -> list[models.Record]:
+        records: list[models.Record] = []
+        if limit is not None and limit <= 0:
+            return records
+        offset = None
+        while True:
+            page_size = self.batch_size
+            if limit is not None:
+                page_size = min(page_size, limit - len(records))
+            with self._guard():
+                page, offset = self.client.scroll(
+                    collection_name=self.collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            records.extend(page)
+            if offset is None or (limit is not None and len(records) >= limit):
+                return records
 
     def get_documents_by_metadata(
         self, metadata_filter: dict[str, Any]
@@ -99,11 +525,13 @@ class QdrantStore(VectorStore):
 
         Returns:
             List of matching documents.
-
-        Raises:
-            NotImplementedError: This store is not yet implemented
         """
-        raise NotImplementedError("QdrantStore coming soon!")
+        try:
+            records = self._scroll(build_filter(metadata_filter))
+            return [self._to_document(record.payload) for record in records]
+        except Exception as e:
+            logger.error(f"Failed to get documents by metadata: {e}")
+            return []
 
     def delete_documents(self, doc_ids: list[str]) -> int:
         """Delete documents by their IDs.
@@ -113,41 +541,96 @@ class QdrantStore(VectorStore):
 
         Returns:
             Number of documents deleted.
-
-        Raises:
-            NotImplementedError: This store is not yet implemented
         """
-        raise NotImplementedError("QdrantStore coming soon!")
+        try:
+            existing = self.get_existing_ids(doc_ids)
+            if not existing:
+                return 0
+            with self._guard():
+                self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=models.PointIdsList(
+                        points=[point_id(doc_id) for doc_id in existing]
+                    ),
+                    wait=True,
+                )
+            self._unindex_lexical(list(existing))
+            logger.info(f"Deleted {len(existing)} documents from Qdrant")
+            return len(existing)
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            raise
 
     def delete_collection(self) -> bool:
-        """Delete the collection.
-
-        Raises:
-            NotImplementedError: This store is not yet implemented
-        """
-        raise NotImplementedError("QdrantStore coming soon!")
+        """Delete the collection."""
+        try:
+            with self._guard():
+                self.client.delete_collection(collection_name=self.collection_name)
+            logger.info(f"Deleted collection: {self.collection_name}")
+            self._indexed_fields.clear()
+            self._unindex_lexical()
+            # Recreate collection for continued use
+            self._setup_collection()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete collection: {e}")
+            return False
 
     def get_collection_info(self) -> dict[str, Any]:
-        """Get information about the Qdrant collection.
+        """Get information about the collection."""
+        try:
+            with self._guard():
+                count = self.client.count(
+                    collection_name=self.collection_name, exact=True
+                ).count
+            return {
+                "name": self.collection_name,
+                "count": count,
+                "document_count": count,
+                "persist_directory": self.persist_directory if self.is_local else None,
+                "distance": self.distance,
+                "quantization": self.quantization,
+            }
+        except Exception as e:
+            logger.error(f"Failed to get collection info: {e}")
+            return {"error": str(e)}
+
+    def list_documents(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        include_content: bool = False,
+    ) -> tuple[list[Document], int]:
+        """List documents in the collection with pagination.
 
-        Returns:
-            Collection statistics and configuration
+        Args:
+            limit: Maximum number of chunks to return
+            offset: Number of chunks to skip
+            include_content: Whether to include document content in results
 
-        Raises:
-            NotImplementedError: This store is not yet implemented
+        Returns:
+            Tuple of (list of Document objects, total count in collection)
         """
-        raise NotImplementedError("QdrantStore coming soon!")
-
-
-# Future implementation notes:
-# 1. Will use qdrant-client Python library
-# 2. Support for both local and cloud Qdrant instances
-# 3. Advanced features:
-#    - Payload filtering with complex conditions
-#    - Vector quantization for memory efficiency
-#    - Distributed collections with sharding
-#    - Real-time updates and deletions
-# 4. Optimization features:
-#    - Bulk operations for large datasets
-#    - Connection pooling and retry logic
-#    - Memory-mapped storage options
+        try:
+            with self._guard():
+                total_count = self.client.count(
+                    collection_name=self.collection_name, exact=True
+                ).count
+            # Qdrant pages by point ID, so skip ``offset`` points by scrolling
+            records = self._scroll(limit=offset + limit)[offset:]
+            documents = [self._to_document(record.payload) for record in records]
+            if not include_content:
+                for doc in documents:
+                    doc.content = ""
+            return documents, total_count
+        except Exception as e:
+            logger.error(f"Failed to list documents from Qdrant: {e}")
+            return [], 0
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get store description."""
+        return (
+            "Qdrant vector store, embedded or client-server, with filtered "
+            "search inside the index and optional scalar quantization."
+        )
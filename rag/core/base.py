@@ -160,6 +160,9 @@ class Embedder(Component):
     - `_call_embedding_api(texts)`: Make the actual API call to generate embeddings
     - `get_embedding_dimension()`: Return the embedding dimension for this model
 
+    and may override `_call_embedding_api_batch(texts)` when the API accepts
+    several inputs per request.
+
     The base class handles:
     - Circuit breaker pattern (stops after consecutive failures)
     - Fail-fast behavior (raises exceptions vs returning zero vectors)
@@ -233,6 +236,24 @@ class Embedder(Component):
         """
         return (ConnectionError, TimeoutError)
 
+    def _call_embedding_api_batch(self, texts: list[str]) -> list[list[float]]:
+        """Make the actual API call to generate embeddings for several texts.
+
+        The default calls `_call_embedding_api` once per text. Subclasses whose
+        API accepts a list of inputs should override this to send one request.
+        Like `_call_embedding_api`, this should NOT handle errors.
+
+        Args:
+            texts: The texts to embed (never empty strings)
+
+        Returns:
+            One embedding vector per text, in input order
+
+        Raises:
+            Any exception from the underlying API
+        """
+        return [self._call_embedding_api(text) for text in texts]
+
     def embed_text(self, text: str) -> list[float]:
         """Embed a single text string with error handling.
 
@@ -245,68 +266,105 @@ class Embedder(Component):
         Returns:
             The embedding vector, or zero vector if fail_fast=False and error occurs
 
+        Raises:
+            EmbedderUnavailableError: If embedding fails and fail_fast=True
+            CircuitBreakerOpenError: If circuit breaker is open
+        """
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts in one API call with error handling.
+
+        Applies the same circuit breaker, validation and fail-fast rules as
+        `embed_text`, with each returned vector counted as one success or
+        failure. Subclasses should implement `_call_embedding_api_batch`.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            One embedding vector per text. Failed texts get zero vectors
+            if fail_fast=False.
+
         Raises:
             EmbedderUnavailableError: If embedding fails and fail_fast=True
             CircuitBreakerOpenError: If circuit breaker is open
         """
         from utils.embedding_safety import EmbedderUnavailableError, is_zero_vector
 
+        if not texts:
+            return []
+
         # Handle empty text
-        if not text or not text.strip():
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        if len(pending) < len(texts):
             if self._fail_fast:
                 raise EmbedderUnavailableError("Cannot embed empty text")
-            return [0.0] * self.get_embedding_dimension()
+            for i, text in enumerate(texts):
+                if not text or not text.strip():
+                    embeddings[i] = self._zero_embedding()
+        if not pending:
+            return embeddings  # type: ignore[return-value]
 
         # Check circuit breaker
         self.check_circuit_breaker()
 
         try:
-            embedding = self._call_embedding_api(text)
-
-            # Validate embedding
-            if embedding and not is_zero_vector(embedding):
-                self.record_success()
-                self._consecutive_failures = 0
-                return embedding
-            else:
-                # Invalid/empty embedding returned
-                self._consecutive_failures += 1
-                self.record_failure(Exception("Empty or invalid embedding returned"))
-
-                if self._fail_fast:
-                    raise EmbedderUnavailableError(
-                        f"{self.name} returned empty/invalid embedding. "
-                        f"Consecutive failures: {self._consecutive_failures}"
-                    )
-                return [0.0] * self.get_embedding_dimension()
+            results = self._call_embedding_api_batch([texts[i] for i in pending])
+            if len(results) != len(pending):
+                raise ValueError(
+                    f"Expected {len(pending)} embeddings, got {len(results)}"
+                )
 
         except EmbedderUnavailableError:
             # Re-raise our own exceptions
             raise
 
         except self._get_connection_exceptions() as e:
-            self._consecutive_failures += 1
             self.logger.error(f"Connection error embedding text: {e}")
-            self.record_failure(e)
-
-            if self._fail_fast:
-                raise EmbedderUnavailableError(
-                    f"{self.name} is unavailable: {e}. "
-                    f"Consecutive failures: {self._consecutive_failures}"
-                ) from e
-            return [0.0] * self.get_embedding_dimension()
+            zero = self._handle_embedding_failure(f"{self.name} is unavailable: {e}", e)
+            for i in pending:
+                embeddings[i] = zero
+            return embeddings  # type: ignore[return-value]
 
         except Exception as e:
-            self._consecutive_failures += 1
             self.logger.error(f"Error embedding text: {e}")
-            self.record_failure(e)
+            zero = self._handle_embedding_failure(f"Failed to embed text: {e}", e)
+            for i in pending:
+                embeddings[i] = zero
+            return embeddings  # type: ignore[return-value]
 
-            if self._fail_fast:
-                raise EmbedderUnavailableError(
-                    f"Failed to embed text: {e}. "
-                    f"Consecutive failures: {self._consecutive_failures}"
-                ) from e
-            return [0.0] * self.get_embedding_dimension()
+        # Validate embeddings
+        for i, embedding in zip(pending, results, strict=True):
+            if embedding and not is_zero_vector(embedding):
+                self.record_success()
+                self._consecutive_failures = 0
+                embeddings[i] = embedding
+            else:
+                # Invalid/empty embedding returned
+                embeddings[i] = self._handle_embedding_failure(
+                    f"{self.name} returned empty/invalid embedding"
+                )
+        return embeddings  # type: ignore[return-value]
+
+    def _handle_embedding_failure(
+        self, message: str, error: Exception | None = None
+    ) -> list[float]:
+        """Record a failure, then raise if fail_fast or return a zero vector."""
+        from utils.embedding_safety import EmbedderUnavailableError
+
+        self._consecutive_failures += 1
+        self.record_failure(error or Exception("Empty or invalid embedding returned"))
+
+        if self._fail_fast:
+            raise EmbedderUnavailableError(
+                f"{message}. Consecutive failures: {self._consecutive_failures}"
+            ) from error
+        return self._zero_embedding()
+
+    def _zero_embedding(self) -> list[float]:
+        return [0.0] * self.get_embedding_dimension()
 
     def check_circuit_breaker(self) -> None:
         """
@@ -381,6 +439,121 @@ class VectorStore(Component):
         if project_dir is None:
             raise ValueError("project_dir is required")
         self.persist_directory = str(Path(project_dir) / "lf_data" / "stores" / name)
+        # BM25 keyword index kept next to the collection, set by stores that
+        # support lexical search (see open_lexical_index)
+        self.lexical_index = None
+        self._lexical_index_checked = False
+
+    def open_lexical_index(self, collection_name: str):
+        """Open the keyword index stored next to a collection.
+
+        Disabled with ``lexical_index: false`` in the store config.
+
+        Args:
+            collection_name: Collection the index belongs to.
+
+        Returns:
+            A LexicalIndex, or None if disabled or it cannot be opened.
+        """
+        if not self.config.get("lexical_index", True):
+            return None
+        # Imported here because utils depends on core
+        from utils.lexical_index import LexicalIndex
+
+        path = Path(self.persist_directory) / f"{collection_name}.lexical.sqlite3"
+        try:
+            return LexicalIndex(path)
+        except Exception as e:
+            logger.warning(f"Could not open lexical index at {path}: {e}")
+            return None
+
+    def _index_lexical(self, documents: list[Document]) -> None:
+        """Add stored documents to the lexical index, if there is one."""
+        if self.lexical_index is None or not documents:
+            return
+        try:
+            self.lexical_index.add(
+                (doc.id, doc.content, doc.metadata) for doc in documents
+            )
+        except Exception as e:
+            # The vector store is the source of truth; keyword search only
+            # misses these documents until the index is rebuilt
+            logger.warning(f"Failed to update lexical index: {e}")
+
+    def _unindex_lexical(self, doc_ids: list[str] | None = None) -> None:
+        """Remove documents (all if doc_ids is None) from the lexical index."""
+        if self.lexical_index is None:
+            return
+        try:
+            if doc_ids is None:
+                self.lexical_index.clear()
+            else:
+                self.lexical_index.remove(doc_ids)
+        except Exception as e:
+            logger.warning(f"Failed to update lexical index: {e}")
+
+    def rebuild_lexical_index(self, batch_size: int = 1000) -> int:
+        """Index every stored document for keyword search.
+
+        Used for collections created before the store kept a lexical index.
+
+        Returns:
+            Number of documents indexed.
+        """
+        if self.lexical_index is None or not hasattr(self, "list_documents"):
+            return 0
+        self.lexical_index.clear()
+        indexed = 0
+        while True:
+            documents, _ = self.list_documents(
+                limit=batch_size, offset=indexed, include_content=True
+            )
+            if not documents:
+                break
+            self._index_lexical(documents)
+            indexed += len(documents)
+        logger.info(f"Rebuilt lexical index with {indexed} documents")
+        return indexed
+
+    def lexical_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        metadata_filter: dict[str, Any] | None = None,
+    ) -> list[Document]:
+        """Rank documents by BM25 keyword relevance to the query.
+
+        Args:
+            query: Free-text query.
+            top_k: Maximum number of results.
+            metadata_filter: Metadata values the results must equal; list
+                values match any of their items.
+
+        Returns:
+            Documents with ``bm25_score`` in their metadata, best match first.
+            Stores without a lexical index return an empty list.
+        """
+        if self.lexical_index is None:
+            return []
+        if not self._lexical_index_checked:
+            self._lexical_index_checked = True
+            if self.lexical_index.count() == 0:
+                self.rebuild_lexical_index()
+
+        documents = []
+        for doc_id, content, metadata, score in self.lexical_index.search(
+            query, top_k, metadata_filter
+        ):
+            metadata["bm25_score"] = score
+            documents.append(
+                Document(
+                    id=doc_id,
+                    content=content,
+                    metadata=metadata,
+                    source=metadata.get("file_path") or metadata.get("source"),
+                )
+            )
+        return documents
 
     @abstractmethod
     def add_documents(self, documents: list[Document]) -> bool:
@@ -413,6 +586,21 @@ class VectorStore(Component):
         """
         pass
 
+    def get_existing_ids(self, doc_ids: list[str]) -> set[str]:
+        """Return which of the given IDs are already stored.
+
+        Lets callers skip work (e.g. embedding) for chunks that are already in
+        the store. Stores without a cheap bulk lookup return an empty set and
+        rely on add_documents to drop duplicates.
+
+        Args:
+            doc_ids: Document IDs to check.
+
+        Returns:
+            Subset of doc_ids present in the store.
+        """
+        return set()
+
     @abstractmethod
     def search(self, query: str, top_k: int = 10) -> list[Document]:
         """Search for similar documents."""
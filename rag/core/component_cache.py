@@ -0,0 +1,197 @@
+"""
+Worker-resident cache of ready RAG components.
+
+Building a DatabaseSearchAPI or IngestHandler parses and validates
+llamafarm.yaml and instantiates the embedder, vector store, parsers and
+extractors. The RAG worker runs many short tasks against the same few
+projects, so finished components are kept here and reused.
+
+Entries are keyed by the component kind, its arguments (project, database,
+strategy, ...) and a hash of the config file contents, so editing
+llamafarm.yaml naturally misses the cache and the stale entries are dropped.
+
+The worker uses a thread pool, so instances are leased: a cached instance is
+handed to one task at a time and returned when the task finishes. Concurrent
+tasks for the same key build extra instances, which are cached too, up to
+COMPONENT_CACHE_SIZE idle instances in total (least recently used evicted).
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from core.logging import RAGStructLogger
+from core.settings import settings
+
+logger = RAGStructLogger("rag.core.component_cache")
+
+T = TypeVar("T")
+
+
+def _config_digest(config_file: Path) -> str | None:
+    """Hash the config file contents, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(config_file.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class ComponentCache:
+    """LRU pool of idle component instances keyed by arguments and config hash."""
+
+    def __init__(self, maxsize: int | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum idle instances kept. Defaults to
+                COMPONENT_CACHE_SIZE; 0 disables caching.
+        """
+        self.maxsize = settings.COMPONENT_CACHE_SIZE if maxsize is None else maxsize
+        self._idle: OrderedDict[tuple, list[Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(instances) for instances in self._idle.values())
+
+    @contextmanager
+    def lease(
+        self,
+        kind: str,
+        config_file: Path | None,
+        key_parts: tuple,
+        factory: Callable[[], T],
+        on_reuse: Callable[[T], None] | None = None,
+    ) -> Iterator[T]:
+        """
+        Borrow a cached instance, building one with ``factory`` on a miss.
+
+        The instance is returned to the cache when the block exits normally.
+        If the block raises, the instance is discarded since its state is
+        unknown.
+
+        Args:
+            kind: Component kind, e.g. "search_api" or "ingest_handler"
+            config_file: Config file whose contents are part of the key
+            key_parts: Hashable arguments the component was built with
+            factory: Builds a new instance
+            on_reuse: Resets per-task state on an instance taken from the cache
+
+        Yields:
+            Component instance, used by this caller only until the block exits
+        """
+        digest = _config_digest(config_file) if config_file else None
+        if self.maxsize <= 0 or digest is None:
+            yield factory()
+            return
+
+        base_key = (kind, *key_parts)
+        key = (*base_key, digest)
+        instance = self._checkout(key)
+        if instance is None:
+            logger.debug("Component cache miss", kind=kind, key=str(key_parts))
+            instance = factory()
+        elif on_reuse is not None:
+            on_reuse(instance)
+
+        # Not reached if the block raises
+        yield instance
+        self._checkin(base_key, key, instance)
+
+    def clear(self) -> None:
+        """Drop all cached instances."""
+        with self._lock:
+            self._idle.clear()
+
+    def _checkout(self, key: tuple) -> Any | None:
+        with self._lock:
+            instances = self._idle.get(key)
+            if not instances:
+                return None
+            instance = instances.pop()
+            if not instances:
+                del self._idle[key]
+            return instance
+
+    def _checkin(self, base_key: tuple, key: tuple, instance: Any) -> None:
+        with self._lock:
+            # Entries built from an older version of the config are stale
+            for stale in [
+                k for k in self._idle if k[:-1] == base_key and k[-1] != key[-1]
+            ]:
+                del self._idle[stale]
+
+            self._idle.setdefault(key, []).append(instance)
+            self._idle.move_to_end(key)
+
+            total = sum(len(instances) for instances in self._idle.values())
+            while total > self.maxsize:
+                oldest_key, instances = next(iter(self._idle.items()))
+                instances.pop(0)
+                total -= 1
+                if not instances:
+                    del self._idle[oldest_key]
+
+
+component_cache = ComponentCache()
+
+
+@contextmanager
+def cached_search_api(project_dir: str, database: str) -> Iterator[Any]:
+    """Lease a DatabaseSearchAPI for a project database."""
+    from config import find_config_file
+
+    from api import DatabaseSearchAPI
+
+    try:
+        config_file = find_config_file(project_dir)
+    except Exception:
+        # Let DatabaseSearchAPI report the problem
+        config_file = None
+
+    with component_cache.lease(
+        "search_api",
+        config_file,
+        (str(Path(project_dir).resolve()), database),
+        lambda: DatabaseSearchAPI(project_dir=project_dir, database=database),
+    ) as api:
+        yield api
+
+
+@contextmanager
+def cached_ingest_handler(
+    config_path: str,
+    data_processing_strategy: str,
+    database: str,
+    dataset_name: str | None = None,
+    parser_overrides: dict[str, Any] | None = None,
+) -> Iterator[Any]:
+    """Lease an IngestHandler for a strategy and database."""
+    from core.ingest_handler import IngestHandler
+
+    overrides_key = json.dumps(parser_overrides or {}, sort_keys=True, default=str)
+    with component_cache.lease(
+        "ingest_handler",
+        Path(config_path),
+        (
+            str(Path(config_path).resolve()),
+            data_processing_strategy,
+            database,
+            dataset_name,
+            overrides_key,
+        ),
+        lambda: IngestHandler(
+            config_path=config_path,
+            data_processing_strategy=data_processing_strategy,
+            database=database,
+            dataset_name=dataset_name,
+            parser_overrides=parser_overrides,
+        ),
+    ) as handler:
+        yield handler
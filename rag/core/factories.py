@@ -92,6 +92,7 @@ from components.extractors.table_extractor.table_extractor import TableExtractor
 from components.retrievers.basic_similarity.basic_similarity import (
     BasicSimilarityStrategy,
 )
+from components.retrievers.bm25.bm25 import BM25Strategy
 from components.retrievers.cross_encoder_reranked.cross_encoder_reranked import (
     CrossEncoderRerankedStrategy,
 )
@@ -264,6 +265,7 @@ class RetrievalStrategyFactory(ComponentFactory):
 
     _registry = {
         "BasicSimilarityStrategy": BasicSimilarityStrategy,
+        "BM25Strategy": BM25Strategy,
         "HybridUniversalStrategy": HybridUniversalStrategy,
         "MetadataFilteredStrategy": MetadataFilteredStrategy,
         "MultiQueryStrategy": MultiQueryStrategy,
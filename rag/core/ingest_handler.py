@@ -9,14 +9,19 @@ Includes safety features to prevent runaway data growth:
 """
 
 import importlib
+import itertools
 import sys
 import uuid
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from core.base import VectorStore
 from core.blob_processor import BlobProcessor
 from core.logging import RAGStructLogger
+from core.settings import settings
 from core.strategies.handler import SchemaHandler
 from utils.embedding_safety import (
     CircuitBreakerOpenError,
@@ -269,6 +274,51 @@ class IngestHandler:
                 f"Cannot initialize vector store {vector_store_type}: {e}"
             ) from e
 
+    def _embed_batch_size(self) -> int:
+        """Number of chunks sent to the embedder per call."""
+        return max(int(getattr(self.embedder, "batch_size", 32) or 1), 1)
+
+    def _embed_in_batches(
+        self, texts: list[str]
+    ) -> Iterator[tuple[int, list[list[float]]]]:
+        """Embed texts in batches, yielding (start index, embeddings) in order.
+
+        Up to EMBED_MAX_INFLIGHT_BATCHES batches are requested concurrently so
+        the embedding service stays busy while earlier results are validated.
+        Embedder errors are raised at the batch that failed; batches that have
+        not started yet are cancelled.
+        """
+        batch_size = self._embed_batch_size()
+        starts = iter(range(0, len(texts), batch_size))
+        max_inflight = max(settings.EMBED_MAX_INFLIGHT_BATCHES, 1)
+
+        if max_inflight == 1 or len(texts) <= batch_size:
+            for start in starts:
+                yield start, self.embedder.embed(texts[start : start + batch_size])
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_inflight, thread_name_prefix="rag-embed"
+        )
+        pending: deque = deque()
+
+        def submit(count: int) -> None:
+            for start in itertools.islice(starts, count):
+                future = executor.submit(
+                    self.embedder.embed, texts[start : start + batch_size]
+                )
+                pending.append((start, future))
+
+        try:
+            submit(max_inflight)
+            while pending:
+                start, future = pending.popleft()
+                embeddings = future.result()
+                submit(1)
+                yield start, embeddings
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def ingest_file(self, file_data: bytes, metadata: dict[str, Any]) -> dict[str, Any]:
         """
         Ingest a single file from the CLI.
@@ -422,9 +472,32 @@ class IngestHandler:
                 },
             )
 
+            # Generate a unique ID based on file hash and chunk index
+            # This ensures the same file won't be re-embedded
+            for i, doc in enumerate(documents):
+                doc.id = f"{file_hash[:16]}_{i:04d}"
+
+                # Add file hash to metadata for tracking
+                doc.metadata["file_hash"] = file_hash
+                doc.metadata["chunk_index"] = i
+                doc.metadata["total_chunks"] = len(documents)
+
+            # Skip chunks that are already stored before embedding them, so
+            # re-ingesting an unchanged file costs one lookup, not a re-embed
+            already_stored = self.vector_store.get_existing_ids(
+                [doc.id for doc in documents]
+            )
+            pending = [doc for doc in documents if doc.id not in already_stored]
+            if already_stored:
+                logger.info(
+                    f"{len(already_stored)}/{len(documents)} chunks already stored, "
+                    "skipping embedding for them"
+                )
+
             # Health check: Verify embedder is available before processing batch
             if (
-                hasattr(self.embedder, "validate_config")
+                pending
+                and hasattr(self.embedder, "validate_config")
                 and not self.embedder.validate_config()
             ):
                 error_msg = (
@@ -441,30 +514,26 @@ class IngestHandler:
                     "reason": "embedder_unavailable",
                 }
 
-            # Generate embeddings for each document
+            # Generate embeddings in batches, validating each chunk
             embedded_documents = []
             failed_embeddings = 0
             expected_dimension = self.embedder.get_embedding_dimension()
+            processed = 0
 
-            for i, doc in enumerate(documents):
-                # Generate a unique ID based on file hash and chunk index
-                # This ensures the same file won't be re-embedded
-                doc.id = f"{file_hash[:16]}_{i:04d}"
-
-                # Add file hash to metadata for tracking
-                doc.metadata["file_hash"] = file_hash
-                doc.metadata["chunk_index"] = i
-                doc.metadata["total_chunks"] = len(documents)
-
-                try:
-                    # Generate embedding
-                    embedding = self.embedder.embed(
-                        [doc.content]
-                    )  # embed expects a list
+            try:
+                for start, embeddings in self._embed_in_batches(
+                    [doc.content for doc in pending]
+                ):
+                    batch = pending[start : start + self._embed_batch_size()]
+                    for offset, doc in enumerate(batch):
+                        i = start + offset
+                        emb = embeddings[offset] if offset < len(embeddings) else None
+                        if not emb:
+                            failed_embeddings += 1
+                            logger.warning(f"No embedding returned for chunk {i}")
+                            continue
 
-                    # Validate embedding before accepting it
-                    if embedding and len(embedding) > 0:
-                        emb = embedding[0]
+                        # Validate embedding before accepting it
                         is_valid, error_msg = is_valid_embedding(
                             emb, expected_dimension=expected_dimension, allow_zero=False
                         )
@@ -484,36 +553,34 @@ class IngestHandler:
                                 f"Invalid embedding for chunk {i}: {error_msg}"
                             )
                             # Don't append document - skip it
-                    else:
-                        failed_embeddings += 1
-                        logger.warning(f"No embedding returned for chunk {i}")
-
-                except (EmbedderUnavailableError, CircuitBreakerOpenError) as e:
-                    # Embedder service failure - stop processing immediately
-                    error_msg = f"Embedder failed after processing {i}/{len(documents)} chunks: {e}"
-                    logger.error(error_msg)
-                    event_logger.fail_event(error_msg)
-
-                    # Return partial results with error status
-                    return {
-                        "status": "error",
-                        "message": str(e),
-                        "filename": filename,
-                        "document_count": len(documents),
-                        "embedded_count": len(embedded_documents),
-                        "failed_count": failed_embeddings + (len(documents) - i),
-                        "reason": "embedder_failure",
-                        "circuit_state": (
-                            self.embedder.get_circuit_state()
-                            if hasattr(self.embedder, "get_circuit_state")
-                            else None
-                        ),
-                    }
+                    processed = start + len(batch)
+
+            except (EmbedderUnavailableError, CircuitBreakerOpenError) as e:
+                # Embedder service failure - stop processing immediately
+                error_msg = f"Embedder failed after processing {processed}/{len(pending)} chunks: {e}"
+                logger.error(error_msg)
+                event_logger.fail_event(error_msg)
+
+                # Return partial results with error status
+                return {
+                    "status": "error",
+                    "message": str(e),
+                    "filename": filename,
+                    "document_count": len(documents),
+                    "embedded_count": len(embedded_documents),
+                    "failed_count": failed_embeddings + (len(pending) - processed),
+                    "reason": "embedder_failure",
+                    "circuit_state": (
+                        self.embedder.get_circuit_state()
+                        if hasattr(self.embedder, "get_circuit_state")
+                        else None
+                    ),
+                }
 
             # Check if we have any valid embeddings
-            if not embedded_documents:
+            if pending and not embedded_documents:
                 error_msg = (
-                    f"All {len(documents)} embeddings failed validation. "
+                    f"All {len(pending)} embeddings failed validation. "
                     "This may indicate the embedder is returning invalid data."
                 )
                 logger.error(error_msg)
@@ -531,7 +598,7 @@ class IngestHandler:
             # Log if some embeddings failed
             if failed_embeddings > 0:
                 logger.warning(
-                    f"⚠️ {failed_embeddings}/{len(documents)} embeddings failed validation and were skipped"
+                    f"⚠️ {failed_embeddings}/{len(pending)} embeddings failed validation and were skipped"
                 )
 
             # Log embeddings generated
@@ -552,12 +619,16 @@ class IngestHandler:
             # Store documents in vector store with duplicate detection
             # Try batch add first (more efficient)
             stored_count = 0
-            skipped_count = 0
+            skipped_count = len(already_stored)
             doc_ids = []
 
             try:
                 # Batch add all documents at once
-                result = self.vector_store.add_documents(embedded_documents)
+                result = (
+                    self.vector_store.add_documents(embedded_documents)
+                    if embedded_documents
+                    else []
+                )
 
                 # ChromaStore returns a list of IDs for successfully added documents
                 # Empty list means all were duplicates
@@ -566,7 +637,7 @@ class IngestHandler:
                         # Some or all documents were stored
                         doc_ids = result
                         stored_count = len(result)
-                        skipped_count = len(embedded_documents) - stored_count
+                        skipped_count += len(embedded_documents) - stored_count
 
                         if stored_count == len(embedded_documents):
                             logger.info(f"Stored all {stored_count} documents")
@@ -582,7 +653,7 @@ class IngestHandler:
                             )
                     else:
                         # All documents were duplicates
-                        skipped_count = len(embedded_documents)
+                        skipped_count += len(embedded_documents)
                         logger.info(
                             f"All {skipped_count} documents were duplicates - skipped"
                         )
@@ -734,6 +805,7 @@ class IngestHandler:
                 "stored_count": stored_count,
                 "skipped_count": skipped_count,
                 "document_ids": doc_ids,
+                "chunk_ids": [doc.id for doc in documents],
                 "parsers_used": list(set(parser_names)),
                 "extractors_applied": self._get_applied_extractors(
                     documents[0] if documents else None
@@ -0,0 +1,261 @@
+"""
+Request/response endpoint for read-only RAG tasks.
+
+Tasks dispatched through the Celery filesystem broker are picked up and
+reported back by polling, which adds the broker and poll latency to every
+search. The worker therefore also serves read-only tasks over a small local
+HTTP endpoint, so a search returns as soon as the work is done. Ingestion and
+deletion stay on Celery.
+
+Protocol:
+    POST /tasks/<task name>   body: {"args": [...], "kwargs": {...}}
+        headers: Content-Type: application/json
+                 Authorization: Bearer <token>
+        200 {"result": ...}
+        500 {"error": "..."} (the traceback is only logged)
+        404 unknown or non read-only task
+        401 missing or wrong token, 403 unexpected Host, 415 not JSON
+    GET /health
+        200 {"status": "ok"}
+
+Requests must name the configured host in their Host header (which stops DNS
+rebinding) and carry the shared token, so a web page can't reach the endpoint
+through the user's browser. The token is RAG_RPC_TOKEN if set; otherwise a
+random one is generated at startup and written to
+<LF_DATA_DIR>/rag_rpc_token, where the server reads it.
+
+The task functions are called in-process, exactly as the Celery worker would
+run them, so both paths share the worker's component cache.
+
+Configuration (see core.settings):
+- RAG_RPC_HOST: Interface to bind (default: 127.0.0.1)
+- RAG_RPC_PORT: Port to bind (default: 14346, 0 disables the endpoint)
+- RAG_RPC_TOKEN: Shared token clients must send (default: generated)
+"""
+
+import hmac
+import json
+import os
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from core.logging import RAGStructLogger
+from core.settings import settings
+
+logger = RAGStructLogger("rag.core.rpc_server")
+
+READ_ONLY_TASKS = frozenset(
+    {
+        "rag.search_with_database",
+        "rag.handle_rag_query",
+        "rag.batch_search",
+        "rag.health_check_database",
+        "rag.get_database_stats",
+        "rag.list_database_documents",
+        "rag.preview_document",
+    }
+)
+
+_TASK_PREFIX = "/tasks/"
+
+RPC_TOKEN_FILENAME = "rag_rpc_token"
+
+_LOOPBACK_HOSTS = frozenset({"127.0.0.1", "localhost", "::1"})
+_WILDCARD_HOSTS = frozenset({"", "0.0.0.0", "::"})
+
+
+def _allowed_hosts(bind_host: str) -> frozenset[str] | None:
+    """Host header names accepted for a bind address (None accepts any)."""
+    if bind_host in _WILDCARD_HOSTS:
+        return None
+    if bind_host in _LOOPBACK_HOSTS:
+        return _LOOPBACK_HOSTS
+    return frozenset({bind_host})
+
+
+def _host_name(host_header: str) -> str:
+    """Strip the port (and IPv6 brackets) from a Host header value."""
+    if host_header.startswith("["):
+        return host_header[1:].split("]", 1)[0]
+    return host_header.rsplit(":", 1)[0] if ":" in host_header else host_header
+
+
+class RPCRequestHandler(BaseHTTPRequestHandler):
+    """Runs one read-only task per POST request."""
+
+    # Keep-alive, so the server can reuse one connection for many searches
+    protocol_version = "HTTP/1.1"
+    server: "RPCServer"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return
+
+        name = self.path.removeprefix(_TASK_PREFIX)
+        task = self.server.tasks.get(name) if name in READ_ONLY_TASKS else None
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid request body: {e}"})
+            return
+
+        if task is None:
+            self._send_json(404, {"error": f"Unknown task: {name}"})
+            return
+
+        try:
+            result = task(*payload.get("args", []), **payload.get("kwargs", {}))
+        except Exception as e:
+            logger.exception("RPC task failed", task_name=name, error=str(e))
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self._send_json(200, {"result": result})
+
+    def _authorized(self) -> bool:
+        """Check Host, token and Content-Type, answering the request if bad."""
+        allowed = self.server.allowed_hosts
+        host = _host_name(self.headers.get("Host", ""))
+        if allowed is not None and host not in allowed:
+            self._reject(403, f"Unexpected Host: {host}")
+            return False
+
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(token.encode(), self.server.token.encode()):
+            self._reject(401, "Missing or invalid token")
+            return False
+
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.split(";", 1)[0].strip().lower() != "application/json":
+            self._reject(415, "Content-Type must be application/json")
+            return False
+        return True
+
+    def _reject(self, status: int, error: str) -> None:
+        # The body is left unread, so the connection can't be reused
+        self.close_connection = True
+        self._send_json(status, {"error": error})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("RPC request", message=format % args)
+
+    def _send_json(self, status: int, body: dict[str, Any]) -> None:
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class RPCServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a Celery app's task registry."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], tasks: Any, token: str):
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to bind; port 0 picks a free port
+            tasks: Task registry, usually ``app.tasks`` of the Celery app
+            token: Shared token clients must send as a Bearer token
+        """
+        super().__init__(address, RPCRequestHandler)
+        self.tasks = tasks
+        self.token = token
+        self.allowed_hosts = _allowed_hosts(address[0])
+
+
+_server: RPCServer | None = None
+_lock = threading.Lock()
+
+
+def _publish_token(token: str) -> None:
+    """Write a generated token (owner-only) to <LF_DATA_DIR>/rag_rpc_token."""
+    path = Path(settings.LF_DATA_DIR) / RPC_TOKEN_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    os.replace(tmp_path, path)
+
+
+def start_rpc_server(tasks: Any) -> RPCServer | None:
+    """Serve read-only tasks on RAG_RPC_HOST:RAG_RPC_PORT in a daemon thread.
+
+    Failing to bind (e.g. the port is taken) is logged and otherwise ignored:
+    the server falls back to dispatching through Celery.
+
+    Args:
+        tasks: Task registry, usually ``app.tasks`` of the Celery app
+
+    Returns:
+        The running server, or None if disabled or the bind failed
+    """
+    global _server
+
+    if settings.RAG_RPC_PORT <= 0:
+        logger.info("RAG RPC endpoint disabled")
+        return None
+
+    with _lock:
+        if _server is not None:
+            return _server
+        address = (settings.RAG_RPC_HOST, settings.RAG_RPC_PORT)
+        token = settings.RAG_RPC_TOKEN or secrets.token_urlsafe(32)
+        try:
+            server = RPCServer(address, tasks, token)
+        except OSError as e:
+            logger.warning(
+                "Could not start RAG RPC endpoint, read-only tasks will use Celery",
+                host=address[0],
+                port=address[1],
+                error=str(e),
+            )
+            return None
+
+        if not settings.RAG_RPC_TOKEN:
+            # Only once bound, so a worker that lost the port race doesn't
+            # replace the running endpoint's token
+            try:
+                _publish_token(token)
+            except OSError as e:
+                server.server_close()
+                logger.warning(
+                    "Could not write RAG RPC token, read-only tasks will use Celery",
+                    error=str(e),
+                )
+                return None
+
+        threading.Thread(
+            target=server.serve_forever, name="rag-rpc", daemon=True
+        ).start()
+        _server = server
+
+    logger.info("RAG RPC endpoint listening", host=address[0], port=address[1])
+    return server
+
+
+def stop_rpc_server() -> None:
+    """Stop the endpoint started by start_rpc_server, if any."""
+    global _server
+
+    with _lock:
+        server, _server = _server, None
+    if server is not None:
+        server.shutdown()
+        server.server_close()
@@ -31,6 +31,24 @@ class Settings(BaseSettings, env_file=".env"):
     # Ollama Configuration
     OLLAMA_HOST: str = "http://localhost:11434"
 
+    # Ingestion: embedding batches requested concurrently per file
+    EMBED_MAX_INFLIGHT_BATCHES: int = 4
+
+    # HTTP connection pooling for embedders and rerankers
+    HTTP_POOL_MAXSIZE: int = 16
+    HEALTH_CHECK_TTL_SECONDS: float = 30.0
+
+    # Idle search APIs / ingest handlers kept by the worker (0 disables)
+    COMPONENT_CACHE_SIZE: int = 8
+
+    # Request/response endpoint for read-only tasks (search, stats, health).
+    # Port 0 disables it; the server then falls back to the Celery broker.
+    RAG_RPC_HOST: str = "127.0.0.1"
+    RAG_RPC_PORT: int = 14346
+    # Shared token for the endpoint; empty generates one per worker start and
+    # writes it to <LF_DATA_DIR>/rag_rpc_token for the server to read
+    RAG_RPC_TOKEN: str = ""
+
     # Celery Broker Override Configuration
     CELERY_BROKER_URL: str = ""
     CELERY_RESULT_BACKEND: str = ""
@@ -15,8 +15,8 @@ from celery_app import app
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.component_cache import cached_ingest_handler
 from core.document_manager import DocumentManager
-from core.ingest_handler import IngestHandler
 from core.logging import RAGStructLogger
 
 logger = RAGStructLogger("rag.tasks.delete")
@@ -91,15 +91,14 @@ def delete_file_task(
         # We use a dummy strategy since we only need the database connection
         # TODO: Refactor rag code so that we don't need to use an IngestHandler just
         #       to get a vector store instance
-        handler = IngestHandler(
+        with cached_ingest_handler(
             config_path=str(config_path),
             data_processing_strategy=_get_first_strategy(config_path),
             database=database_name,
-        )
-
-        # Use DocumentManager to handle the deletion logic
-        doc_manager = DocumentManager(handler.vector_store)
-        result = doc_manager.delete_by_file_hash(file_hash)
+        ) as handler:
+            # Use DocumentManager to handle the deletion logic
+            doc_manager = DocumentManager(handler.vector_store)
+            result = doc_manager.delete_by_file_hash(file_hash)
 
         logger.info(
             "RAG file deletion completed",
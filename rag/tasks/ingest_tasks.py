@@ -5,7 +5,9 @@ Celery tasks for RAG file ingestion and processing operations.
 """
 
 import json
+import os
 import sys
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -16,7 +18,7 @@ from celery_app import app
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.ingest_handler import IngestHandler
+from core.component_cache import cached_ingest_handler
 from core.logging import RAGStructLogger
 
 logger = RAGStructLogger("rag.tasks.ingest")
@@ -38,6 +40,36 @@ class IngestTask(Task):
         )
 
 
+def _record_manifest_entry(manifest_entry: dict[str, Any], result: dict) -> None:
+    """Write the ingest manifest entry for a file whose chunks are all stored.
+
+    Files with chunks that failed to embed are not recorded, so the next
+    incremental run retries them.
+    """
+    chunk_ids = result.get("chunk_ids", [])
+    stored = result.get("stored_count", 0) + result.get("skipped_count", 0)
+    if stored < len(chunk_ids):
+        return
+
+    path = Path(manifest_entry["path"])
+    entry = {
+        "file_hash": manifest_entry["file_hash"],
+        "config_hash": manifest_entry["config_hash"],
+        "chunk_ids": chunk_ids,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Only costs a re-ingest on the next run
+        logger.warning(
+            "Failed to write ingest manifest entry",
+            extra={"path": str(path), "error": str(e)},
+        )
+
+
 @app.task(bind=True, base=IngestTask, name="rag.ingest_file")
 def ingest_file_with_rag_task(
     self,
@@ -48,6 +80,7 @@ def ingest_file_with_rag_task(
     filename: str | None = None,
     dataset_name: str | None = None,
     parser_overrides: dict[str, Any] | None = None,
+    manifest_entry: dict[str, Any] | None = None,
 ) -> tuple[bool, dict[str, Any]]:
     """
     Ingest a single file using the RAG system via Celery task.
@@ -59,6 +92,8 @@ def ingest_file_with_rag_task(
         source_path: Path to the file to ingest
         filename: Optional original filename (for display purposes)
         dataset_name: Optional dataset name for logging
+        manifest_entry: Optional {"path", "file_hash", "config_hash"} of the
+            server's ingest manifest entry to write once the file is stored
 
     Returns:
         Tuple of (success: bool, details: dict) with processing information
@@ -99,15 +134,6 @@ def ingest_file_with_rag_task(
             details["error"] = error_msg
             return False, details
 
-        # Initialize the ingest handler
-        handler = IngestHandler(
-            config_path=str(config_path),
-            data_processing_strategy=data_processing_strategy_name,
-            database=database_name,
-            dataset_name=dataset_name,
-            parser_overrides=parser_overrides,
-        )
-
         # Read the file
         with open(source_path, "rb") as f:
             file_data = f.read()
@@ -147,8 +173,16 @@ def ingest_file_with_rag_task(
             "content_type": mime_type,
         }
 
-        # Ingest the file
-        result = handler.ingest_file(file_data=file_data, metadata=metadata)
+        # Reuse an ingest handler built for this strategy and config if available
+        with cached_ingest_handler(
+            config_path=str(config_path),
+            data_processing_strategy=data_processing_strategy_name,
+            database=database_name,
+            dataset_name=dataset_name,
+            parser_overrides=parser_overrides,
+        ) as handler:
+            # Ingest the file
+            result = handler.ingest_file(file_data=file_data, metadata=metadata)
 
         # Process result
         details["result"] = result
@@ -197,6 +231,8 @@ def ingest_file_with_rag_task(
 
         if not success:
             details["error"] = result.get("message", "Unknown error")
+        elif manifest_entry:
+            _record_manifest_entry(manifest_entry, result)
 
         logger.info(
             "RAG file ingestion completed",
@@ -15,7 +15,7 @@ from celery_app import app
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api import DatabaseSearchAPI
+from core.component_cache import cached_search_api
 from core.logging import RAGStructLogger
 
 logger = RAGStructLogger("rag.tasks.query")
@@ -74,13 +74,12 @@ def handle_rag_query_task(
     )
 
     try:
-        # Initialize search API
-        api = DatabaseSearchAPI(project_dir=project_dir, database=database)
-
-        # Perform search
-        results = api.search(
-            query=query, top_k=top_k, retrieval_strategy=retrieval_strategy
-        )
+        # Reuse a search API built for this project and config if available
+        with cached_search_api(project_dir, database) as api:
+            # Perform search
+            results = api.search(
+                query=query, top_k=top_k, retrieval_strategy=retrieval_strategy
+            )
 
         # Convert results to dictionaries
         result_dicts = [r.to_dict() for r in results]
@@ -154,36 +153,35 @@ def batch_search_task(
     )
 
     try:
-        # Initialize search API
-        api = DatabaseSearchAPI(project_dir=project_dir, database=database)
-
-        # Process each query
-        all_results = []
-        for i, query in enumerate(queries):
-            logger.info(
-                "Processing batch query",
-                extra={
-                    "task_id": self.request.id,
-                    "query_index": i + 1,
-                    "query": query[:50] + "..." if len(query) > 50 else query,
-                },
-            )
-
-            # Perform search
-            results = api.search(
-                query=query, top_k=top_k, retrieval_strategy=retrieval_strategy
-            )
-
-            # Convert results to dictionaries
-            result_dicts = [r.to_dict() for r in results]
-
-            all_results.append(
-                {
-                    "query": query,
-                    "results": result_dicts,
-                    "total_results": len(result_dicts),
-                }
-            )
+        # Reuse a search API built for this project and config if available
+        with cached_search_api(project_dir, database) as api:
+            # Process each query
+            all_results = []
+            for i, query in enumerate(queries):
+                logger.info(
+                    "Processing batch query",
+                    extra={
+                        "task_id": self.request.id,
+                        "query_index": i + 1,
+                        "query": query[:50] + "..." if len(query) > 50 else query,
+                    },
+                )
+
+                # Perform search
+                results = api.search(
+                    query=query, top_k=top_k, retrieval_strategy=retrieval_strategy
+                )
+
+                # Convert results to dictionaries
+                result_dicts = [r.to_dict() for r in results]
+
+                all_results.append(
+                    {
+                        "query": query,
+                        "results": result_dicts,
+                        "total_results": len(result_dicts),
+                    }
+                )
 
         logger.info(
             "Batch RAG search completed",
@@ -16,7 +16,7 @@ from celery_app import app
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api import DatabaseSearchAPI
+from core.component_cache import cached_search_api
 from core.logging import RAGStructLogger
 
 logger = RAGStructLogger("rag.tasks.search")
@@ -95,16 +95,18 @@ def search_with_rag_database_task(
     )
 
     try:
-        # Initialize search API
-        api = DatabaseSearchAPI(project_dir=project_dir, database=database)
-
-        # Perform search
-        results = api.search(
-            query=query,
-            top_k=top_k,
-            retrieval_strategy=retrieval_strategy,
-            min_score=score_threshold,
-        )
+        # Reuse a search API built for this project and config if available
+        with cached_search_api(project_dir, database) as api:
+            # Perform search
+            # hybrid_alpha only affects HybridUniversalStrategy
+            extra = {"hybrid_alpha": hybrid_alpha} if hybrid_alpha is not None else {}
+            results = api.search(
+                query=query,
+                top_k=top_k,
+                retrieval_strategy=retrieval_strategy,
+                min_score=score_threshold,
+                **extra,
+            )
 
         # Convert results to dictionaries
         result_dicts = [r.to_dict() for r in results]
@@ -14,6 +14,7 @@ from celery import Task
 
 from api import DatabaseSearchAPI
 from celery_app import app
+from core.component_cache import cached_search_api
 from core.logging import RAGStructLogger
 
 # Add the repo root to the path to find the config module
@@ -119,45 +120,44 @@ def rag_get_database_stats_task(
         # Embedding dimension from default embedding strategy
         stats_data["embedding_dimension"] = _get_embedding_dimension(database_config)
 
-        # Initialize search API to access vector store
+        # Lease a search API to access vector store
         try:
-            search_api = DatabaseSearchAPI(project_dir=project_dir, database=database)
-
-            # Get collection info from vector store
-            collection_info = search_api.vector_store.get_collection_info()
-
-            if collection_info and "error" not in collection_info:
-                # Vector count is the total number of entries in the collection
-                # This includes all chunks
-                stats_data["vector_count"] = collection_info.get("count", 0)
-                stats_data["chunk_count"] = collection_info.get("count", 0)
-
-                # Try to get unique document count by querying metadata
-                # For now, use vector count as an approximation
-                # In the future, we could query unique source_file metadata
-                stats_data["document_count"] = _estimate_document_count(
-                    search_api, stats_data["chunk_count"]
-                )
-
-                # Add collection metadata
-                stats_data["metadata"]["collection_name"] = collection_info.get(
-                    "name", database
-                )
-                stats_data["metadata"]["persist_directory"] = collection_info.get(
-                    "persist_directory", ""
-                )
-
-                # Try to get storage size from persist directory
-                persist_dir = collection_info.get("persist_directory")
-                if persist_dir:
-                    collection_size, index_size = _get_storage_sizes(persist_dir)
-                    stats_data["collection_size_bytes"] = collection_size
-                    stats_data["index_size_bytes"] = index_size
-
-            else:
-                stats_data["metadata"]["collection_error"] = collection_info.get(
-                    "error", "Unknown error"
-                )
+            with cached_search_api(project_dir, database) as search_api:
+                # Get collection info from vector store
+                collection_info = search_api.vector_store.get_collection_info()
+
+                if collection_info and "error" not in collection_info:
+                    # Vector count is the total number of entries in the collection
+                    # This includes all chunks
+                    stats_data["vector_count"] = collection_info.get("count", 0)
+                    stats_data["chunk_count"] = collection_info.get("count", 0)
+
+                    # Try to get unique document count by querying metadata
+                    # For now, use vector count as an approximation
+                    # In the future, we could query unique source_file metadata
+                    stats_data["document_count"] = _estimate_document_count(
+                        search_api, stats_data["chunk_count"]
+                    )
+
+                    # Add collection metadata
+                    stats_data["metadata"]["collection_name"] = collection_info.get(
+                        "name", database
+                    )
+                    stats_data["metadata"]["persist_directory"] = collection_info.get(
+                        "persist_directory", ""
+                    )
+
+                    # Try to get storage size from persist directory
+                    persist_dir = collection_info.get("persist_directory")
+                    if persist_dir:
+                        collection_size, index_size = _get_storage_sizes(persist_dir)
+                        stats_data["collection_size_bytes"] = collection_size
+                        stats_data["index_size_bytes"] = index_size
+
+                else:
+                    stats_data["metadata"]["collection_error"] = collection_info.get(
+                        "error", "Unknown error"
+                    )
 
         except Exception as e:
             logger.warning(
@@ -263,29 +263,28 @@ def rag_list_database_documents_task(
             logger.warning(f"Database '{database}' not found in configuration")
             return result
 
-        # Initialize search API to access vector store
-        search_api = DatabaseSearchAPI(project_dir=project_dir, database=database)
-
-        # Fetch all chunks by paginating through the entire collection.
-        # We need all chunks because multiple chunks can belong to the same
-        # document, and we must aggregate them before applying document-level
-        # pagination.
-        chunks: list[Any] = []
-        chunk_page_size = 10000
-        chunk_offset = 0
-
-        while True:
-            page_chunks, total_chunks = search_api.vector_store.list_documents(
-                limit=chunk_page_size,
-                offset=chunk_offset,
-                include_content=False,
-            )
-            chunks.extend(page_chunks)
+        # Lease a search API to access vector store
+        with cached_search_api(project_dir, database) as search_api:
+            # Fetch all chunks by paginating through the entire collection.
+            # We need all chunks because multiple chunks can belong to the same
+            # document, and we must aggregate them before applying document-level
+            # pagination.
+            chunks: list[Any] = []
+            chunk_page_size = 10000
+            chunk_offset = 0
+
+            while True:
+                page_chunks, total_chunks = search_api.vector_store.list_documents(
+                    limit=chunk_page_size,
+                    offset=chunk_offset,
+                    include_content=False,
+                )
+                chunks.extend(page_chunks)
 
-            # Stop if we've fetched all chunks or got an empty page
-            if len(page_chunks) < chunk_page_size or len(chunks) >= total_chunks:
-                break
-            chunk_offset += chunk_page_size
+                # Stop if we've fetched all chunks or got an empty page
+                if len(page_chunks) < chunk_page_size or len(chunks) >= total_chunks:
+                    break
+                chunk_offset += chunk_page_size
 
         # Aggregate chunks by source file
         documents_map: dict[str, dict[str, Any]] = {}
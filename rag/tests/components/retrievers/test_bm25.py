@@ -0,0 +1,128 @@
+"""Tests for BM25Strategy and lexical + dense hybrid retrieval."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from components.retrievers.bm25.bm25 import BM25Strategy
+from components.retrievers.hybrid_universal.hybrid_universal import (
+    HybridUniversalStrategy,
+)
+from core.base import Document
+
+
+def _doc(doc_id: str, **metadata) -> Document:
+    return Document(id=doc_id, content=f"content {doc_id}", metadata=metadata)
+
+
+@pytest.fixture
+def vector_store():
+    """Store whose dense and keyword results disagree."""
+    store = Mock()
+    store.search = Mock(
+        side_effect=lambda **kwargs: [
+            _doc("dense1", similarity_score=0.9),
+            _doc("both", similarity_score=0.5),
+        ]
+    )
+    store.lexical_search = Mock(
+        side_effect=lambda query, top_k, metadata_filter: [
+            _doc("keyword1", bm25_score=8.0, page=1),
+            _doc("both", bm25_score=4.0, page=5),
+        ]
+    )
+    return store
+
+
+class TestBM25Strategy:
+    """Tests for BM25Strategy."""
+
+    def test_scores_are_relative_to_best_match(self, vector_store):
+        result = BM25Strategy().retrieve(
+            [0.1], vector_store, top_k=2, query_text="error E-1234"
+        )
+
+        assert [doc.id for doc in result.documents] == ["keyword1", "both"]
+        assert result.scores == [1.0, 0.5]
+        vector_store.lexical_search.assert_called_once_with(
+            "error E-1234", top_k=2, metadata_filter={}
+        )
+
+    def test_operator_filters_are_applied_after_search(self, vector_store):
+        strategy = BM25Strategy(config={"default_filters": {"lang": "en"}})
+
+        result = strategy.retrieve(
+            [0.1],
+            vector_store,
+            top_k=2,
+            query_text="error",
+            metadata_filter={"page": {"$gt": 2}},
+        )
+
+        assert [doc.id for doc in result.documents] == ["both"]
+        vector_store.lexical_search.assert_called_once_with(
+            "error", top_k=6, metadata_filter={"lang": "en"}
+        )
+
+    def test_without_query_text(self, vector_store):
+        result = BM25Strategy().retrieve([0.1], vector_store, top_k=2)
+
+        assert result.documents == []
+        vector_store.lexical_search.assert_not_called()
+
+
+class TestHybridAlpha:
+    """hybrid_alpha blends dense and keyword results."""
+
+    def _retrieve(self, vector_store, **kwargs):
+        strategy = HybridUniversalStrategy(
+            config={
+                "strategies": [{"type": "BasicSimilarityStrategy", "weight": 1.0}],
+                "combination_method": "rank_fusion",
+            }
+        )
+        return strategy.retrieve(
+            [0.1], vector_store, top_k=3, query_text="error", **kwargs
+        )
+
+    def test_without_alpha_keyword_search_is_not_used(self, vector_store):
+        result = self._retrieve(vector_store)
+
+        assert [doc.id for doc in result.documents] == ["dense1", "both"]
+        vector_store.lexical_search.assert_not_called()
+
+    def test_alpha_adds_keyword_search(self, vector_store):
+        result = self._retrieve(vector_store, hybrid_alpha=0.5)
+
+        assert [doc.id for doc in result.documents][0] == "both"
+        assert {doc.id for doc in result.documents} == {"dense1", "both", "keyword1"}
+        assert result.strategy_metadata["hybrid_alpha"] == 0.5
+
+    @pytest.mark.parametrize(
+        ("alpha", "expected"), [(0.0, ["keyword1", "both"]), (1.0, ["dense1", "both"])]
+    )
+    def test_alpha_extremes_run_one_side(self, vector_store, alpha, expected):
+        result = self._retrieve(vector_store, hybrid_alpha=alpha)
+
+        assert [doc.id for doc in result.documents] == expected
+        assert result.strategy_metadata["num_strategies"] == 1
+
+    def test_configured_weights_are_scaled_per_side(self):
+        strategy = HybridUniversalStrategy(
+            config={
+                "alpha": 0.4,
+                "strategies": [
+                    {"type": "basic", "weight": 0.3},
+                    {"type": "filtered", "weight": 0.1},
+                    {"type": "bm25", "weight": 0.5},
+                ],
+            }
+        )
+
+        weights = [w for _, w in strategy._weighted_strategies(strategy.alpha)]
+
+        assert weights == pytest.approx([0.3, 0.1, 0.6])
+
+    def test_alpha_out_of_range(self, vector_store):
+        with pytest.raises(ValueError, match="hybrid_alpha"):
+            self._retrieve(vector_store, hybrid_alpha=1.5)
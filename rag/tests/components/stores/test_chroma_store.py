@@ -4,6 +4,7 @@ import shutil
 import sys
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -316,6 +317,108 @@ class TestChromaStore:
             # Should have exactly the original count
             assert info.get("document_count", 0) == len(sample_documents)
 
+    def test_hash_dedup_persists_across_store_instances(self, temp_directory):
+        """Test that chunk hashes are remembered by a new store instance."""
+        config = {"collection_name": "test_collection", "embedding_dimension": 500}
+        doc = Document(
+            content="Same chunk content",
+            id="first_id",
+            source="a.txt",
+            metadata={"chunk_hash": "chunk_abc"},
+            embeddings=[0.1] * 500,
+        )
+        store = ChromaStore("test_store", config, project_dir=Path(temp_directory))
+        assert store.add_documents([doc]) == ["first_id"]
+
+        # Same content under a new ID, seen by a fresh store instance
+        doc.id = "second_id"
+        reopened = ChromaStore("test_store", config, project_dir=Path(temp_directory))
+        assert reopened.add_documents([doc]) == []
+
+    def test_duplicate_check_is_one_lookup_per_batch(self, test_store):
+        """Test that existence is checked with a single collection.get call."""
+        docs = [
+            Document(
+                content=f"Chunk {i}",
+                id=f"chunk_{i}",
+                source="batch.txt",
+                metadata={"chunk_hash": f"hash_{i}"},
+                embeddings=[0.1 * (i + 1)] * 500,
+            )
+            for i in range(20)
+        ]
+        test_store.add_documents(docs[:10])
+
+        with patch.object(
+            test_store.collection, "get", wraps=test_store.collection.get
+        ) as spy:
+            result = test_store.add_documents(docs)
+
+        assert result == [f"chunk_{i}" for i in range(10, 20)]
+        assert spy.call_count == 1
+
+    def test_deleted_documents_can_be_added_again(self, test_store):
+        """Test that hashes of deleted documents no longer count as duplicates."""
+        doc = Document(
+            content="Re-uploaded chunk",
+            id="reupload_1",
+            source="r.txt",
+            metadata={"chunk_hash": "chunk_reupload"},
+            embeddings=[0.4] * 500,
+        )
+        assert test_store.add_documents([doc]) == ["reupload_1"]
+
+        test_store.delete_documents(["reupload_1"])
+
+        assert test_store.add_documents([doc]) == ["reupload_1"]
+
+    def test_lexical_index_follows_adds_and_deletes(self, test_store, sample_documents):
+        """Test that keyword search sees added and deleted documents."""
+        test_store.add_documents(sample_documents)
+
+        results = test_store.lexical_search("unique characteristics")
+        assert [doc.id for doc in results] == ["doc3"]
+        assert results[0].metadata["priority"] == "low"
+        assert results[0].metadata["bm25_score"] > 0
+
+        filtered = test_store.lexical_search(
+            "document", metadata_filter={"category": "test"}
+        )
+        assert sorted(doc.id for doc in filtered) == ["doc1", "doc2"]
+
+        test_store.delete_documents(["doc3"])
+        assert test_store.lexical_search("unique") == []
+
+        test_store.delete_collection()
+        assert test_store.lexical_search("document") == []
+
+    def test_lexical_index_rebuilt_for_existing_collection(
+        self, temp_directory, sample_documents
+    ):
+        """Test that collections without a keyword index are indexed on first search."""
+        config = {"collection_name": "legacy", "lexical_index": False}
+        ChromaStore(
+            "test_store", config, project_dir=Path(temp_directory)
+        ).add_documents(sample_documents)
+
+        store = ChromaStore(
+            "test_store",
+            {"collection_name": "legacy"},
+            project_dir=Path(temp_directory),
+        )
+
+        assert [doc.id for doc in store.lexical_search("second")] == ["doc2"]
+
+    def test_get_existing_ids(self, test_store, sample_documents):
+        """Test bulk ID existence lookup."""
+        test_store.add_documents(sample_documents[:2])
+
+        assert test_store.get_existing_ids(["doc1", "doc2", "doc3"]) == {
+            "doc1",
+            "doc2",
+        }
+        assert test_store.get_existing_ids([]) == set()
+
     def test_large_batch_operations(self, test_store):
         """Test operations with larger batches of documents."""
         # Create many documents
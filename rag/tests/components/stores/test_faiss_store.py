@@ -0,0 +1,249 @@
+"""Tests for FAISS Store component."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+faiss = pytest.importorskip("faiss")
+
+from components.stores.faiss_store import faiss_store as faiss_store_module  # noqa: E402
+from components.stores.faiss_store.faiss_store import FaissStore  # noqa: E402
+from core.base import Document  # noqa: E402
+
+DIMENSION = 16
+
+
+def _documents(count: int, start: int = 0, category: str = "test") -> list[Document]:
+    rng = np.random.default_rng(start)
+    return [
+        Document(
+            content=f"Document {i}",
+            id=f"doc{i}",
+            source=f"file{i}.txt",
+            metadata={"category": category, "index": i},
+            embeddings=rng.random(DIMENSION).tolist(),
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def _store(tmp_path, index_type: str = "Flat", **config) -> FaissStore:
+    return FaissStore(
+        config={
+            "dimension": DIMENSION,
+            "index_type": index_type,
+            "nlist": 4,
+            "nprobe": 4,
+            **config,
+        },
+        project_dir=tmp_path,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _flush_immediately(monkeypatch):
+    monkeypatch.setattr(faiss_store_module, "FLUSH_INTERVAL_SECONDS", 0.0)
+
+
+class TestFaissStore:
+    """Test FaissStore functionality."""
+
+    @pytest.mark.parametrize("index_type", ["Flat", "IVF", "HNSW"])
+    def test_add_and_search(self, tmp_path, index_type):
+        store = _store(tmp_path, index_type)
+        documents = _documents(20)
+
+        assert store.add_documents(documents) == [doc.id for doc in documents]
+
+        results = store.search(query_embedding=documents[3].embeddings, top_k=3)
+        assert results[0].id == "doc3"
+        assert results[0].content == "Document 3"
+        assert results[0].source == "file3.txt"
+        assert results[0].metadata["category"] == "test"
+        assert 0.0 < results[0].metadata["similarity_score"] <= 1.0
+        assert len(results) == 3
+
+    def test_cosine_metric(self, tmp_path):
+        store = _store(tmp_path, metric="Cosine")
+        documents = _documents(5)
+        store.add_documents(documents)
+
+        scaled = [x * 10 for x in documents[2].embeddings]
+        results = store.search(query_embedding=scaled, top_k=1)
+
+        assert results[0].id == "doc2"
+        assert results[0].metadata["similarity_score"] == pytest.approx(1.0, abs=1e-5)
+
+    def test_search_batch(self, tmp_path):
+        store = _store(tmp_path)
+        documents = _documents(10)
+        store.add_documents(documents)
+
+        results = store.search_batch(
+            [documents[1].embeddings, documents[7].embeddings], top_k=2
+        )
+
+        assert [r[0].id for r in results] == ["doc1", "doc7"]
+
+    def test_search_with_metadata_filter(self, tmp_path):
+        store = _store(tmp_path)
+        store.add_documents(_documents(5, category="a") + _documents(5, 5, "b"))
+
+        results = store.search(
+            query_embedding=_documents(1)[0].embeddings,
+            top_k=3,
+            where={"category": "b"},
+        )
+
+        assert len(results) == 3
+        assert all(doc.metadata["category"] == "b" for doc in results)
+
+    def test_duplicates_are_skipped(self, tmp_path):
+        store = _store(tmp_path)
+        store.add_documents(_documents(3))
+
+        added = store.add_documents(_documents(4))
+
+        assert added == ["doc3"]
+        assert store.get_collection_info()["count"] == 4
+
+    def test_persists_across_instances_with_mmap(self, tmp_path, monkeypatch):
+        documents = _documents(10)
+        _store(tmp_path, "HNSW").add_documents(documents)
+
+        read_flags = []
+        original_read_index = faiss.read_index
+
+        def _read_index(path, *flags):
+            read_flags.extend(flags)
+            return original_read_index(path, *flags)
+
+        monkeypatch.setattr(faiss, "read_index", _read_index)
+        FaissStore.clear_collection_cache()  # As if opened by another process
+        reader = _store(tmp_path, "HNSW")
+        results = reader.search(query_embedding=documents[4].embeddings, top_k=1)
+
+        assert results[0].id == "doc4"
+        assert read_flags == [faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY]
+        assert reader.get_existing_ids(["doc4", "missing"]) == {"doc4"}
+
+    def test_reader_sees_flushed_writes(self, tmp_path):
+        writer = _store(tmp_path)
+        FaissStore.clear_collection_cache()  # As if opened by another process
+        reader = _store(tmp_path)
+        writer.add_documents(_documents(5))
+        assert len(reader.search(query_embedding=[0.5] * DIMENSION, top_k=10)) == 5
+
+        writer.add_documents(_documents(5, 5))
+
+        assert len(reader.search(query_embedding=[0.5] * DIMENSION, top_k=10)) == 10
+
+    def test_unflushed_documents_are_not_reported_as_existing(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(faiss_store_module, "FLUSH_INTERVAL_SECONDS", 60.0)
+        writer = _store(tmp_path)
+        writer._state.last_flush = faiss_store_module.time.monotonic()
+        writer.add_documents(_documents(2))
+
+        assert writer.get_existing_ids(["doc0", "doc1"]) == {"doc0", "doc1"}
+        # Another process (e.g. after a crash) must re-ingest these
+        FaissStore.clear_collection_cache()
+        assert _store(tmp_path).get_existing_ids(["doc0", "doc1"]) == set()
+
+        writer.flush()
+        assert _store(tmp_path).get_existing_ids(["doc0", "doc1"]) == {"doc0", "doc1"}
+
+    def test_stores_on_one_collection_keep_each_others_vectors(self, tmp_path):
+        first = _store(tmp_path)
+        second = _store(tmp_path)
+        documents = _documents(4)
+
+        for i, doc in enumerate(documents):
+            (first if i % 2 == 0 else second).add_documents([doc])
+
+        FaissStore.clear_collection_cache()
+        reader = _store(tmp_path)
+        assert reader._get_mmap_index().ntotal == 4
+        for doc in documents:
+            results = reader.search(query_embedding=doc.embeddings, top_k=1)
+            assert results[0].id == doc.id
+
+    def test_ivf_is_rebuilt_as_collection_grows(self, tmp_path):
+        store = _store(tmp_path, "IVF", nlist=8)
+        store.add_documents(_documents(3))
+        assert faiss.extract_index_ivf(store._state.index).nlist == 3
+
+        documents = _documents(20, 3)
+        store.add_documents(documents)
+
+        assert faiss.extract_index_ivf(store._state.index).nlist == 8
+        assert store._state.index.ntotal == 23
+        results = store.search(query_embedding=documents[5].embeddings, top_k=1)
+        assert results[0].id == documents[5].id
+
+    @pytest.mark.parametrize("index_type", ["Flat", "IVF", "HNSW"])
+    def test_delete_documents(self, tmp_path, index_type):
+        store = _store(tmp_path, index_type)
+        documents = _documents(10)
+        store.add_documents(documents)
+
+        assert store.delete_documents(["doc2", "doc5", "missing"]) == 2
+
+        reader = _store(tmp_path, index_type)
+        results = reader.search(query_embedding=documents[2].embeddings, top_k=8)
+        ids = {doc.id for doc in results}
+        assert len(results) == 8
+        assert "doc2" not in ids and "doc5" not in ids
+        assert reader.get_existing_ids(["doc2", "doc3"]) == {"doc3"}
+
+        # Deleted documents can be added again
+        assert store.add_documents([documents[2]]) == ["doc2"]
+        assert (
+            store.search(query_embedding=documents[2].embeddings, top_k=1)[0].id
+            == "doc2"
+        )
+
+    def test_get_documents_by_metadata(self, tmp_path):
+        store = _store(tmp_path)
+        store.add_documents(_documents(3, category="a") + _documents(2, 3, "b"))
+
+        documents = store.get_documents_by_metadata({"category": "b"})
+
+        assert sorted(doc.id for doc in documents) == ["doc3", "doc4"]
+
+    def test_delete_collection(self, tmp_path):
+        store = _store(tmp_path)
+        store.add_documents(_documents(3))
+
+        assert store.delete_collection() is True
+
+        assert store.search(query_embedding=[0.5] * DIMENSION) == []
+        assert _store(tmp_path).get_collection_info()["count"] == 0
+        assert store.add_documents(_documents(3)) == ["doc0", "doc1", "doc2"]
+
+    def test_lexical_search(self, tmp_path):
+        store = _store(tmp_path)
+        documents = _documents(5)
+        documents[2].content = "Error E-1234 while parsing"
+        store.add_documents(documents)
+
+        assert [doc.id for doc in store.lexical_search("E-1234")] == ["doc2"]
+
+        store.delete_documents(["doc2"])
+        assert store.lexical_search("E-1234") == []
+
+    def test_list_documents(self, tmp_path):
+        store = _store(tmp_path)
+        store.add_documents(_documents(5))
+
+        documents, total = store.list_documents(limit=2, offset=1)
+
+        assert total == 5
+        assert [doc.id for doc in documents] == ["doc1", "doc2"]
+        assert documents[0].content == ""
@@ -0,0 +1,200 @@
+"""Tests for Qdrant Store component (embedded local mode)."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+pytest.importorskip("qdrant_client")
+
+from components.retrievers.metadata_filtered.metadata_filtered import (  # noqa: E402
+    MetadataFilteredStrategy,
+)
+from components.stores.qdrant_store.qdrant_store import (  # noqa: E402
+    QdrantStore,
+    build_filter,
+)
+from core.base import Document  # noqa: E402
+
+VECTOR_SIZE = 4
+
+
+def _documents() -> list[Document]:
+    return [
+        Document(
+            content=f"Document {i}",
+            id=f"doc{i}",
+            source=f"file{i}.txt",
+            metadata={"tenant": "a" if i < 3 else "b", "page": i},
+            embeddings=[1.0, float(i), 0.0, 1.0],
+        )
+        for i in range(6)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = QdrantStore(
+        config={"vector_size": VECTOR_SIZE, "batch_size": 4},
+        project_dir=tmp_path,
+    )
+    yield store
+    QdrantStore.clear_client_cache()
+
+
+class TestQdrantStore:
+    """Test QdrantStore functionality."""
+
+    def test_add_and_search(self, store):
+        assert store.add_documents(_documents()) == [f"doc{i}" for i in range(6)]
+
+        results = store.search(query_embedding=[1.0, 2.0, 0.0, 1.0], top_k=2)
+
+        assert results[0].id == "doc2"
+        assert results[0].content == "Document 2"
+        assert results[0].source == "file2.txt"
+        assert results[0].metadata["tenant"] == "a"
+        assert results[0].metadata["similarity_score"] == pytest.approx(1.0)
+        assert len(results) == 2
+
+    def test_duplicates_are_skipped(self, store):
+        store.add_documents(_documents()[:3])
+
+        assert store.add_documents(_documents()) == ["doc3", "doc4", "doc5"]
+        assert store.get_collection_info()["count"] == 6
+        assert store.get_existing_ids(["doc1", "missing"]) == {"doc1"}
+
+    def test_filtered_search_runs_in_index(self, store):
+        store.add_documents(_documents())
+
+        results = store.search_with_filter(
+            query_embedding=[1.0, 0.0, 0.0, 1.0],
+            top_k=2,
+            metadata_filter={"tenant": "b", "page": {"$ne": 4}},
+        )
+
+        assert [doc.id for doc in results] == ["doc3", "doc5"]
+
+    def test_metadata_filtered_strategy_uses_native_filtering(self, store):
+        store.add_documents(_documents())
+        strategy = MetadataFilteredStrategy(config={"fallback_multiplier": 3})
+
+        result = strategy.retrieve(
+            [1.0, 0.0, 0.0, 1.0], store, top_k=3, metadata_filter={"tenant": "b"}
+        )
+
+        assert result.strategy_metadata["filtering_method"] == "native"
+        assert [doc.id for doc in result.documents] == ["doc3", "doc4", "doc5"]
+
+    def test_search_batch(self, store):
+        store.add_documents(_documents())
+
+        results = store.search_batch(
+            [[1.0, 1.0, 0.0, 1.0], [1.0, 5.0, 0.0, 1.0]],
+            top_k=1,
+            where={"tenant": ["a", "b"]},
+        )
+
+        assert [r[0].id for r in results] == ["doc1", "doc5"]
+
+    def test_persists_across_clients(self, tmp_path):
+        config = {"vector_size": VECTOR_SIZE}
+        QdrantStore(config=config, project_dir=tmp_path).add_documents(_documents())
+        QdrantStore.clear_client_cache()
+
+        reopened = QdrantStore(config=config, project_dir=tmp_path)
+
+        assert reopened.get_document("doc4").content == "Document 4"
+        QdrantStore.clear_client_cache()
+
+    def test_delete_and_metadata_lookup(self, store):
+        store.add_documents(_documents())
+
+        assert store.delete_documents(["doc0", "doc4", "missing"]) == 2
+
+        remaining = store.get_documents_by_metadata({"tenant": "b"})
+        assert sorted(doc.id for doc in remaining) == ["doc3", "doc5"]
+        assert store.get_existing_ids(["doc0", "doc1"]) == {"doc1"}
+
+    def test_delete_collection_recreates_it(self, store):
+        store.add_documents(_documents())
+
+        assert store.delete_collection() is True
+
+        assert store.get_collection_info()["count"] == 0
+        assert store.add_documents(_documents()[:1]) == ["doc0"]
+
+    def test_lexical_search(self, store):
+        store.add_documents(_documents())
+
+        results = store.lexical_search("document", metadata_filter={"tenant": "b"})
+        assert sorted(doc.id for doc in results) == ["doc3", "doc4", "doc5"]
+
+        store.delete_documents(["doc4"])
+        assert [doc.id for doc in store.lexical_search("4")] == []
+
+    def test_list_documents(self, store):
+        store.add_documents(_documents())
+
+        documents, total = store.list_documents(limit=2, offset=3)
+
+        assert total == 6
+        assert len(documents) == 2
+        assert all(doc.content == "" for doc in documents)
+
+
+class TestServerMode:
+    """Payload indexes and search params are only used against a server."""
+
+    @patch("components.stores.qdrant_store.qdrant_store.QdrantClient")
+    def test_filter_fields_get_payload_indexes(self, client_class, tmp_path):
+        client = MagicMock()
+        client.collection_exists.return_value = False
+        client_class.return_value = client
+        store = QdrantStore(
+            config={
+                "vector_size": VECTOR_SIZE,
+                "url": "http://qdrant:6333",
+                "payload_indexes": {"tenant": "keyword"},
+                "hnsw_ef": 128,
+            },
+            project_dir=tmp_path,
+        )
+
+        for _ in range(2):
+            store.search_with_filter(
+                [1.0, 0.0, 0.0, 1.0], metadata_filter={"tenant": "a", "page": 3}
+            )
+
+        indexed = [
+            (c.kwargs["field_name"], c.kwargs["field_schema"].value)
+            for c in client.create_payload_index.call_args_list
+        ]
+        assert indexed == [("metadata.tenant", "keyword"), ("metadata.page", "integer")]
+        assert client.query_points.call_args.kwargs["search_params"].hnsw_ef == 128
+        QdrantStore.clear_client_cache()
+
+
+class TestBuildFilter:
+    """Metadata filters are translated to Qdrant filters."""
+
+    def test_operators(self):
+        query_filter = build_filter(
+            {"tenant": "a", "page": {"$gte": 2, "$lt": 5}, "lang": {"$nin": ["de"]}}
+        )
+
+        assert [c.key for c in query_filter.must] == [
+            "metadata.tenant",
+            "metadata.page",
+        ]
+        assert query_filter.must[1].range.gte == 2
+        assert query_filter.must[1].range.lt == 5
+        assert query_filter.must_not[0].match.any == ["de"]
+
+    def test_unsupported_operator(self):
+        with pytest.raises(ValueError, match="Unsupported filter operator"):
+            build_filter({"page": {"$regex": "x"}})
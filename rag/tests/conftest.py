@@ -15,6 +15,18 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(rag_dir))
 
 from core.base import Document  # noqa: E402
+from core.component_cache import component_cache  # noqa: E402
+from utils.http_pool import clear_health_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_worker_caches() -> Generator[None, None, None]:
+    """Keep cached health probes and components from leaking between tests."""
+    clear_health_cache()
+    component_cache.clear()
+    yield
+    clear_health_cache()
+    component_cache.clear()
 
 
 @pytest.fixture
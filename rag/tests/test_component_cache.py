@@ -0,0 +1,119 @@
+"""Tests for the worker-resident component cache."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from core.component_cache import ComponentCache
+
+
+@pytest.fixture
+def config_file(tmp_path: Path) -> Path:
+    path = tmp_path / "llamafarm.yaml"
+    path.write_text("name: test\n")
+    return path
+
+
+class TestComponentCache:
+    """Test leasing, invalidation and LRU bounds."""
+
+    def test_reuses_instance_for_same_key(self, config_file):
+        cache = ComponentCache(maxsize=4)
+        factory = Mock(side_effect=lambda: object())
+
+        with cache.lease("api", config_file, ("proj", "db"), factory) as first:
+            pass
+        with cache.lease("api", config_file, ("proj", "db"), factory) as second:
+            pass
+
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_concurrent_leases_get_separate_instances(self, config_file):
+        cache = ComponentCache(maxsize=4)
+        factory = Mock(side_effect=lambda: object())
+
+        with (
+            cache.lease("api", config_file, ("proj", "db"), factory) as first,
+            cache.lease("api", config_file, ("proj", "db"), factory) as second,
+        ):
+            assert first is not second
+
+        assert len(cache) == 2
+
+    def test_config_change_invalidates(self, config_file):
+        cache = ComponentCache(maxsize=4)
+        factory = Mock(side_effect=lambda: object())
+
+        with cache.lease("api", config_file, ("proj", "db"), factory) as first:
+            pass
+        config_file.write_text("name: changed\n")
+        with cache.lease("api", config_file, ("proj", "db"), factory) as second:
+            pass
+
+        assert first is not second
+        # The entry built from the old config was dropped
+        assert len(cache) == 1
+
+    def test_different_keys_do_not_share(self, config_file):
+        cache = ComponentCache(maxsize=4)
+        factory = Mock(side_effect=lambda: object())
+
+        with cache.lease("api", config_file, ("proj", "db1"), factory) as first:
+            pass
+        with cache.lease("api", config_file, ("proj", "db2"), factory) as second:
+            pass
+
+        assert first is not second
+
+    def test_lru_bound(self, config_file):
+        cache = ComponentCache(maxsize=2)
+        factory = Mock(side_effect=lambda: object())
+
+        for db in ("a", "b", "c"):
+            with cache.lease("api", config_file, ("proj", db), factory):
+                pass
+        assert len(cache) == 2
+
+        # "a" was least recently used and evicted
+        with cache.lease("api", config_file, ("proj", "a"), factory):
+            pass
+        assert factory.call_count == 4
+
+    def test_failed_lease_discards_instance(self, config_file):
+        cache = ComponentCache(maxsize=4)
+        factory = Mock(side_effect=lambda: object())
+
+        with (
+            pytest.raises(RuntimeError),
+            cache.lease("api", config_file, ("proj", "db"), factory),
+        ):
+            raise RuntimeError("task failed")
+
+        assert len(cache) == 0
+
+    def test_on_reuse_called_for_cached_instances_only(self, config_file):
+        cache = ComponentCache(maxsize=4)
+        on_reuse = Mock()
+
+        for _ in range(2):
+            with cache.lease(
+                "api", config_file, ("proj", "db"), object, on_reuse=on_reuse
+            ):
+                pass
+
+        assert on_reuse.call_count == 1
+
+    def test_disabled_or_missing_config_builds_every_time(self, config_file):
+        factory = Mock(side_effect=lambda: object())
+
+        with ComponentCache(maxsize=0).lease("api", config_file, ("proj",), factory):
+            pass
+        cache = ComponentCache(maxsize=4)
+        missing = config_file.parent / "missing.yaml"
+        with cache.lease("api", missing, ("proj",), factory):
+            pass
+
+        assert factory.call_count == 2
+        assert len(cache) == 0
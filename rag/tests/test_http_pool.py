@@ -0,0 +1,73 @@
+"""Tests for shared HTTP connection pools and cached health probes."""
+
+from unittest.mock import Mock, patch
+
+from utils.http_pool import cached_health_check, close_sessions, get_session
+
+
+class TestSessions:
+    """Test pooled session lookup."""
+
+    def test_same_origin_shares_session(self):
+        a = get_session("http://127.0.0.1:11540/v1")
+        b = get_session("http://127.0.0.1:11540/v1/rerank")
+
+        assert a is b
+
+    def test_different_origins_get_different_sessions(self):
+        a = get_session("http://127.0.0.1:11540/v1")
+        b = get_session("http://localhost:11434")
+
+        assert a is not b
+
+    def test_pool_size_from_settings(self):
+        with patch("utils.http_pool.settings.HTTP_POOL_MAXSIZE", 3):
+            session = get_session("http://pool-size-test:1234")
+
+        adapter = session.get_adapter("http://pool-size-test:1234/")
+        assert adapter._pool_maxsize == 3
+
+    def test_close_sessions(self):
+        a = get_session("http://127.0.0.1:11540/v1")
+
+        with patch.object(a, "close") as close:
+            close_sessions()
+
+        close.assert_called_once()
+        assert get_session("http://127.0.0.1:11540/v1") is not a
+
+
+class TestCachedHealthCheck:
+    """Test health probe caching."""
+
+    def test_success_is_cached(self):
+        probe = Mock(return_value=True)
+
+        assert cached_health_check("svc", probe) is True
+        assert cached_health_check("svc", probe) is True
+        assert probe.call_count == 1
+
+    def test_failure_is_not_cached(self):
+        probe = Mock(return_value=False)
+
+        assert cached_health_check("svc", probe) is False
+        assert cached_health_check("svc", probe) is False
+        assert probe.call_count == 2
+
+    def test_expired_entry_is_reprobed(self):
+        probe = Mock(return_value=True)
+
+        with patch("utils.http_pool.time.monotonic", side_effect=[0.0, 100.0, 100.0]):
+            cached_health_check("svc", probe)
+            cached_health_check("svc", probe)
+
+        assert probe.call_count == 2
+
+    def test_ttl_zero_disables_cache(self):
+        probe = Mock(return_value=True)
+
+        with patch("utils.http_pool.settings.HEALTH_CHECK_TTL_SECONDS", 0):
+            cached_health_check("svc", probe)
+            cached_health_check("svc", probe)
+
+        assert probe.call_count == 2
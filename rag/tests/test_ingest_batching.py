@@ -0,0 +1,96 @@
+"""Tests for batched embedding during ingestion.
+
+IngestHandler embeds chunks in batches of the embedder's batch_size with a
+bounded number of batches in flight, keeping results in chunk order.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from core.ingest_handler import IngestHandler
+from utils.embedding_safety import EmbedderUnavailableError
+
+
+class FakeEmbedder:
+    """Embedder returning [len(text), 1.0] and tracking concurrency."""
+
+    def __init__(self, batch_size: int, fail_on: str | None = None):
+        self.batch_size = batch_size
+        self.fail_on = fail_on
+        self.calls: list[list[str]] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        with self._lock:
+            self.calls.append(list(texts))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.01)
+            if self.fail_on in texts:
+                raise EmbedderUnavailableError("embedder down")
+            return [[float(len(t)), 1.0] for t in texts]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _handler(embedder: FakeEmbedder) -> IngestHandler:
+    handler = IngestHandler.__new__(IngestHandler)
+    handler.embedder = embedder
+    return handler
+
+
+class TestEmbedInBatches:
+    """Test IngestHandler._embed_in_batches."""
+
+    def test_batches_by_embedder_batch_size_in_order(self):
+        embedder = FakeEmbedder(batch_size=2)
+        texts = ["a" * n for n in range(1, 8)]
+
+        with patch("core.ingest_handler.settings.EMBED_MAX_INFLIGHT_BATCHES", 3):
+            results = list(_handler(embedder)._embed_in_batches(texts))
+
+        assert [start for start, _ in results] == [0, 2, 4, 6]
+        vectors = [v for _, batch in results for v in batch]
+        assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+        assert sorted(len(call) for call in embedder.calls) == [1, 2, 2, 2]
+
+    def test_in_flight_batches_are_bounded(self):
+        embedder = FakeEmbedder(batch_size=1)
+
+        with patch("core.ingest_handler.settings.EMBED_MAX_INFLIGHT_BATCHES", 2):
+            list(_handler(embedder)._embed_in_batches(["x"] * 10))
+
+        assert 1 <= embedder.max_active <= 2
+        assert len(embedder.calls) == 10
+
+    def test_single_inflight_batch_runs_sequentially(self):
+        embedder = FakeEmbedder(batch_size=2)
+
+        with patch("core.ingest_handler.settings.EMBED_MAX_INFLIGHT_BATCHES", 1):
+            list(_handler(embedder)._embed_in_batches(["a", "b", "c"]))
+
+        assert embedder.calls == [["a", "b"], ["c"]]
+        assert embedder.max_active == 1
+
+    def test_embedder_failure_raised_at_failing_batch(self):
+        embedder = FakeEmbedder(batch_size=1, fail_on="bad")
+        texts = ["ok", "ok", "bad", "ok", "ok", "ok", "ok", "ok"]
+
+        starts = []
+        with (
+            patch("core.ingest_handler.settings.EMBED_MAX_INFLIGHT_BATCHES", 2),
+            pytest.raises(EmbedderUnavailableError),
+        ):
+            for start, _ in _handler(embedder)._embed_in_batches(texts):
+                starts.append(start)
+
+        assert starts == [0, 1]
+        # Batches past the in-flight window were never requested
+        assert len(embedder.calls) < len(texts)
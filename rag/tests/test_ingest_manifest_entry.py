@@ -0,0 +1,51 @@
+"""Tests for writing the server's ingest manifest entry after ingestion."""
+
+import json
+
+from tasks.ingest_tasks import _record_manifest_entry
+
+
+def _manifest_entry(tmp_path):
+    return {
+        "path": str(tmp_path / "manifests" / "main_db" / "pdf" / "abc.json"),
+        "file_hash": "abc",
+        "config_hash": "cfg",
+    }
+
+
+class TestRecordManifestEntry:
+    """Entries are only written for fully stored files."""
+
+    def test_writes_entry_with_chunk_ids(self, tmp_path):
+        entry = _manifest_entry(tmp_path)
+        result = {
+            "status": "success",
+            "chunk_ids": ["abc_0000", "abc_0001"],
+            "stored_count": 1,
+            "skipped_count": 1,
+        }
+
+        _record_manifest_entry(entry, result)
+
+        written = json.loads((tmp_path / "manifests/main_db/pdf/abc.json").read_text())
+        assert written == {
+            "file_hash": "abc",
+            "config_hash": "cfg",
+            "chunk_ids": ["abc_0000", "abc_0001"],
+        }
+        assert list((tmp_path / "manifests/main_db/pdf").iterdir()) == [
+            tmp_path / "manifests/main_db/pdf/abc.json"
+        ]
+
+    def test_partially_embedded_file_is_not_recorded(self, tmp_path):
+        entry = _manifest_entry(tmp_path)
+        result = {
+            "status": "success",
+            "chunk_ids": ["abc_0000", "abc_0001"],
+            "stored_count": 1,
+            "skipped_count": 0,
+        }
+
+        _record_manifest_entry(entry, result)
+
+        assert not (tmp_path / "manifests").exists()
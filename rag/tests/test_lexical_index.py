@@ -0,0 +1,81 @@
+"""Tests for the BM25 lexical index."""
+
+from utils.lexical_index import LexicalIndex, build_match_query
+
+
+def _index(tmp_path) -> LexicalIndex:
+    index = LexicalIndex(tmp_path / "collection.lexical.sqlite3")
+    index.add(
+        [
+            ("doc1", "Reset your password from the login page", {"lang": "en"}),
+            ("doc2", "Error E-1234: disk quota exceeded", {"lang": "en", "page": 2}),
+            ("doc3", "Passwort zurücksetzen auf der Anmeldeseite", {"lang": "de"}),
+        ]
+    )
+    return index
+
+
+class TestLexicalIndex:
+    """LexicalIndex keeps an FTS5 index in sync with a collection."""
+
+    def test_search_ranks_by_bm25(self, tmp_path):
+        index = _index(tmp_path)
+        index.add([("doc4", "password password password", {"lang": "en"})])
+
+        results = index.search("password reset", top_k=10)
+
+        assert [doc_id for doc_id, *_ in results] == ["doc1", "doc4"]
+        assert results[0][1] == "Reset your password from the login page"
+        assert results[0][2] == {"lang": "en"}
+        assert results[0][3] > results[1][3] > 0
+
+    def test_exact_identifiers(self, tmp_path):
+        results = _index(tmp_path).search("what is E-1234?")
+
+        assert [doc_id for doc_id, *_ in results] == ["doc2"]
+
+    def test_diacritics_are_folded(self, tmp_path):
+        results = _index(tmp_path).search("zurucksetzen")
+
+        assert [doc_id for doc_id, *_ in results] == ["doc3"]
+
+    def test_metadata_filter(self, tmp_path):
+        index = _index(tmp_path)
+
+        assert index.search("password", metadata_filter={"lang": "de"}) == []
+        assert [
+            doc_id
+            for doc_id, *_ in index.search(
+                "password E-1234", metadata_filter={"page": [1, 2]}
+            )
+        ] == ["doc2"]
+
+    def test_readding_replaces_entry(self, tmp_path):
+        index = _index(tmp_path)
+
+        index.add([("doc1", "Completely different text", {})])
+
+        assert index.search("password") == []
+        assert index.count() == 3
+
+    def test_remove_and_clear(self, tmp_path):
+        index = _index(tmp_path)
+
+        index.remove(["doc2", "missing"])
+        assert index.search("E-1234") == []
+        assert index.count() == 2
+
+        index.clear()
+        assert index.count() == 0
+        assert index.search("password") == []
+
+    def test_persists(self, tmp_path):
+        _index(tmp_path).close()
+
+        reopened = LexicalIndex(tmp_path / "collection.lexical.sqlite3")
+
+        assert [doc_id for doc_id, *_ in reopened.search("quota")] == ["doc2"]
+
+    def test_build_match_query(self):
+        assert build_match_query('say "hi" -- now') == '"say" OR """hi""" OR "now"'
+        assert build_match_query("  ?! ") is None
@@ -0,0 +1,162 @@
+"""Tests for the read-only task RPC endpoint of the RAG worker."""
+
+import json
+import socket
+import threading
+from http.client import HTTPConnection
+from unittest.mock import patch
+
+import pytest
+
+from core.rpc_server import RPC_TOKEN_FILENAME, RPCServer, start_rpc_server
+
+TOKEN = "test-token"
+HEADERS = {"Content-Type": "application/json", "Authorization": f"Bearer {TOKEN}"}
+
+
+def _search(project_dir, database, query, top_k=5):
+    return [{"content": query, "database": database, "top_k": top_k}]
+
+
+def _failing_stats(project_dir, database):
+    raise ValueError(f"Database '{database}' not found")
+
+
+@pytest.fixture
+def rpc_server():
+    tasks = {
+        "rag.search_with_database": _search,
+        "rag.get_database_stats": _failing_stats,
+        "rag.ingest_file": lambda *args: pytest.fail("ingest must not be served"),
+    }
+    server = RPCServer(("127.0.0.1", 0), tasks, TOKEN)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(
+    conn: HTTPConnection, path: str, body: dict, headers: dict | None = None
+) -> tuple[int, dict]:
+    conn.request("POST", path, body=json.dumps(body), headers=headers or HEADERS)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+class TestRPCServer:
+    """Test task dispatch over the RPC endpoint."""
+
+    def test_runs_task_with_args_and_kwargs(self, rpc_server):
+        conn = HTTPConnection(*rpc_server.server_address)
+
+        status, body = _post(
+            conn,
+            "/tasks/rag.search_with_database",
+            {"args": ["/proj", "main_db", "hello"], "kwargs": {"top_k": 3}},
+        )
+
+        assert status == 200
+        assert body == {
+            "result": [{"content": "hello", "database": "main_db", "top_k": 3}]
+        }
+
+    def test_connection_is_kept_alive(self, rpc_server):
+        conn = HTTPConnection(*rpc_server.server_address)
+
+        for query in ("a", "b", "c"):
+            status, body = _post(
+                conn,
+                "/tasks/rag.search_with_database",
+                {"args": ["/proj", "db", query]},
+            )
+            assert status == 200
+            assert body["result"][0]["content"] == query
+
+    def test_task_error_does_not_return_traceback(self, rpc_server):
+        conn = HTTPConnection(*rpc_server.server_address)
+
+        status, body = _post(
+            conn, "/tasks/rag.get_database_stats", {"args": ["/proj", "missing"]}
+        )
+
+        assert status == 500
+        assert body == {"error": "Database 'missing' not found"}
+
+    def test_write_tasks_are_not_served(self, rpc_server):
+        conn = HTTPConnection(*rpc_server.server_address)
+
+        status, _ = _post(conn, "/tasks/rag.ingest_file", {"args": []})
+
+        assert status == 404
+
+    @pytest.mark.parametrize(
+        ("headers", "expected_status"),
+        [
+            ({"Content-Type": "application/json"}, 401),
+            (
+                {"Content-Type": "application/json", "Authorization": "Bearer nope"},
+                401,
+            ),
+            ({**HEADERS, "Content-Type": "text/plain"}, 415),
+            ({**HEADERS, "Host": "attacker.example:14346"}, 403),
+        ],
+    )
+    def test_rejects_unauthenticated_or_cross_site_requests(
+        self, rpc_server, headers, expected_status
+    ):
+        conn = HTTPConnection(*rpc_server.server_address)
+
+        status, _ = _post(
+            conn,
+            "/tasks/rag.search_with_database",
+            {"args": ["/proj", "db", "q"]},
+            headers=headers,
+        )
+
+        assert status == expected_status
+
+    def test_health(self, rpc_server):
+        conn = HTTPConnection(*rpc_server.server_address)
+        conn.request("GET", "/health")
+        response = conn.getresponse()
+
+        assert response.status == 200
+        assert json.loads(response.read()) == {"status": "ok"}
+
+
+class TestStartRPCServer:
+    """Test starting the endpoint from the worker."""
+
+    def test_disabled_with_port_zero(self):
+        with patch("core.rpc_server.settings.RAG_RPC_PORT", 0):
+            assert start_rpc_server({}) is None
+
+    def test_generated_token_is_written_to_data_dir(self, tmp_path):
+        with (
+            patch("core.rpc_server.settings.RAG_RPC_HOST", "127.0.0.1"),
+            patch("core.rpc_server.settings.RAG_RPC_PORT", 14346),
+            patch("core.rpc_server.settings.RAG_RPC_TOKEN", ""),
+            patch("core.rpc_server.settings.LF_DATA_DIR", str(tmp_path)),
+            patch("core.rpc_server.RPCServer") as MockServer,
+            patch("core.rpc_server.threading.Thread"),
+            patch("core.rpc_server._server", None),
+        ):
+            start_rpc_server({})
+
+        token = (tmp_path / RPC_TOKEN_FILENAME).read_text()
+        assert token
+        assert MockServer.call_args.args[2] == token
+
+    def test_bind_failure_is_not_fatal(self):
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            port = taken.getsockname()[1]
+
+            with (
+                patch("core.rpc_server.settings.RAG_RPC_HOST", "127.0.0.1"),
+                patch("core.rpc_server.settings.RAG_RPC_PORT", port),
+            ):
+                assert start_rpc_server({}) is None
@@ -399,7 +399,7 @@ class TestListDocumentsTaskAggregation:
 
         with (
             patch("tasks.stats_tasks.load_config", return_value=mock_config),
-            patch("tasks.stats_tasks.DatabaseSearchAPI", return_value=mock_search_api),
+            patch("api.DatabaseSearchAPI", return_value=mock_search_api),
         ):
             from tasks.stats_tasks import rag_list_database_documents_task
 
@@ -68,7 +68,7 @@ class TestUniversalEmbedder:
             embedder = UniversalEmbedder(config={"model": model})
             assert embedder.get_embedding_dimension() == expected_dim
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_validate_config_success(self, mock_get):
         """Test successful configuration validation."""
         # Mock health check
@@ -84,8 +84,19 @@ class TestUniversalEmbedder:
         embedder = UniversalEmbedder()
         assert embedder.validate_config() is True
 
+    @patch("requests.Session.get")
+    def test_validate_config_is_cached(self, mock_get):
+        """A successful health probe is reused by later embedders."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+
+        assert UniversalEmbedder().validate_config() is True
+        assert UniversalEmbedder().validate_config() is True
+        assert mock_get.call_count == 2  # /health and /models, probed once
+
     @patch("time.sleep")
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_validate_config_failure(self, mock_get, mock_sleep):
         """Test configuration validation failure after all retries."""
         mock_response = Mock()
@@ -98,7 +109,7 @@ class TestUniversalEmbedder:
         assert mock_sleep.call_count == 3
 
     @patch("time.sleep")
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_validate_config_exception(self, mock_get, mock_sleep):
         """Test configuration validation with exception after all retries."""
         mock_get.side_effect = Exception("Connection error")
@@ -109,7 +120,7 @@ class TestUniversalEmbedder:
         assert mock_sleep.call_count == 3
 
     @patch("time.sleep")
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_validate_config_retry_then_success(self, mock_get, mock_sleep):
         """Test validation succeeds after initial failures."""
         mock_health_ok = Mock()
@@ -130,7 +141,7 @@ class TestUniversalEmbedder:
         assert mock_sleep.call_count == 1
 
     @patch("time.sleep")
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_validate_config_health_retry_then_success(self, mock_get, mock_sleep):
         """Test validation retries when health check fails then succeeds."""
         mock_health_fail = Mock()
@@ -142,15 +153,15 @@ class TestUniversalEmbedder:
 
         mock_get.side_effect = [
             mock_health_fail,  # attempt 1: health fails
-            mock_health_ok,    # attempt 2: health ok
-            mock_models_ok,    # attempt 2: models ok
+            mock_health_ok,  # attempt 2: health ok
+            mock_models_ok,  # attempt 2: models ok
         ]
 
         embedder = UniversalEmbedder()
         assert embedder.validate_config() is True
         assert mock_sleep.call_count == 1
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_embed_single_text(self, mock_post):
         """Test embedding a single text."""
         mock_response = Mock()
@@ -164,16 +175,18 @@ class TestUniversalEmbedder:
         assert result == [0.1, 0.2, 0.3]
         assert mock_post.called
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_embed_multiple_texts(self, mock_post):
         """Test embedding multiple texts."""
         mock_response = Mock()
         mock_response.status_code = 200
-        # Now each text is embedded individually, so mock returns single embedding per call
-        mock_response.json.side_effect = [
-            {"data": [{"embedding": [0.1, 0.2, 0.3]}]},
-            {"data": [{"embedding": [0.4, 0.5, 0.6]}]},
-        ]
+        # One request for the whole batch; results are ordered by index
+        mock_response.json.return_value = {
+            "data": [
+                {"index": 1, "embedding": [0.4, 0.5, 0.6]},
+                {"index": 0, "embedding": [0.1, 0.2, 0.3]},
+            ]
+        }
         mock_post.return_value = mock_response
 
         embedder = UniversalEmbedder(config={"batch_size": 2})
@@ -183,8 +196,10 @@ class TestUniversalEmbedder:
         assert len(results) == 2
         assert results[0] == [0.1, 0.2, 0.3]
         assert results[1] == [0.4, 0.5, 0.6]
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[1]["json"]["input"] == texts
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_embed_empty_list(self, mock_post):
         """Test embedding empty list."""
         embedder = UniversalEmbedder()
@@ -193,7 +208,7 @@ class TestUniversalEmbedder:
         assert results == []
         assert not mock_post.called
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_embed_error_handling(self, mock_post):
         """Test error handling during embedding with fail_fast enabled (default)."""
         mock_response = Mock()
@@ -207,7 +222,7 @@ class TestUniversalEmbedder:
         with pytest.raises(EmbedderUnavailableError):
             embedder.embed_text("test text")
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_embed_error_handling_legacy_mode(self, mock_post):
         """Test error handling during embedding with fail_fast=False (legacy mode)."""
         mock_response = Mock()
@@ -223,17 +238,21 @@ class TestUniversalEmbedder:
         assert len(result) == expected_dim  # Ensure proper dimensions, not empty
         assert result == [0.0] * expected_dim
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_embed_batch_processing(self, mock_post):
         """Test batch processing of texts."""
         mock_response = Mock()
         mock_response.status_code = 200
 
-        # Now each text is embedded individually via embed_text
+        # One request per batch of batch_size texts
         mock_response.json.side_effect = [
-            {"data": [{"embedding": [0.1]}]},
-            {"data": [{"embedding": [0.2]}]},
-            {"data": [{"embedding": [0.3]}]},
+            {
+                "data": [
+                    {"index": 0, "embedding": [0.1]},
+                    {"index": 1, "embedding": [0.2]},
+                ]
+            },
+            {"data": [{"index": 0, "embedding": [0.3]}]},
         ]
         mock_post.return_value = mock_response
 
@@ -241,8 +260,45 @@ class TestUniversalEmbedder:
         texts = ["text 1", "text 2", "text 3"]
         results = embedder.embed(texts)
 
-        assert len(results) == 3
-        assert mock_post.call_count == 3  # One call per text
+        assert results == [[0.1], [0.2], [0.3]]
+        assert mock_post.call_count == 2  # One call per batch
+
+    @patch("requests.Session.post")
+    def test_embed_batch_rejects_invalid_vector(self, mock_post):
+        """A zero vector in a batch response fails like a single bad embedding."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "data": [
+                {"index": 0, "embedding": [0.1, 0.2]},
+                {"index": 1, "embedding": [0.0, 0.0]},
+            ]
+        }
+        mock_post.return_value = mock_response
+
+        embedder = UniversalEmbedder(config={"fail_fast": False})
+        expected_dim = embedder.get_embedding_dimension()
+        results = embedder.embed(["good", "bad"])
+
+        assert results[0] == [0.1, 0.2]
+        assert results[1] == [0.0] * expected_dim
+        assert embedder._circuit_breaker.failure_count == 1
+
+        with pytest.raises(EmbedderUnavailableError):
+            UniversalEmbedder().embed(["good", "bad"])
+
+    @patch("requests.Session.post")
+    def test_embed_batch_count_mismatch(self, mock_post):
+        """A response with fewer embeddings than inputs is an embedder failure."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": [{"index": 0, "embedding": [0.1]}]}
+        mock_post.return_value = mock_response
+
+        embedder = UniversalEmbedder()
+
+        with pytest.raises(EmbedderUnavailableError):
+            embedder.embed(["text 1", "text 2"])
 
     def test_get_description(self):
         """Test class description."""
@@ -256,7 +312,7 @@ class TestUniversalEmbedder:
             embedder = UniversalEmbedder()
             assert embedder._check_model_availability() is True
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_api_key_header(self, mock_post):
         """Test that API key is included in headers."""
         mock_response = Mock()
@@ -273,7 +329,7 @@ class TestUniversalEmbedder:
         assert "Authorization" in headers
         assert headers["Authorization"] == "Bearer test-key"
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_empty_text_handling(self, mock_post):
         """Test handling of empty or whitespace-only text with fail_fast enabled (default)."""
         embedder = UniversalEmbedder()
@@ -289,7 +345,7 @@ class TestUniversalEmbedder:
         # Should not call API
         assert not mock_post.called
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_empty_text_handling_legacy_mode(self, mock_post):
         """Test handling of empty or whitespace-only text with fail_fast=False (legacy mode)."""
         embedder = UniversalEmbedder(config={"fail_fast": False})
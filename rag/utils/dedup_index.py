@@ -0,0 +1,114 @@
+"""
+Persistent hash index for vector store deduplication.
+
+Stores document, chunk and source hashes next to a collection so that
+duplicates are recognised across ingestions, worker restarts and store
+instances, not only within a single ingestion run.
+
+Each hash maps to the ID of the document that was stored for it. Callers are
+expected to confirm that ID still exists in the collection before treating a
+hash as a duplicate, so entries left behind by out-of-band deletes are
+harmless.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from core.logging import RAGStructLogger
+from utils.sqlite_utils import batched
+
+logger = RAGStructLogger("rag.utils.dedup_index")
+
+HASH_KINDS = ("document", "chunk", "source")
+
+
+class PersistentDedupIndex:
+    """SQLite-backed map of (hash kind, hash) -> document ID."""
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite file to store the index in
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                " kind TEXT NOT NULL,"
+                " hash TEXT NOT NULL,"
+                " doc_id TEXT NOT NULL,"
+                " PRIMARY KEY (kind, hash))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS hashes_doc_id ON hashes (doc_id)"
+            )
+
+    def lookup(self, kind: str, hashes: Iterable[str]) -> dict[str, str]:
+        """
+        Find which of the given hashes are already indexed.
+
+        Args:
+            kind: One of HASH_KINDS
+            hashes: Hashes to look up
+
+        Returns:
+            Mapping of each indexed hash to its document ID
+        """
+        unique = list(dict.fromkeys(h for h in hashes if h))
+        found: dict[str, str] = {}
+        with self._lock:
+            for batch in batched(unique):
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, doc_id FROM hashes"
+                    f" WHERE kind = ? AND hash IN ({placeholders})",
+                    [kind, *batch],
+                )
+                found.update(rows.fetchall())
+        return found
+
+    def register(self, entries: Iterable[tuple[str, str, str]]) -> None:
+        """
+        Record hashes for newly stored documents in one transaction.
+
+        Args:
+            entries: (kind, hash, doc_id) tuples; existing hashes are remapped
+        """
+        rows = [(kind, h, doc_id) for kind, h, doc_id in entries if h]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hashes (kind, hash, doc_id) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def remove_documents(self, doc_ids: Iterable[str]) -> None:
+        """Forget every hash that points at one of the given document IDs."""
+        ids = list(dict.fromkeys(doc_ids))
+        with self._lock, self._conn:
+            for batch in batched(ids):
+                placeholders = ",".join("?" * len(batch))
+                self._conn.execute(
+                    f"DELETE FROM hashes WHERE doc_id IN ({placeholders})", batch
+                )
+
+    def clear(self) -> None:
+        """Forget all hashes, e.g. after the collection was dropped."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM hashes")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -7,6 +7,7 @@ This module provides:
 - Health check utilities for embedders
 """
 
+import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
@@ -74,72 +75,77 @@ class CircuitBreaker:
 
     def __post_init__(self):
         self._name = "CircuitBreaker"
+        # Embedding batches may run on several threads at once
+        self._lock = threading.RLock()
 
     def can_execute(self) -> bool:
         """Check if a request can be executed."""
-        if self.state == CircuitState.CLOSED:
-            return True
-
-        if self.state == CircuitState.OPEN:
-            # Check if reset timeout has passed
-            if time.time() - self.last_failure_time >= self.reset_timeout:
-                logger.info(
-                    "Circuit breaker transitioning to half-open state",
-                    extra={"reset_timeout": self.reset_timeout},
-                )
-                self.state = CircuitState.HALF_OPEN
-                self.half_open_calls = 0  # Reset counter, will be incremented below
-                # Fall through to HALF_OPEN check
-            else:
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+
+            if self.state == CircuitState.OPEN:
+                # Check if reset timeout has passed
+                if time.time() - self.last_failure_time >= self.reset_timeout:
+                    logger.info(
+                        "Circuit breaker transitioning to half-open state",
+                        extra={"reset_timeout": self.reset_timeout},
+                    )
+                    self.state = CircuitState.HALF_OPEN
+                    self.half_open_calls = 0  # Reset counter, will be incremented below
+                    # Fall through to HALF_OPEN check
+                else:
+                    return False
+
+            if self.state == CircuitState.HALF_OPEN:
+                # Allow limited calls in half-open state
+                if self.half_open_calls < self.half_open_max_calls:
+                    self.half_open_calls += 1
+                    return True
                 return False
 
-        if self.state == CircuitState.HALF_OPEN:
-            # Allow limited calls in half-open state
-            if self.half_open_calls < self.half_open_max_calls:
-                self.half_open_calls += 1
-                return True
             return False
 
-        return False
-
     def record_success(self) -> None:
         """Record a successful request."""
-        if self.state == CircuitState.HALF_OPEN:
-            self.success_count += 1
-            if self.success_count >= self.half_open_max_calls:
-                logger.info(
-                    "Circuit breaker closing after successful recovery",
-                    extra={"success_count": self.success_count},
-                )
-                self._reset()
-        else:
-            # Reset failure count on success in closed state
-            self.failure_count = 0
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.success_count += 1
+                if self.success_count >= self.half_open_max_calls:
+                    logger.info(
+                        "Circuit breaker closing after successful recovery",
+                        extra={"success_count": self.success_count},
+                    )
+                    self._reset()
+            else:
+                # Reset failure count on success in closed state
+                self.failure_count = 0
 
     def record_failure(self, error: Exception | None = None) -> None:
         """Record a failed request."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-
-        if self.state == CircuitState.HALF_OPEN:
-            # Any failure in half-open state reopens the circuit
-            logger.warning(
-                "Circuit breaker reopening after failure in half-open state",
-                extra={"error": str(error) if error else "Unknown"},
-            )
-            self.state = CircuitState.OPEN
-            self.half_open_calls = 0
-            self.success_count = 0
-        elif self.failure_count >= self.failure_threshold:
-            logger.error(
-                "Circuit breaker opening due to consecutive failures",
-                extra={
-                    "failure_count": self.failure_count,
-                    "threshold": self.failure_threshold,
-                    "error": str(error) if error else "Unknown",
-                },
-            )
-            self.state = CircuitState.OPEN
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+
+            if self.state == CircuitState.HALF_OPEN:
+                # Any failure in half-open state reopens the circuit
+                logger.warning(
+                    "Circuit breaker reopening after failure in half-open state",
+                    extra={"error": str(error) if error else "Unknown"},
+                )
+                self.state = CircuitState.OPEN
+                self.half_open_calls = 0
+                self.success_count = 0
+            elif self.failure_count >= self.failure_threshold:
+                logger.error(
+                    "Circuit breaker opening due to consecutive failures",
+                    extra={
+                        "failure_count": self.failure_count,
+                        "threshold": self.failure_threshold,
+                        "error": str(error) if error else "Unknown",
+                    },
+                )
+                self.state = CircuitState.OPEN
 
     def _reset(self) -> None:
         """Reset the circuit breaker to closed state."""
@@ -150,24 +156,26 @@ class CircuitBreaker:
 
     def get_state_info(self) -> dict[str, Any]:
         """Get current state information."""
-        info = {
-            "state": self.state.value,
-            "failure_count": self.failure_count,
-            "failure_threshold": self.failure_threshold,
-        }
-
-        if self.state == CircuitState.OPEN:
-            time_until_reset = max(
-                0, self.reset_timeout - (time.time() - self.last_failure_time)
-            )
-            info["time_until_reset"] = round(time_until_reset, 1)
+        with self._lock:
+            info = {
+                "state": self.state.value,
+                "failure_count": self.failure_count,
+                "failure_threshold": self.failure_threshold,
+            }
+
+            if self.state == CircuitState.OPEN:
+                time_until_reset = max(
+                    0, self.reset_timeout - (time.time() - self.last_failure_time)
+                )
+                info["time_until_reset"] = round(time_until_reset, 1)
 
-        return info
+            return info
 
     def force_reset(self) -> None:
         """Force reset the circuit breaker (for manual recovery)."""
-        logger.info("Circuit breaker manually reset")
-        self._reset()
+        with self._lock:
+            logger.info("Circuit breaker manually reset")
+            self._reset()
 
 
 def is_zero_vector(embedding: list[float], tolerance: float = 1e-10) -> bool:
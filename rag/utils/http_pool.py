@@ -0,0 +1,102 @@
+"""
+Shared HTTP connection pools for RAG components.
+
+Embedders and retrievers talk to the same few services (Universal Runtime,
+Ollama) for every chunk and query. Instead of opening a new connection per
+request, components share one keep-alive pool per base URL, and cache
+successful health probes so building a handler does not re-check a service
+that was healthy moments ago.
+
+Configuration (see core.settings):
+- HTTP_POOL_MAXSIZE: Connections kept alive per base URL (default: 16)
+- HEALTH_CHECK_TTL_SECONDS: How long a successful health probe is reused
+  (default: 30, 0 disables caching)
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.settings import settings
+
+_lock = threading.Lock()
+_sessions: dict[str, requests.Session] = {}
+_health_cache: dict[str, float] = {}
+
+
+def _pool_key(base_url: str) -> str:
+    """Reduce a URL to scheme://host:port so all paths share one pool."""
+    parsed = urlparse(base_url)
+    if not parsed.netloc:
+        return base_url.rstrip("/")
+    return f"{parsed.scheme or 'http'}://{parsed.netloc}"
+
+
+def get_session(base_url: str) -> requests.Session:
+    """Return the process-wide keep-alive session for a base URL.
+
+    Up to HTTP_POOL_MAXSIZE connections are kept alive; requests beyond that
+    open a short-lived extra connection instead of waiting.
+
+    Args:
+        base_url: Any URL on the target service
+
+    Returns:
+        Shared requests.Session
+    """
+    key = _pool_key(base_url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=max(settings.HTTP_POOL_MAXSIZE, 1)
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close all sessions; called on worker shutdown."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def cached_health_check(key: str, probe: Callable[[], bool]) -> bool:
+    """Run a health probe unless it succeeded within HEALTH_CHECK_TTL_SECONDS.
+
+    Only successes are cached, so an unhealthy service is re-probed on
+    every call.
+
+    Args:
+        key: Identifies the service (e.g. "universal:http://host:11540/v1")
+        probe: Performs the actual check and returns True if healthy
+
+    Returns:
+        Result of the probe, or True if a recent probe succeeded
+    """
+    ttl = settings.HEALTH_CHECK_TTL_SECONDS
+    checked_at = _health_cache.get(key)
+    if ttl > 0 and checked_at is not None and time.monotonic() - checked_at < ttl:
+        return True
+
+    healthy = probe()
+    if healthy:
+        _health_cache[key] = time.monotonic()
+    else:
+        _health_cache.pop(key, None)
+    return healthy
+
+
+def clear_health_cache() -> None:
+    """Forget all cached health probes."""
+    _health_cache.clear()
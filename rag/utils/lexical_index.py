@@ -0,0 +1,216 @@
+"""
+Persistent BM25 keyword index for vector store collections.
+
+Dense retrieval misses exact-term queries (part numbers, error codes, names),
+so stores keep this lexical index next to their collection and update it in
+add_documents / delete_documents. It is an SQLite FTS5 inverted index:
+postings are stored compressed on disk and a query only reads the postings of
+its terms, so lookups stay fast on collections with millions of chunks.
+
+The FTS5 table is contentless; document content is kept zlib-compressed
+next to it together with the metadata, so keyword hits can be returned
+without a round trip to the vector store.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from core.logging import RAGStructLogger
+from utils.sqlite_utils import batched
+
+logger = RAGStructLogger("rag.utils.lexical_index")
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def build_match_query(text: str) -> str | None:
+    """
+    Turn free text into an FTS5 query matching any of its words.
+
+    Every whitespace-separated word becomes a quoted FTS5 string, so
+    punctuation never breaks the query syntax and words the tokenizer splits
+    (``E-1234``, ``v2.1``) must match as an adjacent phrase.
+    """
+    words = [w.replace('"', '""') for w in _WORD_RE.findall(text)]
+    words = [w for w in words if any(ch.isalnum() for ch in w)]
+    if not words:
+        return None
+    return " OR ".join(f'"{w}"' for w in dict.fromkeys(words))
+
+
+def _decompress(content: bytes) -> str:
+    return zlib.decompress(content).decode("utf-8")
+
+
+class LexicalIndex:
+    """SQLite FTS5 index of document content, ranked with BM25."""
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite file to store the index in
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " id INTEGER PRIMARY KEY,"
+                " doc_id TEXT NOT NULL UNIQUE,"
+                " content BLOB NOT NULL,"
+                " metadata TEXT)"
+            )
+            # Contentless table: only postings, the text lives in documents
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+                " content, content='',"
+                " tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def add(self, entries: Iterable[tuple[str, str, dict[str, Any] | None]]) -> None:
+        """
+        Index documents in one transaction, replacing existing entries.
+
+        Args:
+            entries: (doc_id, content, metadata) tuples
+        """
+        # Keyed by doc_id so repeated IDs keep only their last entry
+        rows = list(
+            {
+                doc_id: (doc_id, content or "", json.dumps(metadata or {}, default=str))
+                for doc_id, content, metadata in entries
+                if doc_id
+            }.values()
+        )
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._remove([doc_id for doc_id, _, _ in rows])
+            for doc_id, content, metadata in rows:
+                cursor = self._conn.execute(
+                    "INSERT INTO documents (doc_id, content, metadata) VALUES (?, ?, ?)",
+                    (doc_id, zlib.compress(content.encode("utf-8")), metadata),
+                )
+                self._conn.execute(
+                    "INSERT INTO documents_fts (rowid, content) VALUES (?, ?)",
+                    (cursor.lastrowid, content),
+                )
+
+    def _remove(self, doc_ids: list[str]) -> None:
+        for batch in batched(list(dict.fromkeys(doc_ids))):
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT id, content FROM documents WHERE doc_id IN ({placeholders})",
+                batch,
+            ).fetchall()
+            if not rows:
+                continue
+            # Contentless tables need the old content to drop postings
+            self._conn.executemany(
+                "INSERT INTO documents_fts (documents_fts, rowid, content)"
+                " VALUES ('delete', ?, ?)",
+                [(row_id, _decompress(content)) for row_id, content in rows],
+            )
+            self._conn.execute(
+                f"DELETE FROM documents WHERE doc_id IN ({placeholders})", batch
+            )
+
+    def remove(self, doc_ids: Iterable[str]) -> None:
+        """Drop documents from the index."""
+        with self._lock, self._conn:
+            self._remove(list(doc_ids))
+
+    def clear(self) -> None:
+        """Drop all documents, e.g. after the collection was deleted."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents")
+            self._conn.execute(
+                "INSERT INTO documents_fts (documents_fts) VALUES ('delete-all')"
+            )
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+        return count
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        metadata_filter: dict[str, Any] | None = None,
+    ) -> list[tuple[str, str, dict[str, Any], float]]:
+        """
+        Find the documents that best match the query words.
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of results
+            metadata_filter: Metadata values the results must equal; list
+                values match any of their items
+
+        Raises:
+            ValueError: If the filter uses operators
+
+        Returns:
+            (doc_id, content, metadata, bm25_score) tuples, best match first.
+            Higher scores are better.
+        """
+        match_query = build_match_query(query)
+        if match_query is None or top_k <= 0:
+            return []
+
+        clauses = ["documents_fts MATCH ?"]
+        params: list[Any] = [match_query]
+        for key, value in (metadata_filter or {}).items():
+            if isinstance(value, dict):
+                raise ValueError(f"Unsupported lexical filter for {key!r}: {value!r}")
+            path = f'$."{key}"'
+            if isinstance(value, list | tuple | set):
+                values = list(value)
+                clauses.append(
+                    f"json_extract(d.metadata, ?) IN ({','.join('?' * len(values))})"
+                )
+                params.extend([path, *values])
+            else:
+                clauses.append("json_extract(d.metadata, ?) = ?")
+                params.extend([path, value])
+        params.append(top_k)
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.doc_id, d.content, d.metadata, bm25(documents_fts) AS rank"
+                " FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+                f" WHERE {' AND '.join(clauses)}"
+                " ORDER BY rank LIMIT ?",
+                params,
+            ).fetchall()
+
+        # FTS5's bm25() is negated so that ascending order ranks best first
+        return [
+            (
+                doc_id,
+                _decompress(content),
+                json.loads(metadata) if metadata else {},
+                -rank,
+            )
+            for doc_id, content, metadata, rank in rows
+        ]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,17 @@
+"""
+Helpers shared by the SQLite-backed indexes (dedup, lexical, FAISS metadata).
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+MAX_SQL_PARAMS = 500
+
+
+def batched(values: Sequence[T], size: int = MAX_SQL_PARAMS) -> Iterable[list[T]]:
+    """Split values into chunks small enough to bind in one ``IN (...)`` query."""
+    for i in range(0, len(values), size):
+        yield list(values[i : i + size])
@@ -18,6 +18,8 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from transformers import AutoConfig
 
+from utils.embedding_batcher import EmbeddingBatcher
+
 from .base import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -86,6 +88,8 @@ class EncoderModel(BaseModel):
         self._use_flash_attention = use_flash_attention
         self._flash_attention_enabled: bool = False  # Track actual activation
         self._detected_max_length: int = 512  # Will be updated on load
+        # Gathers concurrent embed() calls into shared forward passes
+        self._batcher = EmbeddingBatcher(self._embed_batch)
 
     @property
     def max_length(self) -> int:
@@ -268,31 +272,65 @@ class EncoderModel(BaseModel):
         assert self.model is not None, "Model not loaded"
         assert self.tokenizer is not None, "Tokenizer not loaded"
 
-        # Tokenize with configured max_length
-        encoded = self.tokenizer(
-            texts,
-            padding=True,
-            truncation=True,
-            max_length=self.max_length,
-            return_tensors="pt",
-        )
-        encoded = {k: v.to(self.device) for k, v in encoded.items()}
+        return await self._batcher.embed(texts, normalize=normalize)
+
+    async def _embed_batch(
+        self, texts: list[str], normalize: bool
+    ) -> list[list[float]]:
+        """Embed a gathered batch off the event loop."""
+        return await asyncio.to_thread(self._embed_sync, texts, normalize)
+
+    def _embed_sync(self, texts: list[str], normalize: bool) -> list[list[float]]:
+        """Tokenize, sort by length and run padded forward passes.
 
-        # Generate embeddings
+        Texts are sorted by token length so each forward pass pads to similar
+        lengths, and split so no pass exceeds the batcher's token budget.
+        Results are returned in input order.
+        """
         import torch
         import torch.nn.functional as F
 
-        with torch.no_grad():
-            model_output = self.model(**encoded)
+        assert self.model is not None, "Model not loaded"
+        assert self.tokenizer is not None, "Tokenizer not loaded"
 
-        # Mean pooling
-        embeddings = self._mean_pooling(model_output, encoded["attention_mask"])
+        # Tokenize once without padding to learn each text's length
+        features = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        order = sorted(range(len(texts)), key=lambda i: len(features["input_ids"][i]))
+
+        results: list[list[float]] = [[] for _ in texts]
+        budget = self._batcher.max_batch_tokens
+        start = 0
+        while start < len(order):
+            # Sorted ascending, so the last text in a chunk sets its padding
+            end = start + 1
+            while (
+                end < len(order)
+                and len(features["input_ids"][order[end]]) * (end - start + 1) <= budget
+            ):
+                end += 1
+            chunk = order[start:end]
 
-        # Normalize
-        if normalize:
-            embeddings = F.normalize(embeddings, p=2, dim=1)
+            encoded = self.tokenizer.pad(
+                {key: [values[i] for i in chunk] for key, values in features.items()},
+                return_tensors="pt",
+            )
+            encoded = {k: v.to(self.device) for k, v in encoded.items()}
 
-        return embeddings.cpu().tolist()
+            with torch.no_grad():
+                model_output = self.model(**encoded)
+
+            # Mean pooling
+            embeddings = self._mean_pooling(model_output, encoded["attention_mask"])
+
+            # Normalize
+            if normalize:
+                embeddings = F.normalize(embeddings, p=2, dim=1)
+
+            for i, vector in zip(chunk, embeddings.cpu().tolist(), strict=True):
+                results[i] = vector
+            start = end
+
+        return results
 
     async def classify(self, texts: list[str]) -> list[dict[str, Any]]:
         """
@@ -13,6 +13,7 @@ import sys
 from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
+from utils.embedding_batcher import EmbeddingBatcher
 from utils.gguf_metadata_cache import get_gguf_metadata_cached
 from utils.gpu_allocator import InsufficientVRAMError, get_llama_gpu_params
 from utils.model_format import get_gguf_file_path
@@ -24,6 +25,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Per-input context window and number of inputs packed into one decode
+EMBEDDING_N_CTX = 512
+EMBEDDING_N_SEQ_MAX = 8
+
 
 class GGUFEncoderModel(BaseModel):
     """Wrapper for GGUF embedding models using llama-cpp.
@@ -63,6 +68,8 @@ class GGUFEncoderModel(BaseModel):
         self.llama: Llama | None = None
         self.preferred_quantization = preferred_quantization
         self._executor = ThreadPoolExecutor(max_workers=1)
+        # Gathers concurrent embed() calls into shared llama.embed() calls
+        self._batcher = EmbeddingBatcher(self._embed_batch)
 
     async def load(self) -> None:
         """Load the GGUF embedding model using llama-cpp.
@@ -100,10 +107,12 @@ class GGUFEncoderModel(BaseModel):
 
         n_gpu_layers = get_gguf_gpu_layers()
 
-        # Embedding models use a small, fixed context window.  This value
-        # is shared between the VRAM estimator and the Llama() constructor
-        # so that the allocation decision matches actual memory usage.
-        embedding_n_ctx = 512
+        # Embedding models use a small, fixed context window per input.  Up to
+        # EMBEDDING_N_SEQ_MAX inputs are packed into one decode, so the shared
+        # context holds that many windows.  This value is shared between the
+        # VRAM estimator and the Llama() constructor so that the allocation
+        # decision matches actual memory usage.
+        embedding_n_ctx = EMBEDDING_N_CTX * EMBEDDING_N_SEQ_MAX
 
         # GPU allocation: select optimal GPU based on free VRAM
         gpu_params = {}
@@ -161,6 +170,8 @@ class GGUFEncoderModel(BaseModel):
                 model_path=gguf_path,
                 embedding=True,  # Enable embedding mode
                 n_ctx=embedding_n_ctx,
+                n_batch=embedding_n_ctx,
+                n_seq_max=EMBEDDING_N_SEQ_MAX,  # Inputs packed per decode
                 n_gpu_layers=n_gpu_layers,
                 n_threads=None,  # Auto-detect optimal threads
                 verbose=False,  # Disable verbose logging
@@ -202,19 +213,22 @@ class GGUFEncoderModel(BaseModel):
         if not texts:
             return []
 
+        return await self._batcher.embed(texts, normalize=normalize)
+
+    async def _embed_batch(
+        self, texts: list[str], normalize: bool
+    ) -> list[list[float]]:
+        """Embed a gathered batch in the model's worker thread."""
+        assert self.llama is not None, "Model not loaded. Call load() first."
+
         # Run embedding generation in thread pool (blocking call)
         loop = asyncio.get_running_loop()
 
         def _generate_embeddings():
             """Generate embeddings in separate thread."""
             try:
-                embeddings = []
-                for text in texts:
-                    # llama-cpp create_embedding returns dict with 'data' key
-                    result = self.llama.create_embedding(input=text)
-                    embedding = result["data"][0]["embedding"]
-                    embeddings.append(embedding)
-                return embeddings
+                # All texts go through one call so they can share batches
+                return self.llama.embed(texts, normalize=normalize)
             except Exception as e:
                 logger.error(
                     f"Error during llama-cpp embedding generation: {e}",
@@ -227,18 +241,7 @@ class GGUFEncoderModel(BaseModel):
                 self._executor, _generate_embeddings
             )
 
-            # Apply L2 normalization if requested
-            if normalize:
-                import numpy as np
-
-                embeddings_array = np.array(embeddings)
-                norms = np.linalg.norm(embeddings_array, axis=1, keepdims=True)
-                # Avoid division by zero
-                norms = np.maximum(norms, 1e-9)
-                embeddings_array = embeddings_array / norms
-                embeddings = embeddings_array.tolist()
-
-            return embeddings
+            return embeddings.tolist()
         except RuntimeError:
             # Re-raise errors from _generate_embeddings() with their original message
             raise
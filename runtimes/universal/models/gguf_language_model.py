@@ -11,13 +11,16 @@ import asyncio
 import logging
 import os
 import sys
-from collections.abc import AsyncGenerator
+import threading
+from collections.abc import AsyncGenerator, Callable
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, suppress
 from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from utils.context_calculator import get_default_context_size
 from utils.context_manager import ContextBudget, ContextManager, ContextUsage
+from utils.device import get_available_memory_bytes
 from utils.gguf_metadata_cache import get_gguf_metadata_cached
 from utils.gpu_allocator import (
     SPLIT_MODE_LAYER,
@@ -25,16 +28,64 @@ from utils.gpu_allocator import (
     InsufficientVRAMError,
     get_llama_gpu_params,
 )
-from utils.model_format import get_gguf_file_path
+from utils.model_format import get_gguf_file_path, parse_model_with_quantization
+from utils.safe_home import get_data_dir
 from utils.token_counter import TokenCounter
+from utils.tool_calling import StreamingToolCallParser
 
 from .base import BaseModel
 
 if TYPE_CHECKING:
-    from llamafarm_llama import Llama
+    from llamafarm_llama import ContinuousBatcher, Llama, LlamaDiskCache
 
 logger = logging.getLogger(__name__)
 
+# Default number of draft tokens verified per speculative decoding step
+DEFAULT_N_DRAFT = 8
+
+# Default on-disk budget for persisted KV snapshots of conversations
+DEFAULT_KV_CACHE_SIZE_MB = 4096
+
+
+@lru_cache(maxsize=1)
+def _get_kv_disk_cache() -> LlamaDiskCache | None:
+    """Return the process-wide on-disk KV snapshot cache, or None if disabled.
+
+    Snapshots let a conversation resume without re-decoding its history after
+    its model was unloaded (idle timeout, restart). All GGUF models share one
+    size-bounded LRU directory; entries are keyed by model + prompt prefix hash.
+
+    Environment variables:
+        LLAMAFARM_KV_CACHE_DIR: Snapshot directory (default LF_DATA_DIR/cache/kv)
+        LLAMAFARM_KV_CACHE_SIZE_MB: Size budget in MB (default 4096, 0 disables)
+    """
+    try:
+        size_mb = int(
+            os.environ.get("LLAMAFARM_KV_CACHE_SIZE_MB", DEFAULT_KV_CACHE_SIZE_MB)
+        )
+    except ValueError:
+        size_mb = DEFAULT_KV_CACHE_SIZE_MB
+    if size_mb <= 0:
+        logger.info("KV snapshot disk cache disabled (LLAMAFARM_KV_CACHE_SIZE_MB=0)")
+        return None
+
+    cache_dir = os.environ.get("LLAMAFARM_KV_CACHE_DIR") or str(
+        get_data_dir() / "cache" / "kv"
+    )
+    try:
+        from llamafarm_llama import LlamaDiskCache
+
+        cache = LlamaDiskCache(cache_dir, capacity_bytes=size_mb * 1024 * 1024)
+    except (ImportError, OSError) as e:
+        logger.warning(f"KV snapshot disk cache unavailable: {e}")
+        return None
+
+    logger.info(
+        f"KV snapshot disk cache: {cache_dir} ({len(cache)} snapshots, "
+        f"{cache.cache_size / (1024 * 1024):.0f}/{size_mb} MB)"
+    )
+    return cache
+
 
 @lru_cache(maxsize=1)
 def _is_unified_memory_gpu() -> bool:
@@ -88,6 +139,52 @@ def _is_unified_memory_gpu() -> bool:
     return False
 
 
+class _TokenHandoff:
+    """Hands streamed text from a generation thread to the event loop in batches.
+
+    The thread appends to a pending list and schedules at most one flush on the
+    loop at a time, so it never waits on the loop and a burst of tokens costs a
+    single wake-up instead of a blocking round trip per token.
+
+    Items are text chunks, an exception to raise in the consumer, or None to
+    end the stream.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._pending: list[str | Exception | None] = []
+        self._flush_scheduled = False
+        self._queue: asyncio.Queue[list[str | Exception | None]] = asyncio.Queue()
+
+    def put(self, item: str | Exception | None) -> None:
+        """Queue an item from the generation thread."""
+        with self._lock:
+            self._pending.append(item)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        # A closed event loop means nobody is reading the stream any more
+        with suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self) -> None:
+        with self._lock:
+            items, self._pending = self._pending, []
+            self._flush_scheduled = False
+        self._queue.put_nowait(items)
+
+    async def items(self) -> AsyncGenerator[str, None]:
+        """Yield text chunks until the stream ends, raising queued exceptions."""
+        while True:
+            for item in await self._queue.get():
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+
+
 class GGUFLanguageModel(BaseModel):
     """Wrapper for GGUF models using llama-cpp.
 
@@ -120,6 +217,9 @@ class GGUFLanguageModel(BaseModel):
         preferred_quantization: str | None = None,
         mmproj_path: str | None = None,
         auto_detect_mmproj: bool = True,
+        n_parallel: int | None = None,
+        draft_model_id: str | None = None,
+        n_draft: int | None = None,
     ):
         """Initialize GGUF language model.
 
@@ -156,6 +256,15 @@ class GGUFLanguageModel(BaseModel):
                          file in the same repository.
             auto_detect_mmproj: If True (default), automatically detect and download mmproj
                                 files for multimodal models like Qwen2.5-Omni.
+            n_parallel: Optional number of concurrent sequence slots. Values above 1
+                        enable continuous batching: concurrent requests share decode
+                        steps instead of queueing behind each other. If None, reads
+                        LLAMAFARM_N_PARALLEL (default 1 = serialized generation).
+            draft_model_id: Optional small GGUF model (e.g., "unsloth/Qwen3-0.6B-GGUF:Q4_K_M")
+                            sharing this model's vocabulary. Enables speculative decoding:
+                            the draft proposes tokens and the main model verifies them in
+                            one batched decode. Not used with n_parallel > 1.
+            n_draft: Optional maximum draft tokens verified per step. If None, defaults to 8.
         """
         super().__init__(model_id, device, token=token)
         self.model_type = "language"
@@ -186,7 +295,12 @@ class GGUFLanguageModel(BaseModel):
         self.preferred_quantization = preferred_quantization
         self.requested_mmproj_path = mmproj_path  # Explicit mmproj path
         self.auto_detect_mmproj = auto_detect_mmproj  # Auto-detect mmproj files
+        self.requested_n_parallel = n_parallel  # Store requested value (None = env/1)
+        self.draft_model_id = draft_model_id  # Draft model for speculative decoding
+        self.requested_n_draft = n_draft  # Store requested value (None = default 8)
+        self._draft: Llama | None = None
         self._executor = ThreadPoolExecutor(max_workers=1)
+        self._batcher: ContinuousBatcher | None = None
 
         # Context management (initialized during load())
         self._token_counter: TokenCounter | None = None
@@ -209,26 +323,10 @@ class GGUFLanguageModel(BaseModel):
         Returns:
             Available memory in MB, or None if unable to determine.
         """
-        try:
-            # Try Linux /proc/meminfo first (works on Jetson and most Linux)
-            with open("/proc/meminfo") as f:
-                for line in f:
-                    if "MemAvailable" in line:
-                        # Format: "MemAvailable:   1234567 kB"
-                        return int(line.split()[1]) // 1024
-        except (FileNotFoundError, PermissionError, OSError):
-            pass
-
-        # Fallback: try psutil if available
-        try:
-            import psutil
-
-            return int(psutil.virtual_memory().available / (1024 * 1024))
-        except ImportError:
-            pass
-
-        # Unable to determine available memory
-        return None
+        available = get_available_memory_bytes()
+        if available is None:
+            return None
+        return available // (1024 * 1024)
 
     async def load(self) -> None:
         """Load the GGUF model using llama-cpp.
@@ -440,6 +538,46 @@ class GGUFLanguageModel(BaseModel):
         if cache_type_v is not None:
             logger.info(f"Using cache_type_v: {cache_type_v}")
 
+        # Configure continuous batching (1 = serialized single-sequence generation)
+        n_parallel = self.requested_n_parallel
+        if n_parallel is None:
+            try:
+                n_parallel = int(os.environ.get("LLAMAFARM_N_PARALLEL", "1"))
+            except ValueError:
+                n_parallel = 1
+        n_parallel = max(1, n_parallel)
+        if n_parallel > 1:
+            logger.info(f"Using continuous batching with {n_parallel} sequence slots")
+
+        # Locate the draft model for speculative decoding
+        draft_path = None
+        n_draft = (
+            self.requested_n_draft
+            if self.requested_n_draft is not None
+            else DEFAULT_N_DRAFT
+        )
+        if self.draft_model_id is not None:
+            if n_parallel > 1:
+                logger.warning(
+                    "Speculative decoding is not supported with continuous batching; "
+                    f"ignoring draft model {self.draft_model_id}"
+                )
+            else:
+                draft_id, draft_quantization = parse_model_with_quantization(
+                    self.draft_model_id
+                )
+                draft_path = get_gguf_file_path(
+                    draft_id,
+                    self.token,
+                    preferred_quantization=draft_quantization,
+                )
+                if sys.platform == "win32":
+                    draft_path = draft_path.replace("\\", "/")
+                logger.info(
+                    f"Using draft model for speculative decoding: {draft_path} "
+                    f"(n_draft={n_draft})"
+                )
+
         # Detect or use explicit mmproj path for multimodal models
         mmproj_path = self.requested_mmproj_path
         if mmproj_path is None and self.auto_detect_mmproj:
@@ -498,6 +636,7 @@ class GGUFLanguageModel(BaseModel):
                     use_mlock=use_mlock,  # Lock model in RAM
                     cache_type_k=cache_type_k,  # KV cache key quantization
                     cache_type_v=cache_type_v,  # KV cache value quantization
+                    n_seq_max=n_parallel,  # Sequence slots for continuous batching
                     verbose=False,  # Disable verbose logging (managed by ggml_logging)
                     seed=-1,  # Random seed (-1 = random)
                     **gpu_kwargs,
@@ -517,6 +656,22 @@ class GGUFLanguageModel(BaseModel):
                     )
                 raise
 
+        def _load_draft():
+            from llamafarm_llama import Llama
+
+            # Same context as the main model so the draft can follow any prompt
+            return Llama(
+                model_path=draft_path,
+                n_ctx=self.actual_n_ctx,
+                n_batch=n_batch,
+                n_gpu_layers=n_gpu_layers,
+                n_threads=n_threads,
+                flash_attn=flash_attn,
+                use_mmap=use_mmap,
+                use_mlock=use_mlock,
+                verbose=False,
+            )
+
         try:
             # On unified memory platforms (Jetson Tegra, Apple Silicon), load model
             # synchronously to ensure GPU context is created optimally and avoid
@@ -529,6 +684,30 @@ class GGUFLanguageModel(BaseModel):
             else:
                 self.llama = await loop.run_in_executor(self._executor, _load_model)
 
+            # Attach the draft model for speculative decoding
+            if draft_path is not None:
+                if _is_unified_memory_gpu():
+                    self._draft = _load_draft()
+                else:
+                    self._draft = await loop.run_in_executor(
+                        self._executor, _load_draft
+                    )
+                self.llama.set_draft_model(self._draft, n_draft=n_draft)
+
+            # Start the batch scheduler (owns the context from here on)
+            if n_parallel > 1:
+                from llamafarm_llama import ContinuousBatcher
+
+                self._batcher = ContinuousBatcher(self.llama, n_slots=n_parallel)
+                self._batcher.start()
+
+            # Persist conversation KV state so resumes skip re-decoding history.
+            # The batcher manages its own sequences, so it isn't snapshotted.
+            if n_parallel == 1:
+                kv_cache = _get_kv_disk_cache()
+                if kv_cache is not None:
+                    self.llama.set_prefix_cache(kv_cache)
+
             # Initialize context management
             self._token_counter = TokenCounter(self.llama)
             budget = ContextBudget.from_context_size(self.actual_n_ctx)
@@ -537,8 +716,11 @@ class GGUFLanguageModel(BaseModel):
             # Pre-extract and cache GGUF metadata for chat template rendering
             # This avoids re-reading the large GGUF file on every request
             try:
+                from jinja2 import TemplateError
+
                 from utils.jinja_tools import (
                     get_chat_template_from_gguf,
+                    get_compiled_template,
                     get_special_tokens_from_gguf,
                     supports_native_tools,
                 )
@@ -550,6 +732,12 @@ class GGUFLanguageModel(BaseModel):
                         f"Chat template cached ({len(self._chat_template)} chars), "
                         f"supports_native_tools={has_tools}"
                     )
+                    if has_tools:
+                        # Compile now so the first tool request doesn't pay for it
+                        try:
+                            get_compiled_template(self._chat_template)
+                        except TemplateError as e:
+                            logger.debug(f"Chat template failed to compile: {e}")
                 else:
                     logger.debug("No chat template found in GGUF metadata")
 
@@ -802,6 +990,125 @@ class GGUFLanguageModel(BaseModel):
         )
         return inject_tools_into_messages(messages, tools, tool_choice=tool_choice)
 
+    def _exclusive_llama(self):
+        """Context manager for single-sequence calls while batching is enabled.
+
+        Waits for in-flight batched sequences to finish and pauses admission so
+        calls like multimodal completions can use the context directly.
+        """
+        if self._batcher is None:
+            return nullcontext(self.llama)
+        return self._batcher.exclusive()
+
+    def _tokenize_prompt(
+        self, prompt: str | None = None, messages: list[dict] | None = None
+    ) -> list[int]:
+        """Tokenize a raw prompt, or apply the chat template to messages first."""
+        assert self.llama is not None, "Model not loaded"
+        if prompt is None:
+            prompt = self.llama._apply_chat_template(
+                messages or [], add_generation_prompt=True
+            )
+        return self.llama.tokenize(prompt, add_special=False, parse_special=True)
+
+    async def _run_cancellable(
+        self, generate: Callable[[], dict], cancel_event: threading.Event
+    ) -> dict:
+        """Run a blocking completion in the executor.
+
+        If the awaiting task is cancelled (e.g. the client disconnected), the
+        event is set so llama.cpp stops before the next token instead of
+        finishing a response nobody will read.
+        """
+        # On unified memory platforms (Jetson, Apple Silicon), run synchronously
+        # to avoid ThreadPoolExecutor overhead in shared memory architecture
+        if _is_unified_memory_gpu():
+            return generate()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, generate)
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+
+    async def _stream_batched(
+        self,
+        max_tokens: int,
+        temperature: float,
+        top_p: float,
+        stop: list[str] | None,
+        thinking_budget: int | None,
+        prompt: str | None = None,
+        messages: list[dict] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Stream a completion through the continuous batching scheduler.
+
+        The request occupies one sequence slot and shares decode steps with other
+        in-flight requests. Closing the generator early cancels the request and
+        frees its slot.
+
+        Args:
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            top_p: Nucleus sampling threshold
+            stop: List of stop sequences
+            thinking_budget: Maximum tokens for thinking
+            prompt: Pre-formatted prompt string (Jinja2 path)
+            messages: Chat messages to render with the model's chat template
+
+        Yields:
+            Generated text tokens as strings
+        """
+        assert self.llama is not None and self._batcher is not None
+
+        from llamafarm_llama import BatchRequest
+
+        tokens = await asyncio.to_thread(self._tokenize_prompt, prompt, messages)
+
+        logits_processor = None
+        if thinking_budget is not None:
+            from utils.thinking import ThinkingBudgetProcessor
+
+            logits_processor = ThinkingBudgetProcessor(
+                self.llama, max_thinking_tokens=thinking_budget
+            )
+
+        queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        def _on_delta(text: str) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, text)
+
+        def _on_done(finish_reason: str, error: BaseException | None) -> None:
+            item = RuntimeError(f"Completion failed: {error}") if error else None
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        request = BatchRequest(
+            tokens,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            stop=stop or [],
+            logits_processor=logits_processor,
+            on_delta=_on_delta,
+            on_done=_on_done,
+        )
+        self._batcher.submit(request)
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            # Client went away (or an error occurred) - free the slot
+            if not request.done:
+                self._batcher.cancel(request)
+
     async def _generate_from_prompt(
         self,
         prompt: str,
@@ -828,10 +1135,25 @@ class GGUFLanguageModel(BaseModel):
         """
         assert self.llama is not None, "Model not loaded"
 
-        loop = asyncio.get_running_loop()
+        if self._batcher is not None:
+            content = "".join(
+                [
+                    token
+                    async for token in self._stream_batched(
+                        prompt=prompt,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        top_p=top_p,
+                        stop=stop,
+                        thinking_budget=thinking_budget,
+                    )
+                ]
+            )
+            return content.strip()
 
         # Capture llama reference for nested function (type checker can't see through closures)
         llama = self.llama
+        cancel_event = threading.Event()
 
         def _generate():
             try:
@@ -852,6 +1174,7 @@ class GGUFLanguageModel(BaseModel):
                     top_p=top_p,
                     stop=stop or [],
                     logits_processor=logits_processor,
+                    cancel_event=cancel_event,
                 )
             except Exception as e:
                 logger.error(
@@ -861,12 +1184,7 @@ class GGUFLanguageModel(BaseModel):
                 raise RuntimeError(f"Completion failed: {e}") from e
 
         try:
-            # On unified memory platforms (Jetson, Apple Silicon), run synchronously
-            # to avoid ThreadPoolExecutor overhead in shared memory architecture
-            if _is_unified_memory_gpu():
-                result = _generate()
-            else:
-                result = await loop.run_in_executor(self._executor, _generate)
+            result = await self._run_cancellable(_generate, cancel_event)
             content = result["choices"][0]["message"]["content"]
             return content.strip() if content else ""
         except Exception as e:
@@ -948,7 +1266,24 @@ class GGUFLanguageModel(BaseModel):
                 f"[generate] Prepared messages ({len(prepared_messages)} messages):\n"
                 f"{'=' * 60}\n{json.dumps(prepared_messages, indent=2)}\n{'=' * 60}"
             )
-        loop = asyncio.get_running_loop()
+
+        if self._batcher is not None:
+            content = "".join(
+                [
+                    token
+                    async for token in self._stream_batched(
+                        messages=prepared_messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        top_p=top_p,
+                        stop=stop,
+                        thinking_budget=thinking_budget,
+                    )
+                ]
+            )
+            return content.strip()
+
+        cancel_event = threading.Event()
 
         def _generate():
             try:
@@ -969,6 +1304,7 @@ class GGUFLanguageModel(BaseModel):
                     top_p=top_p,
                     stop=stop or [],
                     logits_processor=logits_processor,
+                    cancel_event=cancel_event,
                 )
             except Exception as e:
                 logger.error(
@@ -978,13 +1314,7 @@ class GGUFLanguageModel(BaseModel):
                 raise RuntimeError(f"Chat completion failed: {e}") from e
 
         try:
-            # On unified memory platforms (Jetson, Apple Silicon), run synchronously
-            # to avoid ThreadPoolExecutor overhead in shared memory architecture.
-            # This provides both performance and stability benefits.
-            if _is_unified_memory_gpu():
-                result = _generate()
-            else:
-                result = await loop.run_in_executor(self._executor, _generate)
+            result = await self._run_cancellable(_generate, cancel_event)
             content = result["choices"][0]["message"]["content"]
             return content.strip() if content else ""
         except Exception as e:
@@ -999,6 +1329,7 @@ class GGUFLanguageModel(BaseModel):
         top_p: float,
         stop: list[str] | None,
         thinking_budget: int | None,
+        cancel_event: threading.Event,
     ) -> AsyncGenerator[str, None]:
         """Stream completion from a pre-formatted prompt string.
 
@@ -1011,12 +1342,25 @@ class GGUFLanguageModel(BaseModel):
             top_p: Nucleus sampling threshold
             stop: List of stop sequences
             thinking_budget: Maximum tokens for thinking
+            cancel_event: Stops generation between tokens once set
 
         Yields:
             Generated text tokens as strings
         """
         assert self.llama is not None, "Model not loaded"
 
+        if self._batcher is not None:
+            async for token in self._stream_batched(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                stop=stop,
+                thinking_budget=thinking_budget,
+            ):
+                yield token
+            return
+
         # Capture llama reference for nested function (type checker can't see through closures)
         llama = self.llama
 
@@ -1039,6 +1383,7 @@ class GGUFLanguageModel(BaseModel):
                 stop=stop or [],
                 stream=True,
                 logits_processor=logits_processor,
+                cancel_event=cancel_event,
             ):
                 delta = chunk["choices"][0].get("delta", {})
                 content = delta.get("content", "")
@@ -1048,16 +1393,15 @@ class GGUFLanguageModel(BaseModel):
             return
 
         # Async path: use ThreadPoolExecutor (Apple Silicon, discrete GPUs, CPU)
-        queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
         loop = asyncio.get_running_loop()
+        handoff = _TokenHandoff(loop)
 
         def _generate_stream():
             """Run completion in separate thread."""
             try:
                 thinking_tokens = 0
-                in_thinking = False
-                thinking_ended = False
-                accumulated_text = ""
+                # Tracks <think> blocks without rescanning the whole output
+                think_parser = StreamingToolCallParser(detect_tools=False)
 
                 # Set up logits processor for thinking budget enforcement
                 logits_processor = None
@@ -1076,46 +1420,34 @@ class GGUFLanguageModel(BaseModel):
                     stop=stop or [],
                     stream=True,
                     logits_processor=logits_processor,
+                    cancel_event=cancel_event,
                 ):
+                    if cancel_event.is_set():
+                        break
                     delta = chunk["choices"][0].get("delta", {})
                     content = delta.get("content", "")
                     if content:
-                        accumulated_text += content
-
-                        # Track thinking state
-                        if "<think>" in accumulated_text.lower() and not in_thinking:
-                            in_thinking = True
-                        if "</think>" in accumulated_text.lower():
-                            thinking_ended = True
-                            in_thinking = False
-
                         # Count thinking tokens
-                        if in_thinking and not thinking_ended:
+                        think_parser.feed(content)
+                        if think_parser.in_thinking:
                             thinking_tokens += 1
 
-                        future = asyncio.run_coroutine_threadsafe(
-                            queue.put(content), loop
-                        )
-                        future.result()
+                        handoff.put(content)
             except Exception as e:
                 logger.error(f"Error in GGUF completion stream: {e}", exc_info=True)
-                future = asyncio.run_coroutine_threadsafe(queue.put(e), loop)
-                future.result()
+                handoff.put(e)
             finally:
-                future = asyncio.run_coroutine_threadsafe(queue.put(None), loop)
-                future.result()
+                handoff.put(None)
 
         loop.run_in_executor(self._executor, _generate_stream)
 
         # Yield tokens as they arrive, propagate exceptions
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            elif isinstance(item, Exception):
-                raise item
-            else:
+        try:
+            async for item in handoff.items():
                 yield item
+        finally:
+            # Stop the generation thread if the consumer went away early
+            cancel_event.set()
 
     async def generate_stream(
         self,
@@ -1127,6 +1459,7 @@ class GGUFLanguageModel(BaseModel):
         thinking_budget: int | None = None,
         tools: list[dict] | None = None,
         tool_choice: str | dict | None = None,
+        cancel_event: threading.Event | None = None,
     ) -> AsyncGenerator[str, None]:
         """Generate chat completion with streaming (async generator).
 
@@ -1146,6 +1479,9 @@ class GGUFLanguageModel(BaseModel):
             thinking_budget: Maximum tokens for thinking before forcing </think>
             tools: Optional list of tool definitions in OpenAI format
             tool_choice: Optional tool choice strategy ("auto", "none", "required")
+            cancel_event: Optional event that stops generation between tokens
+                once set (e.g. when the client disconnects). It is also set
+                when the stream is closed early.
 
         Yields:
             Generated text tokens as strings
@@ -1156,6 +1492,8 @@ class GGUFLanguageModel(BaseModel):
         assert self.llama is not None, "Model not loaded. Call load() first."
 
         max_tokens = max_tokens or 512
+        if cancel_event is None:
+            cancel_event = threading.Event()
 
         # Try Jinja2 native tool rendering first (if tools provided)
         if tools:
@@ -1175,6 +1513,7 @@ class GGUFLanguageModel(BaseModel):
                     top_p=top_p,
                     stop=stop,
                     thinking_budget=thinking_budget,
+                    cancel_event=cancel_event,
                 ):
                     yield token
                 return
@@ -1193,6 +1532,18 @@ class GGUFLanguageModel(BaseModel):
                 f"{'=' * 60}\n{json.dumps(prepared_messages, indent=2)}\n{'=' * 60}"
             )
 
+        if self._batcher is not None:
+            async for token in self._stream_batched(
+                messages=prepared_messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                stop=stop,
+                thinking_budget=thinking_budget,
+            ):
+                yield token
+            return
+
         # On Jetson/Tegra, stream synchronously to avoid thread context switching
         # overhead in unified memory architecture
         if _is_unified_memory_gpu():
@@ -1212,6 +1563,7 @@ class GGUFLanguageModel(BaseModel):
                 stop=stop or [],
                 stream=True,
                 logits_processor=logits_processor,
+                cancel_event=cancel_event,
             ):
                 delta = chunk["choices"][0].get("delta", {})
                 content = delta.get("content", "")
@@ -1221,16 +1573,15 @@ class GGUFLanguageModel(BaseModel):
             return
 
         # Async path: use ThreadPoolExecutor (Apple Silicon, discrete GPUs, CPU)
-        queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
         loop = asyncio.get_running_loop()
+        handoff = _TokenHandoff(loop)
 
         def _generate_stream():
             """Run chat completion in separate thread."""
             try:
                 thinking_tokens = 0
-                in_thinking = False
-                thinking_ended = False
-                accumulated_text = ""
+                # Tracks <think> blocks without rescanning the whole output
+                think_parser = StreamingToolCallParser(detect_tools=False)
 
                 # Set up logits processor for thinking budget enforcement
                 logits_processor = None
@@ -1249,46 +1600,34 @@ class GGUFLanguageModel(BaseModel):
                     stop=stop or [],
                     stream=True,
                     logits_processor=logits_processor,
+                    cancel_event=cancel_event,
                 ):
+                    if cancel_event.is_set():
+                        break
                     delta = chunk["choices"][0].get("delta", {})
                     content = delta.get("content", "")
                     if content:
-                        accumulated_text += content
-
-                        # Track thinking state
-                        if "<think>" in accumulated_text.lower() and not in_thinking:
-                            in_thinking = True
-                        if "</think>" in accumulated_text.lower():
-                            thinking_ended = True
-                            in_thinking = False
-
                         # Count thinking tokens
-                        if in_thinking and not thinking_ended:
+                        think_parser.feed(content)
+                        if think_parser.in_thinking:
                             thinking_tokens += 1
 
-                        future = asyncio.run_coroutine_threadsafe(
-                            queue.put(content), loop
-                        )
-                        future.result()
+                        handoff.put(content)
             except Exception as e:
                 logger.error(f"Error in GGUF chat stream: {e}", exc_info=True)
-                future = asyncio.run_coroutine_threadsafe(queue.put(e), loop)
-                future.result()
+                handoff.put(e)
             finally:
-                future = asyncio.run_coroutine_threadsafe(queue.put(None), loop)
-                future.result()
+                handoff.put(None)
 
         loop.run_in_executor(self._executor, _generate_stream)
 
         # Yield tokens as they arrive, propagate exceptions
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            elif isinstance(item, Exception):
-                raise item
-            else:
+        try:
+            async for item in handoff.items():
                 yield item
+        finally:
+            # Stop the generation thread if the consumer went away early
+            cancel_event.set()
 
     async def generate_with_audio(
         self,
@@ -1332,29 +1671,27 @@ class GGUFLanguageModel(BaseModel):
         assert self.llama is not None, "Model not loaded. Call load() first."
 
         max_tokens = max_tokens or 512
-        loop = asyncio.get_running_loop()
+        cancel_event = threading.Event()
 
         def _generate():
             try:
-                return self.llama.create_chat_completion_with_audio(
-                    messages=messages,
-                    audio_data=audio_data,
-                    audio_format=audio_format,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    top_p=top_p,
-                    stop=stop or [],
-                )
+                with self._exclusive_llama():
+                    return self.llama.create_chat_completion_with_audio(
+                        messages=messages,
+                        audio_data=audio_data,
+                        audio_format=audio_format,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        top_p=top_p,
+                        stop=stop or [],
+                        cancel_event=cancel_event,
+                    )
             except Exception as e:
                 logger.error(f"Error during audio chat completion: {e}", exc_info=True)
                 raise RuntimeError(f"Audio chat completion failed: {e}") from e
 
         try:
-            # On Jetson/Tegra, run synchronously to avoid thread context switching overhead
-            if _is_unified_memory_gpu():
-                result = _generate()
-            else:
-                result = await loop.run_in_executor(self._executor, _generate)
+            result = await self._run_cancellable(_generate, cancel_event)
             content = result["choices"][0]["message"]["content"]
             return content.strip() if content else ""
         except Exception as e:
@@ -1372,6 +1709,7 @@ class GGUFLanguageModel(BaseModel):
         temperature: float = 0.7,
         top_p: float = 1.0,
         stop: list[str] | None = None,
+        cancel_event: threading.Event | None = None,
     ) -> AsyncGenerator[str, None]:
         """Generate chat completion with audio input (streaming).
 
@@ -1386,6 +1724,8 @@ class GGUFLanguageModel(BaseModel):
             temperature: Sampling temperature
             top_p: Nucleus sampling threshold
             stop: List of stop sequences
+            cancel_event: Optional event that stops generation between tokens
+                once set. It is also set when the stream is closed early.
 
         Yields:
             Generated text tokens as strings
@@ -1403,32 +1743,12 @@ class GGUFLanguageModel(BaseModel):
         assert self.llama is not None, "Model not loaded. Call load() first."
 
         max_tokens = max_tokens or 512
+        if cancel_event is None:
+            cancel_event = threading.Event()
 
         # On Jetson/Tegra, stream synchronously to avoid thread context switching overhead
         if _is_unified_memory_gpu():
-            for chunk in self.llama.create_chat_completion_with_audio(
-                messages=messages,
-                audio_data=audio_data,
-                audio_format=audio_format,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                top_p=top_p,
-                stop=stop or [],
-                stream=True,
-            ):
-                delta = chunk["choices"][0].get("delta", {})
-                content = delta.get("content", "")
-                if content:
-                    yield content
-                    await asyncio.sleep(0)
-            return
-
-        # Async path: use ThreadPoolExecutor (Apple Silicon, discrete GPUs, CPU)
-        queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
-        loop = asyncio.get_running_loop()
-
-        def _generate_stream():
-            try:
+            with self._exclusive_llama():
                 for chunk in self.llama.create_chat_completion_with_audio(
                     messages=messages,
                     audio_data=audio_data,
@@ -1438,39 +1758,74 @@ class GGUFLanguageModel(BaseModel):
                     top_p=top_p,
                     stop=stop or [],
                     stream=True,
+                    cancel_event=cancel_event,
                 ):
                     delta = chunk["choices"][0].get("delta", {})
                     content = delta.get("content", "")
                     if content:
-                        future = asyncio.run_coroutine_threadsafe(
-                            queue.put(content), loop
-                        )
-                        future.result()
+                        yield content
+                        await asyncio.sleep(0)
+            return
+
+        # Async path: use ThreadPoolExecutor (Apple Silicon, discrete GPUs, CPU)
+        loop = asyncio.get_running_loop()
+        handoff = _TokenHandoff(loop)
+
+        def _generate_stream():
+            try:
+                with self._exclusive_llama():
+                    for chunk in self.llama.create_chat_completion_with_audio(
+                        messages=messages,
+                        audio_data=audio_data,
+                        audio_format=audio_format,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        top_p=top_p,
+                        stop=stop or [],
+                        stream=True,
+                        cancel_event=cancel_event,
+                    ):
+                        if cancel_event.is_set():
+                            break
+                        delta = chunk["choices"][0].get("delta", {})
+                        content = delta.get("content", "")
+                        if content:
+                            handoff.put(content)
             except Exception as e:
                 logger.error(f"Error in audio chat stream: {e}", exc_info=True)
-                future = asyncio.run_coroutine_threadsafe(queue.put(e), loop)
-                future.result()
+                handoff.put(e)
             finally:
-                future = asyncio.run_coroutine_threadsafe(queue.put(None), loop)
-                future.result()
+                handoff.put(None)
 
         loop.run_in_executor(self._executor, _generate_stream)
 
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            elif isinstance(item, Exception):
-                raise item
-            else:
+        try:
+            async for item in handoff.items():
                 yield item
+        finally:
+            # Stop the generation thread if the consumer went away early
+            cancel_event.set()
 
     async def unload(self) -> None:
         """Unload GGUF model and free resources."""
         logger.info(f"Unloading GGUF language model: {self.model_id}")
 
-        # Clear llama-cpp instance
+        # Stop the batch scheduler before the context it drives is freed
+        if self._batcher is not None:
+            self._batcher.stop()
+            self._batcher = None
+
+        # Persist the resident conversation so it can resume after a reload
+        if self.llama is not None and self._executor is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._executor, self.llama.save_prefix_state)
+            except Exception as e:
+                logger.warning(f"Failed to save KV snapshot on unload: {e}")
+
+        # Clear llama-cpp instances
         self.llama = None
+        self._draft = None
 
         # Reset multimodal flags to prevent use-after-free
         # If these remain True after unload, callers checking supports_audio/supports_vision
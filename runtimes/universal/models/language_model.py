@@ -7,7 +7,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from collections.abc import AsyncGenerator
-from threading import Thread
+from threading import Event, Thread
 from typing import cast
 
 from .base import BaseModel
@@ -151,6 +151,7 @@ class LanguageModel(BaseModel):
         thinking_budget: int | None = None,
         tools: list[dict] | None = None,
         tool_choice: str | dict | None = None,
+        cancel_event: Event | None = None,
     ) -> AsyncGenerator[str, None]:
         """Generate chat completion with streaming (yields tokens as they're generated).
 
@@ -165,6 +166,8 @@ class LanguageModel(BaseModel):
             thinking_budget: Not used for transformers models (included for API compatibility)
             tools: Not used for transformers models (included for API compatibility)
             tool_choice: Not used for transformers models (included for API compatibility)
+            cancel_event: Optional event that stops generation once set. It is
+                also set when the stream ends early.
 
         Yields:
             Generated text tokens as strings
@@ -179,7 +182,25 @@ class LanguageModel(BaseModel):
         max_new_tokens = max_tokens or 512
 
         # Create a streamer that will yield tokens as they're generated
-        from transformers import AutoTokenizer, TextIteratorStreamer
+        import torch
+        from transformers import (
+            AutoTokenizer,
+            StoppingCriteria,
+            StoppingCriteriaList,
+            TextIteratorStreamer,
+        )
+
+        if cancel_event is None:
+            cancel_event = Event()
+
+        class _CancelCriteria(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs):
+                return torch.full(
+                    (input_ids.shape[0],),
+                    cancel_event.is_set(),
+                    device=input_ids.device,
+                    dtype=torch.bool,
+                )
 
         streamer = TextIteratorStreamer(
             cast(AutoTokenizer, self.tokenizer),
@@ -196,6 +217,7 @@ class LanguageModel(BaseModel):
             "do_sample": temperature > 0,
             "pad_token_id": self.tokenizer.eos_token_id,
             "streamer": streamer,
+            "stopping_criteria": StoppingCriteriaList([_CancelCriteria()]),
         }
 
         # Run generation in a separate thread so we can stream the results
@@ -203,18 +225,20 @@ class LanguageModel(BaseModel):
         thread.start()
 
         # Yield tokens as they become available
-        for text in streamer:
-            # Check for stop sequences
-            if stop:
-                for stop_seq in stop:
-                    if stop_seq in text:
-                        # Yield up to the stop sequence
-                        idx = text.index(stop_seq)
-                        if idx > 0:
-                            yield text[:idx]
-                        thread.join()
-                        return
-            yield text
-
-        # Wait for generation to complete
-        thread.join()
+        try:
+            for text in streamer:
+                # Check for stop sequences
+                if stop:
+                    for stop_seq in stop:
+                        if stop_seq in text:
+                            # Yield up to the stop sequence
+                            idx = text.index(stop_seq)
+                            if idx > 0:
+                                yield text[:idx]
+                            return
+                yield text
+        finally:
+            # Stop generating after a stop sequence or when the consumer went
+            # away, then wait for generation to complete
+            cancel_event.set()
+            thread.join()
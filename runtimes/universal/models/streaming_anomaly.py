@@ -31,6 +31,7 @@ import numpy as np
 import polars as pl
 
 from utils.polars_buffer import PolarsBuffer
+from utils.rolling_features import RollingFeatureEngine
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +137,11 @@ class StreamingAnomalyDetector:
         self._samples_since_retrain = 0
         self._total_processed = 0
 
+        # Incremental rolling features for scoring (created on fit).
+        # _feature_index maps training columns to positions in engine.latest()
+        self._features: RollingFeatureEngine | None = None
+        self._feature_index: list[int] = []
+
         # Normalization stats (updated during training)
         self._score_mean = 0.0
         self._score_std = 1.0
@@ -183,6 +189,8 @@ class StreamingAnomalyDetector:
 
         # Add to buffer
         self._buffer.append(data)
+        if self._features is not None:
+            self._features.update(data)
         self._total_processed += 1
         self._samples_since_retrain += 1
 
@@ -332,9 +340,34 @@ class StreamingAnomalyDetector:
         # Store feature column names for inference
         if self.rolling_windows:
             self._feature_columns = numeric_cols
+            self._init_feature_engine()
         else:
             self._feature_columns = None
 
+    def _init_feature_engine(self) -> None:
+        """Set up incremental features matching the training columns.
+
+        Scoring a point then costs O(1) per feature instead of recomputing the
+        rolling features over the whole buffer. Falls back to the batch path
+        if the engine cannot produce every training column.
+        """
+        engine = self._buffer.feature_engine(
+            rolling_windows=self.rolling_windows,
+            include_lags=self.include_lags,
+            lag_periods=self.lag_periods,
+            fill_null_value=0.0,
+        )
+        positions = {name: i for i, name in enumerate(engine.feature_names)}
+        missing = [c for c in self._feature_columns if c not in positions]
+        if missing:
+            logger.debug(f"Using batch features for {self.model_id}, missing {missing}")
+            self._features = None
+            self._feature_index = []
+            return
+
+        self._features = engine
+        self._feature_index = [positions[c] for c in self._feature_columns]
+
     async def _score_point(
         self,
         data: dict[str, Any],
@@ -349,7 +382,11 @@ class StreamingAnomalyDetector:
         from models.pyod_backend import get_decision_scores
 
         # Get feature vector - must match training format
-        if self.rolling_windows and self._feature_columns:
+        if self.rolling_windows and self._features is not None:
+            # Newest row's rolling features, updated incrementally on append
+            values = self._features.latest()
+            X = np.array([[values[i] for i in self._feature_index]])
+        elif self.rolling_windows and self._feature_columns:
             # Get the latest row with rolling features computed
             df = self._buffer.get_features(
                 rolling_windows=self.rolling_windows,
@@ -409,6 +446,8 @@ class StreamingAnomalyDetector:
         self._detector = None
         self._model_version = 0
         self._feature_columns = None
+        self._features = None
+        self._feature_index = []
         self._status = DetectorStatus.COLLECTING
         self._samples_since_retrain = 0
         self._total_processed = 0
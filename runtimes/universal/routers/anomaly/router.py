@@ -86,6 +86,7 @@ def set_state(
     models: dict,
     encoders: dict[str, FeatureEncoder],
     model_load_lock,
+    model_loader=None,
 ) -> None:
     """Set shared state from the main server.
 
@@ -93,11 +94,18 @@ def set_state(
         models: Model cache dictionary
         encoders: Feature encoder cache dictionary
         model_load_lock: Async lock for model loading
+        model_loader: The server's ModelLoadCoordinator, shared with the
+            anomaly service helpers for lazy loads
     """
     global _models, _encoders, _model_load_lock
     _models = models
     _encoders = encoders
     _model_load_lock = model_load_lock
+    if model_loader is not None:
+        # Import here to avoid circular imports
+        from state import set_model_loader
+
+        set_model_loader(model_loader)
 
 
 async def _get_anomaly_model(
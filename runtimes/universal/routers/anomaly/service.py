@@ -14,7 +14,7 @@ from state import (
     ANOMALY_MODELS_DIR,
     get_device,
     get_encoders_cache,
-    get_model_load_lock,
+    get_model_loader,
     get_models_cache,
     sanitize_model_name,
 )
@@ -74,27 +74,30 @@ async def load_anomaly(
         Loaded AnomalyModel instance
     """
     models_cache = get_models_cache()
-    model_load_lock = get_model_load_lock()
+    model_loader = get_model_loader()
 
     cache_key = make_anomaly_cache_key(model_id, backend, normalization)
 
     if cache_key not in models_cache:
-        async with model_load_lock:
-            if cache_key not in models_cache:
-                logger.info(f"Loading anomaly model ({backend}): {model_id}")
-                device = get_device()
-
-                model = AnomalyModel(
-                    model_id=model_id,
-                    device=device,
-                    backend=backend,
-                    contamination=contamination,
-                    threshold=threshold,
-                    normalization=normalization,
-                )
-
-                await model.load()
-                models_cache[cache_key] = model
+
+        async def _load() -> AnomalyModel:
+            logger.info(f"Loading anomaly model ({backend}): {model_id}")
+            device = get_device()
+
+            model = AnomalyModel(
+                model_id=model_id,
+                device=device,
+                backend=backend,
+                contamination=contamination,
+                threshold=threshold,
+                normalization=normalization,
+            )
+
+            await model.load()
+            models_cache[cache_key] = model
+            return model
+
+        await model_loader.load(cache_key, _load, cache=models_cache)
 
     # Return model (get() refreshes TTL automatically)
     return models_cache.get(cache_key)
@@ -3,9 +3,9 @@ import base64
 import json
 import logging
 import os
+import threading
 import uuid
 from datetime import datetime
-from enum import Enum
 
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
@@ -25,13 +25,11 @@ from utils.context_summarizer import ContextSummarizer
 from utils.history_compressor import HistoryCompressor
 from utils.thinking import inject_thinking_control, parse_thinking_response
 from utils.tool_calling import (
-    detect_probable_tool_call,
+    StreamingToolCallParser,
+    ToolCallEvent,
+    ToolCallEventType,
     detect_tool_call_in_content,
-    extract_arguments_progress,
-    extract_tool_name_from_partial,
-    is_tool_call_complete,
     parse_tool_choice,
-    strip_tool_call_from_content,
 )
 
 from .types import (
@@ -43,15 +41,6 @@ from .types import (
     replace_audio_with_text,
 )
 
-
-class ToolCallStreamState(Enum):
-    """State machine states for incremental tool call streaming."""
-
-    NORMAL = "normal"  # Streaming regular content
-    BUFFERING_START = "buffering_start"  # Detected <tool_call>, waiting for name
-    STREAMING_ARGS = "streaming_args"  # Name emitted, streaming arguments
-
-
 logger = logging.getLogger(__name__)
 
 
@@ -115,6 +104,9 @@ class ChatCompletionsService:
             use_mlock = chat_request.use_mlock
             cache_type_k = chat_request.cache_type_k
             cache_type_v = chat_request.cache_type_v
+            n_parallel = chat_request.n_parallel
+            draft_model = chat_request.draft_model
+            n_draft = chat_request.n_draft
 
             # Also check extra_body for these parameters (OpenAI SDK sends custom params there)
             if chat_request.extra_body:
@@ -136,6 +128,12 @@ class ChatCompletionsService:
                     cache_type_k = chat_request.extra_body.get("cache_type_k")
                 if cache_type_v is None and "cache_type_v" in chat_request.extra_body:
                     cache_type_v = chat_request.extra_body.get("cache_type_v")
+                if n_parallel is None and "n_parallel" in chat_request.extra_body:
+                    n_parallel = chat_request.extra_body.get("n_parallel")
+                if draft_model is None and "draft_model" in chat_request.extra_body:
+                    draft_model = chat_request.extra_body.get("draft_model")
+                if n_draft is None and "n_draft" in chat_request.extra_body:
+                    n_draft = chat_request.extra_body.get("n_draft")
 
             # Parse model name to extract quantization if present
             model_id, gguf_quantization = parse_model_with_quantization(
@@ -162,6 +160,9 @@ class ChatCompletionsService:
                 cache_type_k=cache_type_k,
                 cache_type_v=cache_type_v,
                 preferred_quantization=gguf_quantization,
+                n_parallel=n_parallel,
+                draft_model=draft_model,
+                n_draft=n_draft,
             )
 
             # Extract thinking params from extra_body if not set at top level
@@ -455,6 +456,7 @@ class ChatCompletionsService:
                     yield f"data: {initial_chunk.model_dump_json(exclude_none=True)}\n\n".encode()
 
                     # Stream tokens - use native audio if supported, otherwise text
+                    cancel_event = threading.Event()
                     if use_native_audio and audio_bytes:
                         # Use native audio processing (no STT transcription)
                         token_stream = model.generate_stream_with_audio(
@@ -467,6 +469,7 @@ class ChatCompletionsService:
                             else 0.7,
                             top_p=chat_request.top_p,
                             stop=chat_request.stop,
+                            cancel_event=cancel_event,
                         )
                     else:
                         # Standard text generation (audio already transcribed if present)
@@ -481,236 +484,99 @@ class ChatCompletionsService:
                             thinking_budget=(thinking_tokens or None) if is_gguf else None,
                             tools=tools_dict,
                             tool_choice=chat_request.tool_choice,
+                            cancel_event=cancel_event,
                         )
 
-                    # State machine for incremental tool call streaming
-                    accumulated_content = ""
-                    tool_state = ToolCallStreamState.NORMAL
-                    buffered_tokens = []
-                    tool_call_id = None
-                    tool_call_index = 0
-                    args_emitted_length = 0
-                    any_tool_calls_emitted = False  # Track if we emitted any tool calls
-
-                    # Parse tool_choice to determine if we should detect tool calls
+                    # Incremental parser for tool calls and thinking: each token is
+                    # consumed once instead of rescanning the accumulated text.
                     # When tool_choice="none", we skip tool detection entirely
                     tool_choice_mode, _ = parse_tool_choice(chat_request.tool_choice)
-                    should_detect_tools = tools_dict and tool_choice_mode != "none"
-
-                    async for token in token_stream:
-                        accumulated_content += token
-
-                        # STATE: NORMAL - streaming regular content
-                        if tool_state == ToolCallStreamState.NORMAL:
-                            # Check if we're entering a tool call
-                            if should_detect_tools and detect_probable_tool_call(
-                                accumulated_content
-                            ):
-                                tool_state = ToolCallStreamState.BUFFERING_START
-                                buffered_tokens.append(token)
-                                continue
-
-                            # Normal content streaming
-                            chunk = ChatCompletionChunk(
-                                id=completion_id,
-                                object="chat.completion.chunk",
-                                created=created_time,
-                                model=chat_request.model,
-                                choices=[
-                                    ChoiceChunk(
-                                        index=0,
-                                        delta=ChoiceDelta(
-                                            role="assistant", content=token
+                    parser = StreamingToolCallParser(
+                        detect_tools=bool(tools_dict) and tool_choice_mode != "none"
+                    )
+                    content_parts: list[str] = []
+                    tool_call_ids: dict[int, str] = {}
+
+                    def event_chunk(event: ToolCallEvent) -> bytes | None:
+                        """Render a parser event as an SSE chunk (None if silent)."""
+                        if event.type is ToolCallEventType.CONTENT:
+                            delta = ChoiceDelta(role="assistant", content=event.text)
+                        elif event.type is ToolCallEventType.TOOL_CALL_START:
+                            tool_call_ids[event.index] = f"call_{uuid.uuid4()}"
+                            logger.info(
+                                f"Tool call started: {event.name} "
+                                f"(id={tool_call_ids[event.index]})"
+                            )
+                            delta = ChoiceDelta(
+                                tool_calls=[
+                                    ChoiceDeltaToolCall(
+                                        index=event.index,
+                                        id=tool_call_ids[event.index],
+                                        type="function",
+                                        function=ChoiceDeltaToolCallFunction(
+                                            name=event.name,
+                                            arguments="",
                                         ),
-                                        finish_reason=None,
                                     )
-                                ],
+                                ]
                             )
-                            yield f"data: {chunk.model_dump_json(exclude_none=True)}\n\n".encode()
-                            # CRITICAL: This asyncio.sleep(0) forces the event loop
-                            # to yield, ensuring token-by-token delivery.
-                            await asyncio.sleep(0)
-
-                        # STATE: BUFFERING_START - waiting for tool name
-                        elif tool_state == ToolCallStreamState.BUFFERING_START:
-                            buffered_tokens.append(token)
-
-                            # Try to extract tool name
-                            tool_name = extract_tool_name_from_partial(
-                                accumulated_content
-                            )
-                            if tool_name:
-                                # Emit initial tool call chunk with name
-                                tool_call_id = f"call_{uuid.uuid4()}"
-                                initial_tool_chunk = ChatCompletionChunk(
-                                    id=completion_id,
-                                    object="chat.completion.chunk",
-                                    created=created_time,
-                                    model=chat_request.model,
-                                    choices=[
-                                        ChoiceChunk(
-                                            index=0,
-                                            delta=ChoiceDelta(
-                                                tool_calls=[
-                                                    ChoiceDeltaToolCall(
-                                                        index=tool_call_index,
-                                                        id=tool_call_id,
-                                                        type="function",
-                                                        function=ChoiceDeltaToolCallFunction(
-                                                            name=tool_name,
-                                                            arguments="",
-                                                        ),
-                                                    )
-                                                ]
-                                            ),
-                                            finish_reason=None,
-                                        )
-                                    ],
-                                )
-                                yield f"data: {initial_tool_chunk.model_dump_json(exclude_none=True)}\n\n".encode()
-                                await asyncio.sleep(0)
-
-                                tool_state = ToolCallStreamState.STREAMING_ARGS
-                                args_emitted_length = 0
-                                logger.info(
-                                    f"Tool call started: {tool_name} (id={tool_call_id})"
-                                )
-
-                        # STATE: STREAMING_ARGS - incrementally streaming arguments
-                        elif tool_state == ToolCallStreamState.STREAMING_ARGS:
-                            # Check if tool call is complete
-                            if is_tool_call_complete(accumulated_content):
-                                # Parse the complete tool call to get final arguments
-                                # We only want the FIRST complete tool call in accumulated_content
-                                tool_calls = detect_tool_call_in_content(
-                                    accumulated_content
-                                )
-                                if tool_calls:
-                                    _, final_args = tool_calls[0]
-
-                                    # Emit remaining arguments (from where we left off)
-                                    if len(final_args) > args_emitted_length:
-                                        remaining_args = final_args[
-                                            args_emitted_length:
-                                        ]
-                                        args_chunk = ChatCompletionChunk(
-                                            id=completion_id,
-                                            object="chat.completion.chunk",
-                                            created=created_time,
-                                            model=chat_request.model,
-                                            choices=[
-                                                ChoiceChunk(
-                                                    index=0,
-                                                    delta=ChoiceDelta(
-                                                        tool_calls=[
-                                                            ChoiceDeltaToolCall(
-                                                                index=tool_call_index,
-                                                                function=ChoiceDeltaToolCallFunction(
-                                                                    arguments=remaining_args,
-                                                                ),
-                                                            )
-                                                        ]
-                                                    ),
-                                                    finish_reason=None,
-                                                )
-                                            ],
-                                        )
-                                        yield f"data: {args_chunk.model_dump_json(exclude_none=True)}\n\n".encode()
-                                        await asyncio.sleep(0)
-
-                                # Log the completed tool call
-                                if tool_calls:
-                                    tool_name_completed, tool_args = tool_calls[0]
-                                    logger.info(
-                                        f"Tool call completed: {tool_name_completed} "
-                                        f"(id={tool_call_id}, args={tool_args[:100]}{'...' if len(tool_args) > 100 else ''})"
+                        elif event.type is ToolCallEventType.ARGUMENTS:
+                            delta = ChoiceDelta(
+                                tool_calls=[
+                                    ChoiceDeltaToolCall(
+                                        index=event.index,
+                                        function=ChoiceDeltaToolCallFunction(
+                                            arguments=event.text,
+                                        ),
                                     )
-
-                                # Mark that we've emitted at least one tool call
-                                any_tool_calls_emitted = True
-
-                                # Reset state machine for potential next tool call
-                                # Strip the completed tool call from accumulated_content
-                                accumulated_content = strip_tool_call_from_content(
-                                    accumulated_content
-                                )
-                                tool_state = ToolCallStreamState.NORMAL
-                                buffered_tokens = []
-                                tool_call_id = None
-                                tool_call_index += 1
-                                args_emitted_length = 0
-
-                                # Check if there's already another tool call starting
-                                # in the remaining content
-                                if should_detect_tools and detect_probable_tool_call(
-                                    accumulated_content
-                                ):
-                                    tool_state = ToolCallStreamState.BUFFERING_START
-
-                                # Continue processing - don't return yet
-                                continue
-
-                            # Try to extract arguments progress
-                            args_progress = extract_arguments_progress(
-                                accumulated_content
+                                ]
                             )
-                            if args_progress:
-                                _, current_args = args_progress
-                                # Emit new argument characters
-                                if len(current_args) > args_emitted_length:
-                                    new_args = current_args[args_emitted_length:]
-                                    args_chunk = ChatCompletionChunk(
-                                        id=completion_id,
-                                        object="chat.completion.chunk",
-                                        created=created_time,
-                                        model=chat_request.model,
-                                        choices=[
-                                            ChoiceChunk(
-                                                index=0,
-                                                delta=ChoiceDelta(
-                                                    tool_calls=[
-                                                        ChoiceDeltaToolCall(
-                                                            index=tool_call_index,
-                                                            function=ChoiceDeltaToolCallFunction(
-                                                                arguments=new_args,
-                                                            ),
-                                                        )
-                                                    ]
-                                                ),
-                                                finish_reason=None,
-                                            )
-                                        ],
-                                    )
-                                    yield f"data: {args_chunk.model_dump_json(exclude_none=True)}\n\n".encode()
-                                    await asyncio.sleep(0)
-                                    args_emitted_length = len(current_args)
-
-                    # Handle incomplete tool calls at stream end
-                    if (
-                        tool_state != ToolCallStreamState.NORMAL
-                        and buffered_tokens
-                        and not is_tool_call_complete(accumulated_content)
-                    ):
-                        # Emit buffered tokens as regular content
-                        for buffered_token in buffered_tokens:
-                            chunk = ChatCompletionChunk(
-                                id=completion_id,
-                                object="chat.completion.chunk",
-                                created=created_time,
-                                model=chat_request.model,
-                                choices=[
-                                    ChoiceChunk(
-                                        index=0,
-                                        delta=ChoiceDelta(content=buffered_token),
-                                        finish_reason=None,
-                                    )
-                                ],
+                        else:
+                            args = event.text
+                            logger.info(
+                                f"Tool call completed: {event.name} "
+                                f"(id={tool_call_ids[event.index]}, args={args[:100]}"
+                                f"{'...' if len(args) > 100 else ''})"
                             )
-                            yield f"data: {chunk.model_dump_json(exclude_none=True)}\n\n".encode()
+                            return None
+
+                        chunk = ChatCompletionChunk(
+                            id=completion_id,
+                            object="chat.completion.chunk",
+                            created=created_time,
+                            model=chat_request.model,
+                            choices=[
+                                ChoiceChunk(index=0, delta=delta, finish_reason=None)
+                            ],
+                        )
+                        return f"data: {chunk.model_dump_json(exclude_none=True)}\n\n".encode()
+
+                    try:
+                        async for token in token_stream:
+                            content_parts.append(token)
+                            for event in parser.feed(token):
+                                data = event_chunk(event)
+                                if data is not None:
+                                    yield data
+                                    # CRITICAL: This asyncio.sleep(0) forces the event
+                                    # loop to yield, ensuring token-by-token delivery.
+                                    await asyncio.sleep(0)
+                    finally:
+                        # Stop llama.cpp between tokens if the client disconnected,
+                        # and close the stream so a batched request frees its slot
+                        cancel_event.set()
+                        await token_stream.aclose()
+
+                    # Incomplete tool calls at stream end are returned as content
+                    for event in parser.finish():
+                        data = event_chunk(event)
+                        if data is not None:
+                            yield data
                             await asyncio.sleep(0)
 
                     # Debug log the accumulated streaming response
                     if logger.isEnabledFor(logging.DEBUG):
+                        accumulated_content = "".join(content_parts)
                         logger.debug(
                             f"Streaming response complete ({len(accumulated_content)} chars):\n"
                             f"{accumulated_content}"
@@ -718,7 +584,9 @@ class ChatCompletionsService:
 
                     # Send final chunk with appropriate finish_reason
                     # If we emitted any tool calls, use "tool_calls", otherwise "stop"
-                    finish_reason = "tool_calls" if any_tool_calls_emitted else "stop"
+                    finish_reason = (
+                        "tool_calls" if parser.tool_calls_completed else "stop"
+                    )
                     final_chunk = ChatCompletionChunk(
                         id=completion_id,
                         object="chat.completion.chunk",
@@ -88,6 +88,9 @@ class ChatCompletionRequest(BaseModel):
     )
     cache_type_k: str | None = None  # KV cache key quantization (q4_0, q8_0, f16)
     cache_type_v: str | None = None  # KV cache value quantization (q4_0, q8_0, f16)
+    n_parallel: int | None = None  # Concurrent sequences (>1 enables batching)
+    draft_model: str | None = None  # Draft GGUF model for speculative decoding
+    n_draft: int | None = None  # Max draft tokens verified per step (default 8)
     extra_body: dict | None = None
 
     # Tool/function calling parameters
@@ -70,16 +70,23 @@ def set_models_dir(models_dir: Path):
     _CLASSIFIER_MODELS_DIR = models_dir
 
 
-def set_state(classifiers: dict, model_load_lock):
+def set_state(classifiers: dict, model_load_lock, model_loader=None):
     """Set shared state for classifier caching.
 
     Args:
         classifiers: Dict/ModelCache for caching loaded classifiers
         model_load_lock: asyncio.Lock for synchronizing model loads
+        model_loader: The server's ModelLoadCoordinator, shared with the
+            classifier service helpers for lazy loads
     """
     global _classifiers, _model_load_lock
     _classifiers = classifiers
     _model_load_lock = model_load_lock
+    if model_loader is not None:
+        # Import here to avoid circular imports
+        from state import set_model_loader
+
+        set_model_loader(model_loader)
 
 
 def _get_classifier_loader():
@@ -12,7 +12,7 @@ from state import (
     CLASSIFIER_MODELS_DIR,
     get_classifiers_cache,
     get_device,
-    get_model_load_lock,
+    get_model_loader,
     sanitize_model_name,
 )
 
@@ -39,7 +39,7 @@ async def load_classifier(
 ) -> ClassifierModel:
     """Load or get cached classifier model."""
     classifiers_cache = get_classifiers_cache()
-    model_load_lock = get_model_load_lock()
+    model_loader = get_model_loader()
 
     cache_key = make_classifier_cache_key(model_id)
 
@@ -55,20 +55,22 @@ async def load_classifier(
         await cached.unload()
 
     if cache_key not in classifiers_cache:
-        async with model_load_lock:
-            # Double-check after acquiring lock
-            if cache_key not in classifiers_cache:
-                logger.info(f"Loading classifier model: {model_id}")
-                device = get_device()
-
-                model = ClassifierModel(
-                    model_id=model_id,
-                    device=device,
-                    base_model=base_model,
-                )
-
-                await model.load()
-                classifiers_cache[cache_key] = model
+
+        async def _load() -> ClassifierModel:
+            logger.info(f"Loading classifier model: {model_id}")
+            device = get_device()
+
+            model = ClassifierModel(
+                model_id=model_id,
+                device=device,
+                base_model=base_model,
+            )
+
+            await model.load()
+            classifiers_cache[cache_key] = model
+            return model
+
+        await model_loader.load(cache_key, _load, cache=classifiers_cache)
 
     # Return model (get() refreshes TTL automatically)
     return classifiers_cache.get(cache_key)
@@ -17,11 +17,18 @@ Key Features:
 Environment Variables:
 - MODEL_UNLOAD_TIMEOUT: Seconds of inactivity before unloading models (default: 300)
 - CLEANUP_CHECK_INTERVAL: Seconds between cleanup checks (default: 30)
+- MODEL_LOAD_CONCURRENCY: Maximum number of models loading at once (default: 2)
+- MODEL_LOAD_MEMORY_BUDGET_MB: Estimated MB allowed to load at once
+  (default: available system memory, 0 disables the memory bound)
+- MODEL_RAM_BUDGET_MB / MODEL_VRAM_BUDGET_MB: Memory loaded models may use
+  before idle models are evicted to make room (default: 0, unbounded)
+- PINNED_MODELS: Comma-separated model IDs that are never unloaded
 """
 
 import asyncio
 import os
 import warnings
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
@@ -88,11 +95,17 @@ from routers.vision import (
     set_file_image_getter,
     set_ocr_loader,
 )
-from utils.device import get_device_info, get_optimal_device
+from utils.device import (
+    get_available_memory_bytes,
+    get_device_info,
+    get_free_vram_bytes,
+    get_optimal_device,
+)
 from utils.feature_encoder import FeatureEncoder
 from utils.file_handler import get_file_images
+from utils.load_coordinator import ModelLoadCoordinator
 from utils.model_cache import ModelCache
-from utils.model_format import detect_model_format
+from utils.model_format import detect_model_format, estimate_model_size_bytes
 from utils.safe_home import get_data_dir
 
 # Suppress spurious "leaked semaphore" warning from CTranslate2 (used by faster-whisper).
@@ -321,11 +334,27 @@ MODEL_UNLOAD_TIMEOUT = int(os.getenv("MODEL_UNLOAD_TIMEOUT", "300"))
 # Cleanup check interval (in seconds) - how often to check for idle models
 # Default: 30 seconds
 CLEANUP_CHECK_INTERVAL = int(os.getenv("CLEANUP_CHECK_INTERVAL", "30"))
+# Memory budgets for loaded models in MB (0 = unbounded). Before a new load
+# starts, unpinned models are evicted by size x idle time to make room.
+MODEL_RAM_BUDGET_MB = int(os.getenv("MODEL_RAM_BUDGET_MB", "0"))
+MODEL_VRAM_BUDGET_MB = int(os.getenv("MODEL_VRAM_BUDGET_MB", "0"))
+# Comma-separated model IDs that are never unloaded for idleness or budget
+PINNED_MODELS = frozenset(
+    m.strip() for m in os.getenv("PINNED_MODELS", "").split(",") if m.strip()
+)
 
 # Global model caches using TTL-based caching (via cachetools)
 # Models are automatically tracked for idle time and cleaned up by background task
-_models: ModelCache[BaseModel] = ModelCache(ttl=MODEL_UNLOAD_TIMEOUT)
+_models: ModelCache[BaseModel] = ModelCache(
+    ttl=MODEL_UNLOAD_TIMEOUT,
+    ram_budget_bytes=MODEL_RAM_BUDGET_MB * 1024 * 1024,
+    vram_budget_bytes=MODEL_VRAM_BUDGET_MB * 1024 * 1024,
+)
 _classifiers: ModelCache["ClassifierModel"] = ModelCache(ttl=MODEL_UNLOAD_TIMEOUT)
+# Lazy loads are coordinated per cache key: duplicate requests share one load,
+# and unrelated models load in parallel (bounded by concurrency/memory budget)
+_model_loader = ModelLoadCoordinator()
+# Serializes explicit load/replace endpoints in the anomaly and classifier routers
 _model_load_lock = asyncio.Lock()
 _current_device = None
 
@@ -392,6 +421,55 @@ def get_device():
     return _current_device
 
 
+async def _load_model(
+    cache: ModelCache,
+    cache_key: str,
+    factory: Callable[[], Awaitable[BaseModel]],
+    estimated_bytes: int = 0,
+) -> BaseModel:
+    """Load a model through the load coordinator, keeping the cache in budget.
+
+    Before the load starts, evicts (and unloads) models until the estimated
+    size fits the cache's RAM/VRAM budget. Afterwards, records the model's
+    footprint: the measured drop in free memory when no other load overlapped
+    it (never less than the estimate), otherwise the estimate alone.
+    """
+
+    async def _run() -> BaseModel:
+        on_gpu = get_device() == "cuda"
+        ram_needed = 0 if on_gpu else estimated_bytes
+        vram_needed = estimated_bytes if on_gpu else 0
+
+        for evicted_key, evicted in cache.pop_for_budget(ram_needed, vram_needed):
+            logger.info(f"Evicting {evicted_key} to fit memory budget")
+            try:
+                await evicted.unload()
+            except Exception as e:
+                logger.error(f"Error unloading model {evicted_key}: {e}", exc_info=True)
+
+        exclusive = _model_loader.active_loads == 1
+        ram_before = get_available_memory_bytes()
+        vram_before = get_free_vram_bytes() if on_gpu else None
+
+        model = await factory()
+
+        if cache_key in cache:
+            ram_used, vram_used = ram_needed, vram_needed
+            if exclusive and _model_loader.active_loads == 1:
+                ram_after = get_available_memory_bytes()
+                if ram_before is not None and ram_after is not None:
+                    ram_used = max(ram_used, ram_before - ram_after)
+                vram_after = get_free_vram_bytes() if on_gpu else None
+                if vram_before is not None and vram_after is not None:
+                    vram_used = max(vram_used, vram_before - vram_after)
+            cache.set_footprint(cache_key, ram_used, vram_used)
+            if getattr(model, "model_id", None) in PINNED_MODELS:
+                cache.pin(cache_key)
+        return model
+
+    return await _model_loader.load(cache_key, _run, estimated_bytes, cache=cache)
+
+
 # ============================================================================
 # Language Model Loading
 # ============================================================================
@@ -409,6 +487,9 @@ def _make_language_cache_key(
     cache_type_k: str | None = None,
     cache_type_v: str | None = None,
     preferred_quantization: str | None = None,
+    n_parallel: int | None = None,
+    draft_model: str | None = None,
+    n_draft: int | None = None,
 ) -> str:
     """Generate a cache key for a causal language model."""
     quant_key = (
@@ -423,10 +504,14 @@ def _make_language_cache_key(
     mlock_key = use_mlock if use_mlock is not None else "default"
     cache_k_key = cache_type_k if cache_type_k is not None else "default"
     cache_v_key = cache_type_v if cache_type_v is not None else "default"
+    parallel_key = n_parallel if n_parallel is not None else "auto"
+    draft_key = draft_model if draft_model is not None else "none"
+    n_draft_key = n_draft if n_draft is not None else "auto"
     return (
         f"language:{model_id}:ctx{ctx_key}:batch{batch_key}:gpu{gpu_key}:"
         f"threads{threads_key}:flash{flash_key}:mmap{mmap_key}:mlock{mlock_key}:"
-        f"cachek{cache_k_key}:cachev{cache_v_key}:quant{quant_key}"
+        f"cachek{cache_k_key}:cachev{cache_v_key}:quant{quant_key}:"
+        f"parallel{parallel_key}:draft{draft_key}:ndraft{n_draft_key}"
     )
 
 
@@ -442,6 +527,9 @@ async def load_language(
     cache_type_k: str | None = None,
     cache_type_v: str | None = None,
     preferred_quantization: str | None = None,
+    n_parallel: int | None = None,
+    draft_model: str | None = None,
+    n_draft: int | None = None,
 ):
     """Load a causal language model (GGUF or transformers format)."""
     cache_key = _make_language_cache_key(
@@ -456,47 +544,61 @@ async def load_language(
         cache_type_k,
         cache_type_v,
         preferred_quantization,
+        n_parallel,
+        draft_model,
+        n_draft,
     )
     if cache_key not in _models:
-        async with _model_load_lock:
-            if cache_key not in _models:
-                logger.info(
-                    f"Loading causal LM: {model_id} "
-                    f"(n_ctx={n_ctx if n_ctx is not None else 'auto'}, "
-                    f"n_batch={n_batch if n_batch is not None else 'auto'}, "
-                    f"n_gpu_layers={n_gpu_layers if n_gpu_layers is not None else 'auto'}, "
-                    f"flash_attn={flash_attn if flash_attn is not None else 'default'}, "
-                    f"cache_type_k={cache_type_k if cache_type_k is not None else 'default'}, "
-                    f"cache_type_v={cache_type_v if cache_type_v is not None else 'default'})"
+
+        async def _load() -> BaseModel:
+            logger.info(
+                f"Loading causal LM: {model_id} "
+                f"(n_ctx={n_ctx if n_ctx is not None else 'auto'}, "
+                f"n_batch={n_batch if n_batch is not None else 'auto'}, "
+                f"n_gpu_layers={n_gpu_layers if n_gpu_layers is not None else 'auto'}, "
+                f"flash_attn={flash_attn if flash_attn is not None else 'default'}, "
+                f"cache_type_k={cache_type_k if cache_type_k is not None else 'default'}, "
+                f"cache_type_v={cache_type_v if cache_type_v is not None else 'default'}, "
+                f"n_parallel={n_parallel if n_parallel is not None else 'auto'}, "
+                f"draft_model={draft_model if draft_model is not None else 'none'})"
+            )
+            device = get_device()
+
+            # Detect model format (GGUF vs transformers)
+            model_format = detect_model_format(model_id)
+            logger.info(f"Detected format: {model_format}")
+
+            # Instantiate appropriate model class based on format
+            model: BaseModel
+            if model_format == "gguf":
+                model = GGUFLanguageModel(
+                    model_id,
+                    device,
+                    n_ctx=n_ctx,
+                    n_batch=n_batch,
+                    n_gpu_layers=n_gpu_layers,
+                    n_threads=n_threads,
+                    flash_attn=flash_attn,
+                    use_mmap=use_mmap,
+                    use_mlock=use_mlock,
+                    cache_type_k=cache_type_k,
+                    cache_type_v=cache_type_v,
+                    preferred_quantization=preferred_quantization,
+                    n_parallel=n_parallel,
+                    draft_model_id=draft_model,
+                    n_draft=n_draft,
                 )
-                device = get_device()
-
-                # Detect model format (GGUF vs transformers)
-                model_format = detect_model_format(model_id)
-                logger.info(f"Detected format: {model_format}")
-
-                # Instantiate appropriate model class based on format
-                model: BaseModel
-                if model_format == "gguf":
-                    model = GGUFLanguageModel(
-                        model_id,
-                        device,
-                        n_ctx=n_ctx,
-                        n_batch=n_batch,
-                        n_gpu_layers=n_gpu_layers,
-                        n_threads=n_threads,
-                        flash_attn=flash_attn,
-                        use_mmap=use_mmap,
-                        use_mlock=use_mlock,
-                        cache_type_k=cache_type_k,
-                        cache_type_v=cache_type_v,
-                        preferred_quantization=preferred_quantization,
-                    )
-                else:
-                    model = LanguageModel(model_id, device)
+            else:
+                model = LanguageModel(model_id, device)
+
+            await model.load()
+            _models[cache_key] = model
+            return model
 
-                await model.load()
-                _models[cache_key] = model
+        estimated_bytes = await asyncio.to_thread(
+            estimate_model_size_bytes, model_id, preferred_quantization
+        )
+        await _load_model(_models, cache_key, _load, estimated_bytes)
 
     # Return model (get() refreshes TTL automatically)
     return _models.get(cache_key)
@@ -536,33 +638,39 @@ async def load_encoder(
     )
 
     if cache_key not in _models:
-        async with _model_load_lock:
-            if cache_key not in _models:
-                logger.info(
-                    f"Loading encoder ({task}): {model_id} (format: {model_format})"
-                )
-                device = get_device()
-
-                model: BaseModel
-                if model_format == "gguf":
-                    if task != "embedding":
-                        raise ValueError(
-                            f"GGUF models only support embedding task, not '{task}'"
-                        )
-                    model = GGUFEncoderModel(
-                        model_id, device, preferred_quantization=preferred_quantization
-                    )
-                else:
-                    model = EncoderModel(
-                        model_id,
-                        device,
-                        task=task,
-                        max_length=max_length,
-                        use_flash_attention=use_flash_attention,
+
+        async def _load() -> BaseModel:
+            logger.info(
+                f"Loading encoder ({task}): {model_id} (format: {model_format})"
+            )
+            device = get_device()
+
+            model: BaseModel
+            if model_format == "gguf":
+                if task != "embedding":
+                    raise ValueError(
+                        f"GGUF models only support embedding task, not '{task}'"
                     )
+                model = GGUFEncoderModel(
+                    model_id, device, preferred_quantization=preferred_quantization
+                )
+            else:
+                model = EncoderModel(
+                    model_id,
+                    device,
+                    task=task,
+                    max_length=max_length,
+                    use_flash_attention=use_flash_attention,
+                )
+
+            await model.load()
+            _models[cache_key] = model
+            return model
 
-                await model.load()
-                _models[cache_key] = model
+        estimated_bytes = await asyncio.to_thread(
+            estimate_model_size_bytes, model_id, preferred_quantization
+        )
+        await _load_model(_models, cache_key, _load, estimated_bytes)
 
     return _models.get(cache_key)
 
@@ -585,19 +693,23 @@ async def load_document(
     cache_key = _make_document_cache_key(model_id, task)
 
     if cache_key not in _models:
-        async with _model_load_lock:
-            if cache_key not in _models:
-                logger.info(f"Loading document model ({task}): {model_id}")
-                device = get_device()
-
-                model = DocumentModel(
-                    model_id=model_id,
-                    device=device,
-                    task=task,
-                )
 
-                await model.load()
-                _models[cache_key] = model
+        async def _load() -> BaseModel:
+            logger.info(f"Loading document model ({task}): {model_id}")
+            device = get_device()
+
+            model = DocumentModel(
+                model_id=model_id,
+                device=device,
+                task=task,
+            )
+
+            await model.load()
+            _models[cache_key] = model
+            return model
+
+        estimated_bytes = await asyncio.to_thread(estimate_model_size_bytes, model_id)
+        await _load_model(_models, cache_key, _load, estimated_bytes)
 
     return _models.get(cache_key)
 
@@ -619,20 +731,23 @@ async def load_ocr(backend: str = "surya", languages: list[str] | None = None):
     cache_key = _make_ocr_cache_key(backend, langs)
 
     if cache_key not in _models:
-        async with _model_load_lock:
-            if cache_key not in _models:
-                logger.info(f"Loading OCR model: {backend} (languages: {langs})")
-                device = get_device()
-
-                model = OCRModel(
-                    model_id=f"ocr-{backend}",
-                    device=device,
-                    backend=backend,
-                    languages=langs,
-                )
 
-                await model.load()
-                _models[cache_key] = model
+        async def _load() -> BaseModel:
+            logger.info(f"Loading OCR model: {backend} (languages: {langs})")
+            device = get_device()
+
+            model = OCRModel(
+                model_id=f"ocr-{backend}",
+                device=device,
+                backend=backend,
+                languages=langs,
+            )
+
+            await model.load()
+            _models[cache_key] = model
+            return model
+
+        await _load_model(_models, cache_key, _load)
 
     return _models.get(cache_key)
 
@@ -662,22 +777,25 @@ async def load_anomaly(
     cache_key = _make_anomaly_cache_key(model_id, backend, normalization)
 
     if cache_key not in _models:
-        async with _model_load_lock:
-            if cache_key not in _models:
-                logger.info(f"Loading anomaly model ({backend}): {model_id}")
-                device = get_device()
-
-                model = AnomalyModel(
-                    model_id=model_id,
-                    device=device,
-                    backend=backend,
-                    contamination=contamination,
-                    threshold=threshold,
-                    normalization=normalization,
-                )
 
-                await model.load()
-                _models[cache_key] = model
+        async def _load() -> BaseModel:
+            logger.info(f"Loading anomaly model ({backend}): {model_id}")
+            device = get_device()
+
+            model = AnomalyModel(
+                model_id=model_id,
+                device=device,
+                backend=backend,
+                contamination=contamination,
+                threshold=threshold,
+                normalization=normalization,
+            )
+
+            await model.load()
+            _models[cache_key] = model
+            return model
+
+        await _load_model(_models, cache_key, _load)
 
     return _models.get(cache_key)
 
@@ -711,19 +829,22 @@ async def load_classifier(
         await cached.unload()
 
     if cache_key not in _classifiers:
-        async with _model_load_lock:
-            if cache_key not in _classifiers:
-                logger.info(f"Loading classifier model: {model_id}")
-                device = get_device()
-
-                model = ClassifierModel(
-                    model_id=model_id,
-                    device=device,
-                    base_model=base_model,
-                )
 
-                await model.load()
-                _classifiers[cache_key] = model
+        async def _load() -> "ClassifierModel":
+            logger.info(f"Loading classifier model: {model_id}")
+            device = get_device()
+
+            model = ClassifierModel(
+                model_id=model_id,
+                device=device,
+                base_model=base_model,
+            )
+
+            await model.load()
+            _classifiers[cache_key] = model
+            return model
+
+        await _load_model(_classifiers, cache_key, _load)
 
     return _classifiers.get(cache_key)
 
@@ -765,19 +886,22 @@ async def load_speech(
     cache_key = _make_speech_cache_key(model_id, compute_type)
 
     if cache_key not in _models:
-        async with _model_load_lock:
-            if cache_key not in _models:
-                logger.info(f"Loading speech model: {model_id}")
-                device = get_device()
-
-                model = SpeechModel(
-                    model_id=model_id,
-                    device=device,
-                    compute_type=compute_type,
-                )
 
-                await model.load()
-                _models[cache_key] = model
+        async def _load() -> BaseModel:
+            logger.info(f"Loading speech model: {model_id}")
+            device = get_device()
+
+            model = SpeechModel(
+                model_id=model_id,
+                device=device,
+                compute_type=compute_type,
+            )
+
+            await model.load()
+            _models[cache_key] = model
+            return model
+
+        await _load_model(_models, cache_key, _load)
 
     return _models.get(cache_key)
 
@@ -854,31 +978,34 @@ async def load_tts(
     cache_key = _make_tts_cache_key(model_id, voice, voice_profile_path)
 
     if cache_key not in _models:
-        async with _model_load_lock:
-            if cache_key not in _models:
-                logger.info(f"Loading TTS model: {model_id} (voice={voice})")
-                device = get_device()
-
-                # Create Chatterbox config if applicable
-                chatterbox_config = None
-                if model_id == "chatterbox-turbo":
-                    chatterbox_config = ChatterboxConfig(
-                        temperature=temperature,
-                        top_k=top_k,
-                        top_p=top_p,
-                        repetition_penalty=repetition_penalty,
-                    )
 
-                model = TTSModel(
-                    model_id=model_id,
-                    device=device,
-                    voice=voice,
-                    voice_profiles=profiles,
-                    chatterbox_config=chatterbox_config,
+        async def _load() -> BaseModel:
+            logger.info(f"Loading TTS model: {model_id} (voice={voice})")
+            device = get_device()
+
+            # Create Chatterbox config if applicable
+            chatterbox_config = None
+            if model_id == "chatterbox-turbo":
+                chatterbox_config = ChatterboxConfig(
+                    temperature=temperature,
+                    top_k=top_k,
+                    top_p=top_p,
+                    repetition_penalty=repetition_penalty,
                 )
 
-                await model.load()
-                _models[cache_key] = model
+            model = TTSModel(
+                model_id=model_id,
+                device=device,
+                voice=voice,
+                voice_profiles=profiles,
+                chatterbox_config=chatterbox_config,
+            )
+
+            await model.load()
+            _models[cache_key] = model
+            return model
+
+        await _load_model(_models, cache_key, _load)
 
     # Return model (get() refreshes TTL automatically)
     return _models.get(cache_key)
@@ -902,12 +1029,12 @@ set_file_image_getter(get_file_images)
 
 # Anomaly router
 set_anomaly_loader(load_anomaly)
-set_anomaly_state(_models, _encoders, _model_load_lock)
+set_anomaly_state(_models, _encoders, _model_load_lock, _model_loader)
 
 # Classifier router
 set_classifier_loader(load_classifier)
 set_classifier_models_dir(CLASSIFIER_MODELS_DIR)
-set_classifier_state(_classifiers, _model_load_lock)
+set_classifier_state(_classifiers, _model_load_lock, _model_loader)
 
 # Audio router
 set_speech_loader(load_speech)
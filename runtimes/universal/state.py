@@ -4,7 +4,7 @@ Shared state management for the Universal Runtime.
 This module centralizes all global state including:
 - Model caches (with TTL-based expiration)
 - Device management
-- Locks for thread-safe model loading
+- Per-key load coordination and locks for thread-safe model loading
 - Configuration constants
 
 All routers should import shared state from this module.
@@ -19,6 +19,7 @@ from core.logging import UniversalRuntimeLogger
 from models import BaseModel, ClassifierModel
 from utils.device import get_optimal_device
 from utils.feature_encoder import FeatureEncoder
+from utils.load_coordinator import ModelLoadCoordinator
 from utils.model_cache import ModelCache
 from utils.safe_home import get_data_dir
 
@@ -54,7 +55,11 @@ CLASSIFIER_MODELS_DIR = _LF_DATA_DIR / "models" / "classifier"
 _models: ModelCache[BaseModel] = ModelCache(ttl=MODEL_UNLOAD_TIMEOUT)
 _classifiers: ModelCache[ClassifierModel] = ModelCache(ttl=MODEL_UNLOAD_TIMEOUT)
 
-# Lock for thread-safe model loading
+# Per-key coordinator for lazy model loads (single-flight, bounded parallelism).
+# Injected by the main server so every router shares its slots and budget.
+_model_loader: ModelLoadCoordinator | None = None
+
+# Lock for explicit load/replace operations
 _model_load_lock = asyncio.Lock()
 
 # Current device (lazily initialized)
@@ -105,6 +110,23 @@ def get_encoders_cache() -> dict[str, FeatureEncoder]:
     return _encoders
 
 
+def set_model_loader(model_loader: ModelLoadCoordinator) -> None:
+    """Set the per-key model load coordinator shared with the main server."""
+    global _model_loader
+    _model_loader = model_loader
+
+
+def get_model_loader() -> ModelLoadCoordinator:
+    """Get the per-key model load coordinator.
+
+    Raises:
+        RuntimeError: If the main server hasn't injected its coordinator
+    """
+    if _model_loader is None:
+        raise RuntimeError("Model loader not initialized. Server configuration error.")
+    return _model_loader
+
+
 def get_model_load_lock() -> asyncio.Lock:
     """Get the model loading lock."""
     return _model_load_lock
@@ -69,6 +69,32 @@ class TestTokenCounter:
         # Should include 10% overhead
         assert estimated == int(base_tokens * TokenCounter.TEMPLATE_OVERHEAD_FACTOR)
 
+    def test_count_tokens_is_cached(self):
+        """Test that repeated text is only tokenized once."""
+        llama = MockLlama()
+        calls = []
+        original_tokenize = llama.tokenize
+        llama.tokenize = lambda text, **kwargs: (
+            calls.append(text) or (original_tokenize(text, **kwargs))
+        )
+        counter = TokenCounter(llama)
+
+        first = counter.count_tokens("Hello world")
+        assert counter.count_tokens("Hello world") == first
+        counter.count_tokens("Something else")
+
+        assert calls == ["Hello world", "Something else"]
+
+    def test_count_tokens_cache_is_bounded(self, monkeypatch):
+        """Test that the least recently used counts are evicted."""
+        monkeypatch.setattr(TokenCounter, "CACHE_SIZE", 2)
+        counter = TokenCounter(MockLlama())
+
+        for text in ["a", "b", "a", "c"]:
+            counter.count_tokens(text)
+
+        assert len(counter._cache) == 2
+
     def test_truncate_to_tokens(self):
         """Test text truncation to token limit."""
         counter = TokenCounter(MockLlama())
@@ -200,6 +226,67 @@ class TestContextManager:
         assert len(messages) == original_len
         assert messages[0]["content"] == original_first
 
+    @pytest.mark.parametrize(
+        "strategy",
+        [
+            TruncationStrategy.SLIDING_WINDOW,
+            TruncationStrategy.KEEP_SYSTEM_SLIDING,
+            TruncationStrategy.MIDDLE_OUT,
+        ],
+    )
+    def test_long_history_tokenizes_each_message_once(self, strategy):
+        """Test that truncating a long history counts each message once."""
+        llama = MockLlama()
+        calls = []
+        original_tokenize = llama.tokenize
+        llama.tokenize = lambda text, **kwargs: (
+            calls.append(text) or (original_tokenize(text, **kwargs))
+        )
+        manager = ContextManager(
+            TokenCounter(llama), ContextBudget.from_context_size(1000)
+        )
+        messages = [{"role": "system", "content": "You are helpful"}] + [
+            {"role": "user" if i % 2 else "assistant", "content": f"{i} " * 40}
+            for i in range(200)
+        ]
+
+        result, usage = manager.truncate_if_needed(messages, strategy)
+
+        assert len(calls) == len(messages)
+        assert usage.prompt_tokens <= manager.budget.max_prompt_tokens
+        assert result[-1] is messages[-1]
+
+        # The next request in the conversation reuses the cached counts
+        calls.clear()
+        manager.truncate_if_needed(
+            messages + [{"role": "user", "content": "next"}], strategy
+        )
+        assert calls == ["next"]
+
+    @pytest.mark.parametrize("max_prompt_tokens", [30, 55, 80, 200])
+    def test_truncation_matches_message_by_message_removal(self, max_prompt_tokens):
+        """Test that the binary search keeps the same messages as a linear scan."""
+        counter = TokenCounter(MockLlama())
+        budget = ContextBudget(
+            total_context=1000,
+            max_prompt_tokens=max_prompt_tokens,
+            reserved_completion=0,
+            safety_margin=0,
+        )
+        manager = ContextManager(counter, budget)
+        messages = [{"role": "user", "content": "x" * (13 * i % 70)} for i in range(12)]
+
+        expected = list(messages)
+        while (
+            len(expected) > 1
+            and counter.estimate_prompt_tokens(expected) > max_prompt_tokens
+        ):
+            expected.pop(0)
+
+        counts = manager._message_counts(messages)
+        dropped = manager._count_oldest_to_drop(counts, max_prompt_tokens)
+        assert messages[dropped:] == expected
+
     def test_content_truncation_for_huge_message(self, manager):
         """Test that huge individual messages get content-truncated."""
         # Create a single message that exceeds entire context budget
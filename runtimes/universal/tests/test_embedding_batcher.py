@@ -0,0 +1,153 @@
+"""
+Tests for embedding micro-batching.
+
+Verifies that concurrent embed() calls are coalesced into shared batches with
+results scattered back in order, and that EncoderModel runs length-sorted
+forward passes within the token budget.
+"""
+
+import asyncio
+
+import pytest
+import torch
+
+from models.encoder_model import EncoderModel
+from utils.embedding_batcher import EmbeddingBatcher
+
+
+def _fake_embed_fn(calls: list):
+    async def _embed(texts: list[str], normalize: bool) -> list[list[float]]:
+        calls.append((list(texts), normalize))
+        await asyncio.sleep(0)
+        return [[float(len(t)), 1.0 if normalize else 0.0] for t in texts]
+
+    return _embed
+
+
+class TestEmbeddingBatcher:
+    """Test request coalescing and result scattering."""
+
+    async def test_concurrent_requests_share_one_call(self):
+        calls: list = []
+        batcher = EmbeddingBatcher(_fake_embed_fn(calls), max_wait_ms=20)
+
+        results = await asyncio.gather(
+            batcher.embed(["a"]),
+            batcher.embed(["bb", "ccc"]),
+            batcher.embed(["dddd"]),
+        )
+
+        assert len(calls) == 1
+        assert calls[0] == (["a", "bb", "ccc", "dddd"], True)
+        assert results == [
+            [[1.0, 1.0]],
+            [[2.0, 1.0], [3.0, 1.0]],
+            [[4.0, 1.0]],
+        ]
+
+    async def test_normalize_settings_are_batched_separately(self):
+        calls: list = []
+        batcher = EmbeddingBatcher(_fake_embed_fn(calls), max_wait_ms=20)
+
+        normalized, raw = await asyncio.gather(
+            batcher.embed(["a"], normalize=True),
+            batcher.embed(["bb"], normalize=False),
+        )
+
+        assert sorted(calls, key=lambda c: c[1]) == [(["bb"], False), (["a"], True)]
+        assert normalized == [[1.0, 1.0]]
+        assert raw == [[2.0, 0.0]]
+
+    async def test_token_budget_closes_window_early(self):
+        calls: list = []
+        batcher = EmbeddingBatcher(
+            _fake_embed_fn(calls), max_wait_ms=10_000, max_batch_tokens=4
+        )
+
+        result = await asyncio.wait_for(batcher.embed(["x" * 40]), timeout=1)
+
+        assert result == [[40.0, 1.0]]
+
+    async def test_errors_reach_every_caller_in_batch(self):
+        async def _fail(texts, normalize):
+            raise RuntimeError("forward failed")
+
+        batcher = EmbeddingBatcher(_fail, max_wait_ms=20)
+        results = await asyncio.gather(
+            batcher.embed(["a"]), batcher.embed(["b"]), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_empty_input(self):
+        calls: list = []
+        batcher = EmbeddingBatcher(_fake_embed_fn(calls))
+
+        assert await batcher.embed([]) == []
+        assert calls == []
+
+
+class _FakeTokenizer:
+    """Tokenizes to one token per character and records padded batches."""
+
+    def __init__(self):
+        self.padded_lengths: list[list[int]] = []
+
+    def __call__(self, texts, truncation=True, max_length=None):
+        ids = [[ord(c) for c in t][:max_length] for t in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(i) for i in ids]}
+
+    def pad(self, features, return_tensors="pt"):
+        lengths = [len(ids) for ids in features["input_ids"]]
+        self.padded_lengths.append(lengths)
+        width = max(lengths)
+        return {
+            key: torch.tensor([row + [0] * (width - len(row)) for row in rows])
+            for key, rows in features.items()
+        }
+
+
+class _FakeModel:
+    """Returns token embeddings that encode the sequence length."""
+
+    def __call__(self, input_ids, attention_mask):
+        lengths = attention_mask.sum(dim=1, keepdim=True).float()
+        hidden = lengths.unsqueeze(-1).expand(-1, input_ids.shape[1], 2)
+        return (hidden,)
+
+
+class TestEncoderModelBatching:
+    """Test length-sorted forward passes in EncoderModel."""
+
+    def _model(self, max_batch_tokens: int) -> EncoderModel:
+        model = EncoderModel("test/encoder", "cpu", task="embedding")
+        model.tokenizer = _FakeTokenizer()
+        model.model = _FakeModel()
+        model._batcher = EmbeddingBatcher(
+            model._embed_batch, max_wait_ms=0, max_batch_tokens=max_batch_tokens
+        )
+        return model
+
+    def test_sorted_chunks_within_budget_in_input_order(self):
+        model = self._model(max_batch_tokens=8)
+        texts = ["aaaa", "a", "aaa", "aa"]
+
+        vectors = model._embed_sync(texts, normalize=False)
+
+        # Results come back in input order
+        assert [v[0] for v in vectors] == [4.0, 1.0, 3.0, 2.0]
+        # Passes were length-sorted and padded size stayed within budget
+        assert model.tokenizer.padded_lengths == [[1, 2], [3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_embed_goes_through_batcher(self):
+        model = self._model(max_batch_tokens=1024)
+
+        first, second = await asyncio.gather(
+            model.embed(["aa"], normalize=False),
+            model.embed(["aaaa"], normalize=False),
+        )
+
+        assert first[0][0] == 2.0
+        assert second[0][0] == 4.0
+        assert model.tokenizer.padded_lengths == [[2, 4]]
@@ -50,6 +50,8 @@ class TestGGUFEncoderModel:
             call_kwargs = mock_llama_cls.call_args[1]
             assert call_kwargs["embedding"] is True
             assert call_kwargs["n_gpu_layers"] == -1
+            # Multiple inputs are packed into one decode
+            assert call_kwargs["n_seq_max"] > 1
 
     @pytest.mark.asyncio
     async def test_load_model_force_cpu(self, tmp_path, monkeypatch):
@@ -130,11 +132,10 @@ class TestGGUFEncoderModel:
 
         # Mock llama instance that returns embedding result
         mock_llama = MagicMock()
-        # Mock the create_embedding response format
-        mock_embedding = [0.1, 0.2, 0.3, 0.4, 0.5]
-        mock_llama.create_embedding.return_value = {
-            "data": [{"embedding": mock_embedding}]
-        }
+        # Llama.embed returns a (n_texts, n_embd) array
+        mock_llama.embed.return_value = np.array(
+            [[0.1, 0.2, 0.3, 0.4, 0.5]], dtype=np.float32
+        )
 
         with (
             patch(
@@ -164,16 +165,19 @@ class TestGGUFEncoderModel:
         # Mock llama instance
         mock_llama = MagicMock()
 
-        def mock_create_embedding(input):
+        def mock_embed(texts, normalize=True):
             """Mock different embeddings for different inputs."""
             embeddings_map = {
                 "Hello": [0.1, 0.2, 0.3],
                 "World": [0.4, 0.5, 0.6],
                 "Test": [0.7, 0.8, 0.9],
             }
-            return {"data": [{"embedding": embeddings_map.get(input, [0.0, 0.0, 0.0])}]}
+            return np.array(
+                [embeddings_map.get(t, [0.0, 0.0, 0.0]) for t in texts],
+                dtype=np.float32,
+            )
 
-        mock_llama.create_embedding.side_effect = mock_create_embedding
+        mock_llama.embed.side_effect = mock_embed
 
         with (
             patch(
@@ -190,6 +194,10 @@ class TestGGUFEncoderModel:
             # All embeddings should have same dimension
             dims = [len(emb) for emb in embeddings]
             assert dims == [3, 3, 3]
+            # All texts are embedded in a single call so they can share batches
+            mock_llama.embed.assert_called_once_with(
+                ["Hello", "World", "Test"], normalize=False
+            )
 
     @pytest.mark.asyncio
     async def test_embed_normalization(self, tmp_path):
@@ -201,12 +209,16 @@ class TestGGUFEncoderModel:
 
         model = GGUFEncoderModel("test/embed-model", "cpu")
 
-        # Mock llama instance with unnormalized embedding
+        # Mock llama instance that normalizes like Llama.embed
         mock_llama = MagicMock()
-        mock_embedding = [3.0, 4.0]  # Length = 5.0
-        mock_llama.create_embedding.return_value = {
-            "data": [{"embedding": mock_embedding}]
-        }
+
+        def mock_embed(texts, normalize=True):
+            embeddings = np.array([[3.0, 4.0]], dtype=np.float32)  # Length = 5.0
+            if normalize:
+                embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+            return embeddings
+
+        mock_llama.embed.side_effect = mock_embed
 
         with (
             patch(
@@ -241,10 +253,9 @@ class TestGGUFEncoderModel:
 
         # Mock llama instance with unnormalized embedding
         mock_llama = MagicMock()
-        mock_embedding = [3.0, 4.0]  # Length = 5.0
-        mock_llama.create_embedding.return_value = {
-            "data": [{"embedding": mock_embedding}]
-        }
+        mock_llama.embed.return_value = np.array(
+            [[3.0, 4.0]], dtype=np.float32
+        )  # Length = 5.0
 
         with (
             patch(
@@ -259,6 +270,7 @@ class TestGGUFEncoderModel:
             embeddings_unnormalized = await model.embed(["Test"], normalize=False)
 
             # Should preserve original values
+            mock_llama.embed.assert_called_once_with(["Test"], normalize=False)
             assert embeddings_unnormalized[0][0] == 3.0
             assert embeddings_unnormalized[0][1] == 4.0
 
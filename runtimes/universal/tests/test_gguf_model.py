@@ -7,11 +7,13 @@ Tests for runtime-specific format detection (detect_model_format) are in
 tests/test_model_format.py.
 """
 
+import asyncio
+import threading
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
-from models.gguf_language_model import GGUFLanguageModel
+from models.gguf_language_model import GGUFLanguageModel, _TokenHandoff
 
 
 class TestGGUFLanguageModel:
@@ -281,7 +283,328 @@ class TestGGUFLanguageModel:
         assert callable(logits_processor), "logits_processor must be callable"
 
 
+class TestGGUFCancellation:
+    """Tests for stopping llama.cpp generation when the client goes away."""
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_generation(self):
+        """Closing the stream early sets the event llama.cpp checks between tokens."""
+        model = GGUFLanguageModel("test/model", "cpu")
+        model.llama = Mock()
+        produced = []
+
+        def chunks(**kwargs):
+            for i in range(10_000):
+                if kwargs["cancel_event"].is_set():
+                    return
+                produced.append(i)
+                yield {"choices": [{"delta": {"content": f"t{i}"}}]}
+
+        model.llama.create_chat_completion.side_effect = chunks
+
+        gen = model.generate_stream([{"role": "user", "content": "Hi"}])
+        assert await gen.__anext__() == "t0"
+        await gen.aclose()
+
+        cancel_event = model.llama.create_chat_completion.call_args[1]["cancel_event"]
+        assert cancel_event.is_set()
+        # The generation thread stops instead of producing all tokens
+        model._executor.shutdown(wait=True)
+        assert len(produced) < 10_000
+
+    @pytest.mark.asyncio
+    async def test_cancelled_generate_sets_cancel_event(self):
+        """Cancelling a non-streaming request stops the running completion."""
+        model = GGUFLanguageModel("test/model", "cpu")
+        model.llama = Mock()
+        started = threading.Event()
+
+        def completion(**kwargs):
+            started.set()
+            kwargs["cancel_event"].wait(5)
+            return {"choices": [{"message": {"content": ""}}]}
+
+        model.llama.create_chat_completion.side_effect = completion
+
+        task = asyncio.create_task(
+            model.generate([{"role": "user", "content": "Hi"}], max_tokens=10)
+        )
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert model.llama.create_chat_completion.call_args[1]["cancel_event"].is_set()
+
+    @pytest.mark.asyncio
+    async def test_token_handoff_batches_wakeups(self):
+        """A burst of tokens from the thread costs one event loop wake-up."""
+        loop = asyncio.get_running_loop()
+        handoff = _TokenHandoff(loop)
+
+        with patch.object(
+            loop, "call_soon_threadsafe", wraps=loop.call_soon_threadsafe
+        ) as call_soon:
+            thread = threading.Thread(
+                target=lambda: [handoff.put(t) for t in ["a", "b", "c", None]]
+            )
+            thread.start()
+            thread.join()
+
+            assert [token async for token in handoff.items()] == ["a", "b", "c"]
+        assert call_soon.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_token_handoff_raises_thread_errors(self):
+        """Exceptions from the generation thread are raised in the consumer."""
+        handoff = _TokenHandoff(asyncio.get_running_loop())
+        handoff.put("a")
+        handoff.put(RuntimeError("boom"))
+
+        received = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for token in handoff.items():
+                received.append(token)
+        assert received == ["a"]
+
+
+class _FakeBatcher:
+    """Batcher stand-in that completes each request synchronously."""
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.requests = []
+
+    def submit(self, request):
+        self.requests.append(request)
+        for delta in self.deltas:
+            request.on_delta(delta)
+        request.finish_reason = "stop"
+        request.on_done("stop", None)
+
+    def cancel(self, request):
+        request.cancelled = True
+
+
+class TestGGUFContinuousBatching:
+    """Tests for the continuous batching path of GGUFLanguageModel."""
+
+    @pytest.mark.asyncio
+    async def test_load_with_n_parallel_starts_batcher(self, tmp_path):
+        """n_parallel > 1 sizes the context for N sequences and starts a batcher."""
+        gguf_file = tmp_path / "model.gguf"
+        gguf_file.write_text("mock gguf content")
+
+        model = GGUFLanguageModel("test/model", "cpu", n_parallel=4)
+        mock_llama = MagicMock()
+
+        with (
+            patch(
+                "models.gguf_language_model.get_gguf_file_path",
+                return_value=str(gguf_file),
+            ),
+            patch(
+                "models.gguf_language_model.get_default_context_size",
+                return_value=(2048, []),
+            ),
+            patch("llamafarm_llama.Llama", return_value=mock_llama) as mock_llama_cls,
+            patch("llamafarm_llama.ContinuousBatcher") as mock_batcher_cls,
+        ):
+            await model.load()
+            assert mock_llama_cls.call_args[1]["n_seq_max"] == 4
+            mock_batcher_cls.assert_called_once_with(mock_llama, n_slots=4)
+            mock_batcher_cls.return_value.start.assert_called_once()
+
+            await model.unload()
+            mock_batcher_cls.return_value.stop.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_load_without_n_parallel_has_no_batcher(self, tmp_path):
+        """The default single-sequence setup does not start a batcher."""
+        gguf_file = tmp_path / "model.gguf"
+        gguf_file.write_text("mock gguf content")
+
+        model = GGUFLanguageModel("test/model", "cpu")
+
+        with (
+            patch(
+                "models.gguf_language_model.get_gguf_file_path",
+                return_value=str(gguf_file),
+            ),
+            patch(
+                "models.gguf_language_model.get_default_context_size",
+                return_value=(2048, []),
+            ),
+            patch("llamafarm_llama.Llama", return_value=MagicMock()) as mock_llama_cls,
+        ):
+            await model.load()
+            assert mock_llama_cls.call_args[1]["n_seq_max"] == 1
+            assert model._batcher is None
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_uses_batcher(self):
+        """Streaming requests are submitted to the batcher instead of the context."""
+        model = GGUFLanguageModel("test/model", "cpu")
+        mock_llama = Mock()
+        mock_llama._apply_chat_template.return_value = "<prompt>"
+        mock_llama.tokenize.return_value = [1, 2, 3]
+        model.llama = mock_llama
+        model._batcher = _FakeBatcher(["Hel", "lo"])
+
+        tokens = [
+            t
+            async for t in model.generate_stream(
+                [{"role": "user", "content": "Hi"}], max_tokens=10, stop=["\n"]
+            )
+        ]
+
+        assert tokens == ["Hel", "lo"]
+        request = model._batcher.requests[0]
+        assert request.prompt_tokens == [1, 2, 3]
+        assert request.max_tokens == 10
+        assert request.stop == ["\n"]
+        mock_llama.create_chat_completion.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_batcher(self):
+        """Non-streaming requests join the batched output."""
+        model = GGUFLanguageModel("test/model", "cpu")
+        mock_llama = Mock()
+        mock_llama._apply_chat_template.return_value = "<prompt>"
+        mock_llama.tokenize.return_value = [1, 2, 3]
+        model.llama = mock_llama
+        model._batcher = _FakeBatcher([" Hello", " there "])
+
+        result = await model.generate([{"role": "user", "content": "Hi"}])
+
+        assert result == "Hello there"
+        mock_llama.create_chat_completion.assert_not_called()
+
+
 @pytest.mark.integration
+class TestGGUFSpeculativeDecoding:
+    """Tests for loading a draft model for speculative decoding."""
+
+    @pytest.mark.asyncio
+    async def test_load_attaches_draft_model(self, tmp_path):
+        """A draft model is loaded alongside the main model and attached to it."""
+        main_file = tmp_path / "model.gguf"
+        main_file.write_text("mock gguf content")
+        draft_file = tmp_path / "draft.gguf"
+        draft_file.write_text("mock gguf content")
+
+        model = GGUFLanguageModel(
+            "test/model", "cpu", draft_model_id="test/draft:Q8_0", n_draft=4
+        )
+        main_llama, draft_llama = MagicMock(), MagicMock()
+
+        with (
+            patch(
+                "models.gguf_language_model.get_gguf_file_path",
+                side_effect=[str(main_file), str(draft_file)],
+            ) as mock_get_path,
+            patch(
+                "models.gguf_language_model.get_default_context_size",
+                return_value=(2048, []),
+            ),
+            patch(
+                "llamafarm_llama.Llama", side_effect=[main_llama, draft_llama]
+            ) as mock_llama_cls,
+        ):
+            await model.load()
+
+            draft_call = mock_get_path.call_args_list[1]
+            assert draft_call[0][0] == "test/draft"
+            assert draft_call[1]["preferred_quantization"] == "Q8_0"
+            assert mock_llama_cls.call_args[1]["model_path"] == str(draft_file)
+            assert mock_llama_cls.call_args[1]["n_ctx"] == 2048
+            main_llama.set_draft_model.assert_called_once_with(draft_llama, n_draft=4)
+
+            await model.unload()
+            assert model._draft is None
+
+    @pytest.mark.asyncio
+    async def test_draft_model_ignored_with_continuous_batching(self, tmp_path):
+        """The batcher does not speculate, so no draft model is loaded."""
+        gguf_file = tmp_path / "model.gguf"
+        gguf_file.write_text("mock gguf content")
+
+        model = GGUFLanguageModel(
+            "test/model", "cpu", n_parallel=2, draft_model_id="test/draft"
+        )
+        mock_llama = MagicMock()
+
+        with (
+            patch(
+                "models.gguf_language_model.get_gguf_file_path",
+                return_value=str(gguf_file),
+            ) as mock_get_path,
+            patch(
+                "models.gguf_language_model.get_default_context_size",
+                return_value=(2048, []),
+            ),
+            patch("llamafarm_llama.Llama", return_value=mock_llama) as mock_llama_cls,
+            patch("llamafarm_llama.ContinuousBatcher"),
+        ):
+            await model.load()
+
+            assert mock_get_path.call_count == 1
+            assert mock_llama_cls.call_count == 1
+            mock_llama.set_draft_model.assert_not_called()
+
+
+class TestGGUFKVSnapshots:
+    """Tests for persisting conversation KV state across model reloads."""
+
+    @pytest.mark.asyncio
+    async def test_load_attaches_cache_and_unload_saves(self, tmp_path):
+        """The disk cache is attached on load and the resident state saved on unload."""
+        gguf_file = tmp_path / "model.gguf"
+        gguf_file.write_text("mock gguf content")
+
+        model = GGUFLanguageModel("test/model", "cpu")
+        mock_llama = MagicMock()
+        kv_cache = MagicMock()
+
+        with (
+            patch(
+                "models.gguf_language_model.get_gguf_file_path",
+                return_value=str(gguf_file),
+            ),
+            patch(
+                "models.gguf_language_model.get_default_context_size",
+                return_value=(2048, []),
+            ),
+            patch(
+                "models.gguf_language_model._get_kv_disk_cache", return_value=kv_cache
+            ),
+            patch("llamafarm_llama.Llama", return_value=mock_llama),
+        ):
+            await model.load()
+            mock_llama.set_prefix_cache.assert_called_once_with(kv_cache)
+
+            await model.unload()
+            mock_llama.save_prefix_state.assert_called_once()
+
+    def test_disk_cache_configured_from_env(self, tmp_path, monkeypatch):
+        """LLAMAFARM_KV_CACHE_DIR and LLAMAFARM_KV_CACHE_SIZE_MB configure the cache."""
+        from models.gguf_language_model import _get_kv_disk_cache
+
+        monkeypatch.setenv("LLAMAFARM_KV_CACHE_DIR", str(tmp_path / "kv"))
+        monkeypatch.setenv("LLAMAFARM_KV_CACHE_SIZE_MB", "1")
+        _get_kv_disk_cache.cache_clear()
+        try:
+            cache = _get_kv_disk_cache()
+            assert cache.cache_dir == tmp_path / "kv"
+            assert cache.capacity_bytes == 1024 * 1024
+
+            monkeypatch.setenv("LLAMAFARM_KV_CACHE_SIZE_MB", "0")
+            _get_kv_disk_cache.cache_clear()
+            assert _get_kv_disk_cache() is None
+        finally:
+            _get_kv_disk_cache.cache_clear()
+
+
 class TestGGUFIntegration:
     """Integration tests for GGUF support (requires actual model download)."""
 
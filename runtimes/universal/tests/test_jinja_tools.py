@@ -2,11 +2,15 @@
 Tests for Jinja2 template utilities.
 """
 
+import json
+from unittest.mock import patch
+
 import pytest
 from jinja2 import TemplateError
 
 from utils.jinja_tools import (
     create_jinja_environment,
+    get_compiled_template,
     render_chat_with_tools,
     supports_native_tools,
 )
@@ -308,3 +312,72 @@ User: {{ message.content }}
         assert "<|system|>" in result
         assert "<|user|>" in result
         assert "<|assistant|>" in result
+
+
+class TestTemplateCaching:
+    """Tests for compiled template and tool definition caching."""
+
+    TEMPLATE = """
+{%- for tool in tools %}{{ tool | tojson(indent=2) }}
+{% endfor %}
+{%- for message in messages %}{{ message.role }}: {{ message.content }}
+{% endfor %}
+    """.strip()
+
+    TOOLS = [
+        {
+            "type": "function",
+            "function": {
+                "name": "get_weather",
+                "description": "Get current weather",
+                "parameters": {
+                    "type": "object",
+                    "properties": {"city": {"type": "string"}},
+                    "required": ["city"],
+                },
+            },
+        }
+    ]
+
+    def test_compiled_template_is_reused(self):
+        """Test that a template is only compiled once."""
+        template = "{{ messages | length }} cached"
+
+        assert get_compiled_template(template) is get_compiled_template(template)
+
+        for n in range(3):
+            messages = [{"role": "user", "content": "Hi"}] * n
+            assert render_chat_with_tools(template, messages) == f"{n} cached"
+
+    def test_cached_tools_render_like_plain_tools(self):
+        """Test that cached tool definitions render exactly like the originals."""
+        messages = [{"role": "user", "content": "Weather in Paris?"}]
+        expected = (
+            create_jinja_environment()
+            .from_string(self.TEMPLATE)
+            .render(messages=messages, tools=self.TOOLS)
+        )
+
+        for _ in range(2):
+            result = render_chat_with_tools(self.TEMPLATE, messages, self.TOOLS)
+            assert result == expected
+
+    def test_tool_json_is_serialized_once_per_tool_list(self):
+        """Test that the same tools are not re-serialized on every turn."""
+        tools = json.loads(json.dumps(self.TOOLS))
+        tools[0]["function"]["name"] = "get_forecast"
+        indented_dumps = []
+        original_dumps = json.dumps
+
+        def tracking_dumps(value, *args, **kwargs):
+            if kwargs.get("indent") is not None:
+                indented_dumps.append(value)
+            return original_dumps(value, *args, **kwargs)
+
+        with patch("utils.jinja_tools.json.dumps", side_effect=tracking_dumps):
+            for turn in range(3):
+                messages = [{"role": "user", "content": f"Turn {turn}"}]
+                result = render_chat_with_tools(self.TEMPLATE, messages, tools)
+                assert f"user: Turn {turn}" in result
+
+        assert len(indented_dumps) == 1
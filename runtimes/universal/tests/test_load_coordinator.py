@@ -0,0 +1,169 @@
+"""
+Tests for per-key model load coordination.
+
+Verifies that duplicate loads share one in-flight load, unrelated loads run in
+parallel, and concurrency/memory bounds are respected.
+"""
+
+import asyncio
+
+import pytest
+
+from utils.load_coordinator import ModelLoadCoordinator
+
+MB = 1024 * 1024
+
+
+class TestSingleFlight:
+    """Concurrent loads for the same key share one factory call."""
+
+    async def test_duplicate_requests_share_one_load(self):
+        loader = ModelLoadCoordinator(max_concurrent=2, memory_budget_bytes=0)
+        calls = 0
+
+        async def _load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return object()
+
+        results = await asyncio.gather(*(loader.load("k", _load) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        assert not loader.is_loading("k")
+
+    async def test_errors_propagate_to_all_waiters_and_allow_retry(self):
+        loader = ModelLoadCoordinator(max_concurrent=2, memory_budget_bytes=0)
+        calls = 0
+
+        async def _fail():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            loader.load("k", _fail), loader.load("k", _fail), return_exceptions=True
+        )
+        assert calls == 1
+        assert all(isinstance(r, ValueError) for r in results)
+
+        # A later request starts a fresh load
+        with pytest.raises(ValueError):
+            await loader.load("k", _fail)
+        assert calls == 2
+        assert loader.active_loads == 0
+
+    async def test_cancelled_waiter_does_not_abort_shared_load(self):
+        loader = ModelLoadCoordinator(max_concurrent=2, memory_budget_bytes=0)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def _load():
+            started.set()
+            await release.wait()
+            return "model"
+
+        first = asyncio.create_task(loader.load("k", _load))
+        await started.wait()
+        second = asyncio.create_task(loader.load("k", _load))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == "model"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+
+    async def test_request_after_load_completes_reuses_cached_model(self):
+        loader = ModelLoadCoordinator(max_concurrent=2, memory_budget_bytes=0)
+        cache: dict[str, object] = {}
+        calls = 0
+
+        async def _load():
+            nonlocal calls
+            calls += 1
+            model = object()
+            cache["k"] = model
+            return model
+
+        # The late request saw a cache miss, then the earlier load finished
+        # and left the in-flight table before the late request reached load()
+        assert "k" not in cache
+        first = await loader.load("k", _load, cache=cache)
+        second = await loader.load("k", _load, cache=cache)
+
+        assert calls == 1
+        assert second is first
+
+
+class TestBounds:
+    """Different keys load in parallel within the configured bounds."""
+
+    async def test_different_keys_load_in_parallel(self):
+        loader = ModelLoadCoordinator(max_concurrent=2, memory_budget_bytes=0)
+        both_running = asyncio.Event()
+        running = 0
+
+        async def _load():
+            nonlocal running
+            running += 1
+            if running == 2:
+                both_running.set()
+            await asyncio.wait_for(both_running.wait(), timeout=1)
+            running -= 1
+            return True
+
+        assert await asyncio.gather(loader.load("a", _load), loader.load("b", _load))
+
+    async def test_concurrency_limit(self):
+        loader = ModelLoadCoordinator(max_concurrent=1, memory_budget_bytes=0)
+        running = 0
+        peak = 0
+
+        async def _load():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(loader.load(f"k{i}", _load) for i in range(4)))
+        assert peak == 1
+
+    async def test_memory_budget_serializes_large_loads(self):
+        loader = ModelLoadCoordinator(max_concurrent=4, memory_budget_bytes=100 * MB)
+        running: set[str] = set()
+        overlaps: list[set[str]] = []
+
+        def _make(name: str):
+            async def _load():
+                running.add(name)
+                overlaps.append(set(running))
+                await asyncio.sleep(0.02)
+                running.discard(name)
+
+            return _load
+
+        await asyncio.gather(
+            loader.load("big1", _make("big1"), estimated_bytes=80 * MB),
+            loader.load("big2", _make("big2"), estimated_bytes=80 * MB),
+            loader.load("small", _make("small"), estimated_bytes=10 * MB),
+        )
+
+        assert not any({"big1", "big2"} <= s for s in overlaps)
+        assert any("small" in s and len(s) > 1 for s in overlaps)
+
+    async def test_oversized_load_still_runs(self):
+        loader = ModelLoadCoordinator(max_concurrent=2, memory_budget_bytes=10 * MB)
+
+        async def _load():
+            return "huge"
+
+        result = await asyncio.wait_for(
+            loader.load("huge", _load, estimated_bytes=1000 * MB), timeout=1
+        )
+        assert result == "huge"
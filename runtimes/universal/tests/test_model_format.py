@@ -211,3 +211,113 @@ class TestDetectModelFormat:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestEstimateModelSize:
+    """Test model size estimation from the local HuggingFace cache."""
+
+    @staticmethod
+    def _download(cache_dir, model_id: str, files: dict[str, int]) -> None:
+        """Lay out files the way huggingface_hub caches them."""
+        repo_dir = cache_dir / f"models--{model_id.replace('/', '--')}"
+        snapshot = repo_dir / "snapshots" / "abc123"
+        (repo_dir / "blobs").mkdir(parents=True, exist_ok=True)
+        snapshot.mkdir(parents=True, exist_ok=True)
+        for name, size in files.items():
+            blob = repo_dir / "blobs" / f"blob-{name}"
+            blob.write_bytes(b"\0" * size)
+            (snapshot / name).symlink_to(blob)
+
+    @pytest.fixture
+    def hf_cache(self, tmp_path, monkeypatch):
+        from huggingface_hub import constants
+
+        monkeypatch.setattr(constants, "HF_HUB_CACHE", str(tmp_path))
+        return tmp_path
+
+    def test_sizes_model_downloaded_after_first_estimate(self, hf_cache):
+        """Test a download after an earlier estimate is picked up."""
+        from utils.model_format import estimate_model_size_bytes
+
+        self._download(hf_cache, "test/other", {"model.gguf": 10})
+        assert estimate_model_size_bytes("test/other") == 10
+        assert estimate_model_size_bytes("test/model-GGUF:Q4_K_M") == 0
+
+        self._download(hf_cache, "test/model-GGUF", {"m.Q4_K_M.gguf": 300})
+
+        assert estimate_model_size_bytes("test/model-GGUF:Q4_K_M") == 300
+
+    def test_gguf_sizes_the_quantization_that_would_load(self, hf_cache):
+        """Test only the selected quantization counts, not siblings or mmproj."""
+        from utils.model_format import estimate_model_size_bytes
+
+        self._download(
+            hf_cache,
+            "test/model-GGUF",
+            {
+                "m.Q4_K_M.gguf": 300,
+                "m.Q8_0.gguf": 500,
+                "m.F16.gguf": 900,
+                "mmproj-m-f16.gguf": 700,
+            },
+        )
+
+        assert estimate_model_size_bytes("test/model-GGUF") == 300
+        assert estimate_model_size_bytes("test/model-GGUF:Q8_0") == 500
+        assert estimate_model_size_bytes("test/model-GGUF:Q8_0", "F16") == 900
+
+    def test_split_gguf_sums_all_parts(self, hf_cache):
+        """Test a split GGUF model is sized by all of its parts."""
+        from utils.model_format import estimate_model_size_bytes
+
+        self._download(
+            hf_cache,
+            "test/big-GGUF",
+            {
+                "big-Q4_K_M-00001-of-00002.gguf": 300,
+                "big-Q4_K_M-00002-of-00002.gguf": 200,
+                "big-Q8_0-00001-of-00002.gguf": 600,
+                "big-Q8_0-00002-of-00002.gguf": 400,
+            },
+        )
+
+        assert estimate_model_size_bytes("test/big-GGUF") == 500
+
+    def test_transformers_model_uses_loaded_weights(self, hf_cache):
+        """Test non-GGUF repositories count only the weights that load."""
+        from utils.model_format import estimate_model_size_bytes
+
+        self._download(
+            hf_cache,
+            "test/encoder",
+            {
+                "model.safetensors": 400,
+                "pytorch_model.bin": 450,
+                "config.json": 20,
+            },
+        )
+
+        assert estimate_model_size_bytes("test/encoder") == 400
+
+    def test_transformers_sharded_weights_use_index(self, hf_cache):
+        """Test sharded checkpoints are sized from their index."""
+        import json
+
+        from utils.model_format import estimate_model_size_bytes
+
+        index = json.dumps(
+            {"weight_map": {"a": "model-1.safetensors", "b": "model-2.safetensors"}}
+        )
+        self._download(
+            hf_cache,
+            "test/sharded",
+            {
+                "model-1.safetensors": 300,
+                "model-2.safetensors": 200,
+                "consolidated.safetensors": 900,
+            },
+        )
+        snapshot = hf_cache / "models--test--sharded" / "snapshots" / "abc123"
+        (snapshot / "model.safetensors.index.json").write_text(index)
+
+        assert estimate_model_size_bytes("test/sharded") == 500
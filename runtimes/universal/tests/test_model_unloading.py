@@ -141,6 +141,77 @@ class TestModelCache:
         assert len(cache) == 0
 
 
+class TestModelCacheBudget:
+    """Test memory-budget tracking and cost-aware eviction."""
+
+    GB = 1024**3
+
+    def _cache_with(self, ttl=300, ram_budget=0, vram_budget=0, **footprints):
+        cache = ModelCache(
+            ttl=ttl, ram_budget_bytes=ram_budget, vram_budget_bytes=vram_budget
+        )
+        for key, (ram, vram) in footprints.items():
+            cache[key] = MagicMock()
+            cache.set_footprint(key, ram_bytes=ram, vram_bytes=vram)
+        return cache
+
+    def test_tracks_used_memory(self):
+        cache = self._cache_with(a=(2 * self.GB, 0), b=(1 * self.GB, 3 * self.GB))
+        assert cache.used_ram_bytes == 3 * self.GB
+        assert cache.used_vram_bytes == 3 * self.GB
+
+        cache.pop("a")
+        assert cache.used_ram_bytes == 1 * self.GB
+
+    def test_no_eviction_within_budget(self):
+        cache = self._cache_with(ram_budget=10 * self.GB, a=(2 * self.GB, 0))
+        assert cache.pop_for_budget(ram_bytes=4 * self.GB) == []
+        assert "a" in cache
+
+    def test_evicts_by_size_times_idle_time(self):
+        cache = self._cache_with(
+            ram_budget=10 * self.GB,
+            big=(6 * self.GB, 0),
+            small=(1 * self.GB, 0),
+        )
+        # Small model idle longer, but the big one costs more per second idle
+        now = cache._timer()
+        cache._access["small"] = now - 20
+        cache._access["big"] = now - 10
+
+        evicted = cache.pop_for_budget(ram_bytes=5 * self.GB)
+
+        assert [key for key, _ in evicted] == ["big"]
+        assert "small" in cache
+
+    def test_pinned_models_never_evicted(self):
+        cache = self._cache_with(
+            ttl=0.1, ram_budget=4 * self.GB, pinned=(3 * self.GB, 0)
+        )
+        cache.pin("pinned")
+        time.sleep(0.2)
+
+        assert cache.pop_for_budget(ram_bytes=2 * self.GB) == []
+        assert cache.pop_expired() == []
+        assert "pinned" in cache
+
+        cache.unpin("pinned")
+        assert [key for key, _ in cache.pop_expired()] == ["pinned"]
+
+    def test_skips_models_that_free_nothing_over_budget(self):
+        cache = self._cache_with(
+            vram_budget=8 * self.GB,
+            cpu_model=(4 * self.GB, 0),
+            gpu_model=(0, 6 * self.GB),
+        )
+        cache._access["cpu_model"] = cache._timer() - 100
+
+        evicted = cache.pop_for_budget(vram_bytes=4 * self.GB)
+
+        assert [key for key, _ in evicted] == ["gpu_model"]
+        assert "cpu_model" in cache
+
+
 @pytest.mark.asyncio
 async def test_cleanup_idle_models(reset_server_globals, mock_model):
     """Test that idle models are unloaded after timeout."""
@@ -206,8 +277,8 @@ async def test_load_language_tracks_access(reset_server_globals):
         await server.load_language(model_id)
 
         # Verify model is tracked - cache key includes all parameters with defaults
-        # Format: language:{model_id}:ctx{ctx}:batch{batch}:gpu{gpu}:threads{threads}:flash{flash}:mmap{mmap}:mlock{mlock}:cachek{k}:cachev{v}:quant{quant}
-        cache_key = f"language:{model_id}:ctxauto:batchauto:gpuauto:threadsauto:flashdefault:mmapdefault:mlockdefault:cachekdefault:cachevdefault:quantdefault"
+        # Format: language:{model_id}:ctx{ctx}:batch{batch}:gpu{gpu}:threads{threads}:flash{flash}:mmap{mmap}:mlock{mlock}:cachek{k}:cachev{v}:quant{quant}:parallel{parallel}:draft{draft}:ndraft{n_draft}
+        cache_key = f"language:{model_id}:ctxauto:batchauto:gpuauto:threadsauto:flashdefault:mmapdefault:mlockdefault:cachekdefault:cachevdefault:quantdefault:parallelauto:draftnone:ndraftauto"
         assert cache_key in server._models
 
 
@@ -256,7 +327,7 @@ async def test_model_reaccess_updates_timestamp(reset_server_globals):
         model_id = "test/model"
         await server.load_language(model_id)
         # Cache key includes all parameters with defaults
-        cache_key = f"language:{model_id}:ctxauto:batchauto:gpuauto:threadsauto:flashdefault:mmapdefault:mlockdefault:cachekdefault:cachevdefault:quantdefault"
+        cache_key = f"language:{model_id}:ctxauto:batchauto:gpuauto:threadsauto:flashdefault:mmapdefault:mlockdefault:cachekdefault:cachevdefault:quantdefault:parallelauto:draftnone:ndraftauto"
         first_idle = server._models.get_idle_time(cache_key)
 
         # Wait a bit
@@ -325,3 +396,75 @@ async def test_cleanup_handles_unload_errors(reset_server_globals):
     # Verify both unloads were attempted
     mock_model1.unload.assert_called_once()
     mock_model2.unload.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_load_evicts_idle_model_to_fit_budget(reset_server_globals):
+    """Test that a new load first unloads idle models over the RAM budget."""
+    import server
+
+    gb = 1024**3
+    server._models = ModelCache(
+        ttl=server.MODEL_UNLOAD_TIMEOUT, ram_budget_bytes=8 * gb
+    )
+    idle_model = MagicMock()
+    idle_model.unload = AsyncMock()
+    server._models["language:idle"] = idle_model
+    server._models.set_footprint("language:idle", ram_bytes=6 * gb)
+
+    with (
+        patch("server.get_device", return_value="cpu"),
+        patch("server.detect_model_format", return_value="transformers"),
+        patch("server.estimate_model_size_bytes", return_value=4 * gb),
+        patch("server.get_available_memory_bytes", return_value=None),
+        patch("server.EncoderModel") as MockEncoderModel,
+    ):
+        mock_instance = MagicMock()
+        mock_instance.load = AsyncMock()
+        MockEncoderModel.return_value = mock_instance
+
+        await server.load_encoder("test/embedding-model", task="embedding")
+
+    idle_model.unload.assert_awaited_once()
+    assert "language:idle" not in server._models
+    cache_key = (
+        "encoder:embedding:transformers:test/embedding-model:quantdefault:lenauto"
+    )
+    assert server._models.get_footprint(cache_key).ram_bytes == 4 * gb
+
+
+@pytest.mark.asyncio
+async def test_load_reuses_model_cached_while_estimating(reset_server_globals):
+    """Test that a load finishing during the size estimate isn't loaded twice."""
+    import server
+
+    cache_key = (
+        "encoder:embedding:transformers:test/embedding-model:quantdefault:lenauto"
+    )
+    loaded = MagicMock()
+    loaded.unload = AsyncMock()
+
+    def _estimate(model_id, preferred_quantization=None):
+        # Another request's load completes while this one sizes the model
+        server._models[cache_key] = loaded
+        return 0
+
+    with (
+        patch("server.get_device", return_value="cpu"),
+        patch("server.detect_model_format", return_value="transformers"),
+        patch("server.estimate_model_size_bytes", side_effect=_estimate),
+        patch("server.EncoderModel") as MockEncoderModel,
+    ):
+        model = await server.load_encoder("test/embedding-model", task="embedding")
+
+    MockEncoderModel.assert_not_called()
+    assert model is loaded
+    loaded.unload.assert_not_awaited()
+
+
+def test_routers_share_server_model_loader():
+    """Test that the anomaly/classifier services use the server's coordinator."""
+    import server
+    import state
+
+    assert state.get_model_loader() is server._model_loader
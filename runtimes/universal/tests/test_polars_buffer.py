@@ -347,6 +347,91 @@ class TestRollingFeatures:
 
 
 @pytest.mark.slow
+class TestRollingFeatureEngine:
+    """Test incremental features against the batch get_features path."""
+
+    @staticmethod
+    def _assert_matches_batch(engine, buffer, **kwargs):
+        latest = buffer.get_features(**kwargs).tail(1).to_dicts()[0]
+        for name, value in zip(engine.feature_names, engine.latest(), strict=True):
+            expected = latest[name] if latest[name] is not None else 0.0
+            approx = pytest.approx(expected, rel=1e-9, abs=1e-9, nan_ok=True)
+            assert value == approx, name
+
+    def test_matches_get_features_while_streaming(self):
+        """Test engine output equals the last row of get_features."""
+        import random
+
+        from utils.polars_buffer import PolarsBuffer
+
+        rng = random.Random(42)
+        kwargs = {"rolling_windows": [3, 5, 20], "lag_periods": [1, 4]}
+        buffer = PolarsBuffer(window_size=30)
+        buffer.append_batch([{"value": rng.gauss(100, 5), "count": 1}])
+        engine = buffer.feature_engine(**kwargs)
+
+        for i in range(80):
+            record = {
+                "value": None if i % 17 == 5 else rng.gauss(100, 5) * 1e4,
+                "count": rng.randint(0, 3),
+            }
+            buffer.append(record)
+            engine.update(record)
+            self._assert_matches_batch(engine, buffer, **kwargs)
+
+    def test_matches_get_features_with_nan(self):
+        """Test a NaN gives NaN stats while in the window, like Polars."""
+        from utils.polars_buffer import PolarsBuffer
+
+        kwargs = {"rolling_windows": [1, 5, 10], "lag_periods": [1, 3]}
+        buffer = PolarsBuffer(window_size=100)
+        buffer.append({"value": 0.0})
+        engine = buffer.feature_engine(**kwargs)
+
+        for i in range(1, 40):
+            record = {"value": float("nan") if i == 12 else float(i % 6)}
+            buffer.append(record)
+            engine.update(record)
+            self._assert_matches_batch(engine, buffer, **kwargs)
+
+    def test_primed_from_buffer(self):
+        """Test engine created from a full buffer starts in sync."""
+        from utils.polars_buffer import PolarsBuffer
+
+        buffer = PolarsBuffer(window_size=10)
+        for i in range(25):
+            buffer.append({"value": float(i % 7)})
+
+        kwargs = {"rolling_windows": [3, 10, 50], "lag_periods": [2, 20]}
+        engine = buffer.feature_engine(**kwargs)
+
+        self._assert_matches_batch(engine, buffer, **kwargs)
+        # Windows and lags longer than the buffer are never available
+        features = dict(zip(engine.feature_names, engine.latest(), strict=True))
+        assert features["value_rolling_mean_50"] == 0.0
+        assert features["value_lag_20"] == 0.0
+
+    def test_cold_start_uses_fill_value(self):
+        """Test features are filled until the window has enough data."""
+        from utils.rolling_features import RollingFeatureEngine
+
+        engine = RollingFeatureEngine(
+            ["value"], rolling_windows=[3], lag_periods=[1], fill_null_value=-1.0
+        )
+        engine.update({"value": 2})
+        engine.update({"value": 4})
+        features = dict(zip(engine.feature_names, engine.latest(), strict=True))
+        assert features["value_rolling_mean_3"] == -1.0
+        assert features["value_lag_1"] == 2.0
+
+        engine.update({"value": 6})
+        features = dict(zip(engine.feature_names, engine.latest(), strict=True))
+        assert features["value_rolling_mean_3"] == 4.0
+        assert features["value_rolling_std_3"] == 2.0
+        assert features["value_rolling_min_3"] == 2.0
+        assert features["value_rolling_max_3"] == 6.0
+
+
 class TestPolarsBufferPerformance:
     """Test performance characteristics.
 
@@ -293,6 +293,31 @@ class TestStreamingAnomalyRollingFeatures:
         # Should still work and produce scores
         assert result.score is not None
 
+    @pytest.mark.asyncio
+    async def test_incremental_features_match_training_features(self):
+        """Test scoring features equal the batch features used for training."""
+        from models.streaming_anomaly import StreamingAnomalyDetector
+
+        detector = StreamingAnomalyDetector(
+            model_id="incremental-features-test",
+            min_samples=20,
+            window_size=50,
+            rolling_windows=[5, 10],
+            lag_periods=[1, 2],
+        )
+
+        for i in range(60):
+            await detector.process({"value": float(i % 9), "other": i * 0.5})
+
+        assert detector._features is not None
+        values = detector._features.latest()
+        streamed = [values[i] for i in detector._feature_index]
+        batch = detector._buffer.get_features(
+            rolling_windows=[5, 10], lag_periods=[1, 2], fill_null_value=0.0
+        )
+        expected = batch.tail(1).select(detector._feature_columns).row(0)
+        assert streamed == pytest.approx(expected)
+
 
 class TestStreamingDetectorManager:
     """Test the detector manager for session management."""
@@ -13,7 +13,12 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from routers.chat_completions.service import ChatCompletionsService, ToolCallStreamState
+from routers.chat_completions.service import ChatCompletionsService
+from utils.tool_calling import (
+    StreamingToolCallParser,
+    ToolCallEventType,
+    ToolCallStreamState,
+)
 
 
 class TestToolCallStreamState:
@@ -89,46 +94,18 @@ class TestIncrementalToolCallStreaming:
         ]
 
         chunks_received = []
-
-        # Parse the SSE chunks as they would be received
-        # This simulates what the streaming logic produces
-        from utils.tool_calling import (
-            detect_probable_tool_call,
-            extract_arguments_progress,
-            extract_tool_name_from_partial,
-            is_tool_call_complete,
-        )
-
-        accumulated = ""
-        tool_state = ToolCallStreamState.NORMAL
+        parser = StreamingToolCallParser()
         tool_name_found = None
-        args_chunks = []
 
         for token in tokens:
-            accumulated += token
-
-            if tool_state == ToolCallStreamState.NORMAL:
-                if detect_probable_tool_call(accumulated):
-                    tool_state = ToolCallStreamState.BUFFERING_START
-
-            elif tool_state == ToolCallStreamState.BUFFERING_START:
-                name = extract_tool_name_from_partial(accumulated)
-                if name:
-                    tool_name_found = name
-                    tool_state = ToolCallStreamState.STREAMING_ARGS
-                    chunks_received.append({"type": "name", "value": name})
-
-            elif tool_state == ToolCallStreamState.STREAMING_ARGS:
-                progress = extract_arguments_progress(accumulated)
-                if progress:
-                    _, args = progress
-                    if args and args not in args_chunks:
-                        args_chunks.append(args)
-                        chunks_received.append({"type": "args", "value": args})
-
-                if is_tool_call_complete(accumulated):
+            for event in parser.feed(token):
+                if event.type is ToolCallEventType.TOOL_CALL_START:
+                    tool_name_found = event.name
+                    chunks_received.append({"type": "name", "value": event.name})
+                elif event.type is ToolCallEventType.ARGUMENTS:
+                    chunks_received.append({"type": "args", "value": event.text})
+                elif event.type is ToolCallEventType.TOOL_CALL_END:
                     chunks_received.append({"type": "complete"})
-                    break
 
         # Verify: name was received before arguments were complete
         name_chunk_idx = next(
@@ -148,55 +125,43 @@ class TestIncrementalToolCallStreaming:
     @pytest.mark.asyncio
     async def test_arguments_streamed_incrementally(self):
         """Verify arguments are streamed in multiple chunks, not all at once."""
-        from utils.tool_calling import (
-            detect_probable_tool_call,
-            extract_arguments_progress,
-        )
-
         # Build a tool call with substantial arguments
         tool_call_content = '<tool_call>{"name": "search", "arguments": {"query": "artificial intelligence", "limit": 10, "sort": "relevance"}}</tool_call>'
 
         # Simulate receiving one character at a time
-        accumulated = ""
-        args_snapshots = []
+        parser = StreamingToolCallParser()
+        args_chunks = []
 
         for char in tool_call_content:
-            accumulated += char
-
-            if detect_probable_tool_call(accumulated):
-                progress = extract_arguments_progress(accumulated)
-                if progress:
-                    _, args = progress
-                    # Only record when args changes
-                    if not args_snapshots or args != args_snapshots[-1]:
-                        args_snapshots.append(args)
-
-        # Verify: arguments were captured incrementally (multiple snapshots)
-        assert len(args_snapshots) > 1, (
-            f"Arguments should be captured incrementally, got {len(args_snapshots)} snapshots"
+            args_chunks.extend(
+                event.text
+                for event in parser.feed(char)
+                if event.type is ToolCallEventType.ARGUMENTS
+            )
+
+        # Verify: arguments were emitted incrementally (multiple deltas)
+        assert len(args_chunks) > 1, (
+            f"Arguments should be streamed incrementally, got {len(args_chunks)} chunks"
         )
 
-        # Verify the snapshots grow over time
-        for i in range(1, len(args_snapshots)):
-            assert len(args_snapshots[i]) >= len(args_snapshots[i - 1]), (
-                "Arguments should grow monotonically"
-            )
+        # Verify the deltas add up to the full arguments
+        assert json.loads("".join(args_chunks)) == {
+            "query": "artificial intelligence",
+            "limit": 10,
+            "sort": "relevance",
+        }
 
     @pytest.mark.asyncio
     async def test_incomplete_tool_call_handled_gracefully(self):
         """Verify incomplete tool calls are handled gracefully at stream end."""
-        from utils.tool_calling import (
-            detect_probable_tool_call,
-            is_tool_call_complete,
-        )
-
         # Incomplete tool call (stream ended before </tool_call>)
         incomplete_content = '<tool_call>{"name": "test", "arguments": {"partial": "da'
 
-        assert detect_probable_tool_call(incomplete_content) is True
-        assert is_tool_call_complete(incomplete_content) is False
+        parser = StreamingToolCallParser()
+        parser.feed(incomplete_content)
 
-        # In this case, the buffered content should be emitted as regular content
+        assert parser.state is ToolCallStreamState.STREAMING_ARGS
+        assert parser.tool_calls_completed == 0
 
     @pytest.mark.asyncio
     async def test_multiple_tool_calls_detection(self):
@@ -306,57 +271,30 @@ class TestIncrementalToolCallStreaming:
         """Test that state machine transitions correctly."""
         # NORMAL -> BUFFERING_START when <tool_call> detected
         # BUFFERING_START -> STREAMING_ARGS when name found
-        # STREAMING_ARGS -> (done) when </tool_call> found
-
-        from utils.tool_calling import (
-            detect_probable_tool_call,
-            extract_tool_name_from_partial,
-            is_tool_call_complete,
-        )
-
-        state = ToolCallStreamState.NORMAL
-        accumulated = ""
+        # STREAMING_ARGS -> NORMAL when </tool_call> found
+        parser = StreamingToolCallParser()
 
         # Phase 1: Normal content
         for token in ["Hello", ", ", "I'll"]:
-            accumulated += token
-            assert state == ToolCallStreamState.NORMAL
-            if detect_probable_tool_call(accumulated):
-                state = ToolCallStreamState.BUFFERING_START
-
-        assert state == ToolCallStreamState.NORMAL
+            parser.feed(token)
+            assert parser.state is ToolCallStreamState.NORMAL
 
         # Phase 2: Tool call starts
-        accumulated += " <tool_call>"
-        if detect_probable_tool_call(accumulated):
-            state = ToolCallStreamState.BUFFERING_START
-
-        assert state == ToolCallStreamState.BUFFERING_START
+        parser.feed(" <tool_call>")
+        assert parser.state is ToolCallStreamState.BUFFERING_START
 
         # Phase 3: Name becomes available
-        accumulated += '{"name": "test"'
-        if state == ToolCallStreamState.BUFFERING_START:
-            name = extract_tool_name_from_partial(accumulated)
-            if name:
-                state = ToolCallStreamState.STREAMING_ARGS
-
-        assert state == ToolCallStreamState.STREAMING_ARGS
+        parser.feed('{"name": "test"')
+        assert parser.state is ToolCallStreamState.STREAMING_ARGS
 
         # Phase 4: Tool call completes
-        accumulated += ', "arguments": {}}</tool_call>'
-        assert is_tool_call_complete(accumulated) is True
+        parser.feed(', "arguments": {}}</tool_call>')
+        assert parser.state is ToolCallStreamState.NORMAL
+        assert parser.tool_calls_completed == 1
 
     @pytest.mark.asyncio
     async def test_multiple_tool_calls_streaming_state_machine(self):
         """Test that state machine correctly handles multiple sequential tool calls."""
-        from utils.tool_calling import (
-            detect_probable_tool_call,
-            detect_tool_call_in_content,
-            extract_tool_name_from_partial,
-            is_tool_call_complete,
-            strip_tool_call_from_content,
-        )
-
         # Simulate streaming two tool calls
         full_content = (
             "I will make two calls. "
@@ -365,40 +303,15 @@ class TestIncrementalToolCallStreaming:
         )
 
         # Tokenize by character to simulate streaming
-        state = ToolCallStreamState.NORMAL
-        accumulated = ""
+        parser = StreamingToolCallParser()
         tool_names_found = []
-        tool_call_index = 0
 
         for char in full_content:
-            accumulated += char
-
-            if state == ToolCallStreamState.NORMAL:
-                if detect_probable_tool_call(accumulated):
-                    state = ToolCallStreamState.BUFFERING_START
-
-            elif state == ToolCallStreamState.BUFFERING_START:
-                name = extract_tool_name_from_partial(accumulated)
-                if name:
-                    tool_names_found.append(name)
-                    state = ToolCallStreamState.STREAMING_ARGS
-
-            elif state == ToolCallStreamState.STREAMING_ARGS and is_tool_call_complete(
-                accumulated
-            ):
-                # Process completed tool call
-                tool_calls = detect_tool_call_in_content(accumulated)
-                assert tool_calls is not None
-                assert len(tool_calls) >= 1
-
-                # Reset state machine for next tool call
-                accumulated = strip_tool_call_from_content(accumulated)
-                state = ToolCallStreamState.NORMAL
-                tool_call_index += 1
-
-                # Check if there's already another tool call starting
-                if detect_probable_tool_call(accumulated):
-                    state = ToolCallStreamState.BUFFERING_START
+            tool_names_found.extend(
+                event.name
+                for event in parser.feed(char)
+                if event.type is ToolCallEventType.TOOL_CALL_START
+            )
 
         # Verify both tool calls were detected
         assert len(tool_names_found) == 2, (
@@ -406,4 +319,124 @@ class TestIncrementalToolCallStreaming:
         )
         assert tool_names_found[0] == "get_weather"
         assert tool_names_found[1] == "get_time"
-        assert tool_call_index == 2
+        assert parser.tool_calls_completed == 2
+
+
+class TestStreamingToolCallParser:
+    """Tests for the incremental StreamingToolCallParser."""
+
+    TOOL_CALL_TEXT = (
+        "I'll check. "
+        '<tool_call>{"name": "get_weather", '
+        '"arguments": {"location": "New \\"York\\"", "days": [1, {"a": "}"}]}}'
+        "</tool_call> Done."
+    )
+
+    @staticmethod
+    def parse(tokens: list[str], detect_tools: bool = True):
+        from utils.tool_calling import StreamingToolCallParser
+
+        parser = StreamingToolCallParser(detect_tools=detect_tools)
+        events = []
+        for token in tokens:
+            events.extend(parser.feed(token))
+        events.extend(parser.finish())
+        return events, parser
+
+    @staticmethod
+    def summarize(events):
+        from utils.tool_calling import ToolCallEventType
+
+        content = "".join(e.text for e in events if e.type is ToolCallEventType.CONTENT)
+        calls = {}
+        for event in events:
+            if event.type is ToolCallEventType.TOOL_CALL_START:
+                calls[event.index] = [event.name, ""]
+            elif event.type is ToolCallEventType.ARGUMENTS:
+                calls[event.index][1] += event.text
+        return content, calls
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+    def test_same_result_for_any_token_split(self, chunk_size):
+        """Test that events don't depend on how the text was tokenized."""
+        text = self.TOOL_CALL_TEXT
+        tokens = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+        content, calls = self.summarize(self.parse(tokens)[0])
+
+        assert content == "I'll check.  Done."
+        assert calls[0][0] == "get_weather"
+        assert json.loads(calls[0][1]) == {
+            "location": 'New "York"',
+            "days": [1, {"a": "}"}],
+        }
+
+    def test_events_in_order(self):
+        """Test that start, argument deltas and end events arrive in order."""
+        from utils.tool_calling import ToolCallEventType
+
+        events, parser = self.parse(list(self.TOOL_CALL_TEXT))
+        kinds = [e.type for e in events if e.type is not ToolCallEventType.CONTENT]
+
+        assert kinds[0] is ToolCallEventType.TOOL_CALL_START
+        assert kinds[-1] is ToolCallEventType.TOOL_CALL_END
+        assert set(kinds[1:-1]) == {ToolCallEventType.ARGUMENTS}
+        assert parser.tool_calls_completed == 1
+
+    def test_partial_tag_is_held_back(self):
+        """Test that a possible <tool_call> prefix isn't emitted as content."""
+        from utils.tool_calling import StreamingToolCallParser, ToolCallEventType
+
+        parser = StreamingToolCallParser()
+
+        assert [e.text for e in parser.feed("Hi <tool")] == ["Hi "]
+        events = parser.feed('_call>{"name": "f"')
+        assert [e.type for e in events] == [ToolCallEventType.TOOL_CALL_START]
+
+        parser = StreamingToolCallParser()
+        parser.feed("a <tool")
+        assert [e.text for e in parser.feed("s> b")] == ["<tools> b"]
+
+    def test_multiple_calls_and_late_name(self):
+        """Test sequential calls, arguments before name, and missing arguments."""
+        events, parser = self.parse(
+            [
+                '<tool_call>{"arguments": {"city": "NYC"}, "name": "get_weather"}',
+                '</tool_call>\n<tool_call>{"name": "get_time"}</tool_call>',
+            ]
+        )
+
+        _, calls = self.summarize(events)
+        assert calls == {0: ["get_weather", '{"city": "NYC"}'], 1: ["get_time", "{}"]}
+        assert parser.tool_calls_completed == 2
+
+    def test_tool_call_inside_thinking_is_content(self):
+        """Test that tool calls inside <think> blocks are not parsed."""
+        text = '<think>Maybe <tool_call>{"name": "x"}</tool_call></THINK>Answer'
+        events, parser = self.parse(list(text))
+
+        content, calls = self.summarize(events)
+        assert content == text
+        assert calls == {}
+        assert parser.in_thinking is False
+
+    def test_thinking_state_without_tool_detection(self):
+        """Test that thinking is tracked when tools are not detected."""
+        from utils.tool_calling import StreamingToolCallParser
+
+        parser = StreamingToolCallParser(detect_tools=False)
+        parser.feed("<thi")
+        assert parser.in_thinking is False
+        parser.feed("nk>reasoning <tool_call>")
+        assert parser.in_thinking is True
+        parser.feed("</think>")
+        assert parser.in_thinking is False
+
+    def test_incomplete_tool_call_returned_as_content(self):
+        """Test that a tool call without a name is flushed as content at the end."""
+        events, parser = self.parse(["Text <tool_call>", '{"na'])
+
+        content, calls = self.summarize(events)
+        assert content == 'Text <tool_call>{"na'
+        assert calls == {}
+        assert parser.tool_calls_completed == 0
@@ -0,0 +1,75 @@
+"""Tests for the thinking budget logits processor."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from utils.thinking import ThinkingBudgetProcessor
+
+THINK_END = [90, 91]
+
+
+def _make_llama(pieces: dict[int, str]):
+    """Mock llamafarm_llama.Llama whose tokens map to text pieces."""
+    llama = MagicMock()
+    llama.tokenize.return_value = THINK_END
+    llama.detokenize.side_effect = lambda ids: "".join(pieces.get(t, "") for t in ids)
+    return llama
+
+
+class TestThinkingBudgetProcessor:
+    """Tests for ThinkingBudgetProcessor."""
+
+    def test_detects_end_tokens_with_llamafarm_signature(self):
+        """</think> is tokenized with the llamafarm_llama tokenize signature."""
+        llama = _make_llama({})
+
+        processor = ThinkingBudgetProcessor(llama, max_thinking_tokens=4)
+
+        assert processor.think_end_tokens == THINK_END
+        llama.tokenize.assert_called_once_with(
+            "</think>", add_special=False, parse_special=True
+        )
+
+    def test_forces_think_end_when_budget_exhausted(self):
+        """Once over budget, the </think> tokens are forced one by one."""
+        llama = _make_llama({1: "<think>", 2: " hmm"})
+        processor = ThinkingBudgetProcessor(llama, max_thinking_tokens=2)
+        input_ids = [1]
+
+        scores = np.zeros(100, dtype=np.float32)
+        assert processor(input_ids, scores) is scores  # Edited in place
+        input_ids.append(2)
+        processor(input_ids, scores)
+
+        assert processor.forcing_end
+        assert scores[THINK_END[0]] == 0.0
+        assert np.isneginf(np.delete(scores, THINK_END[0])).all()
+
+    def test_only_new_tokens_are_detokenized(self):
+        """Each call detokenizes just the tokens added since the previous one."""
+        llama = _make_llama({1: "<think>", 2: "a", 3: "b"})
+        processor = ThinkingBudgetProcessor(llama, max_thinking_tokens=100)
+        input_ids = [1]
+
+        for token in (2, 3):
+            processor(input_ids, np.zeros(10, dtype=np.float32))
+            input_ids.append(token)
+        processor(input_ids, np.zeros(10, dtype=np.float32))
+
+        calls = [c.args[0] for c in llama.detokenize.call_args_list]
+        assert calls == [[1], [2], [3]]
+
+    def test_tag_split_across_tokens(self):
+        """A </think> tag spread over several tokens still ends thinking."""
+        llama = _make_llama({1: "<think>", 2: "</th", 3: "ink>"})
+        processor = ThinkingBudgetProcessor(llama, max_thinking_tokens=100)
+        input_ids = [1]
+
+        for token in (2, 3):
+            processor(input_ids, np.zeros(10, dtype=np.float32))
+            input_ids.append(token)
+        processor(input_ids, np.zeros(10, dtype=np.float32))
+
+        assert processor.thinking_ended
+        assert not processor.in_thinking
@@ -210,6 +210,7 @@ class TestToolCallingE2E:
             thinking_budget=None,
             tools=None,
             tool_choice=None,
+            cancel_event=None,
         ):
             tokens = [
                 "I'll ",
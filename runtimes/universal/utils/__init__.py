@@ -13,6 +13,7 @@ from .file_utils import save_image_with_metadata
 from .polars_buffer import BufferStats, PolarsBuffer
 from .rolling_features import (
     RollingFeatureConfig,
+    RollingFeatureEngine,
     compute_anomaly_features,
     compute_features,
     get_feature_names,
@@ -31,6 +32,7 @@ __all__ = [
     "PolarsBuffer",
     "BufferStats",
     "RollingFeatureConfig",
+    "RollingFeatureEngine",
     "compute_features",
     "compute_anomaly_features",
     "get_feature_names",
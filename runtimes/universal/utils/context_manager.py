@@ -6,7 +6,8 @@ validation, truncation, and multiple strategies for handling context overflow.
 
 from __future__ import annotations
 
-import json
+import bisect
+import itertools
 import logging
 from dataclasses import dataclass
 from enum import Enum
@@ -187,9 +188,8 @@ class ContextManager:
                 strategy_used=None,
             )
 
-        # Deep copy to avoid modifying original
-        # Use JSON for Pydantic-safe deep copy
-        messages = json.loads(json.dumps(messages, default=str))
+        # Strategies build new lists and copy any message they edit, so the
+        # caller's messages are never modified
         original_count = len(messages)
 
         # Apply truncation strategy
@@ -238,23 +238,18 @@ class ContextManager:
         needed.
 
         Args:
-            messages: List of messages (will be modified).
+            messages: List of messages.
 
         Returns:
             Truncated messages.
         """
-        result = list(messages)
-
-        while (
-            len(result) > 1
-            and self._counter.estimate_prompt_tokens(result)
-            > self._budget.max_prompt_tokens
-        ):
-            result.pop(0)
+        counts = self._message_counts(messages)
+        dropped = self._count_oldest_to_drop(counts, self._budget.max_prompt_tokens)
+        result = messages[dropped:]
 
         # If still over budget (single huge message), truncate content
         if (
-            self._counter.estimate_prompt_tokens(result)
+            self._counter.with_template_overhead(sum(counts[dropped:]))
             > self._budget.max_prompt_tokens
         ):
             logger.warning(
@@ -273,30 +268,29 @@ class ContextManager:
         all but one message, truncates individual message content.
 
         Args:
-            messages: List of messages (will be modified).
+            messages: List of messages.
 
         Returns:
             Truncated messages.
         """
         system_msgs = [m for m in messages if m.get("role") == "system"]
         other_msgs = [m for m in messages if m.get("role") != "system"]
+        system_counts = self._message_counts(system_msgs)
+        other_counts = self._message_counts(other_msgs)
 
         # Calculate tokens for system messages
-        system_tokens = self._counter.estimate_prompt_tokens(system_msgs)
+        system_tokens = self._counter.with_template_overhead(sum(system_counts))
         available_for_others = self._budget.max_prompt_tokens - system_tokens
 
         # Remove oldest non-system messages until fits
-        while (
-            len(other_msgs) > 1
-            and self._counter.estimate_prompt_tokens(other_msgs) > available_for_others
-        ):
-            other_msgs.pop(0)
-
-        result = system_msgs + other_msgs
+        dropped = self._count_oldest_to_drop(other_counts, available_for_others)
+        result = system_msgs + other_msgs[dropped:]
 
         # If still over budget, apply aggressive content truncation
         if (
-            self._counter.estimate_prompt_tokens(result)
+            self._counter.with_template_overhead(
+                sum(system_counts) + sum(other_counts[dropped:])
+            )
             > self._budget.max_prompt_tokens
         ):
             logger.warning("Message removal insufficient, applying content truncation")
@@ -312,7 +306,7 @@ class ContextManager:
         Falls back to content truncation if needed.
 
         Args:
-            messages: List of messages (will be modified).
+            messages: List of messages.
 
         Returns:
             Truncated messages.
@@ -329,19 +323,17 @@ class ContextManager:
                 # Keep first non-system message and last N messages
                 first_msg = [other_msgs[0]]
                 remaining = other_msgs[1:]
+                kept_tokens = sum(self._message_counts(system_msgs + first_msg))
 
                 # Remove from the beginning of remaining (oldest after first)
                 # until we fit within budget
-                while (
-                    len(remaining) > 1
-                    and self._counter.estimate_prompt_tokens(
-                        system_msgs + first_msg + remaining
-                    )
-                    > self._budget.max_prompt_tokens
-                ):
-                    remaining.pop(0)
+                dropped = self._count_oldest_to_drop(
+                    self._message_counts(remaining),
+                    self._budget.max_prompt_tokens,
+                    kept_tokens=kept_tokens,
+                )
 
-                result = system_msgs + first_msg + remaining
+                result = system_msgs + first_msg + remaining[dropped:]
 
         # If still over budget (huge messages), truncate content
         if (
@@ -356,6 +348,37 @@ class ContextManager:
 
         return result
 
+    def _message_counts(self, messages: list[dict]) -> list[int]:
+        """Token count of each message, without template overhead."""
+        return [self._counter.count_message_tokens(m) for m in messages]
+
+    def _count_oldest_to_drop(
+        self, counts: list[int], max_tokens: int, kept_tokens: int = 0
+    ) -> int:
+        """Find how many of the oldest messages to drop to fit a budget.
+
+        Binary search over prefix sums of the message counts, so no message
+        is counted twice. At least one message is always kept, matching the
+        message-by-message removal it replaces.
+
+        Args:
+            counts: Token counts of the droppable messages, oldest first.
+            max_tokens: Budget for the estimated prompt.
+            kept_tokens: Tokens of messages that are kept regardless.
+
+        Returns:
+            Number of leading messages to drop.
+        """
+        prefix = list(itertools.accumulate(counts, initial=0))
+        total = prefix[-1] + kept_tokens
+
+        def fits(dropped: int) -> bool:
+            remaining = total - prefix[dropped]
+            return self._counter.with_template_overhead(remaining) <= max_tokens
+
+        # fits() turns True once enough messages are dropped and stays True
+        return bisect.bisect_left(range(max(len(counts) - 1, 0)), True, key=fits)
+
     def _truncate_message_contents(self, messages: list[dict]) -> list[dict]:
         """Truncate individual message contents to fit context budget.
 
@@ -373,8 +396,8 @@ class ContextManager:
         Returns:
             Messages with truncated content.
         """
-        # Use JSON for Pydantic-safe deep copy
-        result = json.loads(json.dumps(messages, default=str))
+        # Messages are copied before their content is replaced
+        result = list(messages)
         max_tokens = self._budget.max_prompt_tokens
 
         # Calculate current usage and how much we need to cut
@@ -432,9 +455,10 @@ class ContextManager:
             truncated_content = self._counter.truncate_to_tokens(content, keep_tokens)
             cut_amount = msg_tokens - self._counter.count_tokens(truncated_content)
 
-            result[idx]["content"] = (
-                truncated_content + "\n\n[... content truncated ...]"
-            )
+            result[idx] = {
+                **result[idx],
+                "content": truncated_content + "\n\n[... content truncated ...]",
+            }
 
             logger.debug(
                 f"Truncated message {idx} (role={result[idx].get('role')}): "
@@ -478,10 +502,11 @@ class ContextManager:
 
             # Truncate the largest message to 50 tokens
             content = result[largest_idx]["content"]
-            result[largest_idx]["content"] = (
-                self._counter.truncate_to_tokens(content, 50)
-                + "\n[... heavily truncated ...]"
-            )
+            result[largest_idx] = {
+                **result[largest_idx],
+                "content": self._counter.truncate_to_tokens(content, 50)
+                + "\n[... heavily truncated ...]",
+            }
 
             final_tokens = self._counter.estimate_prompt_tokens(result)
             logger.info(
@@ -162,6 +162,50 @@ def get_device_info() -> dict:
     return info
 
 
+def get_available_memory_bytes() -> int | None:
+    """
+    Get available system memory (RAM) in bytes.
+
+    Reads /proc/meminfo first (works on Jetson and most Linux), then falls
+    back to psutil.
+
+    Returns:
+        Available memory in bytes, or None if unable to determine.
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if "MemAvailable" in line:
+                    # Format: "MemAvailable:   1234567 kB"
+                    return int(line.split()[1]) * 1024
+    except (FileNotFoundError, PermissionError, OSError):
+        pass
+
+    try:
+        import psutil
+
+        return int(psutil.virtual_memory().available)
+    except ImportError:
+        pass
+
+    return None
+
+
+def get_free_vram_bytes() -> int | None:
+    """
+    Get free VRAM summed across all CUDA GPUs, in bytes.
+
+    Returns:
+        Free VRAM in bytes, or None if no CUDA GPUs are visible.
+    """
+    from utils.gpu_allocator import enumerate_gpus
+
+    gpus = enumerate_gpus()
+    if not gpus:
+        return None
+    return sum(gpu.free_vram for gpu in gpus)
+
+
 def get_gguf_gpu_layers() -> int:
     """
     Get the number of GPU layers to use for GGUF models.
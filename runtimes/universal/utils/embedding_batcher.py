@@ -0,0 +1,165 @@
+"""Micro-batching for embedding requests.
+
+Concurrent /v1/embeddings requests for the same encoder are gathered for a
+few milliseconds (or until a token budget is reached) and run as one batch,
+so many small requests share a forward pass instead of queueing one by one.
+
+Environment Variables:
+- EMBEDDING_BATCH_WAIT_MS: How long to gather requests before running a
+  batch (default: 5, 0 disables waiting)
+- EMBEDDING_BATCH_MAX_TOKENS: Approximate tokens that end the gather window
+  early (default: 16384)
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str], bool], Awaitable[list[list[float]]]]
+
+
+def approximate_token_count(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for batch sizing."""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class _PendingRequest:
+    texts: list[str]
+    normalize: bool
+    future: asyncio.Future
+    tokens: int = field(default=0)
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embed() calls into batched calls of ``embed_fn``.
+
+    Requests with different ``normalize`` settings are batched separately.
+    Results are scattered back in the order each caller passed its texts.
+
+    Example:
+        batcher = EmbeddingBatcher(model._embed_batch)
+        vectors = await batcher.embed(["hello", "world"])
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        max_wait_ms: float | None = None,
+        max_batch_tokens: int | None = None,
+        count_tokens: Callable[[str], int] = approximate_token_count,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            embed_fn: Coroutine function embedding a list of texts
+                (texts, normalize) -> vectors. Called once per batch.
+            max_wait_ms: Gather window in milliseconds. Defaults to
+                EMBEDDING_BATCH_WAIT_MS (5).
+            max_batch_tokens: Token count that closes the gather window
+                early. Defaults to EMBEDDING_BATCH_MAX_TOKENS (16384).
+            count_tokens: Estimates the token count of a text.
+        """
+        if max_wait_ms is None:
+            max_wait_ms = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+        if max_batch_tokens is None:
+            max_batch_tokens = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "16384"))
+        self._embed_fn = embed_fn
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._max_batch_tokens = max(1, max_batch_tokens)
+        self._count_tokens = count_tokens
+        self._pending: list[_PendingRequest] = []
+        self._pending_tokens = 0
+        self._full: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def max_batch_tokens(self) -> int:
+        """Token budget of one batch."""
+        return self._max_batch_tokens
+
+    async def embed(
+        self, texts: list[str], normalize: bool = True
+    ) -> list[list[float]]:
+        """Embed texts as part of the next batch.
+
+        Args:
+            texts: Input texts
+            normalize: Whether to L2 normalize embeddings
+
+        Returns:
+            One embedding vector per input text
+
+        Raises:
+            Whatever ``embed_fn`` raises for the batch containing ``texts``
+        """
+        if not texts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        request = _PendingRequest(
+            texts=list(texts),
+            normalize=normalize,
+            future=loop.create_future(),
+            tokens=sum(self._count_tokens(t) for t in texts),
+        )
+        self._pending.append(request)
+        self._pending_tokens += request.tokens
+
+        if self._full is None:
+            self._full = asyncio.Event()
+        if self._pending_tokens >= self._max_batch_tokens:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+        return await request.future
+
+    async def _run(self) -> None:
+        """Drain pending requests in batches until none are left."""
+        assert self._full is not None
+        first = True
+        while self._pending:
+            # Only the first batch waits: later ones gathered while the
+            # previous forward pass was running.
+            if first and self._max_wait and not self._full.is_set():
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), self._max_wait)
+            first = False
+
+            batch, self._pending = self._pending, []
+            self._pending_tokens = 0
+            self._full.clear()
+
+            for normalize in (True, False):
+                group = [
+                    r
+                    for r in batch
+                    if r.normalize == normalize and not r.future.cancelled()
+                ]
+                if group:
+                    await self._run_group(group, normalize)
+
+    async def _run_group(self, group: list[_PendingRequest], normalize: bool) -> None:
+        texts = [text for request in group for text in request.texts]
+        if len(group) > 1:
+            logger.debug(f"Embedding batch: {len(group)} requests, {len(texts)} texts")
+        try:
+            vectors = await self._embed_fn(texts, normalize)
+        except Exception as e:
+            for request in group:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in group:
+            end = offset + len(request.texts)
+            if not request.future.done():
+                request.future.set_result(vectors[offset:end])
+            offset = end
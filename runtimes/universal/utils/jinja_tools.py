@@ -5,16 +5,19 @@ This module provides functions to extract chat templates from GGUF files
 and render them with tool definitions using Python's Jinja2.
 
 Uses the shared GGUF metadata cache to avoid redundant file reads when
-extracting chat templates and special tokens.
+extracting chat templates and special tokens. Compiled templates and the
+tool definitions passed to them are cached, since chat templates are slow
+to compile and agents resend the same tools on every turn.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 from typing import Any
 
-from jinja2 import TemplateError, Undefined
+from jinja2 import Template, TemplateError, Undefined
 from jinja2.sandbox import SandboxedEnvironment
 from jinja2.utils import Namespace
 
@@ -47,9 +50,71 @@ def _raise_exception(message: str) -> None:
 
 def _tojson(value: Any, indent: int | None = None) -> str:
     """Template filter to convert value to JSON string."""
+    if isinstance(value, _MemoizedJSON):
+        return value._dumps(indent)
     return json.dumps(value, indent=indent, ensure_ascii=False)
 
 
+class _MemoizedJSON:
+    """Mixin for cached tool definitions that remember their JSON rendering."""
+
+    __slots__ = ()
+
+    def _dumps(self, indent: int | None) -> str:
+        text = self._json_cache.get(indent)
+        if text is None:
+            text = json.dumps(self, indent=indent, ensure_ascii=False)
+            self._json_cache[indent] = text
+        return text
+
+
+class _JSONDict(_MemoizedJSON, dict):
+    __slots__ = ("_json_cache",)
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._json_cache: dict[int | None, str] = {}
+
+
+class _JSONList(_MemoizedJSON, list):
+    __slots__ = ("_json_cache",)
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._json_cache: dict[int | None, str] = {}
+
+
+def _memoize_json(value: Any) -> Any:
+    """Convert parsed JSON into containers whose tojson output is memoized."""
+    if isinstance(value, dict):
+        return _JSONDict({k: _memoize_json(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return _JSONList(_memoize_json(v) for v in value)
+    return value
+
+
+@lru_cache(maxsize=32)
+def _load_tools(tools_json: str) -> list:
+    """Build the cached template value for one distinct tool list."""
+    return _memoize_json(json.loads(tools_json))
+
+
+def _cached_tools(tools: list[dict] | None) -> list | None:
+    """Return a shared, memoized copy of a tool list.
+
+    Templates usually serialize every tool with ``tojson`` (often indented,
+    which bypasses the C JSON encoder). Reusing one copy per distinct tool
+    list means that work is done once rather than on every request.
+    """
+    if not tools:
+        return tools
+    try:
+        return _load_tools(json.dumps(tools, ensure_ascii=False))
+    except (TypeError, ValueError):
+        # Not plain JSON (shouldn't happen for API requests) - render as-is
+        return tools
+
+
 def get_chat_template_from_gguf(model_path: str) -> str | None:
     """Extract chat_template from GGUF file metadata.
 
@@ -145,6 +210,35 @@ def create_jinja_environment() -> SandboxedEnvironment:
     return env
 
 
+@lru_cache(maxsize=1)
+def _shared_environment() -> SandboxedEnvironment:
+    """Environment shared by all cached templates (rendering is thread-safe)."""
+    return create_jinja_environment()
+
+
+@lru_cache(maxsize=16)
+def get_compiled_template(template: str) -> Template:
+    """Compile a chat template, reusing earlier compilations.
+
+    Templates are cached by their hash, so models sharing a chat template
+    share its compiled form. Loaded models keep their template string, whose
+    hash Python computes only once.
+
+    Args:
+        template: The Jinja2 chat template string.
+
+    Returns:
+        The compiled template.
+
+    Raises:
+        TemplateError: If the template cannot be parsed.
+    """
+    try:
+        return _shared_environment().from_string(template)
+    except Exception as e:
+        raise TemplateError(f"Failed to parse chat template: {e}") from e
+
+
 def render_chat_with_tools(
     template: str,
     messages: list[dict],
@@ -172,17 +266,12 @@ def render_chat_with_tools(
     Raises:
         TemplateError: If template rendering fails.
     """
-    env = create_jinja_environment()
-
-    try:
-        template_obj = env.from_string(template)
-    except Exception as e:
-        raise TemplateError(f"Failed to parse chat template: {e}") from e
+    template_obj = get_compiled_template(template)
 
     try:
         rendered = template_obj.render(
             messages=messages,
-            tools=tools,
+            tools=_cached_tools(tools),
             add_generation_prompt=add_generation_prompt,
             bos_token=bos_token,
             eos_token=eos_token,
@@ -0,0 +1,194 @@
+"""Per-key model load coordination.
+
+Replaces a single global load lock with:
+- Single-flight per cache key: concurrent requests for the same model share
+  one in-flight load instead of loading it twice
+- Parallel loads for different keys, bounded by a concurrency limit and an
+  estimated memory budget so a cold start can't load everything at once
+
+Environment Variables:
+- MODEL_LOAD_CONCURRENCY: Maximum number of loads running at once (default: 2)
+- MODEL_LOAD_MEMORY_BUDGET_MB: Estimated bytes (in MB) that may be loading at
+  once (default: available system memory, 0 disables the memory bound)
+"""
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable, Mapping
+from typing import TypeVar
+
+from core.logging import UniversalRuntimeLogger
+
+logger = UniversalRuntimeLogger("universal-runtime.load-coordinator")
+
+T = TypeVar("T")
+
+_MB = 1024 * 1024
+
+
+def _default_memory_budget() -> int:
+    """Return the load memory budget in bytes (0 means unbounded)."""
+    env_value = os.getenv("MODEL_LOAD_MEMORY_BUDGET_MB")
+    if env_value is not None:
+        return max(0, int(env_value)) * _MB
+    try:
+        import psutil
+
+        return int(psutil.virtual_memory().available)
+    except Exception:
+        return 0
+
+
+class ModelLoadCoordinator:
+    """Coordinates model loads by cache key.
+
+    Each load runs in its own task so that a caller being cancelled (e.g. a
+    client disconnect) doesn't abort a load other callers are waiting on.
+
+    Example:
+        loader = ModelLoadCoordinator(max_concurrent=2)
+
+        async def _load():
+            model = EncoderModel(model_id, device)
+            await model.load()
+            cache[cache_key] = model
+            return model
+
+        model = await loader.load(cache_key, _load, estimated_bytes=size, cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int | None = None,
+        memory_budget_bytes: int | None = None,
+    ):
+        """Initialize the coordinator.
+
+        Args:
+            max_concurrent: Maximum number of loads running at once.
+                Defaults to MODEL_LOAD_CONCURRENCY (2).
+            memory_budget_bytes: Sum of estimated sizes allowed to load at
+                once. Defaults to MODEL_LOAD_MEMORY_BUDGET_MB, falling back
+                to available system memory. 0 disables the memory bound.
+        """
+        if max_concurrent is None:
+            max_concurrent = int(os.getenv("MODEL_LOAD_CONCURRENCY", "2"))
+        if memory_budget_bytes is None:
+            memory_budget_bytes = _default_memory_budget()
+        self._max_concurrent = max(1, max_concurrent)
+        self._memory_budget = max(0, memory_budget_bytes)
+        self._active_loads = 0
+        self._reserved_bytes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._condition: asyncio.Condition | None = None
+
+    @property
+    def max_concurrent(self) -> int:
+        """Maximum number of loads running at once."""
+        return self._max_concurrent
+
+    @property
+    def memory_budget_bytes(self) -> int:
+        """Estimated bytes allowed to load at once (0 means unbounded)."""
+        return self._memory_budget
+
+    @property
+    def active_loads(self) -> int:
+        """Number of loads currently holding a slot."""
+        return self._active_loads
+
+    def is_loading(self, key: str) -> bool:
+        """Return True if a load for ``key`` is in flight."""
+        return key in self._inflight
+
+    async def load(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        estimated_bytes: int = 0,
+        cache: Mapping[str, T] | None = None,
+    ) -> T:
+        """Run ``factory`` for ``key``, or join the load already in flight.
+
+        Args:
+            key: Cache key identifying the model
+            factory: Coroutine function that loads the model (and stores it
+                in the cache). Only called once per concurrent group.
+            estimated_bytes: Estimated memory the load will use. Loads larger
+                than the whole budget run alone rather than never.
+            cache: Cache the factory stores into. If ``key`` is already there
+                when the load starts (a previous load finished after the
+                caller's own cache check), that model is returned instead.
+
+        Returns:
+            The value returned by ``factory``
+
+        Raises:
+            Whatever ``factory`` raises; every waiter sees the same error
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._run(key, factory, estimated_bytes, cache)
+            )
+            self._inflight[key] = task
+        else:
+            logger.debug(f"Joining in-flight load for {key}")
+        return await asyncio.shield(task)
+
+    async def _run(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        estimated_bytes: int,
+        cache: Mapping[str, T] | None,
+    ) -> T:
+        cost = max(0, estimated_bytes)
+        if self._memory_budget:
+            cost = min(cost, self._memory_budget)
+        try:
+            await self._acquire(key, cost)
+            try:
+                if cache is not None and key in cache:
+                    logger.debug(f"{key} was loaded while waiting, reusing it")
+                    return cache.get(key)
+                return await factory()
+            finally:
+                await self._release(cost)
+        finally:
+            self._inflight.pop(key, None)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the coordinator can be built at import time,
+        # before the server's event loop exists.
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _has_capacity(self, cost: int) -> bool:
+        if self._active_loads >= self._max_concurrent:
+            return False
+        if not self._memory_budget or self._active_loads == 0:
+            return True
+        return self._reserved_bytes + cost <= self._memory_budget
+
+    async def _acquire(self, key: str, cost: int) -> None:
+        condition = self._get_condition()
+        async with condition:
+            if not self._has_capacity(cost):
+                logger.info(
+                    f"Waiting for load slot for {key} "
+                    f"(active={self._active_loads}, "
+                    f"reserved={self._reserved_bytes // _MB}MB, "
+                    f"needs={cost // _MB}MB)"
+                )
+            await condition.wait_for(lambda: self._has_capacity(cost))
+            self._active_loads += 1
+            self._reserved_bytes += cost
+
+    async def _release(self, cost: int) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._active_loads -= 1
+            self._reserved_bytes -= cost
+            condition.notify_all()
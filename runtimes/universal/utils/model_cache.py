@@ -4,10 +4,12 @@ Provides a cache that:
 - Automatically tracks last access time
 - Refreshes TTL on access (not just on write)
 - Supports async cleanup callbacks before expiration
+- Tracks per-model RAM/VRAM footprints and enforces memory budgets
 """
 
 import time
 from collections.abc import Iterator
+from dataclasses import dataclass
 from typing import Generic, TypeVar
 
 from cachetools import TTLCache
@@ -15,6 +17,18 @@ from cachetools import TTLCache
 T = TypeVar("T")
 
 
+@dataclass
+class ModelFootprint:
+    """Estimated resident memory of a cached model."""
+
+    ram_bytes: int = 0
+    vram_bytes: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self.ram_bytes + self.vram_bytes
+
+
 class ModelCache(Generic[T]):
     """TTL-based cache for models with async cleanup support.
 
@@ -39,15 +53,29 @@ class ModelCache(Generic[T]):
         # In cleanup task:
         for key, model in cache.pop_expired():
             await model.unload()
+
+        # Before a new load, make room within the memory budget:
+        for key, model in cache.pop_for_budget(ram_bytes=4 * 1024**3):
+            await model.unload()
     """
 
-    def __init__(self, ttl: float, maxsize: int = 1000):
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 1000,
+        ram_budget_bytes: int = 0,
+        vram_budget_bytes: int = 0,
+    ):
         """Initialize the cache.
 
         Args:
             ttl: Time-to-live in seconds. Items are considered expired
                 after this many seconds of inactivity (no read or write).
             maxsize: Maximum number of items to store.
+            ram_budget_bytes: RAM the cached models may use in total
+                (0 = unbounded).
+            vram_budget_bytes: VRAM the cached models may use in total
+                (0 = unbounded).
         """
         self._ttl = ttl
         self._maxsize = maxsize
@@ -57,12 +85,36 @@ class ModelCache(Generic[T]):
         # Track access times ourselves for TTL-on-read behavior
         self._timer = time.monotonic
         self._access: dict[str, float] = {}
+        self._ram_budget = max(0, ram_budget_bytes)
+        self._vram_budget = max(0, vram_budget_bytes)
+        self._footprints: dict[str, ModelFootprint] = {}
+        self._pinned: set[str] = set()
 
     @property
     def ttl(self) -> float:
         """Get the TTL in seconds."""
         return self._ttl
 
+    @property
+    def ram_budget_bytes(self) -> int:
+        """Get the RAM budget in bytes (0 = unbounded)."""
+        return self._ram_budget
+
+    @property
+    def vram_budget_bytes(self) -> int:
+        """Get the VRAM budget in bytes (0 = unbounded)."""
+        return self._vram_budget
+
+    @property
+    def used_ram_bytes(self) -> int:
+        """Get the summed RAM footprint of cached models."""
+        return sum(f.ram_bytes for f in self._footprints.values())
+
+    @property
+    def used_vram_bytes(self) -> int:
+        """Get the summed VRAM footprint of cached models."""
+        return sum(f.vram_bytes for f in self._footprints.values())
+
     def __contains__(self, key: str) -> bool:
         return key in self._cache
 
@@ -102,7 +154,7 @@ class ModelCache(Generic[T]):
     def __delitem__(self, key: str) -> None:
         """Remove item from cache."""
         del self._cache[key]
-        self._access.pop(key, None)
+        self._forget(key)
 
     def pop(self, key: str, *args) -> T:
         """Remove and return item.
@@ -114,7 +166,7 @@ class ModelCache(Generic[T]):
         Returns:
             The removed item, or default if provided and key not found
         """
-        self._access.pop(key, None)
+        self._forget(key)
         return self._cache.pop(key, *args)
 
     def keys(self):
@@ -133,6 +185,44 @@ class ModelCache(Generic[T]):
         """Clear all items from cache."""
         self._cache.clear()
         self._access.clear()
+        self._footprints.clear()
+        self._pinned.clear()
+
+    def _forget(self, key: str) -> None:
+        """Drop bookkeeping for a removed key."""
+        self._access.pop(key, None)
+        self._footprints.pop(key, None)
+        self._pinned.discard(key)
+
+    def set_footprint(self, key: str, ram_bytes: int = 0, vram_bytes: int = 0) -> None:
+        """Record the estimated resident memory of a cached model.
+
+        Args:
+            key: Cache key (must already be cached)
+            ram_bytes: Estimated system memory used by the model
+            vram_bytes: Estimated GPU memory used by the model
+        """
+        if key not in self._cache:
+            raise KeyError(key)
+        self._footprints[key] = ModelFootprint(max(0, ram_bytes), max(0, vram_bytes))
+
+    def get_footprint(self, key: str) -> ModelFootprint:
+        """Get the recorded footprint for a key (zero if unknown)."""
+        return self._footprints.get(key, ModelFootprint())
+
+    def pin(self, key: str) -> None:
+        """Exempt a cached model from idle and budget eviction."""
+        if key not in self._cache:
+            raise KeyError(key)
+        self._pinned.add(key)
+
+    def unpin(self, key: str) -> None:
+        """Make a pinned model evictable again."""
+        self._pinned.discard(key)
+
+    def is_pinned(self, key: str) -> bool:
+        """Check whether a key is pinned."""
+        return key in self._pinned
 
     def get_idle_time(self, key: str) -> float | None:
         """Get seconds since last access for a key.
@@ -167,7 +257,9 @@ class ModelCache(Generic[T]):
         """
         now = self._timer()
         cutoff = now - self._ttl
-        return [k for k, t in self._access.items() if t < cutoff]
+        return [
+            k for k, t in self._access.items() if t < cutoff and k not in self._pinned
+        ]
 
     def pop_expired(self) -> list[tuple[str, T]]:
         """Remove and return all expired items.
@@ -183,6 +275,71 @@ class ModelCache(Generic[T]):
         for key in expired_keys:
             if key in self._cache:
                 value = self._cache.pop(key)
-                self._access.pop(key, None)
+                self._forget(key)
                 result.append((key, value))
         return result
+
+    def eviction_score(self, key: str) -> float:
+        """Get the eviction priority of a key (higher is evicted first).
+
+        Scores by footprint x idle time, so a large model idle for a minute
+        goes before a small encoder idle for the same time, and a recently
+        used model goes last.
+        """
+        idle = self.get_idle_time(key) or 0.0
+        return self.get_footprint(key).total_bytes * idle
+
+    def pop_for_budget(
+        self, ram_bytes: int = 0, vram_bytes: int = 0
+    ) -> list[tuple[str, T]]:
+        """Remove and return models so that a new load fits the budgets.
+
+        Evicts unpinned models in eviction_score() order until the cached
+        footprint plus the requested bytes fits each configured budget, or
+        nothing evictable remains. Models that free nothing in an
+        over-budget dimension are kept. As with pop_expired(), the caller is
+        responsible for unloading the returned models.
+
+        Args:
+            ram_bytes: RAM the upcoming load is expected to need
+            vram_bytes: VRAM the upcoming load is expected to need
+
+        Returns:
+            List of (key, value) tuples for evicted items
+        """
+        used_ram = self.used_ram_bytes
+        used_vram = self.used_vram_bytes
+
+        def ram_over() -> bool:
+            return bool(self._ram_budget and used_ram + ram_bytes > self._ram_budget)
+
+        def vram_over() -> bool:
+            return bool(
+                self._vram_budget and used_vram + vram_bytes > self._vram_budget
+            )
+
+        if not (ram_over() or vram_over()):
+            return []
+
+        candidates = sorted(
+            (k for k in self._cache if k not in self._pinned),
+            key=self.eviction_score,
+            reverse=True,
+        )
+        result = []
+        for key in candidates:
+            if not (ram_over() or vram_over()):
+                break
+            footprint = self.get_footprint(key)
+            # Only evict models that free memory where we're over budget
+            if not (
+                (ram_over() and footprint.ram_bytes)
+                or (vram_over() and footprint.vram_bytes)
+            ):
+                continue
+            value = self._cache.pop(key)
+            self._forget(key)
+            used_ram -= footprint.ram_bytes
+            used_vram -= footprint.vram_bytes
+            result.append((key, value))
+        return result
@@ -10,9 +10,13 @@ Performance optimizations:
 - Checks local HuggingFace cache before making network requests
 """
 
+import json
 import logging
+import re
+from pathlib import Path
 
-from huggingface_hub import HfApi, scan_cache_dir
+from huggingface_hub import HfApi, constants, scan_cache_dir
+from huggingface_hub.file_download import repo_folder_name
 from huggingface_hub.utils import HFCacheInfo
 from llamafarm_common import (
     GGUF_QUANTIZATION_PREFERENCE_ORDER,
@@ -43,6 +47,7 @@ __all__ = [
     "list_gguf_files",
     "get_gguf_file_path",
     "clear_format_cache",
+    "estimate_model_size_bytes",
 ]
 
 
@@ -161,6 +166,119 @@ def detect_model_format(model_id: str, token: str | None = None) -> str:
         raise
 
 
+# Weight files transformers' from_pretrained() looks for, in the order it
+# tries them (single file, then sharded via its index)
+_TRANSFORMERS_WEIGHTS = (
+    ("model.safetensors", "model.safetensors.index.json"),
+    ("pytorch_model.bin", "pytorch_model.bin.index.json"),
+)
+
+# "-00001-of-00003" in a split GGUF filename
+_SPLIT_GGUF_PART = re.compile(r"-\d{5}-of-\d{5}", re.IGNORECASE)
+
+
+def _cached_snapshot_files(model_id: str) -> dict[str, Path]:
+    """Map top-level filenames across a repo's cached snapshots to their paths.
+
+    Reads the repo's cache folder directly (no cache scan), so files
+    downloaded since an earlier call are found.
+    """
+    snapshots = (
+        Path(constants.HF_HUB_CACHE)
+        / repo_folder_name(repo_id=model_id, repo_type="model")
+        / "snapshots"
+    )
+    if not snapshots.is_dir():
+        return {}
+
+    files: dict[str, Path] = {}
+    for snapshot in snapshots.iterdir():
+        if not snapshot.is_dir():
+            continue
+        for path in snapshot.iterdir():
+            # Snapshot entries are symlinks to blobs; is_file() follows them
+            if path.name not in files and path.is_file():
+                files[path.name] = path
+    return files
+
+
+def _gguf_load_size(files: dict[str, Path], quantization: str | None) -> int:
+    """Size of the GGUF file the loader would pick, with all its split parts."""
+    # Multimodal projectors load alongside the model, never instead of it
+    selected = select_gguf_file(
+        [
+            name
+            for name in files
+            if name.endswith(".gguf") and "mmproj" not in name.lower()
+        ],
+        quantization,
+    )
+    if selected is None:
+        return 0
+    if not _SPLIT_GGUF_PART.search(selected):
+        return files[selected].stat().st_size
+
+    # llama.cpp loads every part of a split model
+    stem = _SPLIT_GGUF_PART.sub("", selected)
+    return sum(
+        path.stat().st_size
+        for name, path in files.items()
+        if _SPLIT_GGUF_PART.search(name) and _SPLIT_GGUF_PART.sub("", name) == stem
+    )
+
+
+def _transformers_load_size(files: dict[str, Path]) -> int:
+    """Size of the weights from_pretrained() would load from the snapshot."""
+    for weights_name, index_name in _TRANSFORMERS_WEIGHTS:
+        if weights_name in files:
+            return files[weights_name].stat().st_size
+        if index_name in files:
+            index = json.loads(files[index_name].read_text())
+            shards = set(index.get("weight_map", {}).values())
+            return sum(files[s].stat().st_size for s in shards if s in files)
+
+    # Unrecognized layout: fall back to every top-level file
+    return sum(path.stat().st_size for path in files.values())
+
+
+def estimate_model_size_bytes(
+    model_id: str, preferred_quantization: str | None = None
+) -> int:
+    """Estimate how much memory loading a model will need, from local files.
+
+    Uses the local HuggingFace cache only (no network requests) and sizes
+    only the files the loader will actually read: for GGUF repositories the
+    file select_gguf_file() picks for the quantization (as the GGUF models
+    do), otherwise the weights from_pretrained() loads (safetensors before
+    PyTorch .bin, single file or shards).
+
+    This touches the filesystem; call it off the event loop.
+
+    Args:
+        model_id: HuggingFace model identifier (optionally with :QUANT suffix)
+        preferred_quantization: Quantization the model will be loaded with;
+            takes precedence over a :QUANT suffix, like get_gguf_file_path()
+
+    Returns:
+        Estimated size in bytes, or 0 if the model isn't cached locally
+    """
+    base_model_id, model_quantization = parse_model_with_quantization(model_id)
+    if preferred_quantization is None:
+        preferred_quantization = model_quantization
+
+    try:
+        files = _cached_snapshot_files(base_model_id)
+        if not files:
+            return 0
+        if any(name.endswith(".gguf") for name in files):
+            return _gguf_load_size(files, preferred_quantization)
+        return _transformers_load_size(files)
+    except Exception as e:
+        logger.debug(f"Could not estimate size for {model_id}: {e}")
+
+    return 0
+
+
 def clear_format_cache():
     """Clear the format detection cache.
 
@@ -11,8 +11,8 @@ Polars solves this by being a columnar data store written in Rust with:
 
 Key Features:
 1. SLIDING WINDOW MECHANICS
-   - Ingest: Convert incoming dict to 1-row DataFrame
-   - Stack: Use pl.concat to append to history
+   - Ingest: Stage incoming dicts in a list (O(1) per record)
+   - Stack: Build one DataFrame from staged rows and pl.concat it on read
    - Truncate: tail(window_size) keeps memory bounded
 
 2. LAZY ROLLING FEATURES
@@ -35,6 +35,10 @@ Usage:
     # Get latest N records with computed features
     latest = buffer.get_latest(n=10)
 
+    # Streaming: newest features in O(1) per point, consistent with get_features
+    engine = buffer.feature_engine(rolling_windows=[5, 10, 20])
+    engine.update(record)
+
 Data Flow Example:
     Step 1: Init        -> []
     Step 2: Tick 1      -> [100]  (user spends $100)
@@ -53,6 +57,8 @@ from typing import Any
 
 import polars as pl
 
+from utils.rolling_features import RollingFeatureEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,6 +106,10 @@ class PolarsBuffer:
 
         # Initialize empty DataFrame
         self._df: pl.DataFrame | None = None
+        # Records appended since the DataFrame was last built. Concatenating a
+        # 1-row DataFrame per record costs more than the record is worth, so
+        # rows are staged and added in one go when the data is read.
+        self._pending: list[dict[str, Any]] = []
 
         # Performance tracking
         self._append_count = 0
@@ -109,7 +119,8 @@ class PolarsBuffer:
     def size(self) -> int:
         """Current number of records in buffer."""
         with self._lock:
-            return 0 if self._df is None else len(self._df)
+            stored = 0 if self._df is None else len(self._df)
+            return min(stored + len(self._pending), self._window_size)
 
     @property
     def window_size(self) -> int:
@@ -120,12 +131,14 @@ class PolarsBuffer:
     def columns(self) -> list[str]:
         """List of column names."""
         with self._lock:
+            self._flush_pending()
             return [] if self._df is None else self._df.columns
 
     @property
     def numeric_columns(self) -> list[str]:
         """List of numeric column names."""
         with self._lock:
+            self._flush_pending()
             if self._df is None:
                 return []
             return [
@@ -143,16 +156,11 @@ class PolarsBuffer:
         start_time = time.perf_counter()
 
         with self._lock:
-            new_row = pl.DataFrame([record], schema=self._schema)
+            self._pending.append(record)
 
-            if self._df is None:
-                self._df = new_row
-            else:
-                self._df = pl.concat([self._df, new_row], how="diagonal_relaxed")
-
-            # Truncate if over window size
-            if len(self._df) > self._window_size:
-                self._df = self._df.tail(self._window_size)
+            # Bound memory: older staged rows would be truncated anyway
+            if len(self._pending) >= self._window_size:
+                self._flush_pending()
 
             # Update counters inside lock for thread safety
             elapsed_ms = (time.perf_counter() - start_time) * 1000
@@ -171,6 +179,7 @@ class PolarsBuffer:
         start_time = time.perf_counter()
 
         with self._lock:
+            self._flush_pending()
             new_rows = pl.DataFrame(records, schema=self._schema)
 
             if self._df is None:
@@ -187,6 +196,29 @@ class PolarsBuffer:
             self._append_count += len(records)
             self._total_append_time_ms += elapsed_ms
 
+    def _flush_pending(self) -> None:
+        """Add staged records to the DataFrame. Caller must hold the lock."""
+        if not self._pending:
+            return
+
+        records = self._pending[-self._window_size :]
+        self._pending = []
+        try:
+            new_rows = [
+                pl.DataFrame(records, schema=self._schema, infer_schema_length=None)
+            ]
+        except (pl.exceptions.PolarsError, TypeError, ValueError):
+            # Types that only reconcile via relaxed concatenation (e.g. a column
+            # that is numeric in some records and text in others)
+            new_rows = [pl.DataFrame([r], schema=self._schema) for r in records]
+
+        frames = new_rows if self._df is None else [self._df, *new_rows]
+        self._df = pl.concat(frames, how="diagonal_relaxed")
+
+        # Truncate if over window size
+        if len(self._df) > self._window_size:
+            self._df = self._df.tail(self._window_size)
+
     def get_data(self) -> pl.DataFrame:
         """Get the raw buffer data as a DataFrame.
 
@@ -194,6 +226,7 @@ class PolarsBuffer:
             Copy of the internal DataFrame
         """
         with self._lock:
+            self._flush_pending()
             if self._df is None:
                 return pl.DataFrame()
             return self._df.clone()
@@ -205,6 +238,7 @@ class PolarsBuffer:
             Numpy array of numeric columns only
         """
         with self._lock:
+            self._flush_pending()
             if self._df is None:
                 import numpy as np
                 return np.array([])
@@ -250,6 +284,7 @@ class PolarsBuffer:
             lag_periods = [1, 2, 3]
 
         with self._lock:
+            self._flush_pending()
             if self._df is None or len(self._df) == 0:
                 return pl.DataFrame()
 
@@ -312,14 +347,61 @@ class PolarsBuffer:
             return df.tail(n)
         else:
             with self._lock:
+                self._flush_pending()
                 if self._df is None:
                     return pl.DataFrame()
                 return self._df.tail(n).clone()
 
+    def feature_engine(
+        self,
+        rolling_windows: list[int] | None = None,
+        include_lags: bool = True,
+        lag_periods: list[int] | None = None,
+        fill_null_value: float = 0.0,
+    ) -> RollingFeatureEngine:
+        """Create an incremental feature engine primed with the buffer's data.
+
+        Feed it the same records appended afterwards and its latest() values
+        match the last row of get_features() with the same arguments, at O(1)
+        cost per record instead of recomputing the window.
+
+        Args:
+            rolling_windows: Window sizes for rolling stats (default: [5, 10, 20])
+            include_lags: Whether to include lag features
+            lag_periods: Lag periods to compute (default: [1, 2, 3])
+            fill_null_value: Value to use for nulls during cold start (default: 0.0)
+
+        Returns:
+            RollingFeatureEngine over the buffer's current numeric columns
+        """
+        with self._lock:
+            self._flush_pending()
+            schema = {} if self._df is None else self._df.schema
+            numeric_cols = [col for col, dtype in schema.items() if dtype.is_numeric()]
+            engine = RollingFeatureEngine(
+                numeric_cols,
+                rolling_windows=rolling_windows,
+                include_lags=include_lags,
+                lag_periods=lag_periods,
+                fill_null_value=fill_null_value,
+                max_rows=self._window_size,
+            )
+            if numeric_cols:
+                # Only the most recent rows can still affect the newest features
+                history = max(
+                    [*engine.rolling_windows, *(lag + 1 for lag in engine.lag_periods)],
+                    default=1,
+                )
+                engine.extend(
+                    self._df.select(numeric_cols).tail(history).iter_rows(named=True)
+                )
+            return engine
+
     def clear(self) -> None:
         """Clear all data from the buffer."""
         with self._lock:
             self._df = None
+            self._pending = []
             self._append_count = 0
             self._total_append_time_ms = 0.0
 
@@ -330,6 +412,7 @@ class PolarsBuffer:
             BufferStats object with current state
         """
         with self._lock:
+            self._flush_pending()
             if self._df is None:
                 return BufferStats(
                     size=0,
@@ -364,6 +447,7 @@ class PolarsBuffer:
             List of record dictionaries
         """
         with self._lock:
+            self._flush_pending()
             if self._df is None:
                 return []
             return self._df.to_dicts()
@@ -5,6 +5,7 @@ Provides support for models like Qwen3 that use <think>...</think> tags
 for chain-of-thought reasoning.
 """
 
+import contextlib
 import re
 from dataclasses import dataclass
 
@@ -163,10 +164,15 @@ class ThinkingBudgetProcessor:
     When the thinking budget is reached, this processor forces the model
     to generate </think> and proceed to the answer.
 
-    This is used with llama-cpp's logits_processor parameter.
-    Uses numpy arrays.
+    This is used with llama-cpp's logits_processor parameter. Scores are edited
+    in place on the zero-copy NumPy view of the logits, and only the tokens
+    added since the previous call are detokenized, so the per-token cost stays
+    constant over long generations.
     """
 
+    # Characters of earlier text kept to catch tags split across tokens
+    _TAIL_CHARS = len("</think>") - 1
+
     def __init__(
         self,
         llama,
@@ -189,24 +195,55 @@ class ThinkingBudgetProcessor:
 
         # Try to get the token IDs for </think>
         if think_end_tokens is None:
-            try:
-                # Tokenize </think> to get its token IDs
-                self.think_end_tokens = llama.tokenize(
-                    b"</think>", add_bos=False, special=True
-                )
-            except Exception:
-                # Fallback - will use soft switch instead
-                self.think_end_tokens = None
+            self.think_end_tokens = self._tokenize_think_end(llama)
         else:
             self.think_end_tokens = think_end_tokens
 
         self._force_token_idx = 0
+        self._n_seen = 0  # Number of input_ids already scanned for tags
+        self._tail = ""  # End of the scanned text
+
+    @staticmethod
+    def _tokenize_think_end(llama) -> list[int] | None:
+        """Tokenize </think>, supporting llamafarm_llama and llama-cpp-python."""
+        try:
+            return llama.tokenize("</think>", add_special=False, parse_special=True)
+        except TypeError:
+            pass
+        except Exception:
+            return None
+        try:
+            return llama.tokenize(b"</think>", add_bos=False, special=True)
+        except Exception:
+            # Fallback - will use soft switch instead
+            return None
+
+    def _scan_new_text(self, input_ids) -> None:
+        """Update thinking state from tokens added since the previous call."""
+        new_ids = input_ids[self._n_seen :]
+        self._n_seen = len(input_ids)
+        if len(new_ids) == 0:
+            return
+
+        ids = new_ids.tolist() if hasattr(new_ids, "tolist") else list(new_ids)
+        text = self.llama.detokenize(ids)
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", errors="ignore")
+
+        window = (self._tail + text).lower()
+        self._tail = window[-self._TAIL_CHARS :]
+
+        if "<think>" in window and not self.in_thinking:
+            self.in_thinking = True
+        if "</think>" in window:
+            self.thinking_ended = True
+            self.in_thinking = False
 
     def __call__(self, input_ids, scores):
         """Process logits to enforce thinking budget.
 
         Args:
-            input_ids: numpy array of token IDs generated so far
+            input_ids: Token IDs so far (prompt + generated, list or numpy)
             scores: numpy array of logits for next token (modified in-place)
 
         Returns:
@@ -218,24 +255,10 @@ class ThinkingBudgetProcessor:
         if not isinstance(scores, np.ndarray):
             scores = np.array(scores)
 
-        # Check current state by looking at generated text
+        # Check current state by looking at newly generated text
         if not self.thinking_ended and not self.forcing_end:
-            try:
-                # Convert input_ids to list if numpy array
-                ids = (
-                    input_ids.tolist()
-                    if hasattr(input_ids, "tolist")
-                    else list(input_ids)
-                )
-                text = self.llama.detokenize(ids).decode("utf-8", errors="ignore")
-
-                if "<think>" in text.lower() and not self.in_thinking:
-                    self.in_thinking = True
-                if "</think>" in text.lower():
-                    self.thinking_ended = True
-                    self.in_thinking = False
-            except Exception:
-                pass
+            with contextlib.suppress(Exception):
+                self._scan_new_text(input_ids)
 
         # Count tokens only while in thinking mode
         if self.in_thinking and not self.thinking_ended:
@@ -257,7 +280,7 @@ class ThinkingBudgetProcessor:
             self._force_token_idx += 1
 
             # Set all logits to -inf except the target token
-            scores[:] = -np.inf
+            scores.fill(-np.inf)
             if target_token < len(scores):
                 scores[target_token] = 0.0
         elif self.forcing_end and self._force_token_idx >= len(self.think_end_tokens):
@@ -6,7 +6,10 @@ for accurate context window management.
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -28,6 +31,9 @@ class TokenCounter:
     # Chat template overhead factor (10% buffer for template markers)
     TEMPLATE_OVERHEAD_FACTOR = 1.10
 
+    # Token counts remembered per counter (i.e. per loaded model)
+    CACHE_SIZE = 8192
+
     def __init__(self, llama: Llama):
         """Initialize token counter with a Llama model instance.
 
@@ -35,10 +41,17 @@ class TokenCounter:
             llama: A loaded Llama model instance with tokenize() method.
         """
         self._llama = llama
+        # Conversations resend their whole history on every request, so
+        # counts are cached by content hash. Keys are digests rather than
+        # the text itself to keep long messages out of memory.
+        self._cache: OrderedDict[bytes, int] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in a text string.
 
+        Counts are cached, so repeated text is only tokenized once.
+
         Args:
             text: The text to tokenize.
 
@@ -48,8 +61,27 @@ class TokenCounter:
         if not text:
             return 0
 
-        tokens = self._llama.tokenize(text, add_special=False, parse_special=True)
-        return len(tokens)
+        key = hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        with self._cache_lock:
+            count = self._cache.get(key)
+            if count is not None:
+                self._cache.move_to_end(key)
+                return count
+
+        count = len(self._llama.tokenize(text, add_special=False, parse_special=True))
+
+        with self._cache_lock:
+            self._cache[key] = count
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return count
+
+    def clear_cache(self) -> None:
+        """Forget cached token counts."""
+        with self._cache_lock:
+            self._cache.clear()
 
     def count_message_tokens(self, message: dict) -> int:
         """Count tokens for a single message including role overhead.
@@ -124,10 +156,24 @@ class TokenCounter:
         base_tokens = self.count_messages_tokens(messages)
 
         if include_template_overhead:
-            return int(base_tokens * self.TEMPLATE_OVERHEAD_FACTOR)
+            return self.with_template_overhead(base_tokens)
 
         return base_tokens
 
+    def with_template_overhead(self, base_tokens: int) -> int:
+        """Apply the chat template overhead to a sum of message token counts.
+
+        Lets callers that already hold per-message counts estimate a prompt
+        without counting its messages again.
+
+        Args:
+            base_tokens: Sum of count_message_tokens() over the messages.
+
+        Returns:
+            Estimated token count for the prompt.
+        """
+        return int(base_tokens * self.TEMPLATE_OVERHEAD_FACTOR)
+
     def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
         """Truncate text to a maximum number of tokens.
 
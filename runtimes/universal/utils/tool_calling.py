@@ -11,6 +11,8 @@ import copy
 import json
 import logging
 import re
+from dataclasses import dataclass
+from enum import Enum
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +20,6 @@ logger = logging.getLogger(__name__)
 # Pattern to extract tool calls from <tool_call>...</tool_call> tags
 TOOL_CALL_PATTERN = re.compile(r"<tool_call>(.*?)</tool_call>", re.DOTALL)
 
-# Pattern to strip tool call tags from content
-TOOL_CALL_STRIP_PATTERN = re.compile(r"<tool_call>.*?</tool_call>", re.DOTALL)
-
-# Pattern to extract tool name from partial JSON
-TOOL_NAME_PATTERN = re.compile(r'"name"\s*:\s*"([^"]+)"')
-
 
 # =============================================================================
 # Prompt templates for different tool_choice modes
@@ -326,230 +322,363 @@ def detect_tool_call_in_content(content: str) -> list[tuple[str, str]] | None:
     return results if results else None
 
 
-def detect_probable_tool_call(content: str) -> bool:
-    """Check if content likely contains an incomplete tool call.
-
-    Used during streaming to detect when we should start buffering
-    instead of emitting tokens.
-
-    Args:
-        content: Accumulated content so far.
-
-    Returns:
-        True if content contains an opening <tool_call> tag.
-    """
-    return "<tool_call>" in content
-
-
-def strip_tool_call_from_content(content: str) -> str:
-    """Remove tool call XML tags from content.
-
-    Args:
-        content: The model's response content.
-
-    Returns:
-        Content with tool call tags removed.
-    """
-    return TOOL_CALL_STRIP_PATTERN.sub("", content).strip()
-
-
 # =============================================================================
-# Incremental streaming utilities
+# Incremental streaming parser
 # =============================================================================
 
+TOOL_CALL_OPEN = "<tool_call>"
+TOOL_CALL_CLOSE = "</tool_call>"
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
 
-def extract_tool_name_from_partial(content: str) -> str | None:
-    """Extract tool name from incomplete tool call JSON.
-
-    Used during streaming to detect the tool name before the entire
-    tool call JSON is complete. This enables emitting the initial
-    tool call chunk early.
-
-    Looks for patterns like:
-    - <tool_call>{"name": "get_weather"
-    - <tool_call>{"name":"get_weather",
 
-    Args:
-        content: Accumulated content that may contain a partial tool call.
-
-    Returns:
-        Tool name if found and complete, None otherwise.
-    """
-    if not content or "<tool_call>" not in content:
-        return None
+class ToolCallStreamState(Enum):
+    """State machine states for incremental tool call streaming."""
 
-    # Find the start of the tool call JSON
-    start_idx = content.find("<tool_call>")
-    if start_idx == -1:
-        return None
+    NORMAL = "normal"  # Streaming regular content
+    BUFFERING_START = "buffering_start"  # Detected <tool_call>, waiting for name
+    STREAMING_ARGS = "streaming_args"  # Name emitted, streaming arguments
 
-    # Extract everything after <tool_call>
-    json_start = start_idx + len("<tool_call>")
-    partial_json = content[json_start:]
 
-    # Use regex to extract a complete "name" value
-    # Matches: "name": "value" or "name":"value"
-    # The name value must be complete (closing quote found)
-    match = TOOL_NAME_PATTERN.search(partial_json)
+class ToolCallEventType(Enum):
+    """Kinds of events produced by StreamingToolCallParser."""
 
-    if match:
-        return match.group(1)
+    CONTENT = "content"  # Regular text (including thinking)
+    TOOL_CALL_START = "tool_call_start"  # Tool name is known
+    ARGUMENTS = "arguments"  # Next piece of the arguments JSON
+    TOOL_CALL_END = "tool_call_end"  # Closing tag seen
 
-    return None
 
+@dataclass
+class ToolCallEvent:
+    """An event produced while parsing a streamed response."""
 
-def extract_arguments_progress(content: str) -> tuple[int, str] | None:
-    """Extract the arguments JSON string progress from a partial tool call.
+    type: ToolCallEventType
+    text: str = ""  # Content, argument delta, or full arguments at the end
+    name: str | None = None  # Tool name (start and end events)
+    index: int = 0  # Tool call index (tool call events)
 
-    Used during streaming to extract how much of the "arguments" value
-    we have so far, enabling incremental streaming of arguments.
 
-    Args:
-        content: Accumulated content containing a partial tool call.
+class _TagMatcher:
+    """Tracks how much of a tag the text seen so far ends with.
 
-    Returns:
-        Tuple of (start_position, arguments_so_far) where start_position
-        is the character index where arguments value begins in the content,
-        and arguments_so_far is the accumulated arguments string.
-        Returns None if arguments section not yet started.
+    Only valid for tags whose first character does not repeat, which holds
+    for all the XML-style tags used here.
     """
-    if not content or "<tool_call>" not in content:
-        return None
-
-    # Find the start of the tool call JSON
-    tool_start = content.find("<tool_call>")
-    if tool_start == -1:
-        return None
-
-    json_start = tool_start + len("<tool_call>")
-    partial_json = content[json_start:]
-
-    # Find "arguments": or "arguments" :
-    args_pattern = r'"arguments"\s*:\s*'
-    match = re.search(args_pattern, partial_json)
-
-    if not match:
-        return None
 
-    # Position where the arguments value starts (after the colon and whitespace)
-    args_value_start = json_start + match.end()
+    __slots__ = ("tag", "matched")
 
-    # Extract everything from there
-    remaining = content[args_value_start:]
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.matched = 0
 
-    # Track brace depth to find the end of the arguments JSON value
-    # Arguments is a JSON object, so we need to find where it closes
-    args_content = _extract_json_value(remaining)
-
-    if not args_content:
-        return None
+    def feed(self, char: str) -> bool:
+        """Advance by one character; return True when the tag completes."""
+        if char == self.tag[self.matched]:
+            self.matched += 1
+            if self.matched == len(self.tag):
+                self.matched = 0
+                return True
+        else:
+            self.matched = 1 if char == self.tag[0] else 0
+        return False
 
-    return (args_value_start, args_content)
 
+class StreamingToolCallParser:
+    """Incremental parser for streamed model output with tool calls.
 
-def _extract_json_value(content: str) -> str:
-    """Extract a JSON value (object or array) from the start of content.
+    Consumes each delta once, tracking <think> blocks, <tool_call> tags and
+    the nesting of the tool call JSON, so the cost per token is proportional
+    to the token rather than to everything generated so far.
 
-    Tracks brace/bracket depth to find where the JSON value ends.
-    Handles incomplete JSON by returning what we have so far.
+    Text outside tool calls is emitted as CONTENT. Tool calls inside a think
+    block are left as content, like the non-streaming path which parses tool
+    calls from the answer only. Text that may be the start of a <tool_call>
+    tag is held back until the next delta decides it.
 
-    Args:
-        content: String starting with a JSON value.
-
-    Returns:
-        The JSON value string (possibly incomplete).
+    Example:
+        >>> parser = StreamingToolCallParser()
+        >>> events = parser.feed('<tool_call>{"name": "f", "arguments": {}}')
+        >>> [e.type.value for e in events]
+        ['tool_call_start', 'arguments']
     """
-    if not content:
-        return ""
-
-    content = content.strip()
-    if not content:
-        return ""
-
-    # Determine the opening bracket type
-    if content[0] == "{":
-        open_char, close_char = "{", "}"
-    elif content[0] == "[":
-        open_char, close_char = "[", "]"
-    else:
-        # Not a JSON object/array, might be a primitive
-        # For tool calls, arguments should always be an object
-        return content
-
-    depth = 0
-    in_string = False
-    escape_next = False
-    end_pos = len(content)
-
-    for i, char in enumerate(content):
-        if escape_next:
-            escape_next = False
-            continue
-
-        if char == "\\":
-            escape_next = True
-            continue
-
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            continue
-
-        if in_string:
-            continue
-
-        if char == open_char:
-            depth += 1
-        elif char == close_char:
-            depth -= 1
-            if depth == 0:
-                # Found the matching closing bracket
-                end_pos = i + 1
-                break
-
-    # Return the JSON value (complete or partial)
-    result = content[:end_pos]
-
-    # Clean up any trailing content after the closing bracket
-    # (like the closing brace of the outer object or </tool_call>)
-    return result
 
-
-def is_tool_call_complete(content: str) -> bool:
-    """Check if content contains a complete tool call with closing tag.
-
-    Args:
-        content: Accumulated content that may contain a tool call.
-
-    Returns:
-        True if a complete <tool_call>...</tool_call> is found.
-    """
-    if not content:
+    def __init__(self, detect_tools: bool = True):
+        """Initialize the parser.
+
+        Args:
+            detect_tools: Whether to parse tool calls. When False, everything is
+                emitted as content and only thinking state is tracked.
+        """
+        self._detect_tools = detect_tools
+        self.in_thinking = False
+        self.tool_calls_completed = 0
+        self._state = ToolCallStreamState.NORMAL
+        self._think = _TagMatcher(THINK_OPEN)
+        self._open = _TagMatcher(TOOL_CALL_OPEN)
+        self._close = _TagMatcher(TOOL_CALL_CLOSE)
+        # Content held back because it may start a <tool_call> tag
+        self._held = ""
+        self._reset_call()
+
+    @property
+    def state(self) -> ToolCallStreamState:
+        """Current state of the tool call state machine."""
+        return self._state
+
+    def _reset_call(self) -> None:
+        """Forget the JSON scanning state of the current tool call."""
+        self._body: list[str] = []
+        self._name: str | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key: str | None = None
+        self._string_chars: list[str] | None = None
+        # Raw arguments JSON: None until the value starts, then its text
+        self._args: list[str] | None = None
+        self._args_open = False
+        self._args_container = False
+        self._args_emitted = 0
+
+    def feed(self, delta: str) -> list[ToolCallEvent]:
+        """Parse the next piece of streamed text.
+
+        Args:
+            delta: Newly generated text.
+
+        Returns:
+            Events for the text that could be decided so far.
+        """
+        events: list[ToolCallEvent] = []
+        buf = self._held + delta
+        start = 0  # First character of buf not yet emitted as content
+
+        for i in range(len(self._held), len(buf)):
+            char = buf[i]
+
+            if self._state is not ToolCallStreamState.NORMAL:
+                if self._consume_call_char(char, events):
+                    start = i + 1
+                continue
+
+            if self._think.feed(char.lower()):
+                self.in_thinking = not self.in_thinking
+                self._think = _TagMatcher(
+                    THINK_CLOSE if self.in_thinking else THINK_OPEN
+                )
+                self._open.matched = 0
+
+            if self._detect_tools and not self.in_thinking and self._open.feed(char):
+                tag_start = i + 1 - len(TOOL_CALL_OPEN)
+                if tag_start > start:
+                    events.append(
+                        ToolCallEvent(ToolCallEventType.CONTENT, buf[start:tag_start])
+                    )
+                start = i + 1
+                self._state = ToolCallStreamState.BUFFERING_START
+
+        if self._state is ToolCallStreamState.NORMAL:
+            end = len(buf) - self._open.matched
+            if end > start:
+                events.append(ToolCallEvent(ToolCallEventType.CONTENT, buf[start:end]))
+            self._held = buf[max(start, end) :]
+        else:
+            self._held = ""
+            self._emit_arguments(events, final=False)
+
+        return events
+
+    def finish(self) -> list[ToolCallEvent]:
+        """Flush whatever is left once the stream has ended.
+
+        A tool call that never got a name is returned as plain content. One
+        whose start was already emitted gets its remaining arguments but no
+        end event, since it was never completed.
+
+        Returns:
+            Remaining events.
+        """
+        events: list[ToolCallEvent] = []
+        if self._state is ToolCallStreamState.NORMAL:
+            if self._held:
+                events.append(ToolCallEvent(ToolCallEventType.CONTENT, self._held))
+        elif self._state is ToolCallStreamState.BUFFERING_START:
+            events.append(
+                ToolCallEvent(
+                    ToolCallEventType.CONTENT, TOOL_CALL_OPEN + "".join(self._body)
+                )
+            )
+        else:
+            self._close.matched = 0
+            self._emit_arguments(events, final=False)
+
+        self._held = ""
+        self._state = ToolCallStreamState.NORMAL
+        self._reset_call()
+        return events
+
+    def _consume_call_char(self, char: str, events: list[ToolCallEvent]) -> bool:
+        """Consume one character inside a tool call.
+
+        Returns:
+            True if the character completed the closing tag.
+        """
+        self._body.append(char)
+        if self._close.feed(char):
+            del self._body[-len(TOOL_CALL_CLOSE) :]
+            if self._args is not None and self._args_open:
+                # Malformed JSON left the arguments open - drop the tag
+                del self._args[-(len(TOOL_CALL_CLOSE) - 1) :]
+            self._end_call(events)
+            return True
+
+        self._scan_json(char)
+        if (
+            self._name is not None
+            and self._state is ToolCallStreamState.BUFFERING_START
+        ):
+            self._start_call(self._name, events)
         return False
 
-    return "</tool_call>" in content
-
-
-def get_tool_call_content_after_tag(content: str) -> str | None:
-    """Extract the content inside <tool_call>...</tool_call> tags.
-
-    Args:
-        content: Content containing tool call tags.
-
-    Returns:
-        The content between the tags, or None if not found.
-    """
-    if not content or "<tool_call>" not in content:
-        return None
-
-    start_idx = content.find("<tool_call>")
-    if start_idx == -1:
-        return None
+    def _scan_json(self, char: str) -> None:
+        """Track JSON nesting to find the top-level name and arguments."""
+        depth = self._depth
+
+        if self._args_open:
+            self._args.append(char)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._string_chars is not None:
+                    text = "".join(self._string_chars)
+                    self._string_chars = None
+                    if self._expect_key:
+                        self._key = text
+                    elif self._key == "name" and self._name is None:
+                        self._name = text
+                if self._args_open and not self._args_container and depth == 1:
+                    self._args_open = False
+                return
+            if self._string_chars is not None:
+                self._string_chars.append(char)
+            return
+
+        if char.isspace():
+            return
+
+        if (
+            depth == 1
+            and self._key == "arguments"
+            and not self._expect_key
+            and self._args is None
+        ):
+            # First character of the arguments value
+            self._args = [char]
+            self._args_open = True
+            self._args_container = char in "{["
+
+        if char == '"':
+            self._in_string = True
+            if depth == 1:
+                self._string_chars = []
+        elif char in "{[":
+            self._depth += 1
+            if self._depth == 1:
+                self._expect_key = True
+        elif char in "}]":
+            self._depth -= 1
+            if self._args_open and self._depth == 1 and self._args_container:
+                self._args_open = False
+            elif self._args_open and self._depth == 0:
+                # Primitive arguments value ended by the closing brace
+                self._args.pop()
+                self._args_open = False
+        elif depth == 1 and char == ":":
+            self._expect_key = False
+        elif depth == 1 and char == ",":
+            if self._args_open and not self._args_container:
+                self._args.pop()
+                self._args_open = False
+            self._expect_key = True
+            self._key = None
+
+    def _start_call(self, name: str, events: list[ToolCallEvent]) -> None:
+        self._state = ToolCallStreamState.STREAMING_ARGS
+        events.append(
+            ToolCallEvent(
+                ToolCallEventType.TOOL_CALL_START,
+                name=name,
+                index=self.tool_calls_completed,
+            )
+        )
 
-    json_start = start_idx + len("<tool_call>")
-    end_idx = content.find("</tool_call>", json_start)
+    def _emit_arguments(self, events: list[ToolCallEvent], final: bool) -> None:
+        """Emit argument text not sent yet.
+
+        Characters that may belong to a closing tag are held back unless the
+        call has ended.
+        """
+        if self._state is not ToolCallStreamState.STREAMING_ARGS or self._args is None:
+            return
+        end = len(self._args)
+        if not final and self._args_open:
+            end -= self._close.matched
+        if end > self._args_emitted:
+            events.append(
+                ToolCallEvent(
+                    ToolCallEventType.ARGUMENTS,
+                    "".join(self._args[self._args_emitted : end]),
+                    index=self.tool_calls_completed,
+                )
+            )
+            self._args_emitted = end
 
-    if end_idx == -1:
-        # No closing tag yet, return everything after opening tag
-        return content[json_start:]
+    def _end_call(self, events: list[ToolCallEvent]) -> None:
+        """Finish the current tool call at its closing tag."""
+        body = "".join(self._body).strip()
+        parsed = None
+        try:
+            parsed = json.loads(body)
+        except json.JSONDecodeError as e:
+            logger.error(
+                f"Failed to parse streamed tool call: {e}, content: {body[:100]!r}"
+            )
+        if not isinstance(parsed, dict):
+            parsed = {}
+
+        name = self._name or parsed.get("name")
+        if not isinstance(name, str) or not name:
+            # Not a usable tool call - hand the text back as content
+            events.append(
+                ToolCallEvent(
+                    ToolCallEventType.CONTENT, TOOL_CALL_OPEN + body + TOOL_CALL_CLOSE
+                )
+            )
+        else:
+            if self._state is ToolCallStreamState.BUFFERING_START:
+                self._start_call(name, events)
+            if self._args is None:
+                # No arguments key (or not parsed yet) - send them whole
+                self._args = [
+                    json.dumps(parsed.get("arguments", {}), ensure_ascii=False)
+                ]
+            self._emit_arguments(events, final=True)
+            events.append(
+                ToolCallEvent(
+                    ToolCallEventType.TOOL_CALL_END,
+                    "".join(self._args).strip(),
+                    name=name,
+                    index=self.tool_calls_completed,
+                )
+            )
+            self.tool_calls_completed += 1
 
-    return content[json_start:end_idx]
+        self._state = ToolCallStreamState.NORMAL
+        self._reset_call()
@@ -12,6 +12,7 @@ import api.routers as routers
 from api.errors import register_exception_handlers
 from api.middleware.errors import ErrorHandlerMiddleware
 from api.middleware.structlog import StructLogMiddleware
+from core.celery.rag_client import close_rpc_clients
 from core.designer import get_designer_dist_path
 from core.logging import FastAPIStructLogger
 from core.mcp_registry import cleanup_all_mcp_services
@@ -35,6 +36,7 @@ async def lifespan(app: fastapi.FastAPI):
     logger.info("Shutting down LlamaFarm API")
     await cleanup_all_mcp_services()
     await close_runtime_client()
+    await close_rpc_clients()
     logger.info("Shutdown complete")
 
 
@@ -11,7 +11,7 @@ from typing import Any
 
 import celery.result
 from config.datamodel import LlamaFarmConfig, Model  # noqa: E402
-from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi import APIRouter, Header, HTTPException, Request, Response
 from fastapi import Path as FastAPIPath
 from openai.types.chat import (
     ChatCompletion,
@@ -26,7 +26,9 @@ from api.errors import ErrorResponse, NamespaceNotFoundError, ProjectNotFoundErr
 
 # RAG imports moved to function level to avoid circular imports
 from api.routers.shared.response_utils import (
+    ClientDisconnectedError,
     create_streaming_response_from_iterator,
+    run_until_disconnected,
     set_session_header,
 )
 from core.celery import app
@@ -465,6 +467,7 @@ async def chat(
     namespace: str,
     project_id: str,
     response: Response,
+    http_request: Request,
     session_id: str | None = Header(None, alias="X-Session-ID"),
     x_no_session: str | None = Header(None, alias="X-No-Session"),
     x_active_project: str | None = Header(None, alias="X-Active-Project"),
@@ -484,92 +487,114 @@ async def chat(
     now = time.time()
     stateless = x_no_session is not None
 
-    if stateless:
-        agent = await ChatOrchestratorAgentFactory.create_agent(
-            project_config=project_config,
-            project_dir=project_dir,
-            model_name=request.model,
-            active_project_namespace=active_project_namespace,
-            active_project_name=active_project_name,
-        )
-    else:
-        # Stateful mode: use or create cached agent with disk-persisted history
-        if not session_id:
-            session_id = str(uuid.uuid4())
-
-        key = _session_key(namespace, project_id, session_id)
-        with _agent_sessions_lock:
-            # Clean up expired sessions before checking cache
-            _cleanup_expired_sessions(now)
-
-            record = agent_sessions.get(key)
-            if record is not None and (now - record.last_used > SESSION_TTL_SECONDS):
-                # Session expired, remove it and create fresh
-                agent_sessions.pop(key, None)
-                record = None
-
-            if record is None or request.model != record.agent.model_name:
-                agent = await ChatOrchestratorAgentFactory.create_agent(
-                    project_config=project_config,
-                    project_dir=project_dir,
-                    model_name=request.model,
-                    session_id=session_id,
-                    active_project_namespace=active_project_namespace,
-                    active_project_name=active_project_name,
-                )
-                # Cache the agent in memory
-                agent_sessions[key] = SessionRecord(
-                    namespace=namespace,
-                    project_id=project_id,
-                    agent=agent,
-                    created_at=now,
-                    last_used=now,
-                    request_count=1,
-                )
-            else:
-                # Reuse cached agent and update stats
-                record.last_used = now
-                record.request_count += 1
-                agent = record.agent
-
-        set_session_header(response, session_id)
-
-    # Extract the latest user message
-    latest_user_message = next(
-        (
-            str(msg.get("content", ""))
-            for msg in reversed(request.messages)
-            if msg.get("role", None) == "user" and msg.get("content", None)
-        ),
-        None,
+    # Start RAG retrieval now so it runs while the agent and tools are set up
+    rag_prefetch = project_chat_service.start_rag_prefetch(
+        project_dir=project_dir,
+        project_config=project_config,
+        messages=request.messages,
+        model_name=request.model,
+        rag_enabled=request.rag_enabled,
+        database=request.database,
+        retrieval_strategy=request.rag_retrieval_strategy,
+        rag_top_k=request.rag_top_k,
+        rag_score_threshold=request.rag_score_threshold,
+        rag_queries=request.rag_queries,
     )
 
-    # Inject relevant documentation based on user query (dev mode only)
-    if (
-        settings.lf_dev_mode_docs_enabled
-        and project_id == "project_seed"
-        and hasattr(agent, "docs_context_provider")
-    ):
-        docs_service = get_docs_service()
-        matched_docs = docs_service.match_docs_for_query(latest_user_message)
-        agent.docs_context_provider.set_docs(matched_docs)
-
-    # Resolve template variables in prompts, config tools, and request tools
     try:
-        # Resolve agent prompts and config tools via single method
-        if hasattr(agent, "set_request_variables"):
-            agent.set_request_variables(request.variables)
-
-        # Resolve request tools separately (they're not part of agent config)
-        request_tools = TemplateService.resolve_object(
-            request.tools or [], request.variables or {}
+        if stateless:
+            agent = await ChatOrchestratorAgentFactory.create_agent(
+                project_config=project_config,
+                project_dir=project_dir,
+                model_name=request.model,
+                active_project_namespace=active_project_namespace,
+                active_project_name=active_project_name,
+            )
+        else:
+            # Stateful mode: use or create cached agent with disk-persisted history
+            if not session_id:
+                session_id = str(uuid.uuid4())
+
+            key = _session_key(namespace, project_id, session_id)
+            with _agent_sessions_lock:
+                # Clean up expired sessions before checking cache
+                _cleanup_expired_sessions(now)
+
+                record = agent_sessions.get(key)
+                if record is not None and (
+                    now - record.last_used > SESSION_TTL_SECONDS
+                ):
+                    # Session expired, remove it and create fresh
+                    agent_sessions.pop(key, None)
+                    record = None
+
+                if record is None or request.model != record.agent.model_name:
+                    agent = await ChatOrchestratorAgentFactory.create_agent(
+                        project_config=project_config,
+                        project_dir=project_dir,
+                        model_name=request.model,
+                        session_id=session_id,
+                        active_project_namespace=active_project_namespace,
+                        active_project_name=active_project_name,
+                    )
+                    # Cache the agent in memory
+                    agent_sessions[key] = SessionRecord(
+                        namespace=namespace,
+                        project_id=project_id,
+                        agent=agent,
+                        created_at=now,
+                        last_used=now,
+                        request_count=1,
+                    )
+                else:
+                    # Reuse cached agent and update stats
+                    record.last_used = now
+                    record.request_count += 1
+                    agent = record.agent
+
+            set_session_header(response, session_id)
+
+        # Extract the latest user message
+        latest_user_message = next(
+            (
+                str(msg.get("content", ""))
+                for msg in reversed(request.messages)
+                if msg.get("role", None) == "user" and msg.get("content", None)
+            ),
+            None,
         )
-        tools = [ToolDefinition.from_openai_tool_dict(t) for t in request_tools]
-    except TemplateError as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Template resolution failed: {e}",
-        ) from e
+
+        # Inject relevant documentation based on user query (dev mode only)
+        if (
+            settings.lf_dev_mode_docs_enabled
+            and project_id == "project_seed"
+            and hasattr(agent, "docs_context_provider")
+        ):
+            docs_service = get_docs_service()
+            matched_docs = docs_service.match_docs_for_query(latest_user_message)
+            agent.docs_context_provider.set_docs(matched_docs)
+
+        # Resolve template variables in prompts, config tools, and request tools
+        try:
+            # Resolve agent prompts and config tools via single method
+            if hasattr(agent, "set_request_variables"):
+                agent.set_request_variables(request.variables)
+
+            # Resolve request tools separately (they're not part of agent config)
+            request_tools = TemplateService.resolve_object(
+                request.tools or [], request.variables or {}
+            )
+            tools = [ToolDefinition.from_openai_tool_dict(t) for t in request_tools]
+        except TemplateError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Template resolution failed: {e}",
+            ) from e
+    except BaseException:
+        # The request failed before chat()/stream_chat() took over the prefetch
+        if rag_prefetch is not None:
+            rag_prefetch.cancel()
+        raise
 
     if request.stream:
         return create_streaming_response_from_iterator(
@@ -592,29 +617,39 @@ async def chat(
                 max_tokens=request.max_tokens,
                 include_sources=request.include_sources or False,
                 sources_limit=request.sources_limit or 10,
+                rag_prefetch=rag_prefetch,
             ),
             session_id if not stateless else "",
             default_message=FALLBACK_ECHO_RESPONSE,
+            # No-op once stream_chat() used the prefetch; stops it if the
+            # stream never started (e.g. the client left before the first byte)
+            on_close=rag_prefetch.cancel if rag_prefetch is not None else None,
         )
 
     try:
-        completion = await project_chat_service.chat(
-            project_dir=project_dir,
-            project_config=project_config,
-            chat_agent=agent,
-            messages=request.messages,
-            tools=tools,
-            rag_enabled=request.rag_enabled,
-            database=request.database,
-            retrieval_strategy=request.rag_retrieval_strategy,
-            rag_top_k=request.rag_top_k,
-            n_ctx=request.n_ctx,
-            rag_score_threshold=request.rag_score_threshold,
-            rag_queries=request.rag_queries,
-            think=request.think,
-            thinking_budget=request.thinking_budget,
-            max_tokens=request.max_tokens,
+        completion = await run_until_disconnected(
+            http_request,
+            project_chat_service.chat(
+                project_dir=project_dir,
+                project_config=project_config,
+                chat_agent=agent,
+                messages=request.messages,
+                tools=tools,
+                rag_enabled=request.rag_enabled,
+                database=request.database,
+                retrieval_strategy=request.rag_retrieval_strategy,
+                rag_top_k=request.rag_top_k,
+                n_ctx=request.n_ctx,
+                rag_score_threshold=request.rag_score_threshold,
+                rag_queries=request.rag_queries,
+                think=request.think,
+                thinking_budget=request.thinking_budget,
+                max_tokens=request.max_tokens,
+                rag_prefetch=rag_prefetch,
+            ),
         )
+    except ClientDisconnectedError as e:
+        raise HTTPException(status_code=499, detail="Client closed request") from e
     except Exception as e:
         error_msg = str(e)
 
@@ -632,6 +667,10 @@ async def chat(
             status_code=500,
             detail=f"Chat service failed to generate a response: {e}",
         ) from e
+    finally:
+        # No-op once chat() used the prefetch; stops it if chat() never got to it
+        if rag_prefetch is not None:
+            rag_prefetch.cancel()
 
     if not stateless:
         set_session_header(response, session_id)
@@ -2,11 +2,12 @@ import asyncio
 import json
 import time
 import uuid
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
-from fastapi import Response
+from fastapi import Request, Response
 from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
 
 from core.logging import FastAPIStructLogger
 
@@ -18,6 +19,53 @@ def set_session_header(response: Response | None, session_id: str | None) -> Non
         response.headers["X-Session-ID"] = session_id
 
 
+class ClientDisconnectedError(Exception):
+    """The client closed the connection before the response was ready."""
+
+
+async def run_until_disconnected[T](
+    http_request: Request, awaitable: Awaitable[T], poll_interval: float = 0.25
+) -> T:
+    """Await ``awaitable``, cancelling it if the client disconnects first.
+
+    Starlette cancels streaming responses when the client goes away, but
+    regular handlers keep running, so long non-streaming work is wrapped in
+    this.
+
+    Raises:
+        ClientDisconnectedError: The client disconnected and the work was
+            cancelled.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                raise ClientDisconnectedError()
+    finally:
+        task.cancel()
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """StreamingResponse that calls ``on_close`` once the response is done.
+
+    Unlike a background task, ``on_close`` also runs when the client
+    disconnects before the body iterator started, or sending fails.
+    """
+
+    def __init__(self, *args: Any, on_close: Callable[[], None], **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._on_close = on_close
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._on_close()
+
+
 def _generate_chunks(text: str, limit: int) -> list[str]:
     words = text.split()
     if not words:
@@ -110,6 +158,7 @@ def create_streaming_response_from_iterator(
     session_id: str,
     *,
     default_message: str | None = None,
+    on_close: Callable[[], None] | None = None,
 ) -> StreamingResponse:
     """Convert ChatCompletionChunk stream to OpenAI SSE format.
 
@@ -118,6 +167,9 @@ def create_streaming_response_from_iterator(
         stream_source: AsyncGenerator yielding ChatCompletionChunk objects
         session_id: Session ID for header
         default_message: Fallback message if no chunks emitted
+        on_close: Called when the response is finished with, whether or not
+            ``stream_source`` was ever iterated (e.g. to release work the
+            stream would have taken over)
     """
 
     async def event_stream() -> AsyncIterator[bytes]:
@@ -206,13 +258,19 @@ def create_streaming_response_from_iterator(
 
         yield b"data: [DONE]\n\n"
 
+    headers = {
+        "X-Session-ID": session_id,
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",
+    }
+    if on_close is not None:
+        return _ClosingStreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers=headers,
+            on_close=on_close,
+        )
     return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={
-            "X-Session-ID": session_id,
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        event_stream(), media_type="text/event-stream", headers=headers
     )
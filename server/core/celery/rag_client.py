@@ -4,17 +4,45 @@ Client utilities for interacting with RAG Celery tasks.
 These helpers centralize the logic for building task signatures, dispatching
 them, and polling for completion so that both FastAPI handlers and Celery
 tasks can reuse the same behavior.
+
+Read-only tasks (search, query, stats, health, listing, preview) are first
+sent to the RAG worker's request/response endpoint (settings.rag_rpc_url), so
+they return as soon as the work is done. If the endpoint cannot be reached
+(or there is no token for it yet), they fall back to dispatching through
+Celery and polling for the result. Ingestion and deletion always go through
+Celery.
 """
 
 from __future__ import annotations
 
 import asyncio
+import threading
 import time
+import weakref
+from pathlib import Path
 from typing import Any
 
+import httpx
 from celery import signature
 
 from core.celery import app
+from core.settings import settings
+
+# After the RPC endpoint was unreachable, use Celery for this long before
+# trying it again
+RPC_RETRY_AFTER_SECONDS = 30.0
+# First Celery status poll; the interval doubles up to the caller's poll_interval
+INITIAL_POLL_INTERVAL = 0.05
+# File in the data directory the RAG worker writes its generated token to
+RPC_TOKEN_FILENAME = "rag_rpc_token"
+
+_rpc_client: httpx.Client | None = None
+_async_rpc_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+_rpc_lock = threading.Lock()
+_rpc_unavailable_until = 0.0
+_rpc_token: str | None = None
 
 
 def build_ingest_signature(
@@ -25,11 +53,17 @@ def build_ingest_signature(
     filename: str | None = None,
     dataset_name: str | None = None,
     parser_overrides: dict[str, Any] | None = None,
+    manifest_entry: dict[str, Any] | None = None,
 ):
     """
     Build a Celery signature for the rag.ingest_file task.
 
     This helper ensures all signatures are constructed consistently.
+
+    Args:
+        manifest_entry: Optional {"path", "file_hash", "config_hash"}; the
+            worker writes the ingest manifest entry there once the file is
+            fully stored
     """
 
     return signature(
@@ -43,6 +77,7 @@ def build_ingest_signature(
             dataset_name,
             parser_overrides or {},
         ],
+        kwargs={"manifest_entry": manifest_entry} if manifest_entry else {},
         app=app,
     )
 
@@ -211,7 +246,7 @@ async def ingest_file_with_rag(
     )
 
 
-def search_with_rag_database(
+def build_search_signature(
     project_dir: str,
     database: str,
     query: str,
@@ -224,12 +259,12 @@ def search_with_rag_database(
     rerank_model: str | None = None,
     query_expansion: bool | None = None,
     max_tokens: int | None = None,
-) -> list[dict[str, Any]]:
+):
     """
-    Run a search query via rag.search_with_database.
+    Build a Celery signature for the rag.search_with_database task.
     """
 
-    task = signature(
+    return signature(
         "rag.search_with_database",
         args=[
             project_dir,
@@ -247,9 +282,81 @@ def search_with_rag_database(
         ],
         app=app,
     )
+
+
+def search_with_rag_database(
+    project_dir: str,
+    database: str,
+    query: str,
+    top_k: int = 5,
+    retrieval_strategy: str | None = None,
+    score_threshold: float | None = None,
+    metadata_filters: dict[str, Any] | None = None,
+    distance_metric: str | None = None,
+    hybrid_alpha: float | None = None,
+    rerank_model: str | None = None,
+    query_expansion: bool | None = None,
+    max_tokens: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Run a search query via rag.search_with_database.
+    """
+
+    task = build_search_signature(
+        project_dir,
+        database,
+        query,
+        top_k,
+        retrieval_strategy,
+        score_threshold,
+        metadata_filters,
+        distance_metric,
+        hybrid_alpha,
+        rerank_model,
+        query_expansion,
+        max_tokens,
+    )
     return _run_sync_task_with_polling(task, timeout=30, poll_interval=0.5) or []
 
 
+async def search_with_rag_database_async(
+    project_dir: str,
+    database: str,
+    query: str,
+    top_k: int = 5,
+    retrieval_strategy: str | None = None,
+    score_threshold: float | None = None,
+    metadata_filters: dict[str, Any] | None = None,
+    distance_metric: str | None = None,
+    hybrid_alpha: float | None = None,
+    rerank_model: str | None = None,
+    query_expansion: bool | None = None,
+    max_tokens: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Run a search query via rag.search_with_database from async contexts.
+
+    Never blocks the event loop, and stops waiting when cancelled.
+    """
+
+    task = build_search_signature(
+        project_dir,
+        database,
+        query,
+        top_k,
+        retrieval_strategy,
+        score_threshold,
+        metadata_filters,
+        distance_metric,
+        hybrid_alpha,
+        rerank_model,
+        query_expansion,
+        max_tokens,
+    )
+    result = await _run_task_with_polling_async(task, timeout=30, poll_interval=0.5)
+    return result or []
+
+
 def handle_rag_query(
     project_dir: str,
     database: str,
@@ -428,40 +535,231 @@ def preview_document(
     }
 
 
-def _run_sync_task_with_polling(task_signature, timeout: float, poll_interval: float):
-    """
-    Helper used by synchronous contexts to poll a Celery AsyncResult safely.
+class _RPCUnavailable(Exception):
+    """The RAG worker endpoint cannot serve this task; use Celery instead."""
+
+
+def _get_rpc_client() -> httpx.Client:
+    global _rpc_client
+
+    with _rpc_lock:
+        if _rpc_client is None:
+            _rpc_client = httpx.Client(base_url=settings.rag_rpc_url)
+        return _rpc_client
+
+
+def _get_async_rpc_client() -> httpx.AsyncClient:
+    """Return the keep-alive async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_rpc_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(base_url=settings.rag_rpc_url)
+        _async_rpc_clients[loop] = client
+    return client
+
+
+async def close_rpc_clients() -> None:
+    """Close the keep-alive RPC clients.
+
+    Should be called during application shutdown. Async clients of other
+    event loops that are still running are closed on their own loop.
     """
+    global _rpc_client
 
-    result = task_signature.apply_async()
-    waited = 0.0
+    with _rpc_lock:
+        client, _rpc_client = _rpc_client, None
+    if client is not None:
+        client.close()
 
-    while waited < timeout:
+    current_loop = asyncio.get_running_loop()
+    for loop, async_client in list(_async_rpc_clients.items()):
+        if loop is current_loop:
+            await async_client.aclose()
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(async_client.aclose(), loop)
+    _async_rpc_clients.clear()
+
+
+def _get_rpc_token() -> str | None:
+    """Return the endpoint token, or None if the worker hasn't published one."""
+    global _rpc_token
+
+    if settings.rag_rpc_token:
+        return settings.rag_rpc_token
+    if _rpc_token is None:
         try:
-            status = result.status
-            if status not in ("PENDING", "STARTED"):
-                break
-        except Exception:
-            time.sleep(poll_interval)
-            waited += poll_interval
-            continue
-        time.sleep(poll_interval)
-        waited += poll_interval
+            token_path = Path(settings.lf_data_dir) / RPC_TOKEN_FILENAME
+            _rpc_token = token_path.read_text().strip() or None
+        except OSError:
+            return None
+    return _rpc_token
+
+
+def _rpc_request(task_signature, timeout: float) -> dict[str, Any]:
+    """Build the RPC request for a task, or raise _RPCUnavailable."""
+    if not settings.rag_rpc_url or time.monotonic() < _rpc_unavailable_until:
+        raise _RPCUnavailable()
+    token = _get_rpc_token()
+    if token is None:
+        raise _RPCUnavailable()
+    return {
+        "url": f"/tasks/{task_signature.task}",
+        "json": {
+            "args": list(task_signature.args),
+            "kwargs": dict(task_signature.kwargs),
+        },
+        "headers": {"Authorization": f"Bearer {token}"},
+        "timeout": httpx.Timeout(timeout, connect=1.0),
+    }
+
 
+def _rpc_transport_failed(exc: httpx.TransportError) -> None:
+    """Handle a failed RPC request: None if the task timed out, else fall back."""
+    global _rpc_unavailable_until
+
+    if isinstance(exc, httpx.TimeoutException) and not isinstance(
+        exc, httpx.ConnectTimeout
+    ):
+        return None
+    _rpc_unavailable_until = time.monotonic() + RPC_RETRY_AFTER_SECONDS
+    raise _RPCUnavailable() from exc
+
+
+def _rpc_result(response: httpx.Response):
+    """Return the task result from an RPC response."""
+    global _rpc_token
+
+    if response.status_code == 200:
+        return response.json()["result"]
+    if response.status_code == 500:
+        raise Exception(f"Task failed: {response.json().get('error')}")  # noqa: BLE001
+    if response.status_code == 401:
+        # The worker restarted with a new token; read it again next time
+        _rpc_token = None
+    raise _RPCUnavailable()
+
+
+def _run_task_via_rpc(task_signature, timeout: float):
+    """
+    Run a read-only task on the RAG worker's request/response endpoint.
+
+    Returns the task result, or None if the task did not finish within
+    ``timeout`` (matching the Celery polling path).
+
+    Raises:
+        _RPCUnavailable: The endpoint is disabled, unreachable or does not
+            serve this task.
+        Exception: The task itself failed.
+    """
+    request = _rpc_request(task_signature, timeout)
     try:
-        final_status = result.status
-    except Exception as exc:  # pragma: no cover - defensive
-        raise Exception(f"Failed to get task status: {exc}") from exc  # noqa: BLE001
+        response = _get_rpc_client().post(**request)
+    except httpx.TransportError as exc:
+        return _rpc_transport_failed(exc)
+    return _rpc_result(response)
 
-    if final_status == "SUCCESS":
+
+async def _run_task_via_rpc_async(task_signature, timeout: float):
+    """Async variant of _run_task_via_rpc."""
+    request = _rpc_request(task_signature, timeout)
+    try:
+        response = await _get_async_rpc_client().post(**request)
+    except httpx.TransportError as exc:
+        return _rpc_transport_failed(exc)
+    return _rpc_result(response)
+
+
+class _StatusPoller:
+    """Celery polling schedule shared by the sync and async polling helpers.
+
+    Status checks start INITIAL_POLL_INTERVAL apart and back off to
+    ``poll_interval``; after a failed check the full ``poll_interval`` is
+    waited. Both methods make blocking result backend calls.
+    """
+
+    def __init__(self, result, timeout: float, poll_interval: float):
+        self.result = result
+        self._remaining = timeout
+        self._poll_interval = poll_interval
+        self._interval = min(INITIAL_POLL_INTERVAL, poll_interval)
+
+    def check(self) -> float | None:
+        """Check the task once.
+
+        Returns:
+            Seconds to wait before the next check, or None to stop polling
+            (the task finished or the timeout elapsed).
+        """
+        if self._remaining <= 0:
+            return None
         try:
-            return result.result
+            if self.result.status not in ("PENDING", "STARTED"):
+                return None
+            delay = self._interval
+            self._interval = min(self._interval * 2, self._poll_interval)
+        except Exception:
+            delay = self._poll_interval
+        self._remaining -= delay
+        return delay
+
+    def outcome(self):
+        """Return the task result, or None if it has not finished."""
+        try:
+            final_status = self.result.status
         except Exception as exc:  # pragma: no cover - defensive
-            raise Exception(f"Failed to get task result: {exc}") from exc  # noqa: BLE001
+            raise Exception(f"Failed to get task status: {exc}") from exc  # noqa: BLE001
 
-    if final_status == "FAILURE":
-        if hasattr(result, "traceback") and result.traceback:
-            raise Exception(f"Task failed: {result.traceback}")  # noqa: BLE001
-        raise Exception("Task failed")  # noqa: BLE001
+        if final_status == "SUCCESS":
+            try:
+                return self.result.result
+            except Exception as exc:  # pragma: no cover - defensive
+                raise Exception(f"Failed to get task result: {exc}") from exc  # noqa: BLE001
 
-    return None
+        if final_status == "FAILURE":
+            if hasattr(self.result, "traceback") and self.result.traceback:
+                raise Exception(f"Task failed: {self.result.traceback}")  # noqa: BLE001
+            raise Exception("Task failed")  # noqa: BLE001
+
+        return None
+
+
+def _run_sync_task_with_polling(task_signature, timeout: float, poll_interval: float):
+    """
+    Helper used by synchronous contexts to poll a Celery AsyncResult safely.
+
+    Read-only tasks are tried on the RAG worker's endpoint first; otherwise
+    the task is dispatched through Celery and polled (see _StatusPoller).
+    """
+
+    try:
+        return _run_task_via_rpc(task_signature, timeout)
+    except _RPCUnavailable:
+        pass
+
+    poller = _StatusPoller(task_signature.apply_async(), timeout, poll_interval)
+    while (delay := poller.check()) is not None:
+        time.sleep(delay)
+    return poller.outcome()
+
+
+async def _run_task_with_polling_async(
+    task_signature, timeout: float, poll_interval: float
+):
+    """
+    Async variant of _run_sync_task_with_polling.
+
+    Result backend calls run in a worker thread and the waits use
+    asyncio.sleep(), so the event loop keeps serving other requests while
+    the task runs.
+    """
+
+    try:
+        return await _run_task_via_rpc_async(task_signature, timeout)
+    except _RPCUnavailable:
+        pass
+
+    result = await asyncio.to_thread(task_signature.apply_async)
+    poller = _StatusPoller(result, timeout, poll_interval)
+    while (delay := await asyncio.to_thread(poller.check)) is not None:
+        await asyncio.sleep(delay)
+    return await asyncio.to_thread(poller.outcome)
@@ -69,6 +69,14 @@ class Settings(BaseSettings):
     )
     celery_result_backend: str = ""  # e.g., "redis://localhost:6379/0"
 
+    # RAG worker request/response endpoint for read-only tasks (search, stats,
+    # health). Empty disables it and always goes through the Celery broker.
+    rag_rpc_url: str = "http://127.0.0.1:14346"
+    # Token the endpoint requires. Empty reads the one the worker generated
+    # from <lf_data_dir>/rag_rpc_token (set RAG_RPC_TOKEN on both when the
+    # worker doesn't share the data directory).
+    rag_rpc_token: str = ""
+
     # Dev mode settings
     lf_dev_mode_docs_enabled: bool = True
     lf_dev_mode_greeting_enabled: bool = True
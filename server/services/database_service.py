@@ -12,6 +12,7 @@ from config.helpers.component_resolver import ComponentResolver
 
 from api.errors import DatabaseNotFoundError
 from core.logging import FastAPIStructLogger
+from services.ingest_manifest_service import IngestManifestService
 from services.project_service import ProjectService
 
 logger = FastAPIStructLogger()
@@ -327,6 +328,7 @@ class DatabaseService:
             success = vector_store.delete_collection()
 
             if success:
+                IngestManifestService.forget_database(project_dir, database.name)
                 logger.info(
                     "Deleted vector store collection",
                     store_type=db_type,
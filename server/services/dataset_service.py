@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from celery import group  # type: ignore[import-not-found,import-untyped]
+from celery import chain, group  # type: ignore[import-not-found,import-untyped]
 from config.datamodel import Dataset
 from fastapi import UploadFile
 from pydantic import BaseModel
@@ -15,12 +15,14 @@ from pydantic import BaseModel
 from api.errors import DatasetNotFoundError
 from core.celery import app
 from core.celery.rag_client import (
+    build_delete_signature,
     build_ingest_signature,
     delete_file_from_rag,
     list_rag_documents,
 )
 from core.logging import FastAPIStructLogger
 from services.data_service import DataService, MetadataFileContent
+from services.ingest_manifest_service import IngestManifestService
 from services.project_service import ProjectService
 
 logger = FastAPIStructLogger()
@@ -434,6 +436,8 @@ class DatasetService:
             deleted_chunks=result.get("deleted_count", 0),
         )
 
+        IngestManifestService.forget_files(namespace, project, dataset, [file_hash])
+
         # Then delete from disk
         metadata_file_content = DataService.delete_data_file(
             namespace=namespace,
@@ -486,6 +490,8 @@ class DatasetService:
         if result.get("status") == "error":
             raise Exception(result.get("error"))
 
+        IngestManifestService.forget_files(namespace, project, dataset, [file_hash])
+
         logger.info(
             "Deleted chunks from vector store (keeping source file)",
             namespace=namespace,
@@ -553,6 +559,8 @@ class DatasetService:
                 total_deleted += result.get("deleted_count", 0)
                 files_cleared += 1
 
+        IngestManifestService.forget_files(namespace, project, dataset)
+
         logger.info(
             "Deleted all chunks from vector store (keeping source files)",
             namespace=namespace,
@@ -577,8 +585,23 @@ class DatasetService:
         dataset: str,
         file_hashes: list[str] | None = None,
         parser_overrides: dict | None = None,
+        incremental: bool = False,
     ) -> tuple[Dataset, list[str], list]:
-        dataset_config = cls.get_dataset_config(namespace, project, dataset)
+        """
+        Build ingest signatures for dataset files.
+
+        With incremental=True, files the ingest manifest records as already
+        ingested with the current processing config are left out, files
+        ingested with an older config get their old chunks deleted first, and
+        chunks of files no longer in the dataset are deleted.
+        """
+        project_config = ProjectService.load_config(namespace, project)
+        dataset_config = next(
+            (ds for ds in project_config.datasets or [] if ds.name == dataset),
+            None,
+        )
+        if dataset_config is None:
+            raise DatasetNotFoundError(dataset)
         dataset_file_hashes: list[str] = []
 
         if file_hashes is None:
@@ -589,6 +612,35 @@ class DatasetService:
 
         project_dir = ProjectService.get_project_dir(namespace, project)
         raw_dir = Path(DataService.ensure_data_dir(namespace, project, dataset)) / "raw"
+        strategy = dataset_config.data_processing_strategy
+        database = dataset_config.database
+        manifest_dir = IngestManifestService.get_manifest_dir(
+            namespace, project, dataset, database, strategy
+        )
+        config_hash = IngestManifestService.get_config_hash(
+            project_config, strategy, database, parser_overrides
+        )
+
+        replaced: set[str] = set()
+        removed: list[str] = []
+        if incremental:
+            plan = IngestManifestService.plan_ingestion(
+                manifest_dir, config_hash, dataset_file_hashes
+            )
+            dataset_file_hashes = plan.to_ingest
+            replaced = plan.replaced
+            removed = plan.removed
+            logger.info(
+                "Planned incremental dataset ingestion",
+                namespace=namespace,
+                project=project,
+                dataset=dataset,
+                to_ingest=len(plan.to_ingest),
+                replaced=len(plan.replaced),
+                removed=len(plan.removed),
+                unchanged=plan.unchanged,
+            )
+
         ingest_tasks = []
 
         for file_hash in dataset_file_hashes:
@@ -601,17 +653,34 @@ class DatasetService:
             )
             original_filename = metadata.original_file_name if metadata else file_hash
 
-            ingest_tasks.append(
-                build_ingest_signature(
-                    project_dir=project_dir,
-                    data_processing_strategy_name=dataset_config.data_processing_strategy,
-                    database_name=dataset_config.database,
-                    source_path=str(file_path),
-                    filename=original_filename,
-                    dataset_name=dataset,
-                    parser_overrides=parser_overrides,
-                )
+            ingest_task = build_ingest_signature(
+                project_dir=project_dir,
+                data_processing_strategy_name=strategy,
+                database_name=database,
+                source_path=str(file_path),
+                filename=original_filename,
+                dataset_name=dataset,
+                parser_overrides=parser_overrides,
+                manifest_entry={
+                    "path": str(
+                        IngestManifestService.get_entry_path(manifest_dir, file_hash)
+                    ),
+                    "file_hash": file_hash,
+                    "config_hash": config_hash,
+                },
             )
+            if file_hash in replaced:
+                # Chunk IDs only depend on the file, so chunks from the old
+                # config would otherwise be kept as duplicates
+                ingest_task = chain(
+                    build_delete_signature(project_dir, database, file_hash),
+                    ingest_task.set(immutable=True),
+                )
+            ingest_tasks.append(ingest_task)
+
+        for file_hash in removed:
+            build_delete_signature(project_dir, database, file_hash).apply_async()
+        IngestManifestService.forget_in_database(manifest_dir, removed)
 
         return dataset_config, dataset_file_hashes, ingest_tasks
 
@@ -625,11 +694,15 @@ class DatasetService:
     ) -> DatasetIngestLaunchResult:
         """
         Kick off ingestion tasks for all files in a dataset and return the tracking task id.
+
+        Only files that are new or whose processing config changed since their
+        last ingestion are queued.
         """
         dataset_config, dataset_file_hashes, ingest_tasks = cls._build_ingest_tasks(
             namespace=namespace,
             project=project,
             dataset=dataset,
+            incremental=True,
         )
 
         if not ingest_tasks:
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from core.logging import FastAPIStructLogger
+from services.data_service import DATA_DIR_NAME
+from services.project_service import ProjectService
+
+logger = FastAPIStructLogger()
+
+MANIFESTS_DIR_NAME = "manifests"
+
+
+class IngestManifestEntry(BaseModel):
+    file_hash: str
+    config_hash: str
+    chunk_ids: list[str] = []
+
+
+@dataclass
+class IngestPlan:
+    to_ingest: list[str]
+    # Files with chunks from an earlier config that must be deleted first
+    replaced: set[str]
+    # Files recorded as ingested that are no longer in the dataset
+    removed: list[str]
+    unchanged: int
+
+
+class IngestManifestService:
+    """
+    Service for tracking which dataset files are already ingested
+
+    A manifest is kept per (dataset, database, strategy) in the dataset
+    directory, one entry per ingested file:
+
+    data_dir/
+      manifests/
+        <database>/
+          <strategy>/
+            <file_content_hash>.json
+
+    Each entry records the processing config hash the file was ingested with
+    and the chunk IDs it produced:
+    {
+      "file_hash": "2b3e321d...",
+      "config_hash": "9f86d081...",
+      "chunk_ids": ["2b3e321d021e5c62_0000", "2b3e321d021e5c62_0001"]
+    }
+
+    Entries are written by the RAG worker once a file is fully stored (see
+    ``manifest_entry`` of the rag.ingest_file task), so a failed or partial
+    ingestion is retried on the next run. One file per entry keeps concurrent
+    ingest tasks from contending on a shared manifest file.
+    """
+
+    @classmethod
+    def _get_manifests_root(cls, namespace: str, project: str, dataset: str) -> Path:
+        datasets_dir = (
+            Path(ProjectService.get_project_dir(namespace, project))
+            / DATA_DIR_NAME
+            / "datasets"
+        )
+        manifests_dir = datasets_dir / dataset / MANIFESTS_DIR_NAME
+        if not manifests_dir.resolve().is_relative_to(datasets_dir.resolve()):
+            raise ValueError(f"Invalid dataset name: {dataset!r}")
+        return manifests_dir
+
+    @classmethod
+    def get_manifest_dir(
+        cls,
+        namespace: str,
+        project: str,
+        dataset: str,
+        database: str,
+        strategy: str,
+    ) -> Path:
+        manifests_dir = cls._get_manifests_root(namespace, project, dataset)
+        manifest_dir = manifests_dir / database / strategy
+        if not manifest_dir.resolve().is_relative_to(manifests_dir.resolve()):
+            raise ValueError(f"Invalid manifest path: {database!r}/{strategy!r}")
+        return manifest_dir
+
+    @classmethod
+    def get_config_hash(
+        cls,
+        project_config: Any,
+        strategy: str,
+        database: str,
+        parser_overrides: dict | None = None,
+    ) -> str:
+        """
+        Hash everything that decides how a file is parsed, chunked and embedded.
+        """
+        rag_config = project_config.rag
+        strategies = (rag_config.data_processing_strategies or []) if rag_config else []
+        databases = (rag_config.databases or []) if rag_config else []
+        strategy_obj = next((s for s in strategies if s.name == strategy), None)
+        database_obj = next((d for d in databases if d.name == database), None)
+
+        config = {
+            "strategy": strategy,
+            "strategy_config": (
+                strategy_obj.model_dump(mode="json") if strategy_obj else None
+            ),
+            "database": database,
+            "database_config": (
+                database_obj.model_dump(mode="json") if database_obj else None
+            ),
+            "parser_overrides": parser_overrides or {},
+        }
+        serialized = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def load_entries(cls, manifest_dir: Path) -> dict[str, IngestManifestEntry]:
+        """
+        Load all entries of a manifest, keyed by file hash.
+        """
+        entries: dict[str, IngestManifestEntry] = {}
+        if not manifest_dir.is_dir():
+            return entries
+
+        for entry_path in manifest_dir.glob("*.json"):
+            try:
+                entry = IngestManifestEntry.model_validate_json(entry_path.read_bytes())
+            except (OSError, ValidationError) as e:
+                # Unreadable entries are treated as not ingested
+                logger.warning(
+                    "Ignoring invalid ingest manifest entry",
+                    path=str(entry_path),
+                    error=str(e),
+                )
+                continue
+            entries[entry.file_hash] = entry
+        return entries
+
+    @classmethod
+    def plan_ingestion(
+        cls, manifest_dir: Path, config_hash: str, file_hashes: list[str]
+    ) -> IngestPlan:
+        """
+        Compare the dataset files with what is recorded for their database.
+
+        A file is up to date only if this manifest has it with the same config
+        hash. Files recorded under another config or another strategy for the
+        same database are re-ingested after their old chunks are deleted.
+        """
+        current = cls.load_entries(manifest_dir)
+        recorded: dict[str, IngestManifestEntry] = {}
+        if manifest_dir.parent.is_dir():
+            for other_dir in manifest_dir.parent.iterdir():
+                if other_dir != manifest_dir:
+                    recorded.update(cls.load_entries(other_dir))
+        recorded.update(current)
+
+        to_ingest: list[str] = []
+        replaced: set[str] = set()
+        for file_hash in file_hashes:
+            entry = current.get(file_hash)
+            if entry is not None and entry.config_hash == config_hash:
+                continue
+            to_ingest.append(file_hash)
+            if file_hash in recorded:
+                replaced.add(file_hash)
+
+        present = set(file_hashes)
+        return IngestPlan(
+            to_ingest=to_ingest,
+            replaced=replaced,
+            removed=[h for h in recorded if h not in present],
+            unchanged=len(file_hashes) - len(to_ingest),
+        )
+
+    @classmethod
+    def forget_in_database(cls, manifest_dir: Path, file_hashes: list[str]) -> None:
+        """
+        Remove entries for files from every strategy's manifest of a database.
+        """
+        if not manifest_dir.parent.is_dir():
+            return
+        for strategy_dir in manifest_dir.parent.iterdir():
+            cls.remove_entries(strategy_dir, file_hashes)
+
+    @classmethod
+    def get_entry_path(cls, manifest_dir: Path, file_hash: str) -> Path:
+        return manifest_dir / f"{file_hash}.json"
+
+    @classmethod
+    def remove_entries(cls, manifest_dir: Path, file_hashes: list[str]) -> None:
+        for file_hash in file_hashes:
+            cls.get_entry_path(manifest_dir, file_hash).unlink(missing_ok=True)
+
+    @classmethod
+    def forget_files(
+        cls,
+        namespace: str,
+        project: str,
+        dataset: str,
+        file_hashes: list[str] | None = None,
+    ) -> None:
+        """
+        Mark files of a dataset as not ingested, for every database and strategy.
+
+        Called whenever chunks are deleted outside of a manifest-driven run, so
+        the next ingestion does not skip them.
+
+        Args:
+            file_hashes: Files to forget; None forgets the whole dataset
+        """
+        manifests_dir = cls._get_manifests_root(namespace, project, dataset)
+        if file_hashes is None:
+            shutil.rmtree(manifests_dir, ignore_errors=True)
+            return
+
+        for manifest_dir in manifests_dir.glob("*/*"):
+            cls.remove_entries(manifest_dir, file_hashes)
+
+    @classmethod
+    def forget_database(cls, project_dir: str, database: str) -> None:
+        """
+        Drop the manifests of every dataset for a database whose collection was
+        deleted.
+        """
+        datasets_dir = Path(project_dir) / DATA_DIR_NAME / "datasets"
+        for manifest_dir in datasets_dir.glob(f"*/{MANIFESTS_DIR_NAME}/*"):
+            if manifest_dir.name == database:
+                shutil.rmtree(manifest_dir, ignore_errors=True)
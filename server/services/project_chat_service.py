@@ -19,7 +19,8 @@ from context_providers.rag_context_provider import (
     RAGContextProvider,
 )
 from core.logging import FastAPIStructLogger
-from services.rag_service import search_with_rag
+from services.model_service import ModelService
+from services.rag_service import search_with_rag_async
 
 logger = FastAPIStructLogger()
 
@@ -68,6 +69,29 @@ class RAGParameters:
         self.rag_queries = rag_queries
 
 
+class RAGPrefetch:
+    """RAG search started before the chat agent is ready.
+
+    Created by ProjectChatService.start_rag_prefetch so retrieval runs while
+    the agent and its tools are set up. chat()/stream_chat() use the results
+    if the prefetch was started for the same model and message, and cancel
+    it otherwise.
+    """
+
+    def __init__(self, model_name: str, message: str, task: asyncio.Task):
+        self.model_name = model_name
+        self.message = message
+        self.task = task
+
+    def matches(self, model_name: str, message: str) -> bool:
+        """Whether this prefetch searched for the given model and message."""
+        return self.model_name == model_name and self.message == message
+
+    def cancel(self) -> None:
+        """Cancel the search if it is still running."""
+        self.task.cancel()
+
+
 class ProjectChatService:
     @staticmethod
     def _find_model_config(project_config: LlamaFarmConfig, model_name: str):
@@ -145,6 +169,7 @@ class ProjectChatService:
         rag_score_threshold: float | None = None,
         rag_queries: list[str] | None = None,
         model_config=None,
+        rag_prefetch: RAGPrefetch | None = None,
     ) -> None:
         """
         Perform RAG search with event logging.
@@ -165,6 +190,8 @@ class ProjectChatService:
         )
 
         if not rag_params.rag_enabled:
+            if rag_prefetch is not None:
+                rag_prefetch.cancel()
             return
 
         # Determine the query for logging
@@ -203,6 +230,7 @@ class ProjectChatService:
             rag_score_threshold=rag_score_threshold,
             rag_queries=rag_queries,
             model_config=model_config,
+            rag_prefetch=rag_prefetch,
         )
 
         # Extract results from context provider to log completion metrics
@@ -270,6 +298,7 @@ class ProjectChatService:
         think: bool | None = None,
         thinking_budget: int | None = None,
         max_tokens: int | None = None,
+        rag_prefetch: RAGPrefetch | None = None,
     ) -> LFChatCompletion:
         # Create event logger (gracefully handles test mocks)
         event_logger = self._create_event_logger(project_config)
@@ -313,10 +342,13 @@ class ProjectChatService:
                     rag_score_threshold=rag_score_threshold,
                     rag_queries=rag_queries,
                     model_config=model_cfg,
+                    rag_prefetch=rag_prefetch,
                 )
             except Exception as e:
                 self._fail_event(event_logger, str(e))
                 raise
+        elif rag_prefetch is not None:
+            rag_prefetch.cancel()
 
         try:
             # Build extra_body dict for runtime-specific parameters
@@ -396,6 +428,7 @@ class ProjectChatService:
         max_tokens: int | None = None,
         include_sources: bool = False,
         sources_limit: int = 10,
+        rag_prefetch: RAGPrefetch | None = None,
     ) -> AsyncGenerator[LFChatCompletionChunk | dict]:
         """Yield assistant content chunks, using agent-native streaming if available."""
         # Create event logger (gracefully handles test mocks)
@@ -453,6 +486,7 @@ class ProjectChatService:
                     rag_score_threshold=rag_score_threshold,
                     rag_queries=rag_queries,
                     model_config=model_cfg,
+                    rag_prefetch=rag_prefetch,
                 )
 
             # Yield sources event before LLM stream (if requested)
@@ -540,12 +574,72 @@ class ProjectChatService:
             event_failed = True
             raise
         finally:
+            # No-op once the prefetch was used; stops it if the stream ended early
+            if rag_prefetch is not None:
+                rag_prefetch.cancel()
             if event_failed:
                 self._fail_event(event_logger, "stream_failed")
             else:
                 self._log_event(event_logger, "stream_complete", {})
                 self._complete_event(event_logger)
 
+    def start_rag_prefetch(
+        self,
+        *,
+        project_dir: str,
+        project_config: LlamaFarmConfig,
+        messages: list[LFChatCompletionMessageParam],
+        model_name: str | None = None,
+        rag_enabled: bool | None = None,
+        database: str | None = None,
+        retrieval_strategy: str | None = None,
+        rag_top_k: int | None = None,
+        rag_score_threshold: float | None = None,
+        rag_queries: list[str] | None = None,
+    ) -> RAGPrefetch | None:
+        """Start the RAG search for a chat request before its agent exists.
+
+        Pass the returned prefetch to chat()/stream_chat() with the same
+        arguments. Must be called from a running event loop.
+
+        Args:
+            model_name: Requested model; None selects the project default
+
+        Returns:
+            Running prefetch, or None if RAG will not run for this request
+        """
+        message = self._extract_latest_user_message(messages)
+        if not message:
+            return None
+
+        try:
+            model_config = ModelService.get_model(project_config, model_name)
+        except Exception:
+            # Let agent creation report the problem
+            return None
+
+        rag_params = self._resolve_rag_parameters(
+            project_config,
+            model_config=model_config,
+            rag_enabled=rag_enabled,
+            database=database,
+            retrieval_strategy=retrieval_strategy,
+            rag_top_k=rag_top_k,
+            rag_score_threshold=rag_score_threshold,
+            rag_queries=rag_queries,
+        )
+        if not rag_params.rag_enabled:
+            return None
+
+        task = asyncio.create_task(
+            self._perform_rag_search(
+                project_dir=project_dir,
+                message=message,
+                rag_params=rag_params,
+            )
+        )
+        return RAGPrefetch(model_config.name, message, task)
+
     def _resolve_rag_parameters(
         self,
         project_config: LlamaFarmConfig,
@@ -736,7 +830,7 @@ class ProjectChatService:
             },
         }
 
-    def _execute_single_rag_query(
+    async def _execute_single_rag_query(
         self,
         project_dir: str,
         query: str,
@@ -754,7 +848,7 @@ class ProjectChatService:
         logger.info(f"Executing RAG query: {query[:50]}...")
 
         # Use shared helper to run RAG search on database
-        results = search_with_rag(
+        results = await search_with_rag_async(
             project_dir,
             database,
             query,
@@ -799,6 +893,7 @@ class ProjectChatService:
         rag_score_threshold: float | None = None,
         rag_queries: list[str] | None = None,
         model_config=None,
+        rag_prefetch: RAGPrefetch | None = None,
     ) -> None:
         self._clear_rag_context_provider(chat_agent)
         context_provider = RAGContextProvider(title="Project Chat Context")
@@ -816,8 +911,17 @@ class ProjectChatService:
             rag_queries=rag_queries,
         )
 
+        if rag_prefetch is not None and not (
+            rag_params.rag_enabled
+            and rag_prefetch.matches(chat_agent.model_name, message)
+        ):
+            rag_prefetch.cancel()
+            rag_prefetch = None
+
         rag_results = []
-        if rag_params.rag_enabled:
+        if rag_prefetch is not None:
+            rag_results = await rag_prefetch.task
+        elif rag_params.rag_enabled:
             rag_results = await self._perform_rag_search(
                 project_dir=project_dir,
                 message=message,
@@ -870,7 +974,7 @@ class ProjectChatService:
         # Single query - execute directly without concurrent overhead
         if len(queries) == 1:
             logger.info(f"Performing RAG search with query: {queries[0][:50]}...")
-            return self._execute_single_rag_query(
+            return await self._execute_single_rag_query(
                 project_dir=project_dir,
                 query=queries[0],
                 database=rag_params.database,
@@ -882,10 +986,8 @@ class ProjectChatService:
         # Multiple queries - execute concurrently
         logger.info(f"Performing RAG search with {len(queries)} queries concurrently")
 
-        # Create concurrent search tasks using asyncio.to_thread for sync function
         search_tasks = [
-            asyncio.to_thread(
-                self._execute_single_rag_query,
+            self._execute_single_rag_query(
                 project_dir=project_dir,
                 query=query,
                 database=rag_params.database,
@@ -18,6 +18,9 @@ from core.celery.rag_client import (
 from core.celery.rag_client import (
     search_with_rag_database as search_task,
 )
+from core.celery.rag_client import (
+    search_with_rag_database_async as search_task_async,
+)
 from core.logging import FastAPIStructLogger
 
 logger = FastAPIStructLogger()
@@ -101,6 +104,71 @@ def search_with_rag(
         return []
 
 
+async def search_with_rag_async(
+    project_dir: str,
+    database: str,
+    query: str,
+    top_k: int = 5,
+    retrieval_strategy: str | None = None,
+    score_threshold: float | None = None,
+    metadata_filters: dict[str, Any] | None = None,
+    distance_metric: str | None = None,
+    hybrid_alpha: float | None = None,
+    rerank_model: str | None = None,
+    query_expansion: bool | None = None,
+    max_tokens: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Async variant of search_with_rag for use on the event loop.
+
+    Waits without blocking other requests and can be cancelled, e.g. when the
+    client disconnects. Takes the same arguments as search_with_rag.
+
+    Returns:
+        List of search results as dictionaries
+    """
+    logger.info(
+        "Starting async RAG database search",
+        project_dir=project_dir,
+        database=database,
+        query=query[:100] + "..." if len(query) > 100 else query,
+        top_k=top_k,
+        retrieval_strategy=retrieval_strategy,
+    )
+
+    try:
+        results = await search_task_async(
+            project_dir=project_dir,
+            database=database,
+            query=query,
+            top_k=top_k,
+            retrieval_strategy=retrieval_strategy,
+            score_threshold=score_threshold,
+            metadata_filters=metadata_filters,
+            distance_metric=distance_metric,
+            hybrid_alpha=hybrid_alpha,
+            rerank_model=rerank_model,
+            query_expansion=query_expansion,
+            max_tokens=max_tokens,
+        )
+
+        logger.info(
+            "RAG database search completed",
+            results_count=len(results),
+        )
+
+        return results
+
+    except Exception as e:
+        logger.error(
+            "RAG database search failed",
+            error=str(e),
+            project_dir=project_dir,
+            database=database,
+        )
+        return []
+
+
 async def ingest_file_with_rag(
     project_dir: str,
     project_config: LlamaFarmConfig,
@@ -369,3 +369,23 @@ def test_stream_empty_output_uses_fallback(app_client):
     streamed = _stream_chat(app_client, "default", "llamafarm-1", payload)
     # Empty output from stub agent should trigger fallback
     assert streamed == FALLBACK_ECHO_RESPONSE
+
+
+def test_agent_setup_failure_cancels_rag_prefetch(app_client, mocker):
+    """A failure before chat() takes over must not leave retrieval running."""
+    prefetch = mocker.MagicMock()
+    mocker.patch(
+        "api.routers.projects.projects.project_chat_service.start_rag_prefetch",
+        return_value=prefetch,
+    )
+    mocker.patch(
+        "api.routers.projects.projects.ChatOrchestratorAgentFactory.create_agent",
+        side_effect=RuntimeError("agent setup failed"),
+    )
+    client = TestClient(llama_farm_api(), raise_server_exceptions=False)
+
+    payload = {"messages": [{"role": "user", "content": "hello"}]}
+    resp = _post_chat(client, "default", "llamafarm-1", payload)
+
+    assert resp.status_code == 500
+    prefetch.cancel.assert_called_once()
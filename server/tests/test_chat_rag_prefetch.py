@@ -0,0 +1,277 @@
+"""
+Tests for non-blocking RAG retrieval in the chat path.
+
+Covers:
+- RAG searches awaiting the async client instead of blocking the event loop
+- Speculative RAG prefetch started before the chat agent is ready
+- Cancelling non-streaming work when the client disconnects
+- Cancelling the prefetch when a streaming response never starts
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from starlette.requests import ClientDisconnect
+
+from api.routers.shared.response_utils import (
+    ClientDisconnectedError,
+    create_streaming_response_from_iterator,
+    run_until_disconnected,
+)
+from services.project_chat_service import (
+    ProjectChatService,
+    RAGParameters,
+    RAGPrefetch,
+)
+
+
+def _rag_params(**overrides) -> RAGParameters:
+    params = {"rag_enabled": True, "database": "test_db", "rag_top_k": 5}
+    params.update(overrides)
+    return RAGParameters(**params)
+
+
+def _result(content: str, score: float = 0.9) -> MagicMock:
+    result = MagicMock()
+    result.content = content
+    result.metadata = {"source": "doc.pdf"}
+    result.score = score
+    return result
+
+
+def _agent(model_name: str = "default") -> MagicMock:
+    agent = MagicMock()
+    agent.model_name = model_name
+    return agent
+
+
+class TestNonBlockingSearch:
+    """RAG searches must leave the event loop free for other requests."""
+
+    @pytest.mark.asyncio
+    async def test_single_query_does_not_block_event_loop(self):
+        service = ProjectChatService()
+        other_request_ran = asyncio.Event()
+
+        async def slow_search(*args, **kwargs):
+            # Only completes if another coroutine gets to run meanwhile
+            await asyncio.wait_for(other_request_ran.wait(), timeout=1)
+            return [{"content": "chunk", "metadata": {}, "score": 0.5}]
+
+        async def other_request():
+            other_request_ran.set()
+
+        with patch(
+            "services.project_chat_service.search_with_rag_async",
+            side_effect=slow_search,
+        ):
+            results, _ = await asyncio.gather(
+                service._perform_rag_search(
+                    project_dir="/test/dir", message="hi", rag_params=_rag_params()
+                ),
+                other_request(),
+            )
+
+        assert [r.content for r in results] == ["chunk"]
+
+
+class TestRAGPrefetch:
+    """Speculative RAG search started ahead of agent setup."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_runs_search_for_latest_user_message(self):
+        service = ProjectChatService()
+        model = MagicMock()
+        model.name = "default"
+
+        with (
+            patch(
+                "services.project_chat_service.ModelService.get_model",
+                return_value=model,
+            ),
+            patch.object(
+                service, "_resolve_rag_parameters", return_value=_rag_params()
+            ),
+            patch.object(
+                service, "_perform_rag_search", return_value=[_result("a")]
+            ) as mock_search,
+        ):
+            prefetch = service.start_rag_prefetch(
+                project_dir="/test/dir",
+                project_config=MagicMock(),
+                messages=[
+                    {"role": "user", "content": "first"},
+                    {"role": "assistant", "content": "reply"},
+                    {"role": "user", "content": "second"},
+                ],
+            )
+            results = await prefetch.task
+
+        assert prefetch.matches("default", "second")
+        assert mock_search.call_args.kwargs["message"] == "second"
+        assert [r.content for r in results] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_no_prefetch_when_rag_disabled(self):
+        service = ProjectChatService()
+
+        with (
+            patch("services.project_chat_service.ModelService.get_model"),
+            patch.object(
+                service,
+                "_resolve_rag_parameters",
+                return_value=_rag_params(rag_enabled=False),
+            ),
+        ):
+            prefetch = service.start_rag_prefetch(
+                project_dir="/test/dir",
+                project_config=MagicMock(),
+                messages=[{"role": "user", "content": "hi"}],
+            )
+
+        assert prefetch is None
+
+    @pytest.mark.asyncio
+    async def test_matching_prefetch_is_used_instead_of_new_search(self):
+        service = ProjectChatService()
+        task = asyncio.create_task(asyncio.sleep(0, result=[_result("prefetched")]))
+        prefetch = RAGPrefetch("default", "question", task)
+        agent = _agent("default")
+
+        with (
+            patch.object(
+                service, "_resolve_rag_parameters", return_value=_rag_params()
+            ),
+            patch.object(service, "_perform_rag_search") as mock_search,
+        ):
+            await service._perform_rag_search_and_add_to_context(
+                agent,
+                "/test/dir",
+                MagicMock(),
+                "question",
+                rag_prefetch=prefetch,
+            )
+
+        mock_search.assert_not_called()
+        provider = agent.register_context_provider.call_args.args[1]
+        assert [c.content for c in provider.chunks] == ["prefetched"]
+
+    @pytest.mark.asyncio
+    async def test_mismatched_prefetch_is_cancelled(self):
+        service = ProjectChatService()
+        task = asyncio.create_task(asyncio.sleep(10))
+        prefetch = RAGPrefetch("other-model", "question", task)
+
+        with (
+            patch.object(
+                service, "_resolve_rag_parameters", return_value=_rag_params()
+            ),
+            patch.object(
+                service, "_perform_rag_search", return_value=[_result("fresh")]
+            ) as mock_search,
+        ):
+            await service._perform_rag_search_and_add_to_context(
+                _agent("default"),
+                "/test/dir",
+                MagicMock(),
+                "question",
+                rag_prefetch=prefetch,
+            )
+
+        mock_search.assert_awaited_once()
+        await asyncio.sleep(0)
+        assert task.cancelled()
+
+
+class TestRunUntilDisconnected:
+    """Non-streaming chat work stops when the client goes away."""
+
+    @pytest.mark.asyncio
+    async def test_returns_result_while_connected(self):
+        http_request = MagicMock()
+        http_request.is_disconnected = AsyncMock(return_value=False)
+
+        result = await run_until_disconnected(
+            http_request, asyncio.sleep(0.02, result="done"), poll_interval=0.01
+        )
+
+        assert result == "done"
+
+    @pytest.mark.asyncio
+    async def test_cancels_work_on_disconnect(self):
+        http_request = MagicMock()
+        http_request.is_disconnected = AsyncMock(return_value=True)
+        work = asyncio.ensure_future(asyncio.sleep(10))
+
+        with pytest.raises(ClientDisconnectedError):
+            await run_until_disconnected(http_request, work, poll_interval=0.01)
+
+        await asyncio.sleep(0)
+        assert work.cancelled()
+
+
+class TestStreamingPrefetchCleanup:
+    """Streaming responses cancel the prefetch even if the stream never runs."""
+
+    @staticmethod
+    def _response(iterated: list[bool], prefetch: RAGPrefetch):
+        async def stream_source():
+            iterated.append(True)
+            yield {"type": "sources", "sources": []}
+
+        return create_streaming_response_from_iterator(
+            MagicMock(model="default"),
+            stream_source(),
+            "session",
+            on_close=prefetch.cancel,
+        )
+
+    @pytest.mark.asyncio
+    async def test_prefetch_cancelled_when_client_leaves_before_first_byte(self):
+        prefetch = RAGPrefetch(
+            "default", "hi", asyncio.ensure_future(asyncio.sleep(10))
+        )
+        iterated: list[bool] = []
+        response = self._response(iterated, prefetch)
+
+        async def receive():
+            await asyncio.sleep(10)
+
+        async def send(message):
+            raise OSError("client went away")
+
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+        with pytest.raises(ClientDisconnect):
+            await response(scope, receive, send)
+
+        await asyncio.sleep(0)
+        assert not iterated
+        assert prefetch.task.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_on_close_runs_after_stream_completes(self):
+        prefetch = RAGPrefetch(
+            "default", "hi", asyncio.ensure_future(asyncio.sleep(10))
+        )
+        iterated: list[bool] = []
+        response = self._response(iterated, prefetch)
+        sent: list[dict] = []
+
+        async def receive():
+            await asyncio.sleep(10)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+        await response(scope, receive, send)
+
+        await asyncio.sleep(0)
+        assert iterated
+        assert sent[-1] == {
+            "type": "http.response.body",
+            "body": b"",
+            "more_body": False,
+        }
+        assert prefetch.task.cancelled()
@@ -5,7 +5,8 @@ This module contains comprehensive tests for the DatasetService class,
 including unit tests for all public methods and edge cases.
 """
 
-from unittest.mock import AsyncMock, patch
+import json
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from config.datamodel import (
@@ -23,6 +24,7 @@ from fastapi import UploadFile
 from api.errors import DatasetNotFoundError
 from services.data_service import MetadataFileContent
 from services.dataset_service import DatasetService
+from services.ingest_manifest_service import IngestManifestService
 from services.project_service import ProjectService
 
 
@@ -836,3 +838,88 @@ class TestDatasetServiceIntegration:
 
             # Verify save was called twice (create and delete)
             assert mock_save_config.call_count == 2
+
+
+class TestIncrementalIngestion:
+    """Re-running dataset ingestion only processes new or changed files."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        dataset = MagicMock()
+        dataset.name = "docs"
+        dataset.data_processing_strategy = "pdf_strategy"
+        dataset.database = "main_db"
+        project_config = MagicMock()
+        project_config.datasets = [dataset]
+        project_config.rag.data_processing_strategies = []
+        project_config.rag.databases = []
+
+        with (
+            patch.object(ProjectService, "load_config", return_value=project_config),
+            patch.object(ProjectService, "get_project_dir", return_value=str(tmp_path)),
+            patch(
+                "services.dataset_service.DataService.get_data_file_metadata_by_hash",
+                return_value=None,
+            ),
+        ):
+            raw_dir = tmp_path / "lf_data" / "datasets" / "docs" / "raw"
+            raw_dir.mkdir(parents=True)
+            for file_hash in ("aaa", "bbb"):
+                (raw_dir / file_hash).write_bytes(b"content")
+            yield project_config
+
+    def _record(self, project_config, file_hash, config_hash=None, strategy=None):
+        manifest_dir = IngestManifestService.get_manifest_dir(
+            "ns", "proj", "docs", "main_db", strategy or "pdf_strategy"
+        )
+        manifest_dir.mkdir(parents=True, exist_ok=True)
+        config_hash = config_hash or IngestManifestService.get_config_hash(
+            project_config, "pdf_strategy", "main_db"
+        )
+        IngestManifestService.get_entry_path(manifest_dir, file_hash).write_text(
+            json.dumps({"file_hash": file_hash, "config_hash": config_hash})
+        )
+        return manifest_dir
+
+    def _build(self, hashes):
+        files = [MagicMock(hash=h) for h in hashes]
+        with patch.object(DatasetService, "list_dataset_files", return_value=files):
+            return DatasetService._build_ingest_tasks(
+                "ns", "proj", "docs", incremental=True
+            )
+
+    def test_unchanged_files_are_not_queued(self, project):
+        self._record(project, "aaa")
+
+        _, file_hashes, tasks = self._build(["aaa", "bbb"])
+
+        assert file_hashes == ["bbb"]
+        assert len(tasks) == 1
+        manifest_entry = tasks[0].kwargs["manifest_entry"]
+        assert manifest_entry["file_hash"] == "bbb"
+        assert manifest_entry["path"].endswith(
+            "manifests/main_db/pdf_strategy/bbb.json"
+        )
+
+    def test_changed_config_deletes_old_chunks_first(self, project):
+        self._record(project, "aaa", config_hash="old")
+
+        _, file_hashes, tasks = self._build(["aaa"])
+
+        assert file_hashes == ["aaa"]
+        assert [t.task for t in tasks[0].tasks] == [
+            "rag.delete_file",
+            "rag.ingest_file",
+        ]
+        assert tasks[0].tasks[1].immutable
+
+    def test_removed_files_are_deleted(self, project):
+        manifest_dir = self._record(project, "gone")
+
+        with patch("services.dataset_service.build_delete_signature") as delete_sig:
+            _, file_hashes, _ = self._build(["aaa", "bbb"])
+
+        assert file_hashes == ["aaa", "bbb"]
+        delete_sig.assert_called_once_with(ANY, "main_db", "gone")
+        delete_sig.return_value.apply_async.assert_called_once()
+        assert not (manifest_dir / "gone.json").exists()
@@ -0,0 +1,143 @@
+"""Tests for the per (dataset, database, strategy) ingest manifest."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.ingest_manifest_service import IngestManifestService
+
+
+def _write_entry(manifest_dir, file_hash, config_hash="cfg"):
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    (manifest_dir / f"{file_hash}.json").write_text(
+        json.dumps(
+            {
+                "file_hash": file_hash,
+                "config_hash": config_hash,
+                "chunk_ids": [f"{file_hash}_0000"],
+            }
+        )
+    )
+
+
+@pytest.fixture
+def manifest_dir(tmp_path):
+    return tmp_path / "manifests" / "main_db" / "pdf_strategy"
+
+
+class TestPlanIngestion:
+    """Compare dataset files against what was ingested before."""
+
+    def test_only_new_files_are_ingested(self, manifest_dir):
+        _write_entry(manifest_dir, "aaa")
+        _write_entry(manifest_dir, "bbb")
+
+        plan = IngestManifestService.plan_ingestion(
+            manifest_dir, "cfg", ["aaa", "bbb", "ccc"]
+        )
+
+        assert plan.to_ingest == ["ccc"]
+        assert plan.replaced == set()
+        assert plan.removed == []
+        assert plan.unchanged == 2
+
+    def test_changed_config_replaces_chunks(self, manifest_dir):
+        _write_entry(manifest_dir, "aaa", config_hash="old")
+
+        plan = IngestManifestService.plan_ingestion(manifest_dir, "new", ["aaa"])
+
+        assert plan.to_ingest == ["aaa"]
+        assert plan.replaced == {"aaa"}
+
+    def test_files_from_another_strategy_are_replaced(self, manifest_dir):
+        _write_entry(manifest_dir.parent / "other_strategy", "aaa")
+
+        plan = IngestManifestService.plan_ingestion(manifest_dir, "cfg", ["aaa"])
+
+        assert plan.to_ingest == ["aaa"]
+        assert plan.replaced == {"aaa"}
+
+    def test_removed_files_are_reported(self, manifest_dir):
+        _write_entry(manifest_dir, "aaa")
+        _write_entry(manifest_dir, "gone")
+
+        plan = IngestManifestService.plan_ingestion(manifest_dir, "cfg", ["aaa"])
+
+        assert plan.to_ingest == []
+        assert plan.removed == ["gone"]
+
+    def test_invalid_entries_count_as_not_ingested(self, manifest_dir):
+        manifest_dir.mkdir(parents=True)
+        (manifest_dir / "aaa.json").write_text("{not json")
+
+        plan = IngestManifestService.plan_ingestion(manifest_dir, "cfg", ["aaa"])
+
+        assert plan.to_ingest == ["aaa"]
+        assert plan.replaced == set()
+
+
+class TestConfigHash:
+    """The config hash changes with anything that affects processing."""
+
+    def _project_config(self, chunk_size: int) -> MagicMock:
+        strategy = MagicMock()
+        strategy.name = "pdf_strategy"
+        strategy.model_dump.return_value = {"chunk_size": chunk_size}
+        database = MagicMock()
+        database.name = "main_db"
+        database.model_dump.return_value = {"type": "ChromaStore"}
+        project_config = MagicMock()
+        project_config.rag.data_processing_strategies = [strategy]
+        project_config.rag.databases = [database]
+        return project_config
+
+    def test_hash_is_stable(self):
+        first = IngestManifestService.get_config_hash(
+            self._project_config(500), "pdf_strategy", "main_db"
+        )
+        second = IngestManifestService.get_config_hash(
+            self._project_config(500), "pdf_strategy", "main_db"
+        )
+
+        assert first == second
+
+    def test_hash_changes_with_strategy_config_and_overrides(self):
+        base = IngestManifestService.get_config_hash(
+            self._project_config(500), "pdf_strategy", "main_db"
+        )
+
+        assert base != IngestManifestService.get_config_hash(
+            self._project_config(1000), "pdf_strategy", "main_db"
+        )
+        assert base != IngestManifestService.get_config_hash(
+            self._project_config(500),
+            "pdf_strategy",
+            "main_db",
+            parser_overrides={"PDFParser": {"chunk_size": 100}},
+        )
+
+
+class TestForget:
+    """Entries are dropped when chunks are deleted outside of a run."""
+
+    @patch("services.ingest_manifest_service.ProjectService.get_project_dir")
+    def test_forget_files_in_every_manifest_of_dataset(self, get_project_dir, tmp_path):
+        get_project_dir.return_value = str(tmp_path)
+        manifests = tmp_path / "lf_data" / "datasets" / "docs" / "manifests"
+        _write_entry(manifests / "main_db" / "a", "aaa")
+        _write_entry(manifests / "other_db" / "b", "aaa")
+        _write_entry(manifests / "main_db" / "a", "bbb")
+
+        IngestManifestService.forget_files("ns", "proj", "docs", ["aaa"])
+
+        assert sorted(p.name for p in manifests.rglob("*.json")) == ["bbb.json"]
+
+    def test_forget_database(self, tmp_path):
+        datasets = tmp_path / "lf_data" / "datasets"
+        _write_entry(datasets / "docs" / "manifests" / "main_db" / "a", "aaa")
+        _write_entry(datasets / "docs" / "manifests" / "other_db" / "a", "bbb")
+
+        IngestManifestService.forget_database(str(tmp_path), "main_db")
+
+        assert [p.name for p in datasets.rglob("*.json")] == ["bbb.json"]
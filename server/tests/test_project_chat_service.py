@@ -372,7 +372,7 @@ class TestProjectChatService:
         assert result is None
 
     @pytest.mark.asyncio
-    @patch("services.project_chat_service.search_with_rag")
+    @patch("services.project_chat_service.search_with_rag_async")
     async def test_chat_without_rag(self, mock_search, base_config):
         """Test chat without RAG."""
         mock_search.return_value = []
@@ -459,7 +459,7 @@ class TestProjectChatService:
             mock_agent.register_context_provider.assert_called()
 
     @pytest.mark.asyncio
-    @patch("services.project_chat_service.search_with_rag")
+    @patch("services.project_chat_service.search_with_rag_async")
     async def test_chat_method_delegates_to_stream(self, mock_search, config_with_rag):
         """Test that chat() delegates to stream_chat()."""
         mock_search.return_value = []
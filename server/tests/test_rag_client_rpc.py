@@ -0,0 +1,278 @@
+"""Tests for running read-only RAG tasks over the worker's RPC endpoint."""
+
+import json
+import threading
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from celery import signature
+
+from core.celery import app, rag_client
+
+
+@pytest.fixture(autouse=True)
+def _reset_rpc_state(mocker):
+    mocker.patch.object(rag_client, "_rpc_unavailable_until", 0.0)
+    mocker.patch.object(rag_client, "_rpc_token", None)
+    mocker.patch.object(rag_client.settings, "rag_rpc_url", "http://rag-worker:14346")
+    mocker.patch.object(rag_client.settings, "rag_rpc_token", "test-token")
+
+
+def _use_transport(mocker, handler) -> list[httpx.Request]:
+    """Route RPC requests to ``handler`` and return the requests it received."""
+    requests: list[httpx.Request] = []
+
+    def _record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    client = httpx.Client(
+        base_url="http://rag-worker:14346", transport=httpx.MockTransport(_record)
+    )
+    mocker.patch.object(rag_client, "_get_rpc_client", return_value=client)
+    return requests
+
+
+def _search_signature():
+    return signature(
+        "rag.search_with_database",
+        args=["/proj", "main_db", "hello", 3],
+        app=app,
+    )
+
+
+def _celery_result(mocker, statuses: list[str], result=None) -> Mock:
+    async_result = Mock()
+    type(async_result).status = mocker.PropertyMock(side_effect=statuses)
+    async_result.result = result
+    mocker.patch("celery.canvas.Signature.apply_async", return_value=async_result)
+    return async_result
+
+
+class TestRunTaskViaRPC:
+    """Read-only tasks go to the RPC endpoint before Celery."""
+
+    def test_returns_rpc_result_without_celery(self, mocker):
+        requests = _use_transport(
+            mocker, lambda r: httpx.Response(200, json={"result": [{"id": "1"}]})
+        )
+        apply_async = mocker.patch("celery.canvas.Signature.apply_async")
+
+        result = rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+
+        assert result == [{"id": "1"}]
+        apply_async.assert_not_called()
+        assert requests[0].url.path == "/tasks/rag.search_with_database"
+        assert requests[0].headers["Authorization"] == "Bearer test-token"
+        assert json.loads(requests[0].content) == {
+            "args": ["/proj", "main_db", "hello", 3],
+            "kwargs": {},
+        }
+
+    def test_task_failure_raises_with_error(self, mocker):
+        _use_transport(mocker, lambda r: httpx.Response(500, json={"error": "boom"}))
+
+        with pytest.raises(Exception, match="Task failed: boom"):
+            rag_client._run_sync_task_with_polling(
+                _search_signature(), timeout=30, poll_interval=0.5
+            )
+
+    def test_read_timeout_returns_none(self, mocker):
+        def _timeout(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        _use_transport(mocker, _timeout)
+        apply_async = mocker.patch("celery.canvas.Signature.apply_async")
+
+        result = rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+
+        assert result is None
+        apply_async.assert_not_called()
+
+    def test_unreachable_endpoint_falls_back_to_celery(self, mocker):
+        def _refused(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        requests = _use_transport(mocker, _refused)
+        _celery_result(mocker, ["SUCCESS", "SUCCESS"] * 2, result=["celery"])
+        mocker.patch("core.celery.rag_client.time.sleep")
+
+        for _ in range(2):
+            result = rag_client._run_sync_task_with_polling(
+                _search_signature(), timeout=30, poll_interval=0.5
+            )
+            assert result == ["celery"]
+
+        # The endpoint is not retried right after it was unreachable
+        assert len(requests) == 1
+
+    def test_reads_generated_token_from_data_dir(self, mocker, tmp_path):
+        mocker.patch.object(rag_client.settings, "rag_rpc_token", "")
+        mocker.patch.object(rag_client.settings, "lf_data_dir", str(tmp_path))
+        (tmp_path / rag_client.RPC_TOKEN_FILENAME).write_text("generated\n")
+        requests = _use_transport(
+            mocker, lambda r: httpx.Response(200, json={"result": []})
+        )
+
+        rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+
+        assert requests[0].headers["Authorization"] == "Bearer generated"
+
+    def test_missing_token_uses_celery(self, mocker, tmp_path):
+        mocker.patch.object(rag_client.settings, "rag_rpc_token", "")
+        mocker.patch.object(rag_client.settings, "lf_data_dir", str(tmp_path))
+        requests = _use_transport(mocker, lambda r: httpx.Response(200))
+        _celery_result(mocker, ["SUCCESS", "SUCCESS"], result=["celery"])
+
+        result = rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+
+        assert result == ["celery"]
+        assert requests == []
+
+    def test_rejected_token_is_read_again(self, mocker, tmp_path):
+        mocker.patch.object(rag_client.settings, "rag_rpc_token", "")
+        mocker.patch.object(rag_client.settings, "lf_data_dir", str(tmp_path))
+        token_file = tmp_path / rag_client.RPC_TOKEN_FILENAME
+        token_file.write_text("old")
+        requests = _use_transport(
+            mocker,
+            lambda r: (
+                httpx.Response(200, json={"result": ["rpc"]})
+                if r.headers["Authorization"] == "Bearer new"
+                else httpx.Response(401, json={"error": "bad token"})
+            ),
+        )
+        _celery_result(mocker, ["SUCCESS", "SUCCESS"], result=["celery"])
+
+        first = rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+        token_file.write_text("new")
+        second = rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+
+        assert (first, second) == (["celery"], ["rpc"])
+        assert len(requests) == 2
+
+    def test_disabled_endpoint_uses_celery(self, mocker):
+        mocker.patch.object(rag_client.settings, "rag_rpc_url", "")
+        requests = _use_transport(mocker, lambda r: httpx.Response(200))
+        _celery_result(mocker, ["SUCCESS", "SUCCESS"], result={"ok": True})
+        mocker.patch("core.celery.rag_client.time.sleep")
+
+        result = rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+
+        assert result == {"ok": True}
+        assert requests == []
+
+
+class TestCeleryPolling:
+    """Celery fallback polls quickly at first, then backs off."""
+
+    def test_poll_interval_backs_off_to_limit(self, mocker):
+        mocker.patch.object(rag_client.settings, "rag_rpc_url", "")
+        _celery_result(
+            mocker, ["PENDING"] * 5 + ["SUCCESS", "SUCCESS"], result=["done"]
+        )
+        sleep = mocker.patch("core.celery.rag_client.time.sleep")
+
+        result = rag_client._run_sync_task_with_polling(
+            _search_signature(), timeout=30, poll_interval=0.5
+        )
+
+        assert result == ["done"]
+        assert [c.args[0] for c in sleep.call_args_list] == [
+            0.05,
+            0.1,
+            0.2,
+            0.4,
+            0.5,
+        ]
+
+
+class TestAsyncSearch:
+    """search_with_rag_database_async never blocks the event loop."""
+
+    async def test_uses_async_rpc_client(self, mocker):
+        client = httpx.AsyncClient(
+            base_url="http://rag-worker:14346",
+            transport=httpx.MockTransport(
+                lambda r: httpx.Response(200, json={"result": [{"id": "1"}]})
+            ),
+        )
+        mocker.patch.object(rag_client, "_get_async_rpc_client", return_value=client)
+        apply_async = mocker.patch("celery.canvas.Signature.apply_async")
+
+        result = await rag_client.search_with_rag_database_async(
+            "/proj", "main_db", "hello"
+        )
+
+        assert result == [{"id": "1"}]
+        apply_async.assert_not_called()
+
+    async def test_celery_fallback_polls_with_asyncio_sleep(self, mocker):
+        mocker.patch.object(rag_client.settings, "rag_rpc_url", "")
+        _celery_result(mocker, ["PENDING"] * 2 + ["SUCCESS"] * 2, result=[])
+        sleep = mocker.patch(
+            "core.celery.rag_client.asyncio.sleep", new_callable=mocker.AsyncMock
+        )
+        blocking_sleep = mocker.patch("core.celery.rag_client.time.sleep")
+
+        result = await rag_client.search_with_rag_database_async(
+            "/proj", "main_db", "hello"
+        )
+
+        assert result == []
+        assert [c.args[0] for c in sleep.await_args_list] == [0.05, 0.1]
+        blocking_sleep.assert_not_called()
+
+    async def test_celery_fallback_reads_status_off_event_loop(self, mocker):
+        mocker.patch.object(rag_client.settings, "rag_rpc_url", "")
+        loop_thread = threading.current_thread()
+        status_threads = []
+
+        def _status():
+            status_threads.append(threading.current_thread())
+            return "PENDING" if len(status_threads) == 1 else "SUCCESS"
+
+        async_result = _celery_result(mocker, [], result=[])
+        type(async_result).status = mocker.PropertyMock(side_effect=_status)
+        mocker.patch(
+            "core.celery.rag_client.asyncio.sleep", new_callable=mocker.AsyncMock
+        )
+
+        result = await rag_client.search_with_rag_database_async(
+            "/proj", "main_db", "hello"
+        )
+
+        assert result == []
+        assert len(status_threads) == 3
+        assert loop_thread not in status_threads
+
+
+class TestCloseRPCClients:
+    """Keep-alive clients are closed on shutdown."""
+
+    async def test_closes_sync_and_async_clients(self, mocker):
+        sync_client = httpx.Client()
+        mocker.patch.object(rag_client, "_rpc_client", sync_client)
+        async_client = rag_client._get_async_rpc_client()
+
+        await rag_client.close_rpc_clients()
+
+        assert sync_client.is_closed
+        assert async_client.is_closed
+        assert rag_client._rpc_client is None
+        assert not rag_client._async_rpc_clients